@@ -0,0 +1,35 @@
+"""Add catalog_versions table for in-memory question catalog invalidation
+
+Revision ID: 5ecd428c3e16
+Revises: 21a84a4e5e82
+Create Date: 2026-02-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5ecd428c3e16'
+down_revision: Union[str, None] = '21a84a4e5e82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create catalog_versions table and seed the questions catalog version"""
+    catalog_versions = op.create_table(
+        'catalog_versions',
+        sa.Column('name', sa.String(64), primary_key=True),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+    op.bulk_insert(catalog_versions, [{'name': 'questions', 'version': 1}])
+
+
+def downgrade() -> None:
+    """Drop catalog_versions table"""
+    op.drop_table('catalog_versions')
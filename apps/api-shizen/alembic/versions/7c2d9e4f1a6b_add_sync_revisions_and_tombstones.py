@@ -0,0 +1,56 @@
+"""Add sync revisions and tombstones for delta sync
+
+Revision ID: 7c2d9e4f1a6b
+Revises: 5ecd428c3e16
+Create Date: 2026-02-03 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d9e4f1a6b'
+down_revision: Union[str, None] = '5ecd428c3e16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = ('tasks', 'projects', 'rituals')
+
+
+def upgrade() -> None:
+    """Add revision columns, per-user revision counter and tombstones table"""
+    for table in SYNCED_TABLES:
+        # Existing rows get revision 0: clients pick them up with sinceRevision=0
+        op.add_column(table, sa.Column('revision', sa.BigInteger(), nullable=False, server_default='0'))
+        op.create_index(f'ix_{table}_user_revision', table, ['user_id', 'revision'])
+
+    op.create_table(
+        'sync_revisions',
+        sa.Column('user_id', sa.String(), primary_key=True),
+        sa.Column('revision', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('entity_type', sa.String(16), primary_key=True),
+        sa.Column('entity_id', sa.String(), primary_key=True),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('revision', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_sync_tombstones_user_revision', 'sync_tombstones', ['user_id', 'revision'])
+
+
+def downgrade() -> None:
+    """Drop delta sync tables and revision columns"""
+    op.drop_index('ix_sync_tombstones_user_revision', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    op.drop_table('sync_revisions')
+
+    for table in SYNCED_TABLES:
+        op.drop_index(f'ix_{table}_user_revision', table_name=table)
+        op.drop_column(table, 'revision')
@@ -0,0 +1,37 @@
+"""Add chart_cache table for memoized birth charts
+
+Revision ID: 8d3e0f5a2b7c
+Revises: 7c2d9e4f1a6b
+Create Date: 2026-02-04 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3e0f5a2b7c'
+down_revision: Union[str, None] = '7c2d9e4f1a6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create chart_cache table (calculator + normalized input hash)"""
+    op.create_table(
+        'chart_cache',
+        sa.Column('calculator', sa.String(32), primary_key=True),
+        sa.Column('input_hash', sa.String(64), primary_key=True),
+        sa.Column('calculator_version', sa.Integer(), nullable=False),
+        sa.Column('inputs', sa.JSON(), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop chart_cache table"""
+    op.drop_table('chart_cache')
@@ -0,0 +1,59 @@
+"""Add keyset pagination and search indexes for conversations
+
+Revision ID: 9e4f1a6b3c8d
+Revises: 8d3e0f5a2b7c
+Create Date: 2026-02-05 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4f1a6b3c8d'
+down_revision: Union[str, None] = '8d3e0f5a2b7c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Composite keyset indexes + GIN full-text / tags indexes (PostgreSQL)"""
+    op.create_index(
+        'ix_messages_conversation_created_id',
+        'messages',
+        ['conversation_id', 'created_at', 'id'],
+    )
+    op.create_index(
+        'ix_conversation_sessions_user_last_message',
+        'conversation_sessions',
+        ['user_id', 'last_message_at', 'id'],
+    )
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Expressions must match the ones used by ConversationService queries
+    op.execute(
+        "CREATE INDEX ix_messages_content_fts ON messages "
+        "USING gin (to_tsvector('simple', content))"
+    )
+    op.execute(
+        "CREATE INDEX ix_conversation_sessions_title_fts ON conversation_sessions "
+        "USING gin (to_tsvector('simple', coalesce(title, '')))"
+    )
+    op.execute(
+        "CREATE INDEX ix_conversation_sessions_tags ON conversation_sessions "
+        "USING gin (CAST(meta -> 'tags' AS JSONB))"
+    )
+
+
+def downgrade() -> None:
+    """Drop conversation pagination and search indexes"""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_conversation_sessions_tags")
+        op.execute("DROP INDEX IF EXISTS ix_conversation_sessions_title_fts")
+        op.execute("DROP INDEX IF EXISTS ix_messages_content_fts")
+
+    op.drop_index('ix_conversation_sessions_user_last_message', table_name='conversation_sessions')
+    op.drop_index('ix_messages_conversation_created_id', table_name='messages')
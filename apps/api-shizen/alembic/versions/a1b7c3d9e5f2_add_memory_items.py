@@ -0,0 +1,56 @@
+"""Add memory_items and memory_index_state for semantic memory
+
+Revision ID: a1b7c3d9e5f2
+Revises: 9e4f1a6b3c8d
+Create Date: 2026-02-09 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1b7c3d9e5f2'
+down_revision: Union[str, None] = '9e4f1a6b3c8d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create memory_items (embedded snippets) and memory_index_state (indexer watermarks)"""
+    op.create_table(
+        'memory_items',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('source_type', sa.String(length=16), nullable=False),
+        sa.Column('source_id', sa.String(), nullable=False),
+        sa.Column('scope', sa.String(), nullable=True),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('model', sa.String(length=128), nullable=False),
+        sa.Column('dimensions', sa.Integer(), nullable=False),
+        sa.Column('embedding', sa.LargeBinary(), nullable=False),
+        sa.Column('source_created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('indexed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_memory_items_user_model', 'memory_items', ['user_id', 'model'])
+    op.create_index('ix_memory_items_source', 'memory_items', ['source_type', 'source_id'])
+
+    op.create_table(
+        'memory_index_state',
+        sa.Column('source_type', sa.String(length=16), nullable=False),
+        sa.Column('watermark_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('watermark_id', sa.String(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('source_type'),
+    )
+
+
+def downgrade() -> None:
+    """Drop semantic memory tables"""
+    op.drop_table('memory_index_state')
+    op.drop_index('ix_memory_items_source', table_name='memory_items')
+    op.drop_index('ix_memory_items_user_model', table_name='memory_items')
+    op.drop_table('memory_items')
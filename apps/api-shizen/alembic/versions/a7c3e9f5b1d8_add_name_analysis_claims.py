@@ -0,0 +1,28 @@
+"""Add batch leases to name_analyses
+
+Revision ID: a7c3e9f5b1d8
+Revises: f6b2c8d4e0a7
+Create Date: 2026-03-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f5b1d8'
+down_revision: Union[str, None] = 'f6b2c8d4e0a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Lease of the worker processing a pending name (NULL: unclaimed)"""
+    op.add_column('name_analyses', sa.Column('claimed_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the batch leases"""
+    op.drop_column('name_analyses', 'claimed_until')
@@ -0,0 +1,42 @@
+"""Add name_analyses shared store
+
+Revision ID: b2c8d4e0f6a3
+Revises: a1b7c3d9e5f2
+Create Date: 2026-02-12 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2c8d4e0f6a3'
+down_revision: Union[str, None] = 'a1b7c3d9e5f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create name_analyses (etymology / anthroponymy / energetic weight per name)"""
+    op.create_table(
+        'name_analyses',
+        sa.Column('kind', sa.String(length=24), nullable=False),
+        sa.Column('name_key', sa.String(), nullable=False),
+        sa.Column('locale', sa.String(length=8), nullable=False),
+        sa.Column('display_name', sa.String(), nullable=False),
+        sa.Column('analysis', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('kind', 'name_key', 'locale'),
+    )
+    op.create_index('ix_name_analyses_status_kind', 'name_analyses', ['status', 'kind', 'locale'])
+
+
+def downgrade() -> None:
+    """Drop name_analyses"""
+    op.drop_index('ix_name_analyses_status_kind', table_name='name_analyses')
+    op.drop_table('name_analyses')
@@ -0,0 +1,73 @@
+"""Move heavy HolisticProfile analysis blobs to holistic_profile_sections
+
+Revision ID: c3d9e5f1a7b4
+Revises: b2c8d4e0f6a3
+Create Date: 2026-02-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9e5f1a7b4'
+down_revision: Union[str, None] = 'b2c8d4e0f6a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SECTIONS = (
+    'psychological_analysis',
+    'neurodivergence_analysis',
+    'shinkofa_analysis',
+    'design_human',
+    'astrology_western',
+    'astrology_chinese',
+    'numerology',
+)
+
+
+def upgrade() -> None:
+    """Create holistic_profile_sections, copy each non-null section, drop the columns"""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    op.create_table(
+        'holistic_profile_sections',
+        sa.Column('profile_id', sa.String(), nullable=False),
+        sa.Column('section', sa.String(length=32), nullable=False),
+        sa.Column('data', sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['profile_id'], ['holistic_profiles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('profile_id', 'section'),
+    )
+
+    for section in SECTIONS:
+        value = f"CAST({section} AS JSONB)" if is_postgres else section
+        op.execute(
+            f"INSERT INTO holistic_profile_sections (profile_id, section, data, updated_at) "
+            f"SELECT id, '{section}', {value}, updated_at FROM holistic_profiles "
+            f"WHERE {section} IS NOT NULL"
+        )
+
+    for section in SECTIONS:
+        op.drop_column('holistic_profiles', section)
+
+
+def downgrade() -> None:
+    """Restore the JSON columns from holistic_profile_sections"""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    for section in SECTIONS:
+        op.add_column('holistic_profiles', sa.Column(section, sa.JSON(), nullable=True))
+
+    for section in SECTIONS:
+        value = "CAST(s.data AS JSON)" if is_postgres else "s.data"
+        op.execute(
+            f"UPDATE holistic_profiles SET {section} = ("
+            f"SELECT {value} FROM holistic_profile_sections s "
+            f"WHERE s.profile_id = holistic_profiles.id AND s.section = '{section}')"
+        )
+
+    op.drop_table('holistic_profile_sections')
@@ -0,0 +1,39 @@
+"""Add holistic_profile_stats materialized admin statistics
+
+Revision ID: d4e0f6a2b8c5
+Revises: c3d9e5f1a7b4
+Create Date: 2026-02-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e0f6a2b8c5'
+down_revision: Union[str, None] = 'c3d9e5f1a7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create holistic_profile_stats (single-row snapshot, filled by the API refresher)"""
+    op.create_table(
+        'holistic_profile_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('total_profiles', sa.Integer(), nullable=False),
+        sa.Column('total_users_with_profile', sa.Integer(), nullable=False),
+        sa.Column('profiles_last_7_days', sa.Integer(), nullable=False),
+        sa.Column('profiles_last_30_days', sa.Integer(), nullable=False),
+        sa.Column('complete_profiles', sa.Integer(), nullable=False),
+        sa.Column('average_version', sa.Float(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    """Drop holistic_profile_stats"""
+    op.drop_table('holistic_profile_stats')
@@ -0,0 +1,56 @@
+"""Unique questionnaire answer per (session_id, question_id)
+
+Revision ID: e5f1a7b3c9d6
+Revises: d4e0f6a2b8c5
+Create Date: 2026-02-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f1a7b3c9d6'
+down_revision: Union[str, None] = 'd4e0f6a2b8c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Make answers upsertable by (session_id, question_id):
+    1. Remove duplicate answers left by concurrent autosaves (keep the latest)
+    2. Add the composite UNIQUE constraint used as ON CONFLICT target
+    """
+    # Correlated subquery (not DELETE ... USING) so it runs on PostgreSQL and SQLite
+    op.execute(sa.text("""
+        DELETE FROM questionnaire_responses
+        WHERE EXISTS (
+            SELECT 1 FROM questionnaire_responses newer
+            WHERE newer.session_id = questionnaire_responses.session_id
+              AND newer.question_id = questionnaire_responses.question_id
+              AND (
+                newer.updated_at > questionnaire_responses.updated_at
+                OR (newer.updated_at = questionnaire_responses.updated_at
+                    AND newer.id > questionnaire_responses.id)
+              )
+        )
+    """))
+
+    # Batch mode: plain ALTER TABLE on PostgreSQL, table copy on SQLite
+    with op.batch_alter_table('questionnaire_responses') as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_questionnaire_responses_session_question',
+            ['session_id', 'question_id']
+        )
+
+
+def downgrade() -> None:
+    """Drop the composite unique constraint"""
+    with op.batch_alter_table('questionnaire_responses') as batch_op:
+        batch_op.drop_constraint(
+            'uq_questionnaire_responses_session_question',
+            type_='unique'
+        )
@@ -0,0 +1,33 @@
+"""Add input fingerprints to holistic profile sections and synthesis
+
+Revision ID: f6b2c8d4e0a7
+Revises: e5f1a7b3c9d6
+Create Date: 2026-02-22 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b2c8d4e0a7'
+down_revision: Union[str, None] = 'e5f1a7b3c9d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Record, per profile version, the inputs each section was computed from.
+    Existing rows keep NULL (recomputed on their next regeneration).
+    """
+    op.add_column('holistic_profile_sections', sa.Column('input_hash', sa.String(length=64), nullable=True))
+    op.add_column('holistic_profiles', sa.Column('synthesis_input_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the input fingerprints"""
+    op.drop_column('holistic_profiles', 'synthesis_input_hash')
+    op.drop_column('holistic_profile_sections', 'input_hash')
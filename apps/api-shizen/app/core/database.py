@@ -5,11 +5,14 @@ Shinkofa Platform - Shizen-Planner Service
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session, declarative_base, scoped_session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import Pool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 from typing import Generator, AsyncGenerator
 import os
+import time
 from dotenv import load_dotenv
 
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT, REGISTRY, Gauge
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -27,9 +30,32 @@ if DATABASE_URL.startswith("postgresql://"):
 # Async database URL (for async operations)
 ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql+psycopg://", "postgresql+asyncpg://", 1)
 
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long checkouts wait for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, engine="sync")
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording how long checkouts wait for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, engine="async")
+
+
 # Create engine with explicit isolation level
 engine = create_engine(
     DATABASE_URL,
+    poolclass=TimedQueuePool,
     pool_size=int(os.getenv("PLANNER_DATABASE_POOL_SIZE", "5")),
     max_overflow=int(os.getenv("PLANNER_DATABASE_MAX_OVERFLOW", "10")),
     pool_pre_ping=True,  # Verify connections before using
@@ -56,12 +82,24 @@ SessionLocal = sessionmaker(
 # Create async engine for async operations
 async_engine = create_async_engine(
     ASYNC_DATABASE_URL,
+    poolclass=TimedAsyncQueuePool,
     pool_size=int(os.getenv("PLANNER_DATABASE_POOL_SIZE", "5")),
     max_overflow=int(os.getenv("PLANNER_DATABASE_MAX_OVERFLOW", "10")),
     pool_pre_ping=True,
     echo=bool(os.getenv("SQL_ECHO", "False") == "True"),
 )
 
+# Connections currently checked out (read at scrape time)
+REGISTRY.register(Gauge(
+    "shizen_db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool",
+    ("engine",),
+    collect=lambda: {
+        ("sync",): engine.pool.checkedout(),
+        ("async",): async_engine.pool.checkedout(),
+    },
+))
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     async_engine,
@@ -0,0 +1,158 @@
+"""
+Executors - Bounded per-workload pools for blocking work
+Shinkofa Platform - Shizen-Planner Service
+
+Blocking calls (OCR, ephemeris/chart calculations, synchronous SQLAlchemy
+sessions) must never run on the event loop: one OCR upload would otherwise
+stall every WebSocket chat on the worker.
+
+Each workload has its own pool, so a burst of OCR uploads cannot starve sync
+requests. Pools are bounded twice: max_workers threads/processes, and at most
+max_pending submissions waiting for them (extra callers wait asynchronously).
+
+Usage:
+    result = await run_blocking("ocr", ocr_service.extract_text_from_file, path)
+
+Sizes are configurable per workload: EXECUTOR_<NAME>_WORKERS / _PENDING
+(e.g., EXECUTOR_OCR_WORKERS=4).
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class WorkloadConfig:
+    """Pool definition for one kind of blocking work"""
+    max_workers: int
+    max_pending: int
+    kind: str = "thread"  # "thread" or "process" (process: picklable callables only)
+
+
+def _config(name: str, workers: int, pending: int, kind: str = "thread") -> WorkloadConfig:
+    prefix = f"EXECUTOR_{name.upper()}"
+    return WorkloadConfig(
+        max_workers=int(os.getenv(f"{prefix}_WORKERS", workers)),
+        max_pending=int(os.getenv(f"{prefix}_PENDING", pending)),
+        kind=os.getenv(f"{prefix}_KIND", kind),
+    )
+
+
+WORKLOADS: Dict[str, WorkloadConfig] = {
+    # pdf2image + tesseract: heavy, few at a time
+    "ocr": _config("ocr", workers=2, pending=8),
+    # Tesseract on single rendered pages, fed by the "ocr" threads (sync submit)
+    "ocr_pages": _config("ocr_pages", workers=max(1, min(4, (os.cpu_count() or 2) - 1)), pending=0, kind="process"),
+    # Swiss Ephemeris / kerykeion / numerology chart calculations
+    "ephemeris": _config("ephemeris", workers=4, pending=64),
+    # Synchronous SQLAlchemy sessions used from async endpoints
+    "sync_db": _config("sync_db", workers=8, pending=64),
+    # Local sentence-embedding model (semantic memory indexing + queries)
+    "embeddings": _config("embeddings", workers=2, pending=64),
+    # Profile Markdown/PDF rendering (user exports, admin bulk exports)
+    "exports": _config("exports", workers=4, pending=128),
+}
+
+
+class WorkloadPool:
+    """Executor + admission semaphore for one workload"""
+
+    def __init__(self, name: str, config: WorkloadConfig):
+        self.name = name
+        self.config = config
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        """Underlying executor (also usable directly from pool threads via submit())"""
+        with self._lock:
+            if self._executor is None:
+                if self.config.kind == "process":
+                    # spawn: forking a multi-threaded server process is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.config.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.config.max_workers,
+                        thread_name_prefix=f"{self.name}-pool",
+                    )
+            return self._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop (tests create several loops)
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.config.max_workers + self.config.max_pending)
+            self._loop = loop
+        return self._slots
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run func(*args, **kwargs) in the pool and await its result"""
+        if self.config.kind == "process":
+            call = functools.partial(func, *args, **kwargs)
+        else:
+            # Keep contextvars (request-scoped logging/tracing) like asyncio.to_thread
+            call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+
+        async with self._semaphore():
+            return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_pools: Dict[str, WorkloadPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(workload: str) -> WorkloadPool:
+    """Get (or lazily create) the pool for a workload"""
+    with _pools_lock:
+        pool = _pools.get(workload)
+        if pool is None:
+            if workload not in WORKLOADS:
+                raise KeyError(f"Unknown executor workload: {workload}")
+            pool = _pools[workload] = WorkloadPool(workload, WORKLOADS[workload])
+        return pool
+
+
+async def run_blocking(workload: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking callable off the event loop in the workload's pool
+
+    Args:
+        workload: Pool name ("ocr", "ephemeris", "sync_db")
+        func: Blocking callable
+
+    Returns:
+        func's return value (its exceptions are re-raised)
+    """
+    return await get_pool(workload).run(func, *args, **kwargs)
+
+
+def shutdown_executors() -> None:
+    """Shut down all pools (application shutdown)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown()
+        _pools.clear()
+    logger.info("🧵 Executor pools shut down")
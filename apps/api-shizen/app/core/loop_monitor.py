@@ -0,0 +1,122 @@
+"""
+Loop Monitor - Event loop lag detection
+Shinkofa Platform - Shizen-Planner Service
+
+A heartbeat coroutine records when the loop last ran; a watchdog thread checks
+it. When a callback blocks the loop for more than LOOP_LAG_THRESHOLD_MS
+(default 100 ms) the watchdog logs the loop thread's current stack - i.e. the
+blocking code - and the heartbeat logs the total stall once the loop resumes.
+
+Started from the application lifespan (disable with LOOP_MONITOR_ENABLED=false).
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.metrics import EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "25"))
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+
+
+@dataclass
+class LoopLagStats:
+    """Counters exposed for diagnostics"""
+    stalls: int = 0
+    max_lag_ms: float = 0.0
+    last_lag_ms: float = 0.0
+
+
+class LoopLagMonitor:
+    """Heartbeat task + watchdog thread for one event loop"""
+
+    def __init__(
+        self,
+        threshold_ms: float = LOOP_LAG_THRESHOLD_MS,
+        interval_ms: float = LOOP_MONITOR_INTERVAL_MS,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.stats = LoopLagStats()
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._reported_beat: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running loop"""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"⏱️ Event loop lag monitor started (threshold {self.threshold * 1000:.0f} ms)")
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread"""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = now - expected
+            EVENT_LOOP_LAG.observe(max(lag, 0.0))
+            if lag > self.threshold:
+                self._record(lag)
+
+    def _record(self, lag: float) -> None:
+        lag_ms = lag * 1000
+        self.stats.stalls += 1
+        self.stats.last_lag_ms = lag_ms
+        self.stats.max_lag_ms = max(self.stats.max_lag_ms, lag_ms)
+        logger.warning(f"🐢 Event loop blocked for {lag_ms:.0f} ms")
+
+    def _watch(self) -> None:
+        """Watchdog thread: dump the loop thread's stack while it is stalled"""
+        while not self._stop.wait(self.interval):
+            last_beat = self._last_beat
+            stalled = time.monotonic() - last_beat - self.interval
+            if stalled <= self.threshold or self._reported_beat == last_beat:
+                continue
+            # Report each stall once
+            self._reported_beat = last_beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "(unavailable)"
+            logger.warning(
+                f"🐢 Event loop stalled for more than {stalled * 1000:.0f} ms, blocking code:\n{stack}"
+            )
+
+
+# Application-wide monitor
+_loop_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Get or create the loop monitor singleton"""
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = LoopLagMonitor()
+    return _loop_monitor
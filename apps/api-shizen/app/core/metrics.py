@@ -0,0 +1,392 @@
+"""
+Metrics - Prometheus-style counters, gauges and histograms
+Shinkofa Platform - Shizen-Planner Service
+
+Minimal in-process registry rendered in the Prometheus text exposition
+format (version 0.0.4) on GET /metrics.
+
+Multi-worker mode (uvicorn --workers N): set METRICS_MULTIPROC_DIR to a
+directory shared by the workers and emptied before they start. Each worker
+writes a snapshot of its metrics there every METRICS_FLUSH_SECONDS
+(run_metrics_flusher) and when it is scraped. Whichever worker answers a
+scrape merges every snapshot. Counters and histograms are summed, and
+snapshots of exited workers are kept so totals never go down. Gauges get a
+`pid` label and only live workers are reported. Without the directory,
+each worker only reports its own metrics.
+
+Usage:
+    LLM_TOKENS.inc(120, provider="ollama", model="qwen2.5", kind="prompt")
+    with QUOTA_CHECK_DURATION.time(operation="reserve"):
+        ...
+
+Application metrics are declared at the bottom of this module so every
+instrumented module shares the same names and label sets.
+"""
+import abc
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, suppress
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Directory shared by the workers of one instance (unset: single-process metrics)
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR") or None
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+# Seconds: fast paths (DB, cache, HTTP routes)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Seconds: LLM generations (seconds to minutes)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _render(name: str, type_name: str, documentation: str, samples) -> str:
+    lines = [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} {type_name}",
+    ]
+    for sample_name, names, values, value in samples:
+        lines.append(f"{sample_name}{_format_labels(names, values)} {_format_value(value)}")
+    return "\n".join(lines)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class Metric(abc.ABC):
+    """Base class: name, help text and label names"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def samples(self) -> List[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """(sample name, label names, label values, value) tuples"""
+
+    def render(self) -> str:
+        return _render(self.name, self.type_name, self.documentation, self.samples())
+
+
+class Counter(Metric):
+    """Monotonic counter"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, self.labelnames, key, value) for key, value in items]
+
+
+class Gauge(Metric):
+    """Value that goes up and down (set directly, or read from `collect` at scrape time)"""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        if self._collect is not None:
+            try:
+                values = dict(self._collect())
+            except Exception:
+                values = {}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [(self.name, self.labelnames, key, value) for key, value in sorted(values.items())]
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram (+ _sum and _count)"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [per-bucket counts..., sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the `with` block (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        names = self.labelnames + ("le",)
+        samples = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", names, key + (_format_value(bound),), cumulative))
+            samples.append((f"{self.name}_sum", self.labelnames, key, state[-1]))
+            samples.append((f"{self.name}_count", self.labelnames, key, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together (merged across workers with multiproc_dir)"""
+
+    def __init__(self, multiproc_dir: Optional[str] = None):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        self.multiproc_dir = multiproc_dir
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        if self.multiproc_dir:
+            return self._render_merged()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+    # === Multi-worker mode ===
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """JSON-serializable samples of every metric of this process"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {
+                "type": metric.type_name,
+                "help": metric.documentation,
+                "samples": [[name, list(names), list(values), value] for name, names, values, value in metric.samples()],
+            }
+            for metric in metrics
+        }
+
+    def write_snapshot(self) -> None:
+        """Save this worker's snapshot in multiproc_dir (atomic replace)"""
+        if not self.multiproc_dir:
+            return
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        path = os.path.join(self.multiproc_dir, f"worker-{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _render_merged(self) -> str:
+        """Render the snapshots of every worker of the instance (this one refreshed first)"""
+        self.write_snapshot()
+        merged: Dict[str, Dict[str, Any]] = {}
+        for filename in sorted(os.listdir(self.multiproc_dir)):
+            if not (filename.startswith("worker-") and filename.endswith(".json")):
+                continue
+            pid = int(filename[len("worker-"):-len(".json")])
+            try:
+                with open(os.path.join(self.multiproc_dir, filename), encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # Being replaced
+
+            gauge_alive = pid == os.getpid() or _alive(pid)
+            for name, metric in snapshot.items():
+                entry = merged.setdefault(name, {"type": metric["type"], "help": metric["help"], "samples": {}})
+                for sample_name, names, values, value in metric["samples"]:
+                    if metric["type"] == "gauge":
+                        if not gauge_alive:
+                            continue
+                        names, values = names + ["pid"], values + [str(pid)]
+                    key = (sample_name, tuple(names), tuple(values))
+                    entry["samples"][key] = entry["samples"].get(key, 0) + value
+
+        rendered = []
+        for name, entry in merged.items():
+            samples = [key + (value,) for key, value in entry["samples"].items()]
+            if entry["type"] == "gauge":
+                samples.sort(key=lambda sample: sample[:3])
+            rendered.append(_render(name, entry["type"], entry["help"], samples))
+        return "\n".join(rendered) + "\n"
+
+
+async def run_metrics_flusher(registry: Optional["MetricsRegistry"] = None, interval: float = METRICS_FLUSH_SECONDS) -> None:
+    """
+    Background task: save this worker's metrics for the other workers' scrapes
+
+    Args:
+        registry: Registry to flush (application registry by default)
+        interval: Seconds between snapshots
+    """
+    registry = registry or REGISTRY
+    if not registry.multiproc_dir:
+        return
+    try:
+        while True:
+            try:
+                registry.write_snapshot()
+            except OSError as e:
+                logger.warning(f"⚠️ Metrics snapshot failed: {e}")
+            await asyncio.sleep(interval)
+    finally:
+        # Last values of this worker (kept after it exits)
+        with suppress(OSError):
+            registry.write_snapshot()
+
+
+REGISTRY = MetricsRegistry(METRICS_MULTIPROC_DIR)
+
+
+# === Application metrics ===
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "shizen_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+))
+
+LLM_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "shizen_llm_request_duration_seconds",
+    "LLM provider call latency",
+    ("provider", "model", "operation", "outcome"),
+    buckets=LLM_BUCKETS,
+))
+
+LLM_TOKENS = REGISTRY.register(Counter(
+    "shizen_llm_tokens_total",
+    "Tokens processed by LLM providers",
+    ("provider", "model", "kind"),
+))
+
+DB_POOL_CHECKOUT_WAIT = REGISTRY.register(Histogram(
+    "shizen_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    ("engine",),
+))
+
+EVENT_LOOP_LAG = REGISTRY.register(Histogram(
+    "shizen_event_loop_lag_seconds",
+    "Delay of the event loop heartbeat beyond its schedule",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+))
+
+QUOTA_CHECK_DURATION = REGISTRY.register(Histogram(
+    "shizen_quota_check_duration_seconds",
+    "Tier lookup and Shizen quota check latency",
+    ("operation",),
+))
+
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "shizen_cache_requests_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ("cache", "result"),
+))
+
+
+def record_cache(cache: str, hit: bool, count: int = 1) -> None:
+    """Count `count` lookups of a cache as hits or misses"""
+    if count:
+        CACHE_REQUESTS.inc(count, cache=cache, result="hit" if hit else "miss")
@@ -0,0 +1,125 @@
+"""
+Tracing - W3C trace context propagation and request metrics
+Shinkofa Platform - Shizen-Planner Service
+
+ObservabilityMiddleware gives every HTTP request a trace context (continued
+from an incoming `traceparent` header, or started fresh), records the
+request latency per route template, and returns the trace id in the
+X-Trace-Id response header.
+
+Outgoing calls (Ollama, DeepSeek) send `traceparent` from
+outgoing_trace_headers(), so a slow chat can be followed across services.
+The context is a contextvar: it follows awaits and run_blocking() pools.
+"""
+import re
+import secrets
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.core.metrics import HTTP_REQUEST_DURATION
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass(frozen=True)
+class TraceContext:
+    """Trace id + current span id (W3C trace context)"""
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    @classmethod
+    def new(cls) -> "TraceContext":
+        return cls(trace_id=secrets.token_hex(16), span_id=secrets.token_hex(8))
+
+    def child(self) -> "TraceContext":
+        """Same trace, new span (one per outgoing call)"""
+        return TraceContext(self.trace_id, secrets.token_hex(8), self.sampled)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[TraceContext]:
+    """
+    Parse a `traceparent` header
+
+    Returns:
+        TraceContext, or None when missing/invalid (all-zero ids are invalid)
+    """
+    match = _TRACEPARENT.match((value or "").strip().lower())
+    if not match:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return TraceContext(trace_id, span_id, sampled=bool(int(flags, 16) & 1))
+
+
+_current_trace: ContextVar[Optional[TraceContext]] = ContextVar("current_trace", default=None)
+
+
+def current_trace() -> Optional[TraceContext]:
+    """Trace context of the running request (None outside requests)"""
+    return _current_trace.get()
+
+
+def outgoing_trace_headers() -> Dict[str, str]:
+    """
+    Headers propagating the current trace to a downstream call
+
+    Background work (no request) starts a new trace per call.
+    """
+    trace = current_trace()
+    span = trace.child() if trace else TraceContext.new()
+    return {"traceparent": span.traceparent}
+
+
+class ObservabilityMiddleware:
+    """ASGI middleware: trace context + per-route latency histogram"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope.get("headers", ()):
+            if name == b"traceparent":
+                incoming = parse_traceparent(value.decode("latin-1"))
+                break
+        trace = incoming.child() if incoming else TraceContext.new()
+        token = _current_trace.set(trace)
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_trace(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", ()))
+                headers.append((TRACE_ID_HEADER.lower().encode(), trace.trace_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            # Route template (not the raw path): bounded label cardinality
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            )
+            _current_trace.reset(token)
@@ -4,7 +4,13 @@ FastAPI AI Companion + Planner (Unified Service)
 Powered by Ollama (Qwen 2.5 7B, CodeLlama 7B) + LangChain
 """
 
-from fastapi import FastAPI
+import asyncio
+import hmac
+import logging
+import os
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from app.routes import (
@@ -20,6 +26,69 @@ from app.routes import (
 from app.routes.stripe_webhooks import router as stripe_webhooks_router
 from app.routes.admin_questions import router as admin_questions_router
 from app.routes.admin_profiles import router as admin_profiles_router
+from app.core.database import SessionLocal
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.core.executors import shutdown_executors
+from app.core.loop_monitor import LOOP_MONITOR_ENABLED, get_loop_monitor
+from app.core.metrics import CONTENT_TYPE_LATEST, REGISTRY, run_metrics_flusher
+from app.core.tracing import TRACE_ID_HEADER, ObservabilityMiddleware
+from app.services.questionnaire_data_loader import get_compiled_questionnaire
+from app.services.questions_db_service import run_catalog_refresher
+from app.services.conversation_memory import get_conversation_memory_service
+from app.services.semantic_memory import run_memory_indexer
+from app.services.name_analysis_store import run_name_analysis_worker
+from app.services.profile_stats_service import run_profile_stats_refresher
+from app.services.ocr.question_matcher import warm_question_matcher
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup / shutdown hooks"""
+    # Compile questionnaire structure once (served from memory afterwards)
+    try:
+        get_compiled_questionnaire()
+    except FileNotFoundError as e:
+        logger.error(f"Questionnaire source missing: {e}")
+
+    # Reload question catalog when admin edits bump its version
+    catalog_refresher = asyncio.create_task(run_catalog_refresher(SessionLocal))
+
+    # Embed new messages / journals / profiles for Shizen's long-term memory
+    memory_indexer = asyncio.create_task(run_memory_indexer())
+
+    # Pre-analyze names of ongoing questionnaires, many names per LLM prompt
+    name_worker = asyncio.create_task(run_name_analysis_worker())
+
+    # Keep the admin dashboard statistics snapshot fresh
+    stats_refresher = asyncio.create_task(run_profile_stats_refresher())
+
+    # Embed canonical questions once for OCR document import
+    matcher_warmup = asyncio.create_task(warm_question_matcher())
+
+    # Share this worker's metrics with the others (METRICS_MULTIPROC_DIR)
+    metrics_flusher = asyncio.create_task(run_metrics_flusher())
+
+    # Log callbacks blocking the event loop (> 100 ms by default)
+    loop_monitor = get_loop_monitor() if LOOP_MONITOR_ENABLED else None
+    if loop_monitor:
+        loop_monitor.start()
+
+    yield
+
+    for task in (catalog_refresher, memory_indexer, name_worker, stats_refresher, matcher_warmup, metrics_flusher):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    # Cancel conversation summaries still running in the background
+    await get_conversation_memory_service().shutdown()
+
+    if loop_monitor:
+        await loop_monitor.stop()
+    shutdown_executors()
+
 
 app = FastAPI(
     title="Shinkofa Shizen-Planner API",
@@ -28,6 +97,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     redirect_slashes=False,  # Disable automatic slash redirects to prevent breaking nginx proxy
+    lifespan=lifespan,
 )
 
 # Proxy Headers Middleware (MUST be first - before CORS)
@@ -46,8 +116,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TRACE_ID_HEADER],  # keyset pagination cursor, trace id
 )
 
+# Trace context + per-route latency (outermost: measures the whole stack)
+app.add_middleware(ObservabilityMiddleware)
+
+# /metrics is off unless enabled; with METRICS_TOKEN set, scrapers must send "Authorization: Bearer <token>"
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 
 @app.get("/health")
 async def health_check():
@@ -61,6 +139,18 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics of the instance (METRICS_ENABLED=true, bearer METRICS_TOKEN if set)"""
+    if not METRICS_ENABLED:
+        return Response(status_code=404)
+    if METRICS_TOKEN and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {METRICS_TOKEN}"
+    ):
+        return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return Response(content=REGISTRY.render(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -7,11 +7,17 @@ from .journal import DailyJournal
 from .ritual import Ritual
 from .questionnaire_session import QuestionnaireSession, SessionStatus
 from .questionnaire_response import QuestionnaireResponse
-from .holistic_profile import HolisticProfile
+from .holistic_profile import HolisticProfile, HolisticProfileSection, PROFILE_SECTIONS
 from .uploaded_chart import UploadedChart, ChartType, ChartStatus
 from .conversation_session import ConversationSession, ConversationStatus
 from .message import Message, MessageRole
 from .shizen_message_usage import ShizenMessageUsage
+from .catalog_version import CatalogVersion
+from .sync_revision import SyncRevision, SyncTombstone
+from .chart_cache import ChartCacheEntry
+from .memory_item import MemoryItem, MemoryIndexState
+from .name_analysis import NameAnalysis
+from .profile_stats import ProfileStatsSnapshot
 
 __all__ = [
     "Task",
@@ -22,6 +28,8 @@ __all__ = [
     "SessionStatus",
     "QuestionnaireResponse",
     "HolisticProfile",
+    "HolisticProfileSection",
+    "PROFILE_SECTIONS",
     "UploadedChart",
     "ChartType",
     "ChartStatus",
@@ -30,4 +38,12 @@ __all__ = [
     "Message",
     "MessageRole",
     "ShizenMessageUsage",
+    "CatalogVersion",
+    "SyncRevision",
+    "SyncTombstone",
+    "ChartCacheEntry",
+    "MemoryItem",
+    "MemoryIndexState",
+    "NameAnalysis",
+    "ProfileStatsSnapshot",
 ]
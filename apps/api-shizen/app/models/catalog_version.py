@@ -0,0 +1,25 @@
+"""
+Catalog Version model - Version counters for in-memory catalogs
+Shinkofa Platform - Planner
+"""
+from sqlalchemy import Column, String, Integer, DateTime
+from datetime import datetime, timezone
+from app.core.database import Base
+
+
+class CatalogVersion(Base):
+    """
+    Monotonic version per cached catalog (e.g., "questions").
+
+    Writers bump the version; API workers poll it and reload
+    their in-memory catalog when it changes.
+    """
+    __tablename__ = "catalog_versions"
+
+    name = Column(String(64), primary_key=True)  # e.g., "questions"
+    version = Column(Integer, nullable=False, default=1)
+
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<CatalogVersion(name={self.name}, version={self.version})>"
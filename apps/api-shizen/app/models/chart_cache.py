@@ -0,0 +1,30 @@
+"""
+Chart Cache model - Memoized birth charts (Design Humain, astrology, numerology)
+Shinkofa Platform - Shizen AI
+"""
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from datetime import datetime, timezone
+from app.core.database import Base
+
+
+class ChartCacheEntry(Base):
+    """
+    Result of a pure chart calculator for one set of normalized birth inputs.
+
+    Shared by every profile version and re-analysis of the same birth data;
+    an entry is recomputed only when its calculator version changes.
+    """
+    __tablename__ = "chart_cache"
+
+    calculator = Column(String(32), primary_key=True)  # design_human, astrology_western, astrology_chinese, numerology
+    input_hash = Column(String(64), primary_key=True)  # SHA-256 of normalized inputs
+    calculator_version = Column(Integer, nullable=False)
+
+    inputs = Column(JSON, nullable=False)  # Normalized inputs (debugging / bulk recompute)
+    result = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<ChartCacheEntry(calculator={self.calculator}, hash={self.input_hash[:12]}, v{self.calculator_version})>"
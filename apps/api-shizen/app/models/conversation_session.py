@@ -4,7 +4,8 @@ Shinkofa Platform - Shizen AI Chatbot
 
 Manages conversation sessions with SHIZEN agent
 """
-from sqlalchemy import Column, String, DateTime, JSON, Enum as SQLEnum, Text
+from sqlalchemy import Column, String, DateTime, JSON, Enum as SQLEnum, Text, Index, cast, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from enum import Enum
@@ -84,6 +85,11 @@ class ConversationSession(Base):
     )
     archived_at = Column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        # Keyset pagination of a user's conversations by last activity
+        Index('ix_conversation_sessions_user_last_message', 'user_id', 'last_message_at', 'id'),
+    )
+
     # Relationships
     messages = relationship(
         "Message",
@@ -91,3 +97,24 @@ class ConversationSession(Base):
         cascade="all, delete-orphan",
         order_by="Message.created_at"
     )
+
+
+# Index-backed search expressions (PostgreSQL only).
+# Queries must use these exact expressions for the GIN indexes to apply.
+CONVERSATION_TITLE_TSVECTOR = func.to_tsvector(
+    text("'simple'"),
+    func.coalesce(ConversationSession.title, text("''")),
+)
+CONVERSATION_TAGS_JSONB = cast(ConversationSession.meta.op('->')(text("'tags'")), JSONB)
+
+Index(
+    'ix_conversation_sessions_title_fts',
+    CONVERSATION_TITLE_TSVECTOR,
+    postgresql_using='gin',
+).ddl_if(dialect='postgresql')
+
+Index(
+    'ix_conversation_sessions_tags',
+    CONVERSATION_TAGS_JSONB,
+    postgresql_using='gin',
+).ddl_if(dialect='postgresql')
@@ -3,10 +3,72 @@ HolisticProfile model
 Shinkofa Platform - Holistic Questionnaire
 """
 from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Text, Integer, Boolean
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.collections import attribute_keyed_dict
 from datetime import datetime, timezone
 from app.core.database import Base
 
+# Heavy analysis blobs stored in holistic_profile_sections (one row per section)
+PROFILE_SECTIONS = (
+    "psychological_analysis",
+    "neurodivergence_analysis",
+    "shinkofa_analysis",
+    "design_human",
+    "astrology_western",
+    "astrology_chinese",
+    "numerology",
+)
+
+
+class HolisticProfileSection(Base):
+    """
+    One heavy analysis section of a HolisticProfile.
+
+    Kept out of holistic_profiles so that listing versions / admin lists never
+    read the blobs. JSONB on PostgreSQL (values over ~2 KB are TOAST-compressed
+    out of line); fetched with the profile entity or alone, per section.
+    """
+    __tablename__ = "holistic_profile_sections"
+
+    profile_id = Column(
+        String,
+        ForeignKey("holistic_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    section = Column(String(32), primary_key=True)  # One of PROFILE_SECTIONS
+    data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    # Fingerprint of the inputs (answer blocs, birth data, name) this data was
+    # computed from; None = not reusable (fallback result, legacy row)
+    input_hash = Column(String(64), nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    def __repr__(self):
+        return f"<HolisticProfileSection(profile_id={self.profile_id}, section={self.section})>"
+
+
+def _section_property(name: str) -> property:
+    """Attribute reading/writing one section row (None = no row)"""
+
+    def getter(profile: "HolisticProfile"):
+        row = profile.sections.get(name)
+        return row.data if row is not None else None
+
+    def setter(profile: "HolisticProfile", value):
+        if value is None:
+            profile.sections.pop(name, None)
+        elif name in profile.sections:
+            profile.sections[name].data = value
+        else:
+            profile.sections[name] = HolisticProfileSection(section=name, data=value)
+
+    return property(getter, setter, doc=f"{name} section (holistic_profile_sections)")
+
 
 class HolisticProfile(Base):
     """
@@ -37,7 +99,7 @@ class HolisticProfile(Base):
     is_active = Column(Boolean, nullable=False, default=True)  # Only one active version per user
 
     # Psychological Analysis (Ollama-generated)
-    psychological_analysis = Column(JSON, nullable=True)
+    # psychological_analysis (section, see HolisticProfileSection)
     # Structure:
     # {
     #     "mbti": {"type": "INTJ", "scores": {...}, "description": "...", "strengths": [...], "challenges": [...]},
@@ -50,7 +112,7 @@ class HolisticProfile(Base):
     # }
 
     # Neurodivergence Analysis (Ollama-generated)
-    neurodivergence_analysis = Column(JSON, nullable=True)
+    # neurodivergence_analysis (section, see HolisticProfileSection)
     # Structure:
     # {
     #     "adhd": {"score": 72, "profile": "inattention", "manifestations": [...], "strategies": [...]},
@@ -63,7 +125,7 @@ class HolisticProfile(Base):
     # }
 
     # Shinkofa Dimensions (Ollama-generated)
-    shinkofa_analysis = Column(JSON, nullable=True)
+    # shinkofa_analysis (section, see HolisticProfileSection)
     # Structure:
     # {
     #     "life_wheel": {"spiritual": 6, "mental": 8, "emotional": 5, ...},
@@ -73,7 +135,7 @@ class HolisticProfile(Base):
     # }
 
     # Design Human (Calculated via Swiss Ephemeris)
-    design_human = Column(JSON, nullable=True)
+    # design_human (section, see HolisticProfileSection)
     # Structure:
     # {
     #     "type": "projector",
@@ -91,7 +153,7 @@ class HolisticProfile(Base):
     # }
 
     # Astrology Western (Calculated via kerykeion)
-    astrology_western = Column(JSON, nullable=True)
+    # astrology_western (section, see HolisticProfileSection)
     # Structure:
     # {
     #     "sun_sign": "libra",
@@ -105,7 +167,7 @@ class HolisticProfile(Base):
     # }
 
     # Astrology Chinese (Calculated manually)
-    astrology_chinese = Column(JSON, nullable=True)
+    # astrology_chinese (section, see HolisticProfileSection)
     # Structure:
     # {
     #     "animal_sign": "horse",
@@ -117,7 +179,7 @@ class HolisticProfile(Base):
     # }
 
     # Numerology (Calculated manually - Pythagorean)
-    numerology = Column(JSON, nullable=True)
+    # numerology (section, see HolisticProfileSection)
     # Structure:
     # {
     #     "life_path": 7,
@@ -135,6 +197,8 @@ class HolisticProfile(Base):
     # AI-Generated Synthesis (Ollama - final integration)
     synthesis = Column(Text, nullable=True)  # Long-form text synthesis by Shizen IA
     recommendations = Column(JSON, nullable=True)  # Actionable recommendations
+    # Fingerprint of the section input hashes + name/context the synthesis was built from
+    synthesis_input_hash = Column(String(64), nullable=True)
 
     # Export files paths (if generated)
     pdf_export_path = Column(String, nullable=True)
@@ -155,3 +219,20 @@ class HolisticProfile(Base):
 
     # Relationships
     session = relationship("QuestionnaireSession", back_populates="profile")
+    # Loaded with the entity (second SELECT ... IN, async-safe); column
+    # projections (list endpoints) never touch it
+    sections = relationship(
+        HolisticProfileSection,
+        collection_class=attribute_keyed_dict("section"),
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+
+    psychological_analysis = _section_property("psychological_analysis")
+    neurodivergence_analysis = _section_property("neurodivergence_analysis")
+    shinkofa_analysis = _section_property("shinkofa_analysis")
+    design_human = _section_property("design_human")
+    astrology_western = _section_property("astrology_western")
+    astrology_chinese = _section_property("astrology_chinese")
+    numerology = _section_property("numerology")
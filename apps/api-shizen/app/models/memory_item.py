@@ -0,0 +1,59 @@
+"""
+Memory Item model - Embedded snippets for semantic long-term memory
+Shinkofa Platform - Shizen AI
+"""
+from sqlalchemy import Column, String, Integer, DateTime, Text, LargeBinary, Index
+from datetime import datetime, timezone
+from app.core.database import Base
+
+
+class MemoryItem(Base):
+    """
+    One embedded chunk of a user's history (message, journal entry, profile section).
+
+    Written by the background indexer, read at prompt time to retrieve the
+    few snippets semantically closest to the user's message. The vector is
+    stored as raw float32 bytes (L2-normalized, `dimensions` floats).
+    """
+    __tablename__ = "memory_items"
+    __table_args__ = (
+        # Loading one user's vectors for one embedding model
+        Index('ix_memory_items_user_model', 'user_id', 'model'),
+        # Replacing every chunk of a source row (e.g., edited journal)
+        Index('ix_memory_items_source', 'source_type', 'source_id'),
+    )
+
+    id = Column(String, primary_key=True)  # "{source_type}:{source_id}:{chunk}"
+    user_id = Column(String, nullable=False)  # No FK - user is in auth service
+    source_type = Column(String(16), nullable=False)  # message, journal, profile
+    source_id = Column(String, nullable=False)
+    scope = Column(String, nullable=True)  # conversation_id for messages
+
+    text = Column(Text, nullable=False)  # Snippet injected in the prompt
+    model = Column(String(128), nullable=False)  # Embedding model name
+    dimensions = Column(Integer, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)  # float32 bytes
+
+    source_created_at = Column(DateTime(timezone=True), nullable=False)
+    indexed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<MemoryItem(id={self.id}, user_id={self.user_id}, model={self.model})>"
+
+
+class MemoryIndexState(Base):
+    """
+    Indexer watermark for one source table: last (timestamp, id) embedded.
+
+    The indexer resumes from here after a restart instead of re-embedding
+    the whole history.
+    """
+    __tablename__ = "memory_index_state"
+
+    source_type = Column(String(16), primary_key=True)
+    watermark_at = Column(DateTime(timezone=True), nullable=False)
+    watermark_id = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<MemoryIndexState(source={self.source_type}, at={self.watermark_at})>"
@@ -4,7 +4,7 @@ Shinkofa Platform - Shizen AI Chatbot
 
 Stores individual messages within conversation sessions
 """
-from sqlalchemy import Column, String, DateTime, JSON, Enum as SQLEnum, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, JSON, Enum as SQLEnum, Text, ForeignKey, Index, func, text
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from enum import Enum
@@ -25,6 +25,10 @@ class Message(Base):
     Stores message content, role, metadata, and links to conversation session
     """
     __tablename__ = "messages"
+    __table_args__ = (
+        # Keyset pagination of a conversation's history
+        Index('ix_messages_conversation_created_id', 'conversation_id', 'created_at', 'id'),
+    )
 
     id = Column(String, primary_key=True, index=True)
     conversation_id = Column(
@@ -80,3 +84,14 @@ class Message(Base):
         "ConversationSession",
         back_populates="messages"
     )
+
+
+# Full-text search over message content (PostgreSQL only).
+# Queries must use this exact expression for the GIN index to apply.
+MESSAGE_CONTENT_TSVECTOR = func.to_tsvector(text("'simple'"), Message.content)
+
+Index(
+    'ix_messages_content_fts',
+    MESSAGE_CONTENT_TSVECTOR,
+    postgresql_using='gin',
+).ddl_if(dialect='postgresql')
@@ -0,0 +1,44 @@
+"""
+Name Analysis model - Shared store of LLM name analyses
+Shinkofa Platform - Shizen AI
+"""
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
+from datetime import datetime, timezone
+from app.core.database import Base
+
+
+class NameAnalysis(Base):
+    """
+    LLM analysis of a name, shared by every user carrying it.
+
+    Kinds:
+    - first_name / last_name: etymology of one name part
+    - anthroponymy: cultural analysis of a "first last" pair
+    - energetic_weight: vibrational analysis of a pair + its numerology numbers
+
+    Rows are created `pending` when a name is first seen (questionnaire
+    started) and filled in batches by the background name analysis worker
+    (claimed_until: lease of the worker processing them); profile generation
+    only calls the LLM for names still missing.
+    """
+    __tablename__ = "name_analyses"
+    __table_args__ = (
+        # Background worker: next pending names of a kind
+        Index('ix_name_analyses_status_kind', 'status', 'kind', 'locale'),
+    )
+
+    kind = Column(String(24), primary_key=True)
+    name_key = Column(String, primary_key=True)  # normalize_name() output
+    locale = Column(String(8), primary_key=True)
+
+    display_name = Column(String, nullable=False)  # As first written by a user (prompts)
+    analysis = Column(Text, nullable=True)  # NULL while pending
+    status = Column(String(16), nullable=False, default="pending")  # pending, ready, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    claimed_until = Column(DateTime(timezone=True), nullable=True)  # Batch lease of a worker (pending rows)
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<NameAnalysis(kind={self.kind}, name={self.name_key}, locale={self.locale}, status={self.status})>"
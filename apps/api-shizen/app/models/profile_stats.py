@@ -0,0 +1,34 @@
+"""
+Profile Stats model - Materialized admin statistics of holistic profiles
+Shinkofa Platform - Shizen AI
+"""
+from sqlalchemy import Column, Integer, Float, DateTime
+from datetime import datetime, timezone
+from app.core.database import Base
+
+# Single row: the latest snapshot
+PROFILE_STATS_ROW_ID = 1
+
+
+class ProfileStatsSnapshot(Base):
+    """
+    Precomputed holistic profile statistics for the admin dashboard.
+
+    Refreshed periodically in the background (one aggregate query over
+    holistic_profiles); the /admin/profiles/stats endpoint reads this
+    single row instead of scanning the profiles table.
+    """
+    __tablename__ = "holistic_profile_stats"
+
+    id = Column(Integer, primary_key=True, default=PROFILE_STATS_ROW_ID)
+    total_profiles = Column(Integer, nullable=False, default=0)
+    total_users_with_profile = Column(Integer, nullable=False, default=0)
+    profiles_last_7_days = Column(Integer, nullable=False, default=0)
+    profiles_last_30_days = Column(Integer, nullable=False, default=0)
+    complete_profiles = Column(Integer, nullable=False, default=0)
+    average_version = Column(Float, nullable=False, default=1.0)
+
+    computed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<ProfileStatsSnapshot(total_profiles={self.total_profiles}, computed_at={self.computed_at})>"
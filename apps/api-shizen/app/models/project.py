@@ -2,7 +2,7 @@
 Project model
 Shinkofa Platform - Planner
 """
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, BigInteger, Index, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.core.database import Base
@@ -21,9 +21,16 @@ class Project(Base):
     # Relations
     user_id = Column(String, nullable=False, index=True)  # No FK - user is in auth service
 
+    # Delta sync: revision of the last write (see SyncRevision)
+    revision = Column(BigInteger, default=0, nullable=False)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
     # Relationships
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index('ix_projects_user_revision', 'user_id', 'revision'),
+    )
@@ -2,7 +2,7 @@
 QuestionnaireResponse model
 Shinkofa Platform - Holistic Questionnaire
 """
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.core.database import Base
@@ -16,6 +16,10 @@ class QuestionnaireResponse(Base):
     Organized by bloc (A-I) and question ID
     """
     __tablename__ = "questionnaire_responses"
+    __table_args__ = (
+        # One answer per question and session (bulk upsert conflict target)
+        UniqueConstraint('session_id', 'question_id', name='uq_questionnaire_responses_session_question'),
+    )
 
     id = Column(String, primary_key=True, index=True)
     session_id = Column(
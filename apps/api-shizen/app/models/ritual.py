@@ -3,7 +3,7 @@ Ritual model
 Shinkofa Platform - Planner
 Daily rituals and habits tracking
 """
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, JSON
+from sqlalchemy import Column, String, BigInteger, Index, Boolean, Integer, DateTime, JSON
 from datetime import datetime, timezone
 from app.core.database import Base
 
@@ -19,9 +19,16 @@ class Ritual(Base):
     order = Column(Integer, default=0, nullable=False)  # Display order
     tasks = Column(JSON, default=list, nullable=True)  # List of subtasks for this ritual
 
+    # Delta sync: revision of the last write (see SyncRevision)
+    revision = Column(BigInteger, default=0, nullable=False)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
     # Relations
     user_id = Column(String, nullable=False, index=True)  # No FK - user is in auth service
+
+    __table_args__ = (
+        Index('ix_rituals_user_revision', 'user_id', 'revision'),
+    )
@@ -0,0 +1,46 @@
+"""
+Sync Revision models - Per-user revision counter and deletion tombstones
+Shinkofa Platform - Planner
+"""
+from sqlalchemy import Column, String, BigInteger, DateTime, Index
+from datetime import datetime, timezone
+from app.core.database import Base
+
+
+class SyncRevision(Base):
+    """
+    Monotonic revision counter per user.
+
+    Every write to tasks, projects or rituals takes the next revision and
+    stamps it on the changed rows, so clients can ask for "changes since N".
+    """
+    __tablename__ = "sync_revisions"
+
+    user_id = Column(String, primary_key=True)  # No FK - user is in auth service
+    revision = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<SyncRevision(user_id={self.user_id}, revision={self.revision})>"
+
+
+class SyncTombstone(Base):
+    """
+    Deleted synced entity, kept so delta sync can tell clients to drop it.
+    """
+    __tablename__ = "sync_tombstones"
+
+    entity_type = Column(String(16), primary_key=True)  # task, project, ritual
+    entity_id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)
+    revision = Column(BigInteger, nullable=False)
+
+    deleted_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (
+        Index('ix_sync_tombstones_user_revision', 'user_id', 'revision'),
+    )
+
+    def __repr__(self):
+        return f"<SyncTombstone({self.entity_type}:{self.entity_id}, revision={self.revision})>"
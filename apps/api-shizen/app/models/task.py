@@ -2,7 +2,7 @@
 Task model
 Shinkofa Platform - Planner
 """
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Integer
+from sqlalchemy import Column, String, BigInteger, Index, DateTime, Boolean, ForeignKey, Integer
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.core.database import Base
@@ -27,9 +27,16 @@ class Task(Base):
     difficulty_level = Column(String, nullable=True)  # quick, medium, complex, long
     order = Column(Integer, default=0, nullable=False)  # Display order
 
+    # Delta sync: revision of the last write (see SyncRevision)
+    revision = Column(BigInteger, default=0, nullable=False)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
     # Relationships
     project = relationship("Project", back_populates="tasks")
+
+    __table_args__ = (
+        Index('ix_tasks_user_revision', 'user_id', 'revision'),
+    )
@@ -3,18 +3,23 @@ Admin Holistic Profiles endpoints
 Shinkofa Platform - Shizen Planner Service
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from pydantic import BaseModel
+from sqlalchemy import desc
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
-import httpx
 import logging
+import os
 
 from app.core.database import get_db
-from app.models.holistic_profile import HolisticProfile
+from app.models.holistic_profile import HolisticProfile, HolisticProfileSection
 from app.models.questionnaire_session import QuestionnaireSession
-from app.core.config import settings
+from app.services.profile_export_service import get_profile_export_service
+from app.services.profile_stats_service import get_profile_stats
+from app.services.user_info_service import get_user_info_service
+from app.utils.auth import verify_super_admin
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +63,7 @@ class ProfileStats(BaseModel):
     complete_profiles: int
     incomplete_profiles: int
     average_version: float
+    computed_at: Optional[datetime] = None
 
 class ProfileListResponse(BaseModel):
     profiles: List[ProfileSummary]
@@ -66,92 +72,45 @@ class ProfileListResponse(BaseModel):
     page_size: int
     total_pages: int
 
+class BulkExportRequest(BaseModel):
+    profile_ids: List[str] = Field(..., min_length=1, max_length=200)
+    format: str = Field("pdf", pattern="^(markdown|pdf)$")
 
-# ============= AUTH HELPER =============
-
-async def verify_super_admin(authorization: str) -> bool:
-    """Verify the request is from a super admin via auth service"""
-    if not authorization or not authorization.startswith("Bearer "):
-        return False
-
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.AUTH_SERVICE_URL}/auth/me",
-                headers={"Authorization": authorization}
-            )
-            if response.status_code == 200:
-                user = response.json()
-                return user.get("is_super_admin", False)
-    except Exception:
-        pass
-    return False
 
+# ============= AUTH HELPER =============
 
 async def get_user_info(user_ids: List[str], authorization: str) -> dict:
-    """Fetch user info from auth service"""
-    user_map = {}
-    try:
-        async with httpx.AsyncClient() as client:
-            for user_id in user_ids:
-                response = await client.get(
-                    f"{settings.AUTH_SERVICE_URL}/auth/super-admin/admin/users/{user_id}",
-                    headers={"Authorization": authorization}
-                )
-                if response.status_code == 200:
-                    user = response.json()
-                    user_map[user_id] = {
-                        "username": user.get("username"),
-                        "email": user.get("email")
-                    }
-    except Exception:
-        pass
-    return user_map
+    """Fetch user info from auth service (cached, misses fetched concurrently)"""
+    return await get_user_info_service().get_many(user_ids, authorization)
 
 
 # ============= ENDPOINTS =============
 
 @router.get("/stats", response_model=ProfileStats)
-async def get_profile_stats(
+async def profile_stats(
     authorization: str = Query(..., alias="authorization"),
     db: Session = Depends(get_db)
 ):
     """
     Get holistic profiles statistics (super admin only)
+
+    Served from the holistic_profile_stats snapshot (see computed_at).
     """
     if not await verify_super_admin(f"Bearer {authorization}"):
         raise HTTPException(status_code=403, detail="Super admin access required")
 
-    from datetime import timedelta
-
-    now = datetime.utcnow()
-    seven_days_ago = now - timedelta(days=7)
-    thirty_days_ago = now - timedelta(days=30)
-
-    total_profiles = db.query(HolisticProfile).count()
-    total_users = db.query(func.count(func.distinct(HolisticProfile.user_id))).scalar()
-    profiles_7d = db.query(HolisticProfile).filter(
-        HolisticProfile.generated_at >= seven_days_ago
-    ).count()
-    profiles_30d = db.query(HolisticProfile).filter(
-        HolisticProfile.generated_at >= thirty_days_ago
-    ).count()
-
-    # Complete = has synthesis
-    complete = db.query(HolisticProfile).filter(
-        HolisticProfile.synthesis.isnot(None)
-    ).count()
-
-    avg_version = db.query(func.avg(HolisticProfile.version)).scalar() or 1.0
+    # Precomputed snapshot (refreshed in the background): one primary-key read
+    snapshot = get_profile_stats(db)
 
     return ProfileStats(
-        total_profiles=total_profiles,
-        total_users_with_profile=total_users or 0,
-        profiles_last_7_days=profiles_7d,
-        profiles_last_30_days=profiles_30d,
-        complete_profiles=complete,
-        incomplete_profiles=total_profiles - complete,
-        average_version=round(avg_version, 2)
+        total_profiles=snapshot.total_profiles,
+        total_users_with_profile=snapshot.total_users_with_profile,
+        profiles_last_7_days=snapshot.profiles_last_7_days,
+        profiles_last_30_days=snapshot.profiles_last_30_days,
+        complete_profiles=snapshot.complete_profiles,
+        incomplete_profiles=snapshot.total_profiles - snapshot.complete_profiles,
+        average_version=snapshot.average_version,
+        computed_at=snapshot.computed_at,
     )
 
 
@@ -170,7 +129,17 @@ async def list_profiles(
     if not await verify_super_admin(f"Bearer {authorization}"):
         raise HTTPException(status_code=403, detail="Super admin access required")
 
-    query = db.query(HolisticProfile)
+    # Summary columns only: analysis sections are never loaded for the list
+    query = db.query(
+        HolisticProfile.id,
+        HolisticProfile.user_id,
+        HolisticProfile.session_id,
+        HolisticProfile.version,
+        HolisticProfile.is_active,
+        HolisticProfile.generated_at,
+        HolisticProfile.updated_at,
+        HolisticProfile.synthesis.isnot(None).label("has_synthesis"),
+    )
 
     # Filters
     if user_id:
@@ -191,6 +160,15 @@ async def list_profiles(
     # Paginate
     profiles = query.offset((page - 1) * page_size).limit(page_size).all()
 
+    # Which sections each profile has (names only, one query for the page)
+    sections_by_profile = {}
+    if profiles:
+        section_rows = db.query(HolisticProfileSection.profile_id, HolisticProfileSection.section).filter(
+            HolisticProfileSection.profile_id.in_([p.id for p in profiles])
+        ).all()
+        for profile_id, section in section_rows:
+            sections_by_profile.setdefault(profile_id, set()).add(section)
+
     # Fetch user info
     user_ids = list(set(p.user_id for p in profiles))
     user_map = await get_user_info(user_ids, f"Bearer {authorization}")
@@ -199,19 +177,20 @@ async def list_profiles(
     profile_summaries = []
     for p in profiles:
         user_info = user_map.get(p.user_id, {})
+        sections = sections_by_profile.get(p.id, set())
         profile_summaries.append(ProfileSummary(
             id=p.id,
             user_id=p.user_id,
             session_id=p.session_id,
             version=p.version,
             is_active=p.is_active,
-            has_psychological=p.psychological_analysis is not None,
-            has_neurodivergence=p.neurodivergence_analysis is not None,
-            has_shinkofa=p.shinkofa_analysis is not None,
-            has_design_human=p.design_human is not None,
-            has_astrology=p.astrology_western is not None or p.astrology_chinese is not None,
-            has_numerology=p.numerology is not None,
-            has_synthesis=p.synthesis is not None,
+            has_psychological="psychological_analysis" in sections,
+            has_neurodivergence="neurodivergence_analysis" in sections,
+            has_shinkofa="shinkofa_analysis" in sections,
+            has_design_human="design_human" in sections,
+            has_astrology="astrology_western" in sections or "astrology_chinese" in sections,
+            has_numerology="numerology" in sections,
+            has_synthesis=bool(p.has_synthesis),
             generated_at=p.generated_at,
             updated_at=p.updated_at,
             username=user_info.get("username"),
@@ -227,6 +206,50 @@ async def list_profiles(
     )
 
 
+@router.post("/export")
+async def bulk_export_profiles(
+    request: BulkExportRequest,
+    authorization: str = Query(..., alias="authorization"),
+    db: Session = Depends(get_db)
+):
+    """
+    Export many profiles as a zip of Markdown or PDF files (super admin only)
+
+    Cached artifacts are reused; the others are rendered on the exports worker pool.
+    """
+    if not await verify_super_admin(f"Bearer {authorization}"):
+        raise HTTPException(status_code=403, detail="Super admin access required")
+
+    rows = db.query(
+        HolisticProfile.id,
+        HolisticProfile.user_id,
+        HolisticProfile.version,
+        HolisticProfile.updated_at,
+    ).filter(HolisticProfile.id.in_(request.profile_ids)).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="No profile found")
+
+    export_service = get_profile_export_service()
+    cached, missing_ids = {}, []
+    for row in rows:
+        path = export_service.cached_path(row.id, row.version, row.updated_at, request.format)
+        if path:
+            cached[export_service.archive_name(row.user_id, row.version, request.format)] = path
+        else:
+            missing_ids.append(row.id)
+
+    # Full profiles (with sections) only for artifacts not rendered yet
+    profiles = db.query(HolisticProfile).filter(HolisticProfile.id.in_(missing_ids)).all() if missing_ids else []
+    archive = await export_service.export_bulk(profiles, cached, request.format)
+
+    return FileResponse(
+        archive,
+        media_type="application/zip",
+        filename=f"profils_{datetime.utcnow().strftime('%Y%m%d_%H%M')}.zip",
+        background=BackgroundTask(os.remove, archive),
+    )
+
+
 @router.post("/{profile_id}/regenerate")
 async def regenerate_profile(
     profile_id: str,
@@ -253,21 +276,12 @@ async def regenerate_profile(
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Get user info from auth service for notification
-    user_info = None
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.AUTH_SERVICE_URL}/auth/super-admin/admin/users/{profile.user_id}",
-                headers={"Authorization": f"Bearer {authorization}"}
-            )
-            if response.status_code == 200:
-                user_info = response.json()
-    except Exception as e:
-        logger.warning(f"Could not fetch user info: {e}")
+    user_info = (await get_user_info([profile.user_id], f"Bearer {authorization}")).get(profile.user_id)
 
     # Delete existing profile to allow regeneration
     db.delete(profile)
     db.commit()
+    get_profile_export_service().invalidate(profile_id)
 
     # Trigger regeneration via the profile service
     try:
@@ -3,10 +3,17 @@ Admin routes for questionnaire management
 Super Admin only
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
 from pathlib import Path
 import json
 
+from app.core.database import get_db
+from app.models.question import Question
+from app.schemas.questionnaire import QuestionTranslationUpdate
+from app.services.questions_db_service import bump_questions_catalog_version
+from app.utils.auth import verify_super_admin
+
 router = APIRouter(prefix="/admin/questions", tags=["admin-questions"])
 
 # Path to questions index
@@ -93,3 +100,38 @@ async def get_question_by_number(question_number: int):
         )
 
     return question
+
+
+@router.patch("/by-number/{question_number}")
+async def update_question_translation(
+    question_number: int,
+    update: QuestionTranslationUpdate,
+    authorization: str = Query(..., alias="authorization"),
+    db: Session = Depends(get_db)
+):
+    """
+    Edit a question's translated fields in the database
+
+    Bumps the questions catalog version so every worker reloads
+    its in-memory catalog.
+
+    Super Admin only
+    """
+    if not await verify_super_admin(f"Bearer {authorization}"):
+        raise HTTPException(status_code=403, detail="Super admin access required")
+
+    question = db.query(Question).filter(Question.number == question_number).first()
+
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Question {question_number} not found"
+        )
+
+    fields = update.model_dump(exclude_unset=True, exclude={"locale"})
+    for field, value in fields.items():
+        setattr(question, f"{field}_{update.locale}", value)
+
+    bump_questions_catalog_version(db)
+
+    return question.to_dict(update.locale)
@@ -3,27 +3,30 @@ Daily Journals CRUD endpoints
 Shinkofa Platform - Planner
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import date
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.journal import DailyJournal
+from app.models.memory_item import MemoryItem
 from app.schemas.journal import (
     DailyJournal as JournalSchema,
     DailyJournalCreate,
     DailyJournalUpdate,
 )
+from app.services.semantic_memory import SOURCE_JOURNAL, get_semantic_memory_service
 from app.utils.auth import get_current_user_id
 
 router = APIRouter(prefix="/journals", tags=["journals"])
 
 
 @router.get("", response_model=List[JournalSchema])
-def get_journals(
+async def get_journals(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = 30,
 ):
     """
@@ -32,30 +35,29 @@ def get_journals(
     Query params:
     - limit: Maximum number of journals to return (default 30)
     """
-    return (
-        db.query(DailyJournal)
-        .filter(DailyJournal.user_id == user_id)
+    result = await db.execute(
+        select(DailyJournal)
+        .where(DailyJournal.user_id == user_id)
         .order_by(DailyJournal.date.desc())
         .limit(limit)
-        .all()
     )
+    return result.scalars().all()
 
 
 @router.get("/date/{journal_date}", response_model=JournalSchema | None)
-def get_journal_by_date(
+async def get_journal_by_date(
     journal_date: date,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get journal for a specific date.
     Returns null if no journal exists for this date (allowing frontend to create one).
     """
-    journal = (
-        db.query(DailyJournal)
-        .filter(DailyJournal.date == journal_date, DailyJournal.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(DailyJournal).where(DailyJournal.date == journal_date, DailyJournal.user_id == user_id)
     )
+    journal = result.scalars().first()
 
     # Return null instead of 404 if journal doesn't exist
     # This allows frontend to display empty journal or create new one
@@ -63,17 +65,16 @@ def get_journal_by_date(
 
 
 @router.get("/{journal_id}", response_model=JournalSchema)
-def get_journal(
+async def get_journal(
     journal_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a journal by ID"""
-    journal = (
-        db.query(DailyJournal)
-        .filter(DailyJournal.id == journal_id, DailyJournal.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(DailyJournal).where(DailyJournal.id == journal_id, DailyJournal.user_id == user_id)
     )
+    journal = result.scalars().first()
 
     if not journal:
         raise HTTPException(
@@ -85,20 +86,19 @@ def get_journal(
 
 
 @router.post("", response_model=JournalSchema, status_code=status.HTTP_201_CREATED)
-def create_journal(
+async def create_journal(
     journal_data: DailyJournalCreate,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new daily journal"""
     # Check if journal already exists for this date
-    existing = (
-        db.query(DailyJournal)
-        .filter(
+    result = await db.execute(
+        select(DailyJournal).where(
             DailyJournal.date == journal_data.date, DailyJournal.user_id == user_id
         )
-        .first()
     )
+    existing = result.scalars().first()
 
     if existing:
         raise HTTPException(
@@ -113,29 +113,28 @@ def create_journal(
     )
 
     db.add(new_journal)
-    db.commit()
-    db.refresh(new_journal)
+    await db.commit()
+    await db.refresh(new_journal)
 
     return new_journal
 
 
 @router.put("/date/{journal_date}", response_model=JournalSchema)
-def upsert_journal_by_date(
+async def upsert_journal_by_date(
     journal_date: date,
     journal_update: DailyJournalUpdate,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create or update journal for a specific date (upsert).
     Convenient endpoint for saving journal without checking if it exists.
     """
     # Try to find existing journal
-    journal = (
-        db.query(DailyJournal)
-        .filter(DailyJournal.date == journal_date, DailyJournal.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(DailyJournal).where(DailyJournal.date == journal_date, DailyJournal.user_id == user_id)
     )
+    journal = result.scalars().first()
 
     if journal:
         # Update existing journal
@@ -153,25 +152,24 @@ def upsert_journal_by_date(
         )
         db.add(journal)
 
-    db.commit()
-    db.refresh(journal)
+    await db.commit()
+    await db.refresh(journal)
 
     return journal
 
 
 @router.put("/{journal_id}", response_model=JournalSchema)
-def update_journal(
+async def update_journal(
     journal_id: str,
     journal_update: DailyJournalUpdate,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update an existing journal by ID"""
-    journal = (
-        db.query(DailyJournal)
-        .filter(DailyJournal.id == journal_id, DailyJournal.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(DailyJournal).where(DailyJournal.id == journal_id, DailyJournal.user_id == user_id)
     )
+    journal = result.scalars().first()
 
     if not journal:
         raise HTTPException(
@@ -184,24 +182,23 @@ def update_journal(
     for field, value in update_data.items():
         setattr(journal, field, value)
 
-    db.commit()
-    db.refresh(journal)
+    await db.commit()
+    await db.refresh(journal)
 
     return journal
 
 
 @router.delete("/{journal_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_journal(
+async def delete_journal(
     journal_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a journal"""
-    journal = (
-        db.query(DailyJournal)
-        .filter(DailyJournal.id == journal_id, DailyJournal.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(DailyJournal).where(DailyJournal.id == journal_id, DailyJournal.user_id == user_id)
     )
+    journal = result.scalars().first()
 
     if not journal:
         raise HTTPException(
@@ -209,7 +206,17 @@ def delete_journal(
             detail=f"Journal {journal_id} not found",
         )
 
-    db.delete(journal)
-    db.commit()
+    await db.delete(journal)
+    # Forget it in Shizen's semantic memory too
+    await db.execute(
+        delete(MemoryItem)
+        .where(
+            MemoryItem.source_type == SOURCE_JOURNAL,
+            MemoryItem.source_id == journal_id,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    get_semantic_memory_service().invalidate(user_id)
 
     return None
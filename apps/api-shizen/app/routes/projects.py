@@ -7,12 +7,13 @@ Tier limits enforced:
 - SAMURAI+: Unlimited projects
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import datetime, timezone
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.project import Project
 from app.schemas.project import (
     Project as ProjectSchema,
@@ -28,9 +29,9 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 
 
 @router.get("", response_model=List[ProjectSchema])
-def get_projects(
+async def get_projects(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     status_filter: str = None,
 ):
     """
@@ -39,26 +40,26 @@ def get_projects(
     Query params:
     - status_filter: Filter by status (active, completed, archived)
     """
-    query = db.query(Project).filter(Project.user_id == user_id)
+    query = select(Project).where(Project.user_id == user_id)
 
     if status_filter:
-        query = query.filter(Project.status == status_filter)
+        query = query.where(Project.status == status_filter)
 
-    return query.order_by(Project.created_at.desc()).all()
+    result = await db.execute(query.order_by(Project.created_at.desc()))
+    return result.scalars().all()
 
 
 @router.get("/{project_id}", response_model=ProjectSchema)
-def get_project(
+async def get_project(
     project_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a single project by ID"""
-    project = (
-        db.query(Project)
-        .filter(Project.id == project_id, Project.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(Project).where(Project.id == project_id, Project.user_id == user_id)
     )
+    project = result.scalars().first()
 
     if not project:
         raise HTTPException(
@@ -73,7 +74,7 @@ def get_project(
 async def create_project(
     project_data: ProjectCreate,
     user_id: str = Depends(verify_project_limit),  # Verifies tier limit
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a new project
@@ -95,25 +96,24 @@ async def create_project(
     )
 
     db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+    await db.commit()
+    await db.refresh(new_project)
 
     return new_project
 
 
 @router.put("/{project_id}", response_model=ProjectSchema)
-def update_project(
+async def update_project(
     project_id: str,
     project_update: ProjectUpdate,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update an existing project"""
-    project = (
-        db.query(Project)
-        .filter(Project.id == project_id, Project.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(Project).where(Project.id == project_id, Project.user_id == user_id)
     )
+    project = result.scalars().first()
 
     if not project:
         raise HTTPException(
@@ -126,24 +126,23 @@ def update_project(
     for field, value in update_data.items():
         setattr(project, field, value)
 
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
 
     return project
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(
+async def delete_project(
     project_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a project (cascade deletes associated tasks)"""
-    project = (
-        db.query(Project)
-        .filter(Project.id == project_id, Project.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(Project).where(Project.id == project_id, Project.user_id == user_id)
     )
+    project = result.scalars().first()
 
     if not project:
         raise HTTPException(
@@ -151,8 +150,8 @@ def delete_project(
             detail=f"Project {project_id} not found",
         )
 
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.commit()
 
     return None
 
@@ -161,7 +160,7 @@ def delete_project(
 async def sync_projects(
     sync_request: ProjectSyncRequest,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Bidirectional sync for projects
@@ -178,7 +177,8 @@ async def sync_projects(
     deleted_ids = []
 
     # Get all server projects for user
-    server_projects = db.query(Project).filter(Project.user_id == user_id).all()
+    result = await db.execute(select(Project).where(Project.user_id == user_id))
+    server_projects = result.scalars().all()
     server_project_map = {p.id: p for p in server_projects}
 
     # Tier verification: count new projects to be created
@@ -188,7 +188,7 @@ async def sync_projects(
             1 for p in sync_request.projects
             if not p.deleted and p.id not in server_project_map
         )
-        current_count = get_user_project_count(user_id, db)
+        current_count = await get_user_project_count(user_id, db)
 
         if current_count + new_project_count > tier.project_limit:
             raise HTTPException(
@@ -208,7 +208,7 @@ async def sync_projects(
         if client_project.deleted:
             # Client deleted this project
             if client_project.id in server_project_map:
-                db.delete(server_project_map[client_project.id])
+                await db.delete(server_project_map[client_project.id])
                 updated_on_server.append(client_project.id)
             continue
 
@@ -248,11 +248,12 @@ async def sync_projects(
             db.add(new_project)
             updated_on_server.append(client_project.id)
 
-    db.commit()
+    await db.commit()
 
     # Get server changes newer than last_sync
     server_changes = []
-    refreshed_projects = db.query(Project).filter(Project.user_id == user_id).all()
+    result = await db.execute(select(Project).where(Project.user_id == user_id))
+    refreshed_projects = result.scalars().all()
 
     for proj in refreshed_projects:
         proj_updated = proj.updated_at
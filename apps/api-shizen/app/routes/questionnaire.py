@@ -2,7 +2,7 @@
 Questionnaire API routes
 Shinkofa Platform - Holistic Questionnaire (144 questions)
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -16,6 +16,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 from app.core.database import get_db, get_async_db
+from app.core.executors import run_blocking
 from app.models.questionnaire_session import QuestionnaireSession, SessionStatus
 from app.models.questionnaire_response import QuestionnaireResponse
 from app.models.holistic_profile import HolisticProfile
@@ -25,6 +26,7 @@ from app.schemas.questionnaire import (
     QuestionnaireSessionResponse,
     AnswerSubmit,
     AnswersBatchSubmit,
+    AnswersImportResult,
     AnswerResponse,
     UploadedChartResponse,
     HolisticProfileResponse,
@@ -33,20 +35,26 @@ from app.schemas.questionnaire import (
     DocumentOCRResponse,
     OCRQuestionAnswer,
 )
-from app.services.questionnaire_data_loader import (
-    get_questionnaire_data,
-    get_bloc_questions,
-    get_module_questions
+from app.services.answer_ingestion import (
+    ANSWER_BATCH_SIZE,
+    AnswerStreamError,
+    read_answer_stream,
+    update_session_progress,
+    upsert_answers,
 )
+from app.services.questionnaire_data_loader import get_compiled_questionnaire
+from app.utils.http_cache import cached_json_response
 from app.services.questions_db_service import QuestionsDBService
-from app.services.ocr.ocr_service import (
-    OCRService,
-    save_uploaded_file,
-    cleanup_temp_file
-)
+from app.services.ocr.ocr_service import OCRService
 from app.services.ocr.parser import OCRTextParser
+from app.services.ocr.question_matcher import (
+    QUESTION_MATCH_LLM_FALLBACK,
+    get_question_matcher,
+    resolve_low_confidence,
+)
 from app.services.holistic_profile_service import get_holistic_profile_service
 from app.services.chart_analyzer_service import get_chart_analyzer_service
+from app.services.profile_export_service import get_profile_export_service
 
 router = APIRouter(prefix="/questionnaire", tags=["questionnaire"])
 
@@ -217,18 +225,19 @@ async def get_user_sessions(
 @router.post("/submit-answers", response_model=List[AnswerResponse], status_code=status.HTTP_201_CREATED)
 async def submit_answers_batch(
     batch: AnswersBatchSubmit,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Submit batch of answers
 
     Allows submitting multiple answers at once (up to 50 per request)
     Updates session status and completion percentage automatically
+
+    Answers are upserted in one statement keyed by (session_id, question_id),
+    then progress is recomputed with one UPDATE (autosave calls this constantly).
     """
     # Verify session exists
-    session = db.query(QuestionnaireSession).filter(
-        QuestionnaireSession.id == batch.session_id
-    ).first()
+    session = await db.get(QuestionnaireSession, batch.session_id)
 
     if not session:
         raise HTTPException(
@@ -244,64 +253,75 @@ async def submit_answers_batch(
             for _ in batch.answers
         ]
 
-    # Create answer records
-    created_answers = []
-    for answer_data in batch.answers:
-        # Check if answer already exists (update if so)
-        existing_answer = db.query(QuestionnaireResponse).filter(
-            QuestionnaireResponse.session_id == batch.session_id,
-            QuestionnaireResponse.question_id == answer_data.question_id
-        ).first()
-
-        if existing_answer:
-            # Update existing answer
-            existing_answer.answer = answer_data.answer
-            existing_answer.question_text = answer_data.question_text
-            existing_answer.question_type = answer_data.question_type
-            existing_answer.is_required = answer_data.is_required
-            existing_answer.updated_at = datetime.now(timezone.utc)
-            created_answers.append(existing_answer)
-        else:
-            # Create new answer
-            new_answer = QuestionnaireResponse(
-                id=str(uuid.uuid4()),
-                session_id=batch.session_id,
-                bloc=answer_data.bloc,
-                question_id=answer_data.question_id,
-                question_text=answer_data.question_text,
-                answer=answer_data.answer,
-                question_type=answer_data.question_type,
-                is_required=answer_data.is_required,
-                answered_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
-            )
-            db.add(new_answer)
-            created_answers.append(new_answer)
+    stored_answers = await upsert_answers(db, batch.session_id, batch.answers)
+    await update_session_progress(db, batch.session_id, current_bloc=batch.answers[-1].bloc)
+    await db.commit()
 
-    # Update session status
-    total_answers = db.query(QuestionnaireResponse).filter(
-        QuestionnaireResponse.session_id == batch.session_id
-    ).count() + len([a for a in created_answers if a.id.startswith(batch.session_id) is False])
+    return stored_answers
 
-    # NOTE: 144 total questions after questionnaire optimization (was 168)
-    # Updated 2026-01-24 to reflect actual question count
-    completion_percentage = min(100, int((total_answers / 144) * 100))
 
-    session.status = SessionStatus.IN_PROGRESS
-    session.completion_percentage = str(completion_percentage)
-    session.current_bloc = batch.answers[-1].bloc if batch.answers else session.current_bloc
-    session.last_activity_at = datetime.now(timezone.utc)
+@router.post("/submit-answers/stream", response_model=AnswersImportResult, status_code=status.HTTP_201_CREATED)
+async def submit_answers_stream(
+    session_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import answers streamed as NDJSON (one AnswerSubmit object per line)
+
+    For large imports (OCR documents, restores): the body is parsed as it
+    arrives and written every ANSWER_BATCH_SIZE answers, in one transaction.
+    Progress is recomputed once at the end.
 
-    if completion_percentage == 100:
-        session.status = SessionStatus.COMPLETED
-        session.completed_at = datetime.now(timezone.utc)
+    Content-Type: application/x-ndjson
+    """
+    session = await db.get(QuestionnaireSession, session_id)
 
-    db.commit()
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found"
+        )
 
-    for answer in created_answers:
-        db.refresh(answer)
+    if session.status == SessionStatus.COMPLETED:
+        return AnswersImportResult(
+            session_id=session_id,
+            received=0,
+            completion_percentage=int(session.completion_percentage),
+            status=session.status.value,
+        )
 
-    return created_answers
+    received = 0
+    last_bloc = None
+    pending: List[AnswerSubmit] = []
+    try:
+        async for answer in read_answer_stream(request.stream()):
+            pending.append(answer)
+            received += 1
+            last_bloc = answer.bloc
+            if len(pending) >= ANSWER_BATCH_SIZE:
+                await upsert_answers(db, session_id, pending)
+                pending = []
+        if pending:
+            await upsert_answers(db, session_id, pending)
+    except AnswerStreamError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    if received == 0:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No answers in stream")
+
+    completion, session_status = await update_session_progress(db, session_id, current_bloc=last_bloc)
+    await db.commit()
+
+    logger.info(f"📥 Imported {received} answers into session {session_id} ({completion}%)")
+
+    return AnswersImportResult(
+        session_id=session_id,
+        received=received,
+        completion_percentage=completion,
+        status=session_status.value,
+    )
 
 
 @router.get("/answers/{session_id}", response_model=List[AnswerResponse])
@@ -403,8 +423,9 @@ async def upload_chart(
         db.commit()
 
         # Step 2: Extract text with OCR
+        # pdf2image + tesseract are CPU-bound: run in the OCR pool, off the event loop
         ocr_service = OCRService(language='fra+eng')
-        ocr_result = ocr_service.extract_text_from_file(file_path)
+        ocr_result = await run_blocking("ocr", ocr_service.extract_text_from_file, file_path)
 
         if not ocr_result.get("success"):
             raise Exception(f"OCR extraction failed: {ocr_result.get('error')}")
@@ -550,15 +571,14 @@ async def upload_questionnaire_document(
             detail=f"File too large ({file_size_mb:.2f}MB). Maximum 10MB allowed"
         )
 
-    temp_file_path = None
-
     try:
-        # Save uploaded file to temporary location
-        temp_file_path = save_uploaded_file(content, file.filename)
-
-        # Extract text using OCR service
+        # Stream OCR page by page (images stay in memory, PDFs are rendered one
+        # page at a time); each page's text is parsed as soon as it is ready
         ocr_service = OCRService(language='fra+eng')
-        ocr_result = ocr_service.extract_text_from_file(temp_file_path)
+        parser = OCRTextParser()
+        ocr_result = await run_blocking(
+            "ocr", ocr_service.extract_text_from_bytes, content, file.filename, on_page=parser.feed_page
+        )
 
         if not ocr_result["success"]:
             raise HTTPException(
@@ -566,9 +586,22 @@ async def upload_questionnaire_document(
                 detail=f"OCR extraction failed: {ocr_result.get('error', 'Unknown error')}"
             )
 
-        # Parse extracted text to find question-answer pairs
-        parser = OCRTextParser()
-        parsed_result = parser.parse_document(ocr_result["text"])
+        parsed_result = parser.finish()
+
+        # Align fragments to the canonical questions (cosine search over embedded
+        # questions); only low-confidence fragments go to the LLM
+        matcher = get_question_matcher()
+        fragments = [qa.get("question_text") or "" for qa in parsed_result["data"]]
+        matches = await run_blocking("embeddings", matcher.match, fragments)
+        resolved_by_llm = 0
+        if QUESTION_MATCH_LLM_FALLBACK:
+            resolved_by_llm = await resolve_low_confidence(matcher, fragments, matches)
+
+        matched = sum(1 for match in matches if match.question_id)
+        if matches:
+            parsed_result["parsing_notes"].append(
+                f"🧭 {matched}/{len(matches)} questions matched to the questionnaire ({resolved_by_llm} via AI)"
+            )
 
         # Build response with OCR results + parsed data
         response = DocumentOCRResponse(
@@ -580,7 +613,15 @@ async def upload_questionnaire_document(
             questions_found=parsed_result["questions_found"],
             answers_found=parsed_result["answers_found"],
             parsed_data=[
-                OCRQuestionAnswer(**qa) for qa in parsed_result["data"]
+                OCRQuestionAnswer(
+                    **qa,
+                    question_id=match.question_id,
+                    bloc=match.bloc,
+                    match_score=match.score,
+                    match_confidence=match.confidence,
+                    match_source=match.source if match.question_id else None,
+                )
+                for qa, match in zip(parsed_result["data"], matches)
             ],
             raw_sections=parsed_result["raw_sections"],
             parsing_notes=parsed_result["parsing_notes"],
@@ -600,11 +641,6 @@ async def upload_questionnaire_document(
             detail=f"Document processing failed: {str(e)}"
         )
 
-    finally:
-        # Clean up temporary file
-        if temp_file_path:
-            cleanup_temp_file(temp_file_path)
-
 
 # ═════════════════════════════════════════════════════════════
 # HOLISTIC PROFILE
@@ -705,6 +741,7 @@ async def delete_holistic_profile_by_user(
     responses_deleted = 0
 
     # Delete all profiles
+    profile_ids = [profile.id for profile in profiles]
     for profile in profiles:
         db.delete(profile)
 
@@ -735,6 +772,9 @@ async def delete_holistic_profile_by_user(
             sessions_deleted += 1
 
     db.commit()
+    export_service = get_profile_export_service()
+    for profile_id in profile_ids:
+        export_service.invalidate(profile_id)
 
     logger.info(f"✅ Deleted {profiles_deleted} profile(s) for user {user_id}")
     if delete_questionnaire:
@@ -824,10 +864,14 @@ async def trigger_analysis(
     if existing_profiles:
         # Re-analyze existing profile - delete ALL existing profiles for this session
         logger.info(f"🗑️ Deleting {len(existing_profiles)} existing profile(s) for session {session_id}")
+        profile_ids = [profile.id for profile in existing_profiles]
         for profile in existing_profiles:
             await db.delete(profile)
         await db.flush()  # Flush immediately to avoid duplicate key error
         await db.commit()
+        export_service = get_profile_export_service()
+        for profile_id in profile_ids:
+            export_service.invalidate(profile_id)
 
     # Generate complete holistic profile using service
     try:
@@ -1129,6 +1173,7 @@ Tu perfil holístico integrará:
 
 @router.get("/structure")
 async def get_questionnaire_structure(
+    request: Request,
     locale: str = "fr",
     db: Session = Depends(get_db)
 ):
@@ -1142,22 +1187,28 @@ async def get_questionnaire_structure(
         Full questionnaire structure with all questions, metadata, and organization
 
     Note:
-        - locale=fr: Loads from Markdown source (default, legacy)
-        - locale=en/es: Loads from PostgreSQL with translations
+        - locale=fr: Served from the compiled Markdown artifact (ETag / 304 supported)
+        - locale=en/es: Served from the in-memory question catalog (ETag / 304 supported)
     """
     try:
-        # If French, use legacy Markdown source
+        # If French, serve pre-serialized compiled structure
         if locale == "fr":
-            data = get_questionnaire_data()
-            return data
+            body, etag = get_compiled_questionnaire().payload("structure")
+            return cached_json_response(request, body, etag)
+
+        # For EN/ES, serve from the in-memory question catalog (no DB round trip)
+        catalog = QuestionsDBService(db).get_catalog(locale)
 
-        # For EN/ES, load from database and transform to structure
-        questions_service = QuestionsDBService(db)
-        questions = questions_service.get_all_questions(locale=locale)
+        if catalog.locale != locale:
+            # Unsupported locale: French questions with fallback metadata (not cached)
+            return _transform_questions_to_structure(catalog.questions, locale=locale)
 
         # Transform flat questions list to hierarchical structure with translations
-        structure = _transform_questions_to_structure(questions, locale=locale)
-        return structure
+        body, etag = catalog.payload(
+            "structure",
+            lambda: _transform_questions_to_structure(catalog.questions, locale=locale),
+        )
+        return cached_json_response(request, body, etag)
 
     except FileNotFoundError as e:
         raise HTTPException(
@@ -1172,7 +1223,7 @@ async def get_questionnaire_structure(
 
 
 @router.get("/structure/bloc/{bloc_id}")
-async def get_bloc_structure(bloc_id: str):
+async def get_bloc_structure(bloc_id: str, request: Request):
     """
     Get structure for a specific bloc (A-I)
 
@@ -1180,21 +1231,22 @@ async def get_bloc_structure(bloc_id: str):
         bloc_id: Bloc identifier (A, B, C, D, E, F, G, H, I)
 
     Returns:
-        Bloc data with all modules and questions
+        Bloc data with all modules and questions (ETag / 304 supported)
     """
-    bloc_data = get_bloc_questions(bloc_id.upper())
+    payload = get_compiled_questionnaire().payload(f"bloc:{bloc_id.upper()}")
 
-    if not bloc_data:
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Bloc {bloc_id.upper()} not found"
         )
 
-    return bloc_data
+    body, etag = payload
+    return cached_json_response(request, body, etag)
 
 
 @router.get("/structure/module/{module_id}")
-async def get_module_structure(module_id: str):
+async def get_module_structure(module_id: str, request: Request):
     """
     Get structure for a specific module (e.g., A1, B2, C3)
 
@@ -1202,17 +1254,18 @@ async def get_module_structure(module_id: str):
         module_id: Module identifier (e.g., "A1", "B2")
 
     Returns:
-        Module data with all questions
+        Module data with all questions (ETag / 304 supported)
     """
-    module_data = get_module_questions(module_id.upper())
+    payload = get_compiled_questionnaire().payload(f"module:{module_id.upper()}")
 
-    if not module_data:
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Module {module_id.upper()} not found"
         )
 
-    return module_data
+    body, etag = payload
+    return cached_json_response(request, body, etag)
 
 
 # ═════════════════════════════════════════════════════════════
@@ -1222,6 +1275,7 @@ async def get_module_structure(module_id: str):
 @router.get("/questions/{locale}")
 async def get_questions_by_locale(
     locale: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -1229,7 +1283,8 @@ async def get_questions_by_locale(
 
     Supported locales: fr (French), en (English), es (Spanish - coming soon)
 
-    Returns questions with full translations from PostgreSQL database
+    Returns questions with full translations from the in-memory question catalog
+    (loaded from PostgreSQL once, ETag / 304 supported)
     """
     # Validate locale
     valid_locales = ["fr", "en", "es"]
@@ -1239,21 +1294,22 @@ async def get_questions_by_locale(
             detail=f"Invalid locale '{locale}'. Supported: {', '.join(valid_locales)}"
         )
 
-    # Get questions from database
-    questions_service = QuestionsDBService(db)
-    questions = questions_service.get_all_questions(locale=locale)
+    # Get questions from catalog
+    catalog = QuestionsDBService(db).get_catalog(locale)
 
-    return {
+    body, etag = catalog.payload("questions", lambda: {
         "locale": locale,
-        "total_questions": len(questions),
-        "questions": questions
-    }
+        "total_questions": len(catalog.questions),
+        "questions": catalog.questions
+    })
+    return cached_json_response(request, body, etag)
 
 
 @router.get("/questions/{locale}/bloc/{bloc_letter}")
 async def get_bloc_questions_i18n(
     locale: str,
     bloc_letter: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -1282,16 +1338,17 @@ async def get_bloc_questions_i18n(
             detail=f"Invalid bloc '{bloc_letter}'. Supported: {', '.join(valid_blocs)}"
         )
 
-    # Get bloc questions
-    questions_service = QuestionsDBService(db)
-    questions = questions_service.get_questions_by_bloc(bloc_upper, locale=locale)
+    # Get bloc questions from catalog
+    catalog = QuestionsDBService(db).get_catalog(locale)
+    questions = catalog.by_bloc_letter.get(bloc_upper, [])
 
-    return {
+    body, etag = catalog.payload(f"bloc:{bloc_upper}", lambda: {
         "locale": locale,
         "bloc": bloc_upper,
         "total_questions": len(questions),
         "questions": questions
-    }
+    })
+    return cached_json_response(request, body, etag)
 
 
 @router.get("/translations/stats")
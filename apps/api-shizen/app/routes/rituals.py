@@ -3,22 +3,24 @@ Rituals CRUD endpoints
 Shinkofa Platform - Planner
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.ritual import Ritual
 from app.schemas.ritual import Ritual as RitualSchema, RitualCreate, RitualUpdate
+from app.services.sync_revisions import allocate_revision
 from app.utils.auth import get_current_user_id
 
 router = APIRouter(prefix="/rituals", tags=["rituals"])
 
 
 @router.get("", response_model=List[RitualSchema])
-def get_rituals(
+async def get_rituals(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     category: str = None,
 ):
     """
@@ -27,26 +29,26 @@ def get_rituals(
     Query params:
     - category: Filter by category (morning, evening, daily, custom)
     """
-    query = db.query(Ritual).filter(Ritual.user_id == user_id)
+    query = select(Ritual).where(Ritual.user_id == user_id)
 
     if category:
-        query = query.filter(Ritual.category == category)
+        query = query.where(Ritual.category == category)
 
-    return query.order_by(Ritual.order, Ritual.label).all()
+    result = await db.execute(query.order_by(Ritual.order, Ritual.label))
+    return result.scalars().all()
 
 
 @router.get("/{ritual_id}", response_model=RitualSchema)
-def get_ritual(
+async def get_ritual(
     ritual_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a single ritual by ID"""
-    ritual = (
-        db.query(Ritual)
-        .filter(Ritual.id == ritual_id, Ritual.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(Ritual).where(Ritual.id == ritual_id, Ritual.user_id == user_id)
     )
+    ritual = result.scalars().first()
 
     if not ritual:
         raise HTTPException(
@@ -58,10 +60,10 @@ def get_ritual(
 
 
 @router.post("", response_model=RitualSchema, status_code=status.HTTP_201_CREATED)
-def create_ritual(
+async def create_ritual(
     ritual_data: RitualCreate,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new ritual"""
     new_ritual = Ritual(
@@ -71,25 +73,24 @@ def create_ritual(
     )
 
     db.add(new_ritual)
-    db.commit()
-    db.refresh(new_ritual)
+    await db.commit()
+    await db.refresh(new_ritual)
 
     return new_ritual
 
 
 @router.put("/{ritual_id}", response_model=RitualSchema)
-def update_ritual(
+async def update_ritual(
     ritual_id: str,
     ritual_update: RitualUpdate,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update an existing ritual"""
-    ritual = (
-        db.query(Ritual)
-        .filter(Ritual.id == ritual_id, Ritual.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(Ritual).where(Ritual.id == ritual_id, Ritual.user_id == user_id)
     )
+    ritual = result.scalars().first()
 
     if not ritual:
         raise HTTPException(
@@ -102,24 +103,23 @@ def update_ritual(
     for field, value in update_data.items():
         setattr(ritual, field, value)
 
-    db.commit()
-    db.refresh(ritual)
+    await db.commit()
+    await db.refresh(ritual)
 
     return ritual
 
 
 @router.delete("/{ritual_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_ritual(
+async def delete_ritual(
     ritual_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a ritual"""
-    ritual = (
-        db.query(Ritual)
-        .filter(Ritual.id == ritual_id, Ritual.user_id == user_id)
-        .first()
+    result = await db.execute(
+        select(Ritual).where(Ritual.id == ritual_id, Ritual.user_id == user_id)
     )
+    ritual = result.scalars().first()
 
     if not ritual:
         raise HTTPException(
@@ -127,19 +127,26 @@ def delete_ritual(
             detail=f"Ritual {ritual_id} not found",
         )
 
-    db.delete(ritual)
-    db.commit()
+    await db.delete(ritual)
+    await db.commit()
 
     return None
 
 
 @router.post("/reset", status_code=status.HTTP_200_OK)
-def reset_rituals(
+async def reset_rituals(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Reset all rituals (mark as not completed)"""
-    db.query(Ritual).filter(Ritual.user_id == user_id).update({"completed_today": False})
-    db.commit()
+    # Bulk UPDATE bypasses the before_flush listener: stamp the revision here
+    # so delta-sync clients receive the reset
+    revision = await db.run_sync(lambda session: allocate_revision(session, user_id))
+    await db.execute(
+        update(Ritual)
+        .where(Ritual.user_id == user_id, Ritual.completed_today.is_(True))
+        .values(completed_today=False, revision=revision)
+    )
+    await db.commit()
 
     return {"message": "All rituals reset successfully"}
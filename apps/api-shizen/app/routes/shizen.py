@@ -4,7 +4,8 @@ Shinkofa Platform - Shizen Companion
 
 Shizen: Coach holistique IA basé sur Design Humain, Shinkofa et TDAH
 """
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
@@ -16,22 +17,29 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.ollama_service import get_ollama_service
 from app.services.holistic_profile_service import get_holistic_profile_service
 from app.services.shizen_agent_service import get_shizen_agent
-from app.services.conversation_service import get_conversation_service
+from app.services.conversation_service import DEFAULT_PAGE_SIZE, get_conversation_service
 from app.services.llm_service import get_llm_service
 from app.services.shizen_context_service import get_shizen_context_service
+from app.services.conversation_memory import RECENT_WINDOW_MESSAGES, get_conversation_memory_service
+from app.services.semantic_memory import get_semantic_memory_service
+from app.services.profile_export_service import EXPORT_FORMATS, get_profile_export_service
 from app.utils.auth import get_current_user_id
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from app.utils.tier_service import (
     verify_shizen_message_limit,
     increment_shizen_message_count,
+    reserve_shizen_message,
+    refund_shizen_message,
     raise_shizen_limit_error,
     get_user_tier,
+    SHIZEN_QUOTA_RESERVE,
 )
 from app.core.database import get_async_db
-from app.models.holistic_profile import HolisticProfile
+from app.core.executors import run_blocking
+from app.models.holistic_profile import HolisticProfile, HolisticProfileSection, PROFILE_SECTIONS
 from app.models.questionnaire_session import QuestionnaireSession
-from app.models.questionnaire_response import QuestionnaireResponse
 from app.models import MessageRole, ConversationStatus
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/shizen", tags=["shizen-ai"])
@@ -120,12 +128,18 @@ async def chat_with_shizen(
     }
     ```
     """
+    reserved_month = None
     try:
         # === TIER LIMIT CHECK ===
-        can_send, current_count, limit = await verify_shizen_message_limit(user_id, db)
+        if SHIZEN_QUOTA_RESERVE:
+            can_send, current_count, limit, year_month = await reserve_shizen_message(user_id, db)
+        else:
+            can_send, current_count, limit = await verify_shizen_message_limit(user_id, db)
         if not can_send:
             tier = await get_user_tier(user_id)
             raise_shizen_limit_error(current_count, limit, tier.tier)
+        if SHIZEN_QUOTA_RESERVE:
+            reserved_month = year_month
 
         ollama = get_ollama_service()
 
@@ -154,7 +168,11 @@ async def chat_with_shizen(
             )
 
         # === INCREMENT MESSAGE COUNT ===
-        new_count = await increment_shizen_message_count(user_id, db)
+        if reserved_month:
+            new_count = current_count
+            reserved_month = None
+        else:
+            new_count = await increment_shizen_message_count(user_id, db)
         logger.info(f"📊 User {user_id} Shizen usage: {new_count}/{limit or '∞'}")
 
         return ChatResponse(
@@ -164,10 +182,14 @@ async def chat_with_shizen(
         )
 
     except HTTPException:
+        if reserved_month:
+            await refund_shizen_message(user_id, db, reserved_month)
         raise
 
     except Exception as e:
         logger.error(f"❌ Shizen chat error: {e}")
+        if reserved_month:
+            await refund_shizen_message(user_id, db, reserved_month)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Shizen AI error: {str(e)}",
@@ -549,14 +571,20 @@ async def get_user_profile_versions(
                 detail="You can only access your own profile versions",
             )
 
-        # Query all profiles for user, ordered by version
+        # Summary columns only (analysis sections and synthesis are never read)
         result = await db.execute(
-            select(HolisticProfile)
+            select(
+                HolisticProfile.id,
+                HolisticProfile.version,
+                HolisticProfile.version_name,
+                HolisticProfile.is_active,
+                HolisticProfile.generated_at,
+            )
             .where(HolisticProfile.user_id == user_id)
             .order_by(HolisticProfile.version.desc())
         )
 
-        profiles = result.scalars().all()
+        profiles = result.all()
 
         if not profiles:
             raise HTTPException(
@@ -607,11 +635,12 @@ async def activate_profile_version(
     **Effect**: Deactivates all other versions and activates the selected one
     """
     try:
-        # Get profile to activate
+        # Get profile to activate (summary columns only)
         result = await db.execute(
-            select(HolisticProfile).where(HolisticProfile.id == profile_id)
+            select(HolisticProfile.id, HolisticProfile.user_id, HolisticProfile.version)
+            .where(HolisticProfile.id == profile_id)
         )
-        profile = result.scalar_one_or_none()
+        profile = result.one_or_none()
 
         if not profile:
             raise HTTPException(
@@ -626,18 +655,24 @@ async def activate_profile_version(
                 detail="You can only activate your own profiles",
             )
 
-        # Deactivate all profiles for this user
-        user_profiles_result = await db.execute(
-            select(HolisticProfile).where(HolisticProfile.user_id == profile.user_id)
+        # Deactivate other versions, activate selected one (no profile rows loaded)
+        now = datetime.now(timezone.utc)
+        await db.execute(
+            update(HolisticProfile)
+            .where(
+                HolisticProfile.user_id == profile.user_id,
+                HolisticProfile.id != profile.id,
+                HolisticProfile.is_active == True,
+            )
+            .values(is_active=False, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(HolisticProfile)
+            .where(HolisticProfile.id == profile.id)
+            .values(is_active=True, updated_at=now)
+            .execution_options(synchronize_session=False)
         )
-        user_profiles = user_profiles_result.scalars().all()
-
-        for p in user_profiles:
-            p.is_active = False
-
-        # Activate selected profile
-        profile.is_active = True
-        profile.updated_at = datetime.now(timezone.utc)
 
         await db.commit()
 
@@ -661,6 +696,110 @@ async def activate_profile_version(
         )
 
 
+@router.get("/profile/{profile_id}/sections/{section}")
+async def get_profile_section(
+    profile_id: str,
+    section: str,
+    current_user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get one section of a profile version (on-demand loading)
+
+    **Auth**: Users can only read their own profiles
+
+    **Sections**: psychological_analysis, neurodivergence_analysis, shinkofa_analysis,
+    design_human, astrology_western, astrology_chinese, numerology, synthesis, recommendations
+    """
+    if section not in PROFILE_SECTIONS and section not in ("synthesis", "recommendations"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown section '{section}'",
+        )
+
+    inline_column = getattr(HolisticProfile, section) if section not in PROFILE_SECTIONS else None
+    columns = [HolisticProfile.user_id] + ([inline_column] if inline_column is not None else [])
+    result = await db.execute(select(*columns).where(HolisticProfile.id == profile_id))
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found",
+        )
+    if row.user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only access your own profiles",
+        )
+
+    if inline_column is not None:
+        data = row[1]
+    else:
+        data = (await db.execute(
+            select(HolisticProfileSection.data).where(
+                HolisticProfileSection.profile_id == profile_id,
+                HolisticProfileSection.section == section,
+            )
+        )).scalar_one_or_none()
+
+    return {"profile_id": profile_id, "section": section, "data": data}
+
+
+@router.get("/profile/{profile_id}/export")
+async def export_profile(
+    profile_id: str,
+    format: str = Query("markdown", pattern="^(markdown|pdf)$"),
+    current_user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Download a profile version as Markdown or PDF
+
+    **Auth**: Users can only export their own profiles
+
+    Rendered artifacts are cached per profile version and last update: repeated
+    downloads stream the cached file without loading the profile sections.
+    """
+    result = await db.execute(
+        select(HolisticProfile.user_id, HolisticProfile.version, HolisticProfile.updated_at)
+        .where(HolisticProfile.id == profile_id)
+    )
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found",
+        )
+    if row.user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only export your own profiles",
+        )
+
+    export_service = get_profile_export_service()
+    path = export_service.cached_path(profile_id, row.version, row.updated_at, format)
+    if path is None:
+        profile = (await db.execute(
+            select(HolisticProfile).where(HolisticProfile.id == profile_id)
+        )).scalar_one()
+        try:
+            path = await run_blocking("exports", export_service.render_to_cache, profile, format)
+        except Exception as e:
+            logger.error(f"❌ Profile export failed for {profile_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Profile export failed",
+            )
+
+    return FileResponse(
+        path,
+        media_type=EXPORT_FORMATS[format][1],
+        filename=export_service.archive_name(row.user_id, row.version, format),
+    )
+
+
 class EnrichProfileSectionRequest(BaseModel):
     """Request to enrich a profile section with Shizen AI"""
     profile_id: str = Field(..., description="Profile ID to enrich")
@@ -671,6 +810,39 @@ ENRICHABLE_SECTIONS = ['synthesis', 'psychological', 'neurodivergence', 'shinkof
 ENRICHMENT_ALLOWED_TIERS = ['samurai', 'samurai_famille', 'sensei', 'sensei_famille', 'founder']
 
 
+async def _fill_chart_sections(profile: HolisticProfile, section: str, db: AsyncSession) -> Optional[Dict]:
+    """
+    Fill empty birth-chart sections of a profile from the chart cache
+
+    Args:
+        profile: Profile to update (not committed)
+        section: design_human, astrology, numerology or name_analysis
+
+    Returns:
+        New section data (None if the session has no birth data)
+    """
+    session_result = await db.execute(
+        select(QuestionnaireSession).where(QuestionnaireSession.id == profile.session_id)
+    )
+    session = session_result.scalar_one_or_none()
+    if not session or not session.birth_data:
+        return None
+
+    charts = await get_holistic_profile_service().calculate_birth_charts(
+        session.birth_data, session.full_name, db
+    )
+
+    if section == 'design_human':
+        profile.design_human = charts["design_human"] or profile.design_human
+        return profile.design_human
+    if section == 'astrology':
+        profile.astrology_western = profile.astrology_western or charts["astrology_western"]
+        profile.astrology_chinese = profile.astrology_chinese or charts["astrology_chinese"]
+        return {'western': profile.astrology_western, 'chinese': profile.astrology_chinese}
+    profile.numerology = charts["numerology"] or profile.numerology
+    return profile.numerology
+
+
 @router.post("/enrich-profile-section")
 async def enrich_profile_section(
     request: EnrichProfileSectionRequest,
@@ -790,13 +962,11 @@ async def enrich_profile_section(
                     detail="Original questionnaire session not found - cannot regenerate",
                 )
 
-            # Load responses
-            responses_result = await db.execute(
-                select(QuestionnaireResponse)
-                .where(QuestionnaireResponse.session_id == profile.session_id)
-                .order_by(QuestionnaireResponse.answered_at)
+            # Load only the responses of the blocs neurodivergence depends on
+            profile_service = get_holistic_profile_service()
+            responses = await profile_service.load_section_responses(
+                profile.session_id, "neurodivergence_analysis", db
             )
-            responses = list(responses_result.scalars().all())
 
             if len(responses) < 10:
                 # Not enough responses - suggest using full regeneration instead
@@ -810,6 +980,7 @@ async def enrich_profile_section(
             # Convert responses to dict format
             responses_dict = [
                 {
+                    "question_id": r.question_id,
                     "bloc": r.bloc,
                     "question_text": r.question_text,
                     "answer": r.answer,
@@ -826,8 +997,11 @@ async def enrich_profile_section(
                 logger.info(f"🧬 Regenerating neurodivergence analysis...")
                 new_neurodivergence = await psych_service.analyze_neurodivergence(responses_dict)
 
-                # Update profile
+                # Update profile (with its inputs, so the next regeneration can reuse it)
                 profile.neurodivergence_analysis = new_neurodivergence
+                profile.sections["neurodivergence_analysis"].input_hash = (
+                    get_holistic_profile_service().analysis_input_hash(responses, "neurodivergence_analysis")
+                )
                 profile.updated_at = datetime.now(timezone.utc)
                 await db.commit()
 
@@ -848,6 +1022,11 @@ async def enrich_profile_section(
                     detail=f"Régénération échouée: {str(regen_error)[:200]}",
                 )
 
+        chart_missing = is_pending or (request.section == 'astrology' and not profile.astrology_western)
+        if chart_missing and request.section in ('design_human', 'astrology', 'numerology', 'name_analysis'):
+            # Birth-data charts: fill from the chart cache (computed once per birth data)
+            section_data = await _fill_chart_sections(profile, request.section, db)
+
         if not section_data:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -1072,21 +1251,27 @@ async def create_conversation(
 
 @router.get("/conversations", response_model=List[ConversationResponse])
 async def list_conversations(
+    response: Response,
     user_id: str = Depends(get_current_user_id),
     status_filter: Optional[str] = None,
-    limit: int = 20,
-    offset: int = 0,
+    q: Optional[str] = Query(None, max_length=200),
+    tags: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_async_db),
 ):
     """
-    List user's conversations
+    List (and search) user's conversations
 
     **Query params**:
     - status: Filter by status (active, archived, deleted)
+    - q: Full-text search over titles and message content
+    - tags: Only conversations carrying all these tags (repeatable)
     - limit: Max conversations (default 20)
-    - offset: Pagination offset (default 0)
+    - cursor: Value of the X-Next-Cursor header of the previous page
 
     **Returns**: List of conversations ordered by last activity
+    (X-Next-Cursor header set when more pages exist)
     """
     try:
         conv_service = get_conversation_service()
@@ -1102,13 +1287,17 @@ async def list_conversations(
                     detail=f"Invalid status: {status_filter}. Must be: active, archived, deleted",
                 )
 
-        conversations = await conv_service.get_user_conversations(
+        conversations, next_cursor = await conv_service.list_conversations(
             user_id=user_id,
             db=db,
             status=status_enum,
+            query=q,
+            tags=tags,
             limit=limit,
-            offset=offset,
+            cursor=cursor,
         )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
         return [
             ConversationResponse(
@@ -1138,15 +1327,24 @@ async def list_conversations(
 @router.get("/conversations/{conversation_id}/messages", response_model=List[MessageResponse])
 async def get_conversation_messages(
     conversation_id: str,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
-    limit: Optional[int] = None,
-    offset: int = 0,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=200),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
     db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Get conversation message history
+    Get conversation message history (keyset-paginated)
+
+    **Query params**:
+    - limit: Page size (default 50)
+    - before: Scroll back - cursor from X-Next-Cursor of the previous page
+      (no cursor = newest messages)
+    - after: Read forward - messages newer than this cursor
 
     **Returns**: List of messages in chronological order
+    (X-Next-Cursor header set when more pages exist in the same direction)
     """
     try:
         conv_service = get_conversation_service()
@@ -1166,12 +1364,15 @@ async def get_conversation_messages(
             )
 
         # Get messages
-        messages = await conv_service.get_conversation_history(
+        messages, next_cursor = await conv_service.get_message_page(
             conversation_id=conversation_id,
             db=db,
             limit=limit,
-            offset=offset,
+            before=before,
+            after=after,
         )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
         return [
             MessageResponse(
@@ -1295,9 +1496,8 @@ async def websocket_chat(
     agent = get_shizen_agent()
     conv_service = get_conversation_service()
     context_service = get_shizen_context_service()
-
-    # Track message count for periodic context updates
-    message_count_in_session = 0
+    memory_service = get_conversation_memory_service()
+    semantic_memory = get_semantic_memory_service()
 
     try:
         # Get async database session (using dependency injection pattern)
@@ -1325,11 +1525,11 @@ async def websocket_chat(
             if conversation_context:
                 logger.info(f"📝 Loaded conversation context for {conversation_id}")
 
-            # Get recent chat history for context
-            recent_messages = await conv_service.get_conversation_history(
+            # Recent chat history (older messages live in the rolling summary)
+            recent_messages = await conv_service.get_recent_messages(
                 conversation_id=conversation_id,
                 db=db,
-                limit=10,
+                limit=RECENT_WINDOW_MESSAGES,
             )
 
             # Format chat history
@@ -1352,7 +1552,11 @@ async def websocket_chat(
                     continue
 
                 # === TIER LIMIT CHECK ===
-                can_send, current_count, limit = await verify_shizen_message_limit(user_id, db)
+                reserved_month = None
+                if SHIZEN_QUOTA_RESERVE:
+                    can_send, current_count, limit, reserved_month = await reserve_shizen_message(user_id, db)
+                else:
+                    can_send, current_count, limit = await verify_shizen_message_limit(user_id, db)
                 if not can_send:
                     tier = await get_user_tier(user_id)
                     await websocket.send_json({
@@ -1365,56 +1569,80 @@ async def websocket_chat(
                     })
                     continue
 
-                logger.info(f"📨 User {user_id} message: {user_message[:50]}... (usage: {current_count}/{limit or '∞'})")
-
-                # Save user message to DB
-                await conv_service.add_message(
-                    conversation_id=conversation_id,
-                    role=MessageRole.USER,
-                    content=user_message,
-                    db=db,
-                )
-
-                # Update chat history
-                chat_history.append({"role": "user", "content": user_message})
-                message_count_in_session += 1
-
-                # Process through SHIZEN agent with adaptive context
-                agent_response = await agent.process_message(
-                    user_message=user_message,
-                    user_id=user_id,
-                    conversation_id=conversation_id,
-                    db=db,
-                    chat_history=chat_history,
-                    adaptive_context=adaptive_prompt,
-                    conversation_context=conversation_context,
-                )
-
-                assistant_message = agent_response.get("message", "")
-
-                # Save assistant message to DB
-                await conv_service.add_message(
-                    conversation_id=conversation_id,
-                    role=MessageRole.ASSISTANT,
-                    content=assistant_message,
-                    meta={
-                        "tools_used": agent_response.get("tools_used", []),
-                        "model": agent_response.get("model"),
-                        "reasoning_steps": agent_response.get("reasoning_steps", 0),
-                    },
-                    db=db,
-                )
+                # From here on the reserved message is given back if anything fails
+                try:
+                    logger.info(f"📨 User {user_id} message: {user_message[:50]}... (usage: {current_count}/{limit or '∞'})")
+
+                    # Save user message to DB
+                    await conv_service.add_message(
+                        conversation_id=conversation_id,
+                        role=MessageRole.USER,
+                        content=user_message,
+                        db=db,
+                    )
+
+                    # Update chat history
+                    chat_history.append({"role": "user", "content": user_message})
+
+                    # Pick up memory rebuilt in the background since the last turn
+                    conversation_context = memory_service.latest(conversation_id, conversation_context)
+
+                    # Recall related facts from past conversations, journals and profile
+                    retrieved_memories = await semantic_memory.search(
+                        user_id, user_message, db, exclude_scope=conversation_id,
+                    )
+
+                    # Process through SHIZEN agent with adaptive context
+                    agent_response = await agent.process_message(
+                        user_message=user_message,
+                        user_id=user_id,
+                        conversation_id=conversation_id,
+                        db=db,
+                        chat_history=chat_history,
+                        adaptive_context=adaptive_prompt,
+                        conversation_context=conversation_context,
+                        retrieved_memories=retrieved_memories,
+                    )
+
+                    assistant_message = agent_response.get("message", "")
+
+                    # Agent failed: give the reserved message back (fallback reply is free)
+                    if reserved_month and agent_response.get("error"):
+                        await refund_shizen_message(user_id, db, reserved_month)
+                        current_count -= 1
+                        reserved_month = None
+
+                    # Save assistant message to DB
+                    await conv_service.add_message(
+                        conversation_id=conversation_id,
+                        role=MessageRole.ASSISTANT,
+                        content=assistant_message,
+                        meta={
+                            "tools_used": agent_response.get("tools_used", []),
+                            "model": agent_response.get("model"),
+                            "reasoning_steps": agent_response.get("reasoning_steps", 0),
+                        },
+                        db=db,
+                    )
+                except Exception:
+                    if reserved_month:
+                        await db.rollback()
+                        await refund_shizen_message(user_id, db, reserved_month)
+                    raise
 
                 # === INCREMENT MESSAGE COUNT ===
-                new_count = await increment_shizen_message_count(user_id, db)
+                if SHIZEN_QUOTA_RESERVE:
+                    new_count = current_count
+                else:
+                    new_count = await increment_shizen_message_count(user_id, db)
                 logger.info(f"📊 User {user_id} Shizen usage: {new_count}/{limit or '∞'}")
 
                 # Update chat history
                 chat_history.append({"role": "assistant", "content": assistant_message})
 
-                # Keep only last 20 messages in memory
-                if len(chat_history) > 20:
-                    chat_history = chat_history[-20:]
+                # Keep only the recent window in memory (the prompt trims it to its token budget)
+                if len(chat_history) > 2 * RECENT_WINDOW_MESSAGES:
+                    chat_history = chat_history[-2 * RECENT_WINDOW_MESSAGES:]
 
                 # Send response to client
                 await websocket.send_json({
@@ -1427,20 +1655,8 @@ async def websocket_chat(
 
                 logger.info(f"✅ SHIZEN responded to user {user_id}")
 
-                # === PERIODIC CONTEXT UPDATE (every 10 messages) ===
-                if message_count_in_session % 10 == 0 and message_count_in_session > 0:
-                    try:
-                        updated = await context_service.summarize_and_update_context(
-                            conversation_id=conversation_id,
-                            recent_messages=chat_history,
-                            db=db
-                        )
-                        if updated:
-                            # Reload updated context
-                            conversation_context = await context_service.get_conversation_context(conversation_id, db)
-                            logger.info(f"🔄 Context updated for conversation {conversation_id}")
-                    except Exception as ctx_err:
-                        logger.warning(f"Context update failed (non-blocking): {ctx_err}")
+                # === CONVERSATION MEMORY (background, off the reply path) ===
+                memory_service.schedule_update(conversation_id)
 
     except WebSocketDisconnect:
         logger.info(f"🔌 WebSocket disconnected for conversation {conversation_id}")
@@ -7,11 +7,12 @@ Tier limits enforced:
 - SAMURAI+: Unlimited tasks
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.task import Task
 from app.schemas.task import Task as TaskSchema, TaskCreate, TaskUpdate
 from app.utils.auth import get_current_user_id
@@ -21,9 +22,9 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
 @router.get("", response_model=List[TaskSchema])
-def get_tasks(
+async def get_tasks(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     completed: bool = None,
     project_id: str = None,
 ):
@@ -34,25 +35,27 @@ def get_tasks(
     - completed: Filter by completion status
     - project_id: Filter by project
     """
-    query = db.query(Task).filter(Task.user_id == user_id)
+    query = select(Task).where(Task.user_id == user_id)
 
     if completed is not None:
-        query = query.filter(Task.completed == completed)
+        query = query.where(Task.completed == completed)
 
     if project_id:
-        query = query.filter(Task.project_id == project_id)
+        query = query.where(Task.project_id == project_id)
 
-    return query.order_by(Task.order, Task.created_at.desc()).all()
+    result = await db.execute(query.order_by(Task.order, Task.created_at.desc()))
+    return result.scalars().all()
 
 
 @router.get("/{task_id}", response_model=TaskSchema)
-def get_task(
+async def get_task(
     task_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a single task by ID"""
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == user_id).first()
+    result = await db.execute(select(Task).where(Task.id == task_id, Task.user_id == user_id))
+    task = result.scalars().first()
 
     if not task:
         raise HTTPException(
@@ -67,7 +70,7 @@ def get_task(
 async def create_task(
     task_data: TaskCreate,
     user_id: str = Depends(verify_task_limit),  # Verifies tier limit
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a new task
@@ -89,21 +92,22 @@ async def create_task(
     )
 
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await db.commit()
+    await db.refresh(new_task)
 
     return new_task
 
 
 @router.put("/{task_id}", response_model=TaskSchema)
-def update_task(
+async def update_task(
     task_id: str,
     task_update: TaskUpdate,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update an existing task"""
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == user_id).first()
+    result = await db.execute(select(Task).where(Task.id == task_id, Task.user_id == user_id))
+    task = result.scalars().first()
 
     if not task:
         raise HTTPException(
@@ -116,20 +120,21 @@ def update_task(
     for field, value in update_data.items():
         setattr(task, field, value)
 
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
 
     return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a task"""
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == user_id).first()
+    result = await db.execute(select(Task).where(Task.id == task_id, Task.user_id == user_id))
+    task = result.scalars().first()
 
     if not task:
         raise HTTPException(
@@ -137,7 +142,7 @@ def delete_task(
             detail=f"Task {task_id} not found",
         )
 
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
 
     return None
@@ -3,10 +3,11 @@ Widget Data endpoints - Multi-device sync for widgets
 Shinkofa Platform - Planner
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.widget_data import WidgetData
 from app.schemas.widget_data import WidgetData as WidgetDataSchema, WidgetDataUpdate
 from app.utils.auth import get_current_user_id
@@ -15,11 +16,11 @@ router = APIRouter(prefix="/v1/widget-data", tags=["widget-data"])
 
 
 @router.get("/{widget_slug}/{target_user_id}", response_model=WidgetDataSchema | None)
-def get_widget_data(
+async def get_widget_data(
     widget_slug: str,
     target_user_id: str,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get widget data for a specific widget and user.
@@ -34,22 +35,21 @@ def get_widget_data(
             detail="You can only access your own widget data"
         )
 
-    widget_data = (
-        db.query(WidgetData)
-        .filter(WidgetData.user_id == user_id, WidgetData.widget_slug == widget_slug)
-        .first()
+    result = await db.execute(
+        select(WidgetData).where(WidgetData.user_id == user_id, WidgetData.widget_slug == widget_slug)
     )
+    widget_data = result.scalars().first()
 
     return widget_data
 
 
 @router.put("/{widget_slug}/{target_user_id}", response_model=WidgetDataSchema)
-def update_widget_data(
+async def update_widget_data(
     widget_slug: str,
     target_user_id: str,
     data_update: WidgetDataUpdate,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create or update widget data for a specific widget and user.
@@ -65,11 +65,10 @@ def update_widget_data(
         )
 
     # Try to find existing widget data
-    widget_data = (
-        db.query(WidgetData)
-        .filter(WidgetData.user_id == user_id, WidgetData.widget_slug == widget_slug)
-        .first()
+    result = await db.execute(
+        select(WidgetData).where(WidgetData.user_id == user_id, WidgetData.widget_slug == widget_slug)
     )
+    widget_data = result.scalars().first()
 
     if widget_data:
         # Update existing
@@ -84,7 +83,7 @@ def update_widget_data(
         )
         db.add(widget_data)
 
-    db.commit()
-    db.refresh(widget_data)
+    await db.commit()
+    await db.refresh(widget_data)
 
     return widget_data
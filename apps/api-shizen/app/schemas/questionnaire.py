@@ -2,7 +2,7 @@
 Questionnaire schemas
 Shinkofa Platform - Holistic Questionnaire
 """
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from app.models.questionnaire_session import SessionStatus
@@ -120,6 +120,14 @@ class AnswersBatchSubmit(BaseModel):
     answers: List[AnswerSubmit] = Field(..., min_length=1, max_length=50)
 
 
+class AnswersImportResult(BaseModel):
+    """Result of a streamed (NDJSON) answer import"""
+    session_id: str
+    received: int = Field(..., description="Answers read from the stream (repeated questions included)")
+    completion_percentage: int
+    status: str
+
+
 class AnswerResponse(BaseModel):
     """Individual answer response"""
     id: str
@@ -225,6 +233,26 @@ class AllBlocsResponse(BaseModel):
     total_questions: int = Field(..., description="Total number of questions (should be 144)")
 
 
+class QuestionTranslationUpdate(BaseModel):
+    """Admin edit of a question's translated fields (only provided fields are updated)"""
+    locale: str = Field(..., pattern="^(fr|en|es)$")
+    text: Optional[str] = Field(None, min_length=1)
+    bloc: Optional[str] = None
+    module: Optional[str] = None
+    options: Optional[List[str]] = None
+    annotation: Optional[str] = None
+    comment_label: Optional[str] = None
+
+    @model_validator(mode="after")
+    def not_null(self):
+        """Required columns (text_fr, bloc_fr, module_fr) can be edited but never cleared"""
+        if self.locale == "fr":
+            for field in ("text", "bloc", "module"):
+                if field in self.model_fields_set and getattr(self, field) is None:
+                    raise ValueError(f"{field} cannot be null in French (omit the field to keep it unchanged)")
+        return self
+
+
 # ═════════════════════════════════════════════════════════════
 # OCR DOCUMENT PROCESSING SCHEMAS
 # ═════════════════════════════════════════════════════════════
@@ -236,6 +264,13 @@ class OCRQuestionAnswer(BaseModel):
     answer: Optional[str] = None
     confidence: str = Field(..., description="Extraction confidence: high, medium, low, none")
 
+    # Canonical question the fragment was matched to (QuestionMatcher)
+    question_id: Optional[str] = Field(None, description="Matched question ID (e.g. A0_Q01), None if unmatched")
+    bloc: Optional[str] = None
+    match_score: Optional[float] = Field(None, description="Cosine similarity with the matched question")
+    match_confidence: Optional[str] = Field(None, description="Match confidence: high, medium, low")
+    match_source: Optional[str] = Field(None, description="embedding or llm")
+
 
 class DocumentOCRResponse(BaseModel):
     """OCR processing result for uploaded questionnaire document"""
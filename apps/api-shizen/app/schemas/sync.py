@@ -2,7 +2,7 @@
 Sync schemas
 """
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 class TaskSync(BaseModel):
@@ -18,6 +18,7 @@ class TaskSync(BaseModel):
     order: Optional[int] = 0
     createdAt: Optional[str] = None
     updatedAt: Optional[str] = None
+    baseRevision: Optional[int] = None  # Delta sync: server revision this edit is based on (None = new)
 
 
 class RitualSync(BaseModel):
@@ -27,6 +28,7 @@ class RitualSync(BaseModel):
     completed: bool = False
     category: str = "custom"
     order: int = 0
+    baseRevision: Optional[int] = None
 
 
 class DailyJournalSync(BaseModel):
@@ -57,6 +59,7 @@ class ProjectSync(BaseModel):
     status: str = "active"  # active, completed, archived
     createdAt: Optional[str] = None
     updatedAt: Optional[str] = None
+    baseRevision: Optional[int] = None
 
 
 class SyncRequest(BaseModel):
@@ -68,6 +71,45 @@ class SyncRequest(BaseModel):
     lastUpdated: str
 
 
+class DeletedEntitySync(BaseModel):
+    type: Literal["task", "project", "ritual"]
+    id: str
+    baseRevision: int  # Server revision the client saw before deleting
+
+
+class DeltaSyncRequest(BaseModel):
+    """Changes made on the client since it last saw server revision `sinceRevision`"""
+    sinceRevision: int = 0
+    tasks: List[TaskSync] = []
+    projects: List[ProjectSync] = []
+    rituals: List[RitualSync] = []
+    deleted: List[DeletedEntitySync] = []
+    dailyJournal: Optional[DailyJournalSync] = None
+
+
+class SyncConflict(BaseModel):
+    type: str  # task, project, ritual
+    id: str
+    reason: str  # modified (server changed it since baseRevision), deleted, exists
+    serverRevision: int
+
+
+class DeltaSyncData(BaseModel):
+    revision: int  # Send back as sinceRevision next time
+    tasks: List[dict] = []
+    projects: List[dict] = []
+    rituals: List[dict] = []
+    deleted: List[dict] = []  # Tombstones: {type, id, revision}
+    conflicts: List[SyncConflict] = []  # Client changes rejected (server version is in the lists above)
+    dailyJournal: Optional[dict] = None
+
+
+class DeltaSyncResponse(BaseModel):
+    success: bool
+    data: Optional[DeltaSyncData] = None
+    error: Optional[str] = None
+
+
 class SyncResponse(BaseModel):
     success: bool
     data: Optional[dict] = None
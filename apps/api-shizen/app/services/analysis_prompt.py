@@ -0,0 +1,253 @@
+"""
+Analysis Prompt Encoder - Compact questionnaire responses under a token budget
+Shinkofa Platform - Shizen AI
+
+The psychological analyses (MBTI, Big Five, Enneagram, PNL, PCM, VAKOG, Love
+Languages, neurodivergence, Shinkofa) all read the same session responses.
+They are encoded once per session (ResponseDigest):
+- one compact line per question (last answer wins, empty answers dropped)
+- token counts estimated per line (estimate_tokens)
+
+Every analysis prompt then starts with the same prefix (shared system prompt
++ commented answers, which the V5.0 methodology prioritizes), so providers
+caching prompt prefixes (Ollama with keep_alive, DeepSeek context caching)
+only prefill it once. The analysis-specific part comes after it: answers of
+the blocs most relevant to that analysis, within ANALYSIS_PROMPT_TOKEN_BUDGET.
+"""
+import os
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Sequence, Union
+
+from app.services.conversation_memory import estimate_tokens
+
+# Bump when the analysis prompts (name analyses included), roles or response
+# encoding change: profile sections analyzed with another version are
+# recomputed on regeneration
+ANALYSIS_PROMPT_VERSION = 1
+
+# Token budget of the responses in one analysis prompt (shared prefix included).
+# Same size as the former raw prompts (8000 characters, ~2000 tokens): the
+# compact lines (~22 tokens each) fit about 90 answers in it, where raw JSON fit 70.
+ANALYSIS_PROMPT_TOKEN_BUDGET = int(os.getenv("ANALYSIS_PROMPT_TOKEN_BUDGET", "2000"))
+# Part of the budget given to the shared prefix (commented answers)
+ANALYSIS_SHARED_TOKEN_BUDGET = int(os.getenv("ANALYSIS_SHARED_TOKEN_BUDGET", "500"))
+
+MAX_QUESTION_CHARS = 100
+MAX_VALUE_CHARS = 80
+MAX_COMMENT_CHARS = 300
+MAX_LIST_OPTIONS = 4
+
+ANALYSIS_SYSTEM_PROMPT = """Tu es Shizen, expert en analyse psychologique holistique (approche Shinkofa).
+
+MÉTHODOLOGIE V5.0 ANTI-BIAIS :
+- Les commentaires libres (💬) ont PRIORITÉ absolue sur les cases cochées
+- Privilégie les descriptions comportementales concrètes aux auto-évaluations
+- Les récits narratifs révèlent plus que les réponses binaires
+- Si conflit entre commentaire et case cochée → fais confiance au commentaire
+
+Retourne UNIQUEMENT un JSON valide, sans texte explicatif avant/après."""
+
+# Expert role of each analysis (in the analysis-specific part, after the shared prefix)
+ANALYSIS_ROLES: Dict[str, str] = {
+    "mbti": "Tu es un expert en psychologie MBTI. Analyse les réponses avec rigueur.",
+    "big_five": "Tu es un expert en Big Five (OCEAN). Analyse les réponses avec rigueur.",
+    "enneagram": "Tu es un expert en Ennéagramme. Analyse les réponses avec rigueur.",
+    "neurodivergence": "Tu es un expert en neurodivergence (TDA(H), Autisme, HPI). Analyse les patterns avec bienveillance.",
+    "pnl": "Tu es un expert en PNL (Programmation Neuro-Linguistique). Analyse les méta-programmes.",
+    "pcm": "Tu es un expert en PCM (Process Communication Model). Analyse les types de personnalité.",
+    "vakog": "Tu es un expert en systèmes sensoriels VAKOG. Analyse les préférences.",
+    "love_languages": "Tu es un expert en langages d'amour (Gary Chapman). Analyse les préférences relationnelles.",
+    "shinkofa": "Tu es un expert en philosophie Shinkofa. Analyse les réponses avec sagesse.",
+}
+
+# Blocs most informative for each analysis, in priority order (other blocs
+# only fill the remaining budget)
+ANALYSIS_BLOCS: Dict[str, tuple] = {
+    "mbti": ("E", "D", "F"),
+    "big_five": ("E", "F", "B"),
+    "enneagram": ("F", "E", "I"),
+    "neurodivergence": ("F", "D", "B", "C", "I"),
+    "pnl": ("D", "E"),
+    "pcm": ("E", "F"),
+    "vakog": ("D", "C"),
+    "love_languages": ("F", "E", "A"),
+    "shinkofa": ("G", "A"),
+}
+
+# Analyses behind each questionnaire-based profile section
+SECTION_ANALYSES: Dict[str, tuple] = {
+    "psychological_analysis": ("mbti", "big_five", "enneagram", "pnl", "pcm", "vakog", "love_languages"),
+    "neurodivergence_analysis": ("neurodivergence",),
+    "shinkofa_analysis": ("shinkofa",),
+}
+
+
+def section_blocs(section: str) -> tuple:
+    """Answer blocs a profile section reads: the blocs of its analyses, in priority order"""
+    return tuple(dict.fromkeys(
+        bloc for analysis in SECTION_ANALYSES[section] for bloc in ANALYSIS_BLOCS[analysis]
+    ))
+
+
+@dataclass(frozen=True)
+class ResponseLine:
+    """One encoded answer"""
+    bloc: str
+    text: str
+    tokens: int
+    has_comment: bool
+
+
+def _format_value(value: Any) -> str:
+    """Compact form of an answer value (checkbox/likert/radio/text/number)"""
+    if isinstance(value, list):
+        shown = ", ".join(str(v) for v in value[:MAX_LIST_OPTIONS])
+        if len(value) > MAX_LIST_OPTIONS:
+            shown += f" (+{len(value) - MAX_LIST_OPTIONS})"
+        return shown
+    if isinstance(value, dict):
+        return ", ".join(f"{k}:{v}" for k, v in value.items())
+    if value is None:
+        return ""
+    return " ".join(str(value).split())[:MAX_VALUE_CHARS]
+
+
+def encode_response(response: Dict) -> ResponseLine:
+    """Encode one response dict (bloc, question_text, answer) as a compact line"""
+    bloc = response.get("bloc") or "?"
+    question = " ".join((response.get("question_text") or "").split())[:MAX_QUESTION_CHARS]
+    answer = response.get("answer")
+
+    comment = ""
+    if isinstance(answer, dict) and ("value" in answer or "comment" in answer):
+        value = _format_value(answer.get("value"))
+        comment = " ".join(str(answer.get("comment") or "").split())[:MAX_COMMENT_CHARS]
+    else:
+        value = _format_value(answer)
+
+    text = f"[{bloc}] {question} → {value}"
+    if comment:
+        text += f" 💬 {comment}"
+    return ResponseLine(bloc=bloc, text=text, tokens=estimate_tokens(text) + 1, has_comment=bool(comment))
+
+
+def _is_empty(response: Dict) -> bool:
+    answer = response.get("answer")
+    if isinstance(answer, dict):
+        return answer.get("value") in (None, "", [], {}) and not answer.get("comment")
+    return answer in (None, "", [], {})
+
+
+class ResponseDigest:
+    """
+    Compact, deduplicated responses of a session, encoded once and shared by
+    every analysis prompt
+    """
+
+    def __init__(
+        self,
+        lines: Sequence[ResponseLine],
+        budget: int = ANALYSIS_PROMPT_TOKEN_BUDGET,
+        shared_budget: int = ANALYSIS_SHARED_TOKEN_BUDGET,
+    ):
+        self.lines = list(lines)
+        self.budget = budget
+        self.shared_budget = min(shared_budget, budget)
+
+    @classmethod
+    def of(cls, responses: Union["ResponseDigest", Iterable[Dict]]) -> "ResponseDigest":
+        """Digest of response dicts (returned as is if already encoded)"""
+        if isinstance(responses, cls):
+            return responses
+        return encode_responses(responses)
+
+    @cached_property
+    def shared_lines(self) -> List[ResponseLine]:
+        """Commented answers, in order, within the shared budget"""
+        return _take((line for line in self.lines if line.has_comment), self.shared_budget)
+
+    @cached_property
+    def prefix(self) -> str:
+        """Shared start of every analysis prompt of this session (identical bytes)"""
+        comments = "\n".join(line.text for line in self.shared_lines) or "(aucun commentaire libre)"
+        return (
+            f"**RÉPONSES QUESTIONNAIRE** ({len(self.lines)} réponses, "
+            f"{sum(line.has_comment for line in self.lines)} commentaires)\n\n"
+            f"💬 COMMENTAIRES LIBRES (prioritaires) :\n{comments}"
+        )
+
+    def analysis_lines(self, analysis_type: str) -> List[ResponseLine]:
+        """Answers added for one analysis: its blocs first, then the others, within the budget"""
+        shared = {id(line) for line in self.shared_lines}
+        remaining = self.budget - sum(line.tokens for line in self.shared_lines)
+        blocs = ANALYSIS_BLOCS.get(analysis_type, ())
+
+        selected: List[ResponseLine] = []
+        for bloc in (*blocs, None):
+            candidates = [
+                line for line in self.lines
+                if id(line) not in shared and (line.bloc == bloc if bloc else line.bloc not in blocs)
+            ]
+            taken = _take(candidates, remaining)
+            remaining -= sum(line.tokens for line in taken)
+            selected.extend(taken)
+        return selected
+
+    def prompt(self, analysis_type: str, instructions: str) -> str:
+        """
+        Full user prompt of an analysis
+
+        Args:
+            analysis_type: Key of ANALYSIS_ROLES / ANALYSIS_BLOCS (e.g. "mbti")
+            instructions: Analysis-specific instructions and expected JSON
+
+        Returns:
+            Shared prefix + answers selected for this analysis + role + instructions
+        """
+        lines = self.analysis_lines(analysis_type)
+        answers = "\n".join(line.text for line in lines) or "(aucune autre réponse)"
+        role = ANALYSIS_ROLES.get(analysis_type, "Tu es un expert en analyse psychologique.")
+        return (
+            f"{self.prefix}\n\n"
+            f"═════════════════════════════════════════════════════════\n"
+            f"RÉPONSES SÉLECTIONNÉES ({analysis_type}) :\n{answers}\n\n"
+            f"{role}\n\n"
+            f"{instructions}"
+        )
+
+
+def _take(lines: Iterable[ResponseLine], budget: int) -> List[ResponseLine]:
+    """Lines, in order, that fit in `budget` tokens (a line too long is skipped)"""
+    taken = []
+    for line in lines:
+        if line.tokens <= budget:
+            taken.append(line)
+            budget -= line.tokens
+    return taken
+
+
+def encode_responses(
+    responses: Iterable[Dict],
+    budget: int = ANALYSIS_PROMPT_TOKEN_BUDGET,
+    shared_budget: int = ANALYSIS_SHARED_TOKEN_BUDGET,
+) -> ResponseDigest:
+    """
+    Encode session responses once for all analysis prompts
+
+    Args:
+        responses: Response dicts (question_id, bloc, question_text, answer)
+        budget: Token budget of the responses in one prompt
+        shared_budget: Part of it for the shared prefix (commented answers)
+
+    Returns:
+        ResponseDigest (one line per question: the last answer wins, empty answers dropped)
+    """
+    latest: Dict[Any, Dict] = {}
+    for response in responses:
+        key = response.get("question_id") or response.get("question_text")
+        latest.pop(key, None)
+        latest[key] = response
+
+    lines = [encode_response(r) for r in latest.values() if not _is_empty(r)]
+    return ResponseDigest(lines, budget=budget, shared_budget=shared_budget)
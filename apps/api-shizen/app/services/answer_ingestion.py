@@ -0,0 +1,212 @@
+"""
+Answer Ingestion - Bulk upsert of questionnaire answers
+Shinkofa Platform - Holistic Questionnaire
+
+Autosave and document imports (OCR) send many answers at once. Instead of
+one lookup + INSERT/UPDATE per answer, a batch is:
+1. Written with one INSERT ... ON CONFLICT (session_id, question_id) DO UPDATE
+   ... RETURNING per ANSWER_BATCH_SIZE answers
+2. Reflected in the session progress with one UPDATE (answer count as subquery)
+
+Large imports can be streamed as NDJSON (one AnswerSubmit per line), parsed
+and written chunk by chunk.
+
+Everything runs in the caller's transaction.
+"""
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import String, case, cast, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.questionnaire_response import QuestionnaireResponse
+from app.models.questionnaire_session import QuestionnaireSession, SessionStatus
+from app.schemas.questionnaire import AnswerSubmit
+
+# Questions in the holistic questionnaire (100% completion)
+TOTAL_QUESTIONS = 144
+
+# Answers per INSERT statement (10 bind parameters each)
+ANSWER_BATCH_SIZE = 500
+
+# NDJSON import limits
+MAX_NDJSON_ANSWERS = 1000
+MAX_NDJSON_LINE_BYTES = 64 * 1024
+
+
+class AnswerStreamError(ValueError):
+    """Invalid NDJSON answer stream (line number included in the message)"""
+
+
+def _insert(db: AsyncSession):
+    """Dialect-specific INSERT supporting ON CONFLICT (PostgreSQL in prod, SQLite in tests)"""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite.insert(QuestionnaireResponse)
+    return postgresql.insert(QuestionnaireResponse)
+
+
+async def upsert_answers(
+    db: AsyncSession,
+    session_id: str,
+    answers: Sequence[AnswerSubmit],
+) -> List[Dict[str, Any]]:
+    """
+    Insert or update answers of a session, keyed by (session_id, question_id)
+
+    Args:
+        db: Async database session
+        session_id: Questionnaire session ID
+        answers: Answers to store (the last one wins for a repeated question_id)
+
+    Returns:
+        Stored answer rows (AnswerResponse fields), in question order of arrival
+    """
+    # ON CONFLICT cannot touch the same row twice in one statement
+    latest: Dict[str, AnswerSubmit] = {}
+    for answer in answers:
+        latest.pop(answer.question_id, None)
+        latest[answer.question_id] = answer
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "session_id": session_id,
+            "bloc": answer.bloc,
+            "question_id": answer.question_id,
+            "question_text": answer.question_text,
+            "answer": answer.answer,
+            "question_type": answer.question_type,
+            "is_required": answer.is_required,
+            "answered_at": now,
+            "updated_at": now,
+        }
+        for answer in latest.values()
+    ]
+
+    stored: List[Dict[str, Any]] = []
+    for start in range(0, len(rows), ANSWER_BATCH_SIZE):
+        stmt = _insert(db).values(rows[start:start + ANSWER_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[QuestionnaireResponse.session_id, QuestionnaireResponse.question_id],
+            set_={
+                "answer": stmt.excluded.answer,
+                "question_text": stmt.excluded.question_text,
+                "question_type": stmt.excluded.question_type,
+                "is_required": stmt.excluded.is_required,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(*QuestionnaireResponse.__table__.columns)
+        result = await db.execute(stmt)
+        stored.extend(dict(row._mapping) for row in result)
+
+    order = {question_id: index for index, question_id in enumerate(latest)}
+    stored.sort(key=lambda row: order[row["question_id"]])
+    return stored
+
+
+async def update_session_progress(
+    db: AsyncSession,
+    session_id: str,
+    current_bloc: Optional[str] = None,
+) -> Tuple[int, SessionStatus]:
+    """
+    Recompute completion of a session in one UPDATE ... RETURNING
+
+    Args:
+        db: Async database session
+        session_id: Questionnaire session ID
+        current_bloc: Bloc the user is on (unchanged if None)
+
+    Returns:
+        Tuple of (completion_percentage, status)
+    """
+    now = datetime.now(timezone.utc)
+    answered = (
+        select(func.count())
+        .select_from(QuestionnaireResponse)
+        .where(QuestionnaireResponse.session_id == session_id)
+        .scalar_subquery()
+    )
+    complete = answered >= TOTAL_QUESTIONS
+    percentage = case((complete, 100), else_=answered * 100 // TOTAL_QUESTIONS)
+
+    values = {
+        "completion_percentage": cast(percentage, String),
+        "status": cast(
+            case((complete, SessionStatus.COMPLETED.name), else_=SessionStatus.IN_PROGRESS.name),
+            QuestionnaireSession.status.type,
+        ),
+        "completed_at": case((complete, now), else_=QuestionnaireSession.completed_at),
+        "last_activity_at": now,
+    }
+    if current_bloc is not None:
+        values["current_bloc"] = current_bloc
+
+    result = await db.execute(
+        update(QuestionnaireSession)
+        .where(QuestionnaireSession.id == session_id)
+        .values(**values)
+        .returning(QuestionnaireSession.completion_percentage, QuestionnaireSession.status)
+        .execution_options(synchronize_session=False)
+    )
+    completion, status = result.one()
+    return int(completion), SessionStatus(status)
+
+
+async def read_answer_stream(
+    chunks: AsyncIterator[bytes],
+    max_answers: int = MAX_NDJSON_ANSWERS,
+) -> AsyncIterator[AnswerSubmit]:
+    """
+    Parse an NDJSON body (one AnswerSubmit object per line) as it arrives
+
+    Args:
+        chunks: Raw body chunks (Request.stream())
+        max_answers: Maximum number of answers accepted
+
+    Yields:
+        Validated answers (blank lines are skipped)
+
+    Raises:
+        AnswerStreamError: Invalid JSON/answer, line too long or too many answers
+    """
+    buffer = b""
+    line_number = 0
+    count = 0
+
+    def parse(line: bytes) -> Optional[AnswerSubmit]:
+        if not line.strip():
+            return None
+        try:
+            return AnswerSubmit.model_validate(json.loads(line))
+        except (ValueError, ValidationError) as e:
+            raise AnswerStreamError(f"Line {line_number}: invalid answer ({e})") from e
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > MAX_NDJSON_LINE_BYTES:
+            raise AnswerStreamError(f"Line {line_number + len(lines) + 1}: longer than {MAX_NDJSON_LINE_BYTES} bytes")
+        for line in lines:
+            line_number += 1
+            if len(line) > MAX_NDJSON_LINE_BYTES:
+                raise AnswerStreamError(f"Line {line_number}: longer than {MAX_NDJSON_LINE_BYTES} bytes")
+            answer = parse(line)
+            if answer is None:
+                continue
+            count += 1
+            if count > max_answers:
+                raise AnswerStreamError(f"More than {max_answers} answers in one import")
+            yield answer
+
+    line_number += 1
+    answer = parse(buffer)
+    if answer is not None:
+        if count + 1 > max_answers:
+            raise AnswerStreamError(f"More than {max_answers} answers in one import")
+        yield answer
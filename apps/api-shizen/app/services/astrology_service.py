@@ -24,6 +24,10 @@ class AstrologyService:
     Manual calculation for Chinese astrology
     """
 
+    # Bump when chart output changes (invalidates chart_cache entries)
+    CALCULATOR_VERSION = 1
+    CHINESE_CALCULATOR_VERSION = 1
+
     # Zodiac signs
     SIGNS = [
         "aries", "taurus", "gemini", "cancer", "leo", "virgo",
@@ -0,0 +1,189 @@
+"""
+Chart Cache Service - Read-through cache for pure birth chart calculators
+Shinkofa Platform - Shizen AI
+
+Design Humain, Western/Chinese astrology and numerology are pure functions of
+birth data (and name). Results are stored in `chart_cache`, keyed by the
+calculator name and a hash of its normalized inputs, and reused across profile
+versions, re-analyses and section enrichment.
+
+Each calculator exposes a CALCULATOR_VERSION: bumping it makes existing
+entries stale (they are recomputed and overwritten on next use).
+
+Cache I/O never ends the caller's transaction: reads run in a savepoint of
+the caller's session, writes in a short-lived session of their own.
+"""
+import hashlib
+import json
+import logging
+import unicodedata
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.executors import run_blocking
+from app.core.metrics import record_cache
+from app.models.chart_cache import ChartCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Coordinates are rounded to ~1 cm so float noise does not split cache entries
+COORDINATE_DECIMALS = 7
+
+
+def normalize_chart_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize calculator inputs for hashing
+
+    Strings: Unicode NFC, surrounding whitespace stripped, inner whitespace collapsed.
+    Floats: rounded to COORDINATE_DECIMALS.
+    """
+    normalized = {}
+    for key, value in inputs.items():
+        if isinstance(value, str):
+            value = " ".join(unicodedata.normalize("NFC", value).split())
+        elif isinstance(value, float):
+            value = round(value, COORDINATE_DECIMALS)
+        normalized[key] = value
+    return normalized
+
+
+def chart_cache_key(calculator: str, inputs: Dict[str, Any]) -> str:
+    """SHA-256 of the calculator name and its normalized inputs"""
+    payload = json.dumps(
+        {"calculator": calculator, "inputs": normalize_chart_inputs(inputs)},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _insert(db: AsyncSession):
+    """Dialect-specific INSERT supporting ON CONFLICT (PostgreSQL in prod, SQLite in tests)"""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite.insert(ChartCacheEntry)
+    return postgresql.insert(ChartCacheEntry)
+
+
+class ChartCacheService:
+    """Persistent memoization of chart calculators"""
+
+    def __init__(self, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+
+    async def get(
+        self,
+        db: AsyncSession,
+        calculator: str,
+        version: int,
+        inputs: Dict[str, Any],
+    ) -> Optional[Dict]:
+        """Cached result for these inputs at this calculator version (None on miss)"""
+        try:
+            # Savepoint: a failed read must not abort the caller's transaction
+            async with db.begin_nested():
+                result = await db.execute(
+                    select(ChartCacheEntry.result).where(
+                        ChartCacheEntry.calculator == calculator,
+                        ChartCacheEntry.input_hash == chart_cache_key(calculator, inputs),
+                        ChartCacheEntry.calculator_version == version,
+                    )
+                )
+                return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.warning(f"⚠️ Chart cache read failed ({calculator}): {e}")
+            return None
+
+    async def put(
+        self,
+        calculator: str,
+        version: int,
+        inputs: Dict[str, Any],
+        result: Dict,
+    ) -> None:
+        """
+        Store a result (overwrites an entry from an older calculator version)
+
+        Committed in its own session, so the entry survives a later failure of
+        the caller (e.g., LLM timeout during profile generation) and a failed
+        write leaves the caller's transaction untouched.
+        """
+        try:
+            async with self.session_factory() as db:
+                await db.execute(self._upsert(db, calculator, version, inputs, result))
+                await db.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"⚠️ Chart cache write failed ({calculator}): {e}")
+
+    def _upsert(self, db: AsyncSession, calculator: str, version: int, inputs: Dict[str, Any], result: Dict):
+        now = datetime.now(timezone.utc)
+        stmt = _insert(db).values(
+            calculator=calculator,
+            input_hash=chart_cache_key(calculator, inputs),
+            calculator_version=version,
+            inputs=normalize_chart_inputs(inputs),
+            result=result,
+            created_at=now,
+            updated_at=now,
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[ChartCacheEntry.calculator, ChartCacheEntry.input_hash],
+            set_={
+                "calculator_version": stmt.excluded.calculator_version,
+                "result": stmt.excluded.result,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+
+    async def get_or_compute(
+        self,
+        db: AsyncSession,
+        calculator: str,
+        version: int,
+        inputs: Dict[str, Any],
+        compute: Callable[[], Dict],
+    ) -> Dict:
+        """
+        Read-through lookup
+
+        Args:
+            db: Async database session
+            calculator: Calculator name (e.g., "design_human")
+            version: Calculator version (CALCULATOR_VERSION of the service)
+            inputs: Exact keyword inputs of the calculator
+            compute: Computes the chart on miss, run in the "ephemeris" pool
+                (empty results are not cached)
+
+        Returns:
+            Chart dictionary
+        """
+        cached = await self.get(db, calculator, version, inputs)
+        record_cache("chart", hit=cached is not None)
+        if cached is not None:
+            logger.info(f"⚡ Chart cache hit: {calculator} v{version}")
+            return cached
+
+        # Swiss Ephemeris / kerykeion are CPU-bound: keep them off the event loop
+        result = await run_blocking("ephemeris", compute)
+        if result:
+            await self.put(calculator, version, inputs, result)
+        return result
+
+
+# Singleton instance
+_chart_cache_service: Optional[ChartCacheService] = None
+
+
+def get_chart_cache_service() -> ChartCacheService:
+    """Get or create Chart Cache service singleton"""
+    global _chart_cache_service
+    if _chart_cache_service is None:
+        _chart_cache_service = ChartCacheService()
+    return _chart_cache_service
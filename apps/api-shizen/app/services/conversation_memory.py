@@ -0,0 +1,290 @@
+"""
+Conversation Memory - Rolling summary + token-budgeted prompt window
+Shinkofa Platform - Shizen AI Chatbot
+
+Long conversations must not make every reply slower. The memory of a
+conversation (stored in ConversationSession.context) is:
+- a rolling summary of every message older than the recent window,
+- user preferences and goals extracted along the way (merged, capped),
+- a watermark (`memory.summarized_until`) marking what the summary covers.
+
+It is built in the background after replies (never on the request path):
+once MEMORY_BATCH_MESSAGES messages have fallen out of the recent window, one
+LLM call folds them into the previous summary.
+
+The agent prompt is then assembled within a fixed token budget: memory
+section (MEMORY_TOKEN_BUDGET) + newest messages that fit HISTORY_TOKEN_BUDGET.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ConversationSession, Message
+
+logger = logging.getLogger(__name__)
+
+# Prompt budgets (tokens, estimated)
+MEMORY_TOKEN_BUDGET = int(os.getenv("SHIZEN_MEMORY_TOKEN_BUDGET", "400"))
+HISTORY_TOKEN_BUDGET = int(os.getenv("SHIZEN_HISTORY_TOKEN_BUDGET", "1200"))
+
+# Messages kept verbatim (not summarized yet) and summarization batch size
+RECENT_WINDOW_MESSAGES = int(os.getenv("SHIZEN_MEMORY_WINDOW_MESSAGES", "8"))
+MEMORY_BATCH_MESSAGES = int(os.getenv("SHIZEN_MEMORY_BATCH_MESSAGES", "6"))
+
+MAX_MEMORY_ITEMS = 10  # preferences / goals kept
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for French/English)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut text to a token budget (on a word boundary when possible)"""
+    max_chars = budget * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars - 1].rsplit(" ", 1)[0]
+    return cut + "…"
+
+
+def format_memory_section(context: Optional[Dict[str, Any]], budget: int = MEMORY_TOKEN_BUDGET) -> str:
+    """
+    Memory block of the agent prompt, within `budget` tokens
+
+    Goals and emotional state are short and kept first; the summary gets
+    whatever budget remains.
+    """
+    if not context:
+        return ""
+
+    parts = []
+    if context.get("goals_identified"):
+        parts.append(f"Objectifs identifiés: {', '.join(context['goals_identified'][:3])}")
+    if context.get("user_preferences"):
+        parts.append(f"Préférences: {', '.join(context['user_preferences'][:3])}")
+    if context.get("emotional_state"):
+        parts.append(f"État émotionnel: {context['emotional_state']}")
+
+    used = sum(estimate_tokens(p) for p in parts)
+    if context.get("summary") and budget - used > 20:
+        parts.insert(0, f"Résumé précédent: {truncate_to_tokens(context['summary'], budget - used)}")
+
+    if not parts:
+        return ""
+    return "\n**MÉMOIRE CONVERSATION** :\n" + "\n".join(f"- {p}" for p in parts) + "\n"
+
+
+def format_history_window(chat_history: List[Dict], budget: int = HISTORY_TOKEN_BUDGET) -> str:
+    """
+    Newest messages that fit in `budget` tokens, in chronological order
+
+    A single message longer than the remaining budget is truncated (so the
+    latest exchange is never dropped entirely).
+    """
+    if not chat_history:
+        return "Pas d'historique (première interaction)"
+
+    lines: List[str] = []
+    remaining = budget
+    for msg in reversed(chat_history):
+        role = "Utilisateur" if msg["role"] == "user" else "SHIZEN"
+        line = f"{role}: {msg['content']}"
+        cost = estimate_tokens(line)
+        if cost > remaining:
+            if not lines:
+                lines.append(truncate_to_tokens(line, remaining))
+            break
+        lines.append(line)
+        remaining -= cost
+
+    return "\n".join(reversed(lines))
+
+
+def _merge_items(previous: List[str], new: List[str]) -> List[str]:
+    """Union keeping the most recent items (case-insensitive dedup)"""
+    merged: List[str] = []
+    seen: Set[str] = set()
+    for item in list(new) + list(previous):
+        key = str(item).strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            merged.append(str(item).strip())
+    return merged[:MAX_MEMORY_ITEMS]
+
+
+class ConversationMemoryService:
+    """
+    Background builder of conversation memories
+
+    schedule_update() is fire-and-forget: one task per conversation at a time;
+    requests arriving while it runs are coalesced into one more pass.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        llm=None,
+    ):
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        if llm is None:
+            from app.services.ollama_service import get_ollama_service
+            llm = get_ollama_service()
+
+        self.session_factory = session_factory
+        self.llm = llm
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._dirty: Set[str] = set()
+        self._latest: Dict[str, Dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def schedule_update(self, conversation_id: str) -> None:
+        """Request a memory update for a conversation (returns immediately)"""
+        task = self._tasks.get(conversation_id)
+        if task and not task.done():
+            self._dirty.add(conversation_id)
+            return
+        self._tasks[conversation_id] = asyncio.create_task(self._run(conversation_id))
+
+    async def _run(self, conversation_id: str) -> None:
+        try:
+            while True:
+                self._dirty.discard(conversation_id)
+                try:
+                    await self.update_memory(conversation_id)
+                except Exception as e:
+                    logger.warning(f"⚠️ Memory update failed for {conversation_id} (non-blocking): {e}")
+                if conversation_id not in self._dirty:
+                    break
+        finally:
+            self._tasks.pop(conversation_id, None)
+
+    def latest(self, conversation_id: str, default: Optional[Dict] = None) -> Optional[Dict]:
+        """Context produced by the last background update in this worker (else default)"""
+        return self._latest.pop(conversation_id, default)
+
+    async def wait_idle(self) -> None:
+        """Wait for running updates (tests / graceful shutdown)"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    async def shutdown(self) -> None:
+        """Cancel pending updates (application shutdown)"""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    async def update_memory(self, conversation_id: str) -> bool:
+        """
+        Fold messages that left the recent window into the rolling summary
+
+        Returns:
+            True if the memory was updated
+        """
+        async with self.session_factory() as db:
+            conversation = await db.get(ConversationSession, conversation_id)
+            if conversation is None:
+                return False
+
+            context = dict(conversation.context or {})
+            memory = dict(context.get("memory") or {})
+            watermark = memory.get("summarized_until")
+
+            query = select(Message.role, Message.content, Message.created_at).where(
+                Message.conversation_id == conversation_id
+            )
+            if watermark:
+                query = query.where(Message.created_at > datetime.fromisoformat(watermark))
+            rows = (await db.execute(query.order_by(Message.created_at))).all()
+
+            to_summarize = rows[:-RECENT_WINDOW_MESSAGES] if len(rows) > RECENT_WINDOW_MESSAGES else []
+            if len(to_summarize) < MEMORY_BATCH_MESSAGES:
+                return False
+
+            extracted = await self._summarize(context, to_summarize)
+            if extracted is None:
+                return False
+
+            context.update({
+                "summary": extracted.get("summary") or context.get("summary"),
+                "user_preferences": _merge_items(context.get("user_preferences", []), extracted.get("user_preferences", [])),
+                "goals_identified": _merge_items(context.get("goals_identified", []), extracted.get("goals_identified", [])),
+                "topics_discussed": _merge_items(context.get("topics_discussed", []), extracted.get("topics_discussed", [])),
+                "emotional_state": extracted.get("emotional_state") or context.get("emotional_state"),
+                "memory": {
+                    "summarized_until": to_summarize[-1].created_at.isoformat(),
+                    "summarized_messages": memory.get("summarized_messages", 0) + len(to_summarize),
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                },
+            })
+            conversation.context = context
+            await db.commit()
+
+        self._latest[conversation_id] = context
+        logger.info(f"🧠 Memory updated for {conversation_id}: +{len(to_summarize)} messages summarized")
+        return True
+
+    async def _summarize(self, context: Dict[str, Any], rows) -> Optional[Dict[str, Any]]:
+        """One LLM call: previous memory + new messages -> updated memory fields"""
+        conv_text = "\n".join(f"{row.role.value.upper()}: {row.content}" for row in rows)
+        previous = context.get("summary") or "(aucun)"
+
+        prompt = f"""Mets à jour la mémoire de cette conversation.
+
+RÉSUMÉ PRÉCÉDENT:
+{previous}
+
+NOUVEAUX MESSAGES:
+{conv_text}
+
+Réponds en JSON avec ces champs:
+{{
+    "summary": "résumé de 3-5 phrases couvrant le résumé précédent ET les nouveaux messages",
+    "user_preferences": ["préférences ou besoins exprimés dans les nouveaux messages"],
+    "goals_identified": ["objectifs ou souhaits mentionnés dans les nouveaux messages"],
+    "emotional_state": "état émotionnel le plus récent (ex: motivé, fatigué, anxieux, curieux)",
+    "topics_discussed": ["sujets abordés"]
+}}
+
+Réponds UNIQUEMENT avec le JSON, sans texte avant ou après."""
+
+        response_text = await self.llm.generate(prompt=prompt, temperature=0.3)
+
+        json_match = re.search(r'\{.*\}', response_text or "", re.DOTALL)
+        if not json_match:
+            logger.warning("Could not extract JSON from memory summary response")
+            return None
+        try:
+            return json.loads(json_match.group())
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse memory summary JSON: {response_text[:200]}")
+            return None
+
+
+# Singleton instance
+_conversation_memory_service: Optional[ConversationMemoryService] = None
+
+
+def get_conversation_memory_service() -> ConversationMemoryService:
+    """Get or create Conversation Memory service singleton"""
+    global _conversation_memory_service
+    if _conversation_memory_service is None:
+        _conversation_memory_service = ConversationMemoryService()
+    return _conversation_memory_service
@@ -4,10 +4,14 @@ Shinkofa Platform - Shizen AI Chatbot
 
 Manages conversation sessions and message history
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import String, and_, cast, literal, select, desc, func, or_, text, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime, timezone
+import json
+import re
 import uuid
 import logging
 
@@ -17,9 +21,14 @@ from app.models import (
     Message,
     MessageRole,
 )
+from app.models.conversation_session import CONVERSATION_TAGS_JSONB, CONVERSATION_TITLE_TSVECTOR
+from app.models.message import MESSAGE_CONTENT_TSVECTOR
+from app.utils.pagination import decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 50
+
 
 class ConversationService:
     """
@@ -171,37 +180,121 @@ class ConversationService:
         self,
         conversation_id: str,
         db: AsyncSession,
-        limit: Optional[int] = None,
-        offset: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
     ) -> List[Message]:
         """
-        Get conversation message history
+        Get conversation message history (oldest first, keyset-paginated)
 
         Args:
             conversation_id: Conversation ID
             db: Database session
-            limit: Maximum number of messages (None = all)
-            offset: Offset for pagination
+            limit: Maximum number of messages
+            after: Cursor of the last message already read (None = from the start)
 
         Returns:
-            List of messages in chronological order
+            List of messages in chronological order (empty on error)
         """
         try:
-            query = (
-                select(Message)
-                .where(Message.conversation_id == conversation_id)
-                .order_by(Message.created_at)
-                .offset(offset)
+            messages, _ = await self.get_message_page(
+                conversation_id, db, limit=limit, after=after, oldest_first=True
             )
+            return messages
+
+        except Exception as e:
+            logger.error(f"❌ Error getting conversation history: {e}")
+            return []
+
+    async def get_message_page(
+        self,
+        conversation_id: str,
+        db: AsyncSession,
+        limit: int = DEFAULT_PAGE_SIZE,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        oldest_first: bool = False,
+    ) -> Tuple[List[Message], Optional[str]]:
+        """
+        One page of messages, served by ix_messages_conversation_created_id
+
+        By default pages go backwards from the newest message (chat
+        scroll-back): `before` is the cursor returned by the previous page.
+        With `after` (or oldest_first), pages go forward from that cursor
+        (or from the first message).
+
+        Args:
+            conversation_id: Conversation ID
+            db: Database session
+            limit: Page size
+            before: Return messages older than this cursor
+            after: Return messages newer than this cursor
+            oldest_first: Start from the first message when no cursor is given
 
-            if limit:
-                query = query.limit(limit)
+        Returns:
+            (messages in chronological order, cursor of the next page or None)
 
-            result = await db.execute(query)
-            return list(result.scalars().all())
+        Raises:
+            HTTPException 400: Both `before` and `after` given (one direction per page)
+        """
+        if before is not None and after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use either 'before' or 'after', not both",
+            )
+
+        sort_key = tuple_(Message.created_at, Message.id)
+        query = select(Message).where(Message.conversation_id == conversation_id)
+
+        forward = oldest_first or after is not None
+        if forward:
+            if after is not None:
+                query = query.where(sort_key > tuple_(*decode_cursor(after)))
+            query = query.order_by(Message.created_at, Message.id)
+        else:
+            if before is not None:
+                query = query.where(sort_key < tuple_(*decode_cursor(before)))
+            query = query.order_by(desc(Message.created_at), desc(Message.id))
+
+        result = await db.execute(query.limit(limit + 1))
+        messages = list(result.scalars().all())
+
+        next_cursor = None
+        if len(messages) > limit:
+            messages = messages[:limit]
+            next_cursor = encode_cursor(messages[-1].created_at, messages[-1].id)
+
+        if not forward:
+            messages.reverse()
+        return messages, next_cursor
+
+    async def get_recent_messages(
+        self,
+        conversation_id: str,
+        db: AsyncSession,
+        limit: int = 10,
+    ) -> List[Message]:
+        """
+        Get the latest messages of a conversation
+
+        Args:
+            conversation_id: Conversation ID
+            db: Database session
+            limit: Number of messages
+
+        Returns:
+            The `limit` newest messages, in chronological order
+        """
+        try:
+            result = await db.execute(
+                select(Message)
+                .where(Message.conversation_id == conversation_id)
+                .order_by(desc(Message.created_at))
+                .limit(limit)
+            )
+            return list(reversed(result.scalars().all()))
 
         except Exception as e:
-            logger.error(f"❌ Error getting conversation history: {e}")
+            logger.error(f"❌ Error getting recent messages: {e}")
             return []
 
     async def get_user_conversations(
@@ -210,7 +303,7 @@ class ConversationService:
         db: AsyncSession,
         status: Optional[ConversationStatus] = None,
         limit: int = 20,
-        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[ConversationSession]:
         """
         Get user's conversations
@@ -220,34 +313,123 @@ class ConversationService:
             db: Database session
             status: Optional filter by status
             limit: Maximum conversations
-            offset: Offset for pagination
+            cursor: Cursor returned by the previous page
 
         Returns:
-            List of conversations ordered by last activity
+            List of conversations ordered by last activity (empty on error)
         """
         try:
-            query = (
-                select(ConversationSession)
-                .where(ConversationSession.user_id == user_id)
-            )
-
-            if status:
-                query = query.where(ConversationSession.status == status)
-
-            query = (
-                query
-                .order_by(desc(ConversationSession.last_message_at))
-                .limit(limit)
-                .offset(offset)
+            conversations, _ = await self.list_conversations(
+                user_id, db, status=status, limit=limit, cursor=cursor
             )
-
-            result = await db.execute(query)
-            return list(result.scalars().all())
+            return conversations
 
         except Exception as e:
             logger.error(f"❌ Error getting user conversations: {e}")
             return []
 
+    async def list_conversations(
+        self,
+        user_id: str,
+        db: AsyncSession,
+        status: Optional[ConversationStatus] = None,
+        query: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        exclude_deleted: bool = False,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ConversationSession], Optional[str]]:
+        """
+        One page of a user's conversations, most recently active first
+
+        Pagination is keyset on (last_message_at, id)
+        (ix_conversation_sessions_user_last_message). On PostgreSQL, `query`
+        is a full-text prefix search over titles and message content and
+        `tags` a JSONB containment test, all served by GIN indexes.
+
+        Args:
+            user_id: User ID
+            db: Database session
+            status: Optional filter by status
+            query: Search words (all must match, as prefixes)
+            tags: Conversations carrying all these tags
+            exclude_deleted: Skip soft-deleted conversations
+            limit: Page size
+            cursor: Cursor returned by the previous page
+
+        Returns:
+            (conversations, cursor of the next page or None)
+        """
+        sql_query = select(ConversationSession).where(ConversationSession.user_id == user_id)
+
+        if status:
+            sql_query = sql_query.where(ConversationSession.status == status)
+        elif exclude_deleted:
+            sql_query = sql_query.where(ConversationSession.status != ConversationStatus.DELETED)
+
+        postgres = db.bind.dialect.name == "postgresql"
+        if query and query.strip():
+            sql_query = sql_query.where(self._search_filter(query, postgres))
+        if tags:
+            sql_query = sql_query.where(self._tags_filter(tags, postgres))
+
+        position = decode_cursor(cursor)
+        if position is not None:
+            sql_query = sql_query.where(
+                tuple_(ConversationSession.last_message_at, ConversationSession.id) < tuple_(*position)
+            )
+
+        sql_query = sql_query.order_by(
+            desc(ConversationSession.last_message_at), desc(ConversationSession.id)
+        ).limit(limit + 1)
+
+        result = await db.execute(sql_query)
+        conversations = list(result.scalars().all())
+
+        next_cursor = None
+        if len(conversations) > limit:
+            conversations = conversations[:limit]
+            last = conversations[-1]
+            next_cursor = encode_cursor(last.last_message_at, last.id)
+        return conversations, next_cursor
+
+    @staticmethod
+    def _search_filter(query: str, postgres: bool):
+        """Title or any message content matches the query"""
+        if postgres:
+            words = [re.sub(r"\W", "", word) for word in query.split()]
+            ts_query = func.to_tsquery(
+                text("'simple'"),
+                " & ".join(f"{word}:*" for word in words if word) or "''",
+            )
+            content_match = (
+                select(Message.id)
+                .where(Message.conversation_id == ConversationSession.id)
+                .where(MESSAGE_CONTENT_TSVECTOR.op("@@")(ts_query))
+                .exists()
+            )
+            return or_(CONVERSATION_TITLE_TSVECTOR.op("@@")(ts_query), content_match)
+
+        # Other dialects (SQLite tests): substring match
+        pattern = f"%{query.strip()}%"
+        content_match = (
+            select(Message.id)
+            .where(Message.conversation_id == ConversationSession.id)
+            .where(Message.content.ilike(pattern))
+            .exists()
+        )
+        return or_(ConversationSession.title.ilike(pattern), content_match)
+
+    @staticmethod
+    def _tags_filter(tags: List[str], postgres: bool):
+        """Conversation carries every tag"""
+        if postgres:
+            return CONVERSATION_TAGS_JSONB.op("@>")(literal(list(tags), JSONB))
+        return and_(*(
+            cast(ConversationSession.meta["tags"], String).like(f'%{json.dumps(tag)}%')
+            for tag in tags
+        ))
+
     async def update_conversation_context(
         self,
         conversation_id: str,
@@ -409,7 +591,7 @@ class ConversationService:
         Args:
             user_id: User ID
             db: Database session
-            query: Search query (matches title)
+            query: Search query (matches title and message content)
             tags: Filter by tags
             limit: Maximum results
 
@@ -417,34 +599,10 @@ class ConversationService:
             Matching conversations
         """
         try:
-            sql_query = (
-                select(ConversationSession)
-                .where(ConversationSession.user_id == user_id)
-                .where(ConversationSession.status != ConversationStatus.DELETED)
+            conversations, _ = await self.list_conversations(
+                user_id, db, query=query, tags=tags, exclude_deleted=True, limit=limit
             )
-
-            # Filter by title query
-            if query:
-                sql_query = sql_query.where(
-                    ConversationSession.title.ilike(f"%{query}%")
-                )
-
-            # Filter by tags (JSON containment)
-            # Note: This is PostgreSQL-specific
-            if tags:
-                for tag in tags:
-                    sql_query = sql_query.where(
-                        ConversationSession.meta["tags"].astext.contains(tag)
-                    )
-
-            sql_query = (
-                sql_query
-                .order_by(desc(ConversationSession.last_message_at))
-                .limit(limit)
-            )
-
-            result = await db.execute(sql_query)
-            return list(result.scalars().all())
+            return conversations
 
         except Exception as e:
             logger.error(f"❌ Error searching conversations: {e}")
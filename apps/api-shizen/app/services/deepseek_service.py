@@ -7,10 +7,14 @@ Using DeepSeek API (https://platform.deepseek.com)
 """
 import httpx
 import os
+import time
 from typing import List, Dict, Optional
 import logging
 import traceback
 
+from app.core.metrics import LLM_REQUEST_DURATION, LLM_TOKENS
+from app.core.tracing import outgoing_trace_headers
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,13 +80,29 @@ class DeepSeekService:
         try:
             logger.info(f"📤 Sending chat request to DeepSeek API (model: {self.model})")
 
-            response = await self.client.post(
-                f"{self.base_url}/chat/completions",
-                json=payload,
-            )
-            response.raise_for_status()
-
-            result = response.json()
+            outcome = "error"
+            start = time.perf_counter()
+            try:
+                response = await self.client.post(
+                    f"{self.base_url}/chat/completions",
+                    json=payload,
+                    headers=outgoing_trace_headers(),
+                )
+                response.raise_for_status()
+
+                result = response.json()
+                outcome = "success"
+            finally:
+                LLM_REQUEST_DURATION.observe(
+                    time.perf_counter() - start,
+                    provider="deepseek", model=self.model, operation="chat", outcome=outcome,
+                )
+
+            usage = result.get("usage") or {}
+            LLM_TOKENS.inc(usage.get("prompt_tokens") or 0, provider="deepseek", model=self.model, kind="prompt")
+            LLM_TOKENS.inc(usage.get("completion_tokens") or 0, provider="deepseek", model=self.model, kind="completion")
+            # Context caching: prompt prefix tokens served from DeepSeek's disk cache
+            LLM_TOKENS.inc(usage.get("prompt_cache_hit_tokens") or 0, provider="deepseek", model=self.model, kind="prompt_cached")
 
             # Extract content from OpenAI-compatible format
             assistant_message = result["choices"][0]["message"]["content"]
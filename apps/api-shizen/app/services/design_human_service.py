@@ -5,15 +5,22 @@ Shinkofa Platform - Shizen AI
 Calculates Human Design chart using Swiss Ephemeris
 Determines: Type, Authority, Profile, Centers, Gates, Channels, Incarnation Cross
 
+Planetary positions and the 88° solar-arc solve are served from the
+precomputed EphemerisTable when its chunks are built (always for batch
+computation via calculate_charts), otherwise from Swiss Ephemeris directly.
+
 References:
 - pyswisseph documentation: https://www.astro.com/swisseph/
 - Human Design system: https://www.jovianarchive.com/
 """
+import numpy as np
 import swisseph as swe
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import logging
 
+from app.services.ephemeris_table import BODIES, EphemerisTable, get_ephemeris_table
+
 logger = logging.getLogger(__name__)
 
 # Swiss Ephemeris file path (ephemeris data)
@@ -29,6 +36,9 @@ class DesignHumanService:
     Calculates complete Human Design chart from birth data
     """
 
+    # Bump when chart output changes (invalidates chart_cache entries)
+    CALCULATOR_VERSION = 1
+
     # Hexagram I-Ching correspondences (64 gates)
     GATES = list(range(1, 65))
 
@@ -214,8 +224,19 @@ class DesignHumanService:
         64: {"right_angle": "Consciousness", "juxtaposition": "Confusion", "left_angle": "Dominion"},
     }
 
-    def __init__(self):
+    # Design Humain planet order (Earth and South Node derived from Sun and North Node)
+    PLANET_ORDER = [
+        "sun", "earth", "moon", "mercury", "venus", "mars", "jupiter",
+        "saturn", "uranus", "neptune", "pluto", "north_node", "south_node",
+    ]
+
+    # Design moment is ~88-89 days before birth; table lookups need that margin
+    DESIGN_MARGIN_DAYS = 100.0
+
+    def __init__(self, ephemeris: Optional[EphemerisTable] = None):
         """Initialize Design Humain service"""
+        self.ephemeris = ephemeris or get_ephemeris_table()
+
         # Validate Swiss Ephemeris availability
         try:
             swe_version = swe.version
@@ -317,80 +338,165 @@ class DesignHumanService:
             to convert to UTC for accurate Swiss Ephemeris calculations.
         """
         try:
-            # Parse birth datetime (local time)
-            dt_str = f"{birth_date} {birth_time}"
-            birth_dt_local = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
-
-            # CRITICAL: Convert local time to UTC using timezone offset
-            # The Swiss Ephemeris requires UTC time for accurate calculations
-            utc_offset_hours = self._parse_timezone_offset(timezone_offset)
-            birth_dt_utc = birth_dt_local - timedelta(hours=utc_offset_hours)
-
-            logger.info(f"📅 Birth time conversion: {birth_dt_local} (local, {timezone_offset}) -> {birth_dt_utc} (UTC)")
-
-            # Convert to Julian Day (used by Swiss Ephemeris) - NOW IN UTC
-            jd_personality = self._datetime_to_jd(birth_dt_utc)
-
-            # Calculate Design date (88° solar arc before birth - NOT 88 days!)
-            jd_design = self._calculate_design_time(jd_personality)
-
-            # Calculate planetary positions
-            personality_planets = self._calculate_planetary_positions(jd_personality)
-            design_planets = self._calculate_planetary_positions(jd_design)
-
-            # Extract gates from planetary positions
-            personality_gates = self._planets_to_gates(personality_planets)
-            design_gates = self._planets_to_gates(design_planets)
-
-            # CRITICAL FIX: Update side for design gates (they're marked "personality" by default in _planets_to_gates)
-            for gate in design_gates:
-                gate["side"] = "design"
-
-            # Determine defined centers
-            all_gates = personality_gates + design_gates
-            defined_centers = self._determine_centers(all_gates)
-
-            # Determine type based on centers AND gates (to check motor-throat channels)
-            chart_type = self._determine_type(defined_centers, all_gates)
-
-            # Determine authority
-            authority = self._determine_authority(defined_centers, all_gates)
-
-            # Determine profile (based on Sun/Earth gates)
-            profile = self._determine_profile(personality_gates, design_gates)
-
-            # Determine channels
-            channels = self._determine_channels(all_gates)
-
-            # Calculate Variable (4 arrows)
-            variable = self._calculate_variable(personality_gates, design_gates)
-
-            # Build complete chart
-            chart = {
-                "type": chart_type,
-                "authority": authority,
-                "profile": profile,
-                "definition": self._determine_definition(defined_centers, channels),
-                "strategy": self._get_strategy(chart_type),
-                "signature": self._get_signature(chart_type),
-                "not_self": self._get_not_self(chart_type),
-                "defined_centers": defined_centers,
-                "open_centers": [c for c in self.CENTERS if c not in defined_centers],
-                "gates": all_gates,
-                "channels": channels,
-                "incarnation_cross": self._determine_incarnation_cross(personality_gates, design_gates, profile),
-                "variable": variable,
-                "personality_planets": personality_planets,
-                "design_planets": design_planets,
-            }
-
-            logger.info(f"✅ Design Humain chart calculated: Type={chart_type}, Authority={authority}")
-            return chart
+            jd_personality = self._birth_to_jd(birth_date, birth_time, timezone_offset)
+
+            if self._table_ready(np.array([jd_personality]), build=False):
+                # Precomputed ephemeris: no Swiss Ephemeris call
+                jd_design = float(self.ephemeris.solve_solar_arc(np.array([jd_personality]), build=False)[0])
+                longitudes = self.ephemeris.lookup(np.array([jd_personality, jd_design]), build=False)[0]
+                personality_planets = self._planets_from_longitudes(longitudes[0])
+                design_planets = self._planets_from_longitudes(longitudes[1])
+            else:
+                # Calculate Design date (88° solar arc before birth - NOT 88 days!)
+                jd_design = self._calculate_design_time(jd_personality)
+
+                # Calculate planetary positions
+                personality_planets = self._calculate_planetary_positions(jd_personality)
+                design_planets = self._calculate_planetary_positions(jd_design)
+
+            return self._build_chart(personality_planets, design_planets)
 
         except Exception as e:
             logger.error(f"❌ Design Humain calculation error: {e}")
             raise Exception(f"Design Humain calculation failed: {str(e)}")
 
+    def calculate_charts(self, births: Sequence[Dict]) -> List[Optional[Dict]]:
+        """
+        Calculate many Human Design charts at once (admin bulk regeneration)
+
+        Solar-arc solve and planetary positions are computed for all births in
+        a few vectorized table lookups; missing table chunks are built once.
+
+        Args:
+            births: Dicts with calculate_chart() keyword arguments
+                (birth_date, birth_time, latitude, longitude, timezone_offset)
+
+        Returns:
+            Charts in the same order (None for births that could not be calculated)
+        """
+        charts: List[Optional[Dict]] = [None] * len(births)
+        jds: List[float] = []
+        indexes: List[int] = []
+
+        for index, birth in enumerate(births):
+            try:
+                jds.append(self._birth_to_jd(
+                    birth["birth_date"],
+                    birth["birth_time"],
+                    birth.get("timezone_offset", "+00:00"),
+                ))
+                indexes.append(index)
+            except Exception as e:
+                logger.warning(f"⚠️ Skipping birth #{index} in batch: {e}")
+
+        jd_personality = np.array(jds, dtype=float)
+        in_range = self._table_mask(jd_personality)
+
+        # Out-of-range dates: one by one with Swiss Ephemeris
+        for position in np.flatnonzero(~in_range):
+            try:
+                charts[indexes[position]] = self.calculate_chart(**births[indexes[position]])
+            except Exception as e:
+                logger.warning(f"⚠️ Design Humain batch item #{indexes[position]} failed: {e}")
+
+        if in_range.any():
+            jd_batch = jd_personality[in_range]
+            jd_design = self.ephemeris.solve_solar_arc(jd_batch)
+            longitudes = self.ephemeris.lookup(np.concatenate([jd_batch, jd_design]))[0]
+            count = len(jd_batch)
+            for row, position in enumerate(np.flatnonzero(in_range)):
+                charts[indexes[position]] = self._build_chart(
+                    self._planets_from_longitudes(longitudes[row]),
+                    self._planets_from_longitudes(longitudes[count + row]),
+                )
+
+        logger.info(f"✅ Design Humain batch: {sum(c is not None for c in charts)}/{len(births)} charts")
+        return charts
+
+    def _birth_to_jd(self, birth_date: str, birth_time: str, timezone_offset: str) -> float:
+        """Local birth date/time + UTC offset -> Julian Day (UT)"""
+        # Parse birth datetime (local time)
+        dt_str = f"{birth_date} {birth_time}"
+        birth_dt_local = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
+
+        # CRITICAL: Convert local time to UTC using timezone offset
+        # The Swiss Ephemeris requires UTC time for accurate calculations
+        utc_offset_hours = self._parse_timezone_offset(timezone_offset)
+        birth_dt_utc = birth_dt_local - timedelta(hours=utc_offset_hours)
+
+        logger.info(f"📅 Birth time conversion: {birth_dt_local} (local, {timezone_offset}) -> {birth_dt_utc} (UTC)")
+
+        # Convert to Julian Day (used by Swiss Ephemeris) - NOW IN UTC
+        return self._datetime_to_jd(birth_dt_utc)
+
+    def _table_mask(self, jd_personality: np.ndarray) -> np.ndarray:
+        """Births whose personality and design moments are inside the table range"""
+        return (
+            self.ephemeris.supports(jd_personality)
+            & self.ephemeris.supports(jd_personality - self.DESIGN_MARGIN_DAYS)
+        )
+
+    def _table_ready(self, jd_personality: np.ndarray, build: bool) -> bool:
+        """True if the table can serve these births (without building chunks unless build)"""
+        if not self._table_mask(jd_personality).all():
+            return False
+        if build:
+            return True
+        return self.ephemeris.is_available(
+            np.concatenate([jd_personality, jd_personality - self.DESIGN_MARGIN_DAYS])
+        )
+
+    def _build_chart(self, personality_planets: List[Dict], design_planets: List[Dict]) -> Dict:
+        """Derive the full chart from personality and design planetary positions"""
+        # Extract gates from planetary positions
+        personality_gates = self._planets_to_gates(personality_planets)
+        design_gates = self._planets_to_gates(design_planets)
+
+        # CRITICAL FIX: Update side for design gates (they're marked "personality" by default in _planets_to_gates)
+        for gate in design_gates:
+            gate["side"] = "design"
+
+        # Determine defined centers
+        all_gates = personality_gates + design_gates
+        defined_centers = self._determine_centers(all_gates)
+
+        # Determine type based on centers AND gates (to check motor-throat channels)
+        chart_type = self._determine_type(defined_centers, all_gates)
+
+        # Determine authority
+        authority = self._determine_authority(defined_centers, all_gates)
+
+        # Determine profile (based on Sun/Earth gates)
+        profile = self._determine_profile(personality_gates, design_gates)
+
+        # Determine channels
+        channels = self._determine_channels(all_gates)
+
+        # Calculate Variable (4 arrows)
+        variable = self._calculate_variable(personality_gates, design_gates)
+
+        # Build complete chart
+        chart = {
+            "type": chart_type,
+            "authority": authority,
+            "profile": profile,
+            "definition": self._determine_definition(defined_centers, channels),
+            "strategy": self._get_strategy(chart_type),
+            "signature": self._get_signature(chart_type),
+            "not_self": self._get_not_self(chart_type),
+            "defined_centers": defined_centers,
+            "open_centers": [c for c in self.CENTERS if c not in defined_centers],
+            "gates": all_gates,
+            "channels": channels,
+            "incarnation_cross": self._determine_incarnation_cross(personality_gates, design_gates, profile),
+            "variable": variable,
+            "personality_planets": personality_planets,
+            "design_planets": design_planets,
+        }
+
+        logger.info(f"✅ Design Humain chart calculated: Type={chart_type}, Authority={authority}")
+        return chart
+
     def _datetime_to_jd(self, dt: datetime) -> float:
         """Convert datetime to Julian Day"""
         return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute/60.0 + dt.second/3600.0)
@@ -430,8 +536,9 @@ class DesignHumanService:
         tolerance = 0.0001  # 0.0001° precision (~0.36 arcseconds)
 
         for i in range(max_iterations):
-            # Current Sun position
-            sun_current = swe.calc_ut(jd_design, swe.SUN)[0][0]
+            # Current Sun position and speed (one call returns both)
+            sun_values = swe.calc_ut(jd_design, swe.SUN)[0]
+            sun_current = sun_values[0]
 
             # Calculate angular difference (handle 360° wrap)
             diff = (target_position - sun_current + 180.0) % 360.0 - 180.0
@@ -442,8 +549,7 @@ class DesignHumanService:
                 return jd_design
 
             # Sun's daily motion (varies 0.95-1.02°/day)
-            # Calculate speed at current time
-            sun_speed = swe.calc_ut(jd_design, swe.SUN)[0][3]  # [0][3] = speed in °/day
+            sun_speed = sun_values[3]  # [3] = speed in °/day
 
             # Newton-Raphson step: adjust jd by (difference / speed)
             jd_design += diff / sun_speed
@@ -453,53 +559,39 @@ class DesignHumanService:
 
     def _calculate_planetary_positions(self, jd: float) -> List[Dict]:
         """
-        Calculate planetary positions at given Julian Day
+        Calculate planetary positions at given Julian Day (Swiss Ephemeris)
 
         Returns list of planets with their positions in zodiac degrees
         """
-        planets = []
-
-        # Planets used in Human Design (Swiss Ephemeris constants)
-        planet_ids = [
-            (swe.SUN, "sun"),
-            (swe.EARTH, "earth"),  # Note: Earth not directly in swisseph, calculate as Sun + 180°
-            (swe.MOON, "moon"),
-            (swe.MERCURY, "mercury"),
-            (swe.VENUS, "venus"),
-            (swe.MARS, "mars"),
-            (swe.JUPITER, "jupiter"),
-            (swe.SATURN, "saturn"),
-            (swe.URANUS, "uranus"),
-            (swe.NEPTUNE, "neptune"),
-            (swe.PLUTO, "pluto"),
-            (swe.TRUE_NODE, "north_node"),  # Dragon's Head (Rahu) - True Node for substructure accuracy
-            (None, "south_node"),  # Dragon's Tail (Ketu) - calculated as North Node + 180°
-        ]
-
-        for planet_id, planet_name in planet_ids:
+        longitudes = []
+        for planet_id, planet_name in BODIES:
             try:
-                # Calculate position
-                if planet_name == "earth":
-                    # Earth = Sun + 180°
-                    sun_pos = swe.calc_ut(jd, swe.SUN)[0][0]
-                    position = (sun_pos + 180.0) % 360.0
-                elif planet_name == "south_node":
-                    # South Node = North Node + 180°
-                    north_node_pos = swe.calc_ut(jd, swe.TRUE_NODE)[0][0]
-                    position = (north_node_pos + 180.0) % 360.0
-                else:
-                    position = swe.calc_ut(jd, planet_id)[0][0]  # [0][0] = longitude
-
-                planets.append({
-                    "name": planet_name,
-                    "position_degrees": position,
-                })
-
+                longitudes.append(swe.calc_ut(jd, planet_id)[0][0])  # [0][0] = longitude
             except Exception as e:
                 logger.warning(f"⚠️ Could not calculate {planet_name}: {e}")
-                continue
+                longitudes.append(float("nan"))
+
+        return self._planets_from_longitudes(longitudes)
+
+    def _planets_from_longitudes(self, longitudes: Sequence[float]) -> List[Dict]:
+        """
+        Build the Design Humain planet list from body longitudes
 
-        return planets
+        Args:
+            longitudes: Longitude per body, in ephemeris_table.BODIES order
+
+        Returns:
+            Planets in PLANET_ORDER (Earth = Sun + 180°, South Node = North Node + 180°)
+        """
+        positions = {name: float(longitudes[index]) for index, (_, name) in enumerate(BODIES)}
+        positions["earth"] = (positions["sun"] + 180.0) % 360.0
+        positions["south_node"] = (positions["north_node"] + 180.0) % 360.0
+
+        return [
+            {"name": name, "position_degrees": positions[name]}
+            for name in self.PLANET_ORDER
+            if not np.isnan(positions[name])
+        ]
 
     def _planets_to_gates(self, planets: List[Dict]) -> List[Dict]:
         """
@@ -0,0 +1,251 @@
+"""
+Ephemeris Table - Precomputed planetary positions for Design Humain
+Shinkofa Platform - Shizen AI
+
+Half-day samples of longitude + daily speed for every body used by Design
+Humain, computed once with Swiss Ephemeris and interpolated with cubic
+Hermite splines (position and speed at both ends of each interval).
+Interpolation error vs swe.calc_ut stays around 1e-5° - far below one tone
+(0.026°), the finest Design Humain subdivision.
+
+The table is split in chunks of 512 days, built on first use, kept in memory
+and persisted as .npy files so restarts and other workers reuse them
+(scripts/build_ephemeris_table.py prebuilds the whole supported range).
+
+All lookups are vectorized: many Julian days are resolved in one call, which
+is what DesignHumanService.calculate_charts() uses for batch computation.
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+logger = logging.getLogger(__name__)
+
+# Bodies read from Swiss Ephemeris (Earth and South Node are derived: +180°)
+BODIES: Tuple[Tuple[int, str], ...] = (
+    (swe.SUN, "sun"),
+    (swe.MOON, "moon"),
+    (swe.MERCURY, "mercury"),
+    (swe.VENUS, "venus"),
+    (swe.MARS, "mars"),
+    (swe.JUPITER, "jupiter"),
+    (swe.SATURN, "saturn"),
+    (swe.URANUS, "uranus"),
+    (swe.NEPTUNE, "neptune"),
+    (swe.PLUTO, "pluto"),
+    (swe.TRUE_NODE, "north_node"),
+)
+BODY_INDEX: Dict[str, int] = {name: index for index, (_, name) in enumerate(BODIES)}
+
+STEP_DAYS = 0.5
+CHUNK_SAMPLES = 1024  # 512 days per chunk
+
+# Supported date range (outside it callers fall back to swe.calc_ut)
+JD_START = swe.julday(1900, 1, 1, 0.0)
+JD_END = swe.julday(2100, 1, 1, 0.0)
+
+# Bump when the table layout changes, so stale chunk files get rebuilt
+TABLE_FORMAT_VERSION = 1
+
+EPHEMERIS_CACHE_DIR = Path(
+    os.getenv("EPHEMERIS_CACHE_DIR", Path(__file__).parent.parent / "data" / "ephemeris")
+)
+
+
+class EphemerisTable:
+    """
+    Chunked table of (longitude, speed) samples with Hermite interpolation
+
+    Arrays are shaped (samples, bodies, 2) where the last axis is
+    [longitude in degrees, speed in degrees/day].
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = EPHEMERIS_CACHE_DIR):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._chunks: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Chunks
+    # ------------------------------------------------------------------
+
+    def supports(self, jds: np.ndarray) -> np.ndarray:
+        """Mask of Julian days inside the supported range"""
+        jds = np.asarray(jds, dtype=float)
+        return (jds >= JD_START) & (jds < JD_END)
+
+    def _chunk_path(self, index: int) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"v{TABLE_FORMAT_VERSION}-swe{swe.version}-chunk{index:04d}.npy"
+
+    @staticmethod
+    def _compute_chunk(index: int) -> np.ndarray:
+        """Sample all bodies over one chunk with Swiss Ephemeris"""
+        first_sample = index * CHUNK_SAMPLES
+        data = np.empty((CHUNK_SAMPLES + 1, len(BODIES), 2))
+        for sample in range(CHUNK_SAMPLES + 1):
+            jd = JD_START + (first_sample + sample) * STEP_DAYS
+            for body_index, (body, _) in enumerate(BODIES):
+                values = swe.calc_ut(jd, body)[0]
+                data[sample, body_index, 0] = values[0]
+                data[sample, body_index, 1] = values[3]
+        return data
+
+    def _chunk(self, index: int, build: bool) -> Optional[np.ndarray]:
+        """Get a chunk from memory, then disk, then (if build) Swiss Ephemeris"""
+        chunk = self._chunks.get(index)
+        if chunk is not None:
+            return chunk
+
+        path = self._chunk_path(index)
+        if path is not None and path.exists():
+            try:
+                chunk = np.load(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable ephemeris chunk {path.name}: {e}")
+
+        if chunk is None:
+            if not build:
+                return None
+            with self._lock:
+                if index in self._chunks:
+                    return self._chunks[index]
+                chunk = self._compute_chunk(index)
+                self._save(path, chunk)
+
+        self._chunks[index] = chunk
+        return chunk
+
+    def _save(self, path: Optional[Path], chunk: np.ndarray) -> None:
+        """Persist a chunk atomically (best effort)"""
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, chunk)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not persist ephemeris chunk {path.name}: {e}")
+
+    def is_available(self, jds: np.ndarray) -> bool:
+        """True if every Julian day is in range and its chunk is in memory or on disk"""
+        jds = np.atleast_1d(np.asarray(jds, dtype=float))
+        if not self.supports(jds).all():
+            return False
+        indexes = np.unique(((jds - JD_START) / STEP_DAYS // CHUNK_SAMPLES).astype(int))
+        return all(self._chunk(int(index), build=False) is not None for index in indexes)
+
+    def build_range(self, jd_from: float = JD_START, jd_to: float = JD_END) -> int:
+        """Build (or load) every chunk covering [jd_from, jd_to); returns chunk count"""
+        first = int((max(jd_from, JD_START) - JD_START) / STEP_DAYS // CHUNK_SAMPLES)
+        last = int((min(jd_to, JD_END) - JD_START) / STEP_DAYS // CHUNK_SAMPLES)
+        for index in range(first, last + 1):
+            self._chunk(index, build=True)
+        return last - first + 1
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def lookup(self, jds: np.ndarray, build: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolated longitudes and speeds of all bodies
+
+        Args:
+            jds: Julian days (UT), all inside the supported range
+            build: Build missing chunks (otherwise raise KeyError)
+
+        Returns:
+            Tuple (longitudes, speeds), each shaped (len(jds), len(BODIES))
+        """
+        jds = np.atleast_1d(np.asarray(jds, dtype=float))
+        if not self.supports(jds).all():
+            raise ValueError("Julian day outside the ephemeris table range")
+
+        position = (jds - JD_START) / STEP_DAYS
+        sample = np.floor(position).astype(int)
+        t = (position - sample)[:, None]
+        chunk_index = sample // CHUNK_SAMPLES
+        offset = sample - chunk_index * CHUNK_SAMPLES
+
+        start = np.empty((len(jds), len(BODIES), 2))
+        end = np.empty_like(start)
+        for index in np.unique(chunk_index):
+            chunk = self._chunk(int(index), build=build)
+            if chunk is None:
+                raise KeyError(f"Ephemeris chunk {index} not built")
+            mask = chunk_index == index
+            start[mask] = chunk[offset[mask]]
+            end[mask] = chunk[offset[mask] + 1]
+
+        p0, v0 = start[..., 0], start[..., 1] * STEP_DAYS
+        v1 = end[..., 1] * STEP_DAYS
+        # Unwrap across 0°/360° (no body moves 180° in half a day)
+        p1 = p0 + (end[..., 0] - p0 + 180.0) % 360.0 - 180.0
+
+        t2, t3 = t * t, t * t * t
+        longitudes = (
+            (2 * t3 - 3 * t2 + 1) * p0
+            + (t3 - 2 * t2 + t) * v0
+            + (-2 * t3 + 3 * t2) * p1
+            + (t3 - t2) * v1
+        ) % 360.0
+        speeds = (
+            (6 * t2 - 6 * t) * p0
+            + (3 * t2 - 4 * t + 1) * v0
+            + (-6 * t2 + 6 * t) * p1
+            + (3 * t2 - 2 * t) * v1
+        ) / STEP_DAYS
+        return longitudes, speeds
+
+    def solve_solar_arc(
+        self,
+        jd_birth: np.ndarray,
+        arc: float = 88.0,
+        tolerance: float = 0.0001,
+        max_iterations: int = 20,
+        build: bool = True,
+    ) -> np.ndarray:
+        """
+        Julian days when the Sun was `arc` degrees before its birth position (vectorized Newton)
+
+        Args:
+            jd_birth: Birth Julian days (UT)
+            arc: Solar arc in degrees (88° for Design Humain)
+            tolerance: Convergence threshold in degrees
+
+        Returns:
+            Design Julian days, same shape as jd_birth
+        """
+        sun = BODY_INDEX["sun"]
+        jd_birth = np.atleast_1d(np.asarray(jd_birth, dtype=float))
+        target = (self.lookup(jd_birth, build)[0][:, sun] - arc) % 360.0
+        jd = jd_birth - arc
+
+        for _ in range(max_iterations):
+            longitudes, speeds = self.lookup(jd, build)
+            diff = (target - longitudes[:, sun] + 180.0) % 360.0 - 180.0
+            if np.all(np.abs(diff) < tolerance):
+                break
+            jd = jd + diff / speeds[:, sun]
+        return jd
+
+
+# Worker-wide table
+_ephemeris_table: Optional[EphemerisTable] = None
+
+
+def get_ephemeris_table() -> EphemerisTable:
+    """Get or create the ephemeris table singleton"""
+    global _ephemeris_table
+    if _ephemeris_table is None:
+        _ephemeris_table = EphemerisTable()
+    return _ephemeris_table
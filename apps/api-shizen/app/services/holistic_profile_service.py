@@ -12,30 +12,70 @@ Orchestrates complete holistic profile generation:
 7. AI Synthesis (Ollama - integrated recommendations)
 
 Saves complete profile to database (HolisticProfile model)
+
+Regeneration is incremental: each section records a fingerprint of its inputs
+(the answer blocs of SECTION_ANSWER_BLOCS, birth data, name; for the LLM
+sections also the analysis prompt version and the model). Sections whose
+fingerprint matches the active version are copied from it, and the synthesis
+is only regenerated when one of its upstream sections (or its own context)
+changed.
 """
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Iterable
 from datetime import datetime, timezone
+import hashlib
+import json
 import logging
 import uuid
 import asyncio
 import traceback
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 
 from app.models.questionnaire_session import QuestionnaireSession, SessionStatus
 from app.models.questionnaire_response import QuestionnaireResponse
-from app.models.holistic_profile import HolisticProfile
+from app.models.holistic_profile import HolisticProfile, PROFILE_SECTIONS
 from app.models.uploaded_chart import UploadedChart, ChartType, ChartStatus
 
 from app.services.design_human_service import get_design_human_service
 from app.services.astrology_service import get_astrology_service
 from app.services.numerology_service import get_numerology_service
+from app.services.analysis_prompt import (
+    ANALYSIS_PROMPT_TOKEN_BUDGET,
+    ANALYSIS_PROMPT_VERSION,
+    SECTION_ANALYSES,
+    encode_responses,
+    section_blocs,
+)
+from app.services.chart_cache_service import get_chart_cache_service, normalize_chart_inputs
 from app.services.psychological_analysis_service import get_psychological_analysis_service
 from app.services.name_holistic_analysis_service import get_name_holistic_analysis_service
 
 logger = logging.getLogger(__name__)
 
+# Answer blocs read by each questionnaire-based section, derived from the blocs
+# of its analyses (only these responses are sent to them, so an edit elsewhere
+# leaves the section reusable)
+SECTION_ANSWER_BLOCS: Dict[str, tuple] = {section: section_blocs(section) for section in SECTION_ANALYSES}
+
+# Synthesis context besides the sections: current situation (A) and spiritual abilities (H)
+SYNTHESIS_ANSWER_BLOCS = ("A", "H")
+
+
+def fingerprint(payload: Any) -> str:
+    """SHA-256 of a JSON-serializable payload (key order independent)"""
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def answers_fingerprint(responses: Iterable[QuestionnaireResponse], blocs: Iterable[str]) -> str:
+    """Fingerprint of the answers of some blocs (question, wording and answer)"""
+    blocs = set(blocs)
+    return fingerprint(sorted(
+        ((r.question_id, r.question_text, r.answer) for r in responses if r.bloc in blocs),
+        key=lambda item: item[0],
+    ))
+
 
 class HolisticProfileService:
     """
@@ -51,9 +91,32 @@ class HolisticProfileService:
         self.num_service = get_numerology_service()
         self.psych_service = get_psychological_analysis_service()
         self.name_holistic_service = get_name_holistic_analysis_service()
+        self.chart_cache = get_chart_cache_service()
 
         logger.info("🌟 Holistic Profile Service initialized")
 
+    def analysis_signature(self) -> Dict[str, Any]:
+        """What the LLM sections depend on besides their answers (prompt version, budget, model)"""
+        return {
+            "prompt": ANALYSIS_PROMPT_VERSION,
+            "budget": ANALYSIS_PROMPT_TOKEN_BUDGET,
+            "model": self.psych_service.llm.model_name,
+        }
+
+    def name_analysis_signature(self) -> Dict[str, Any]:
+        """What the LLM name analyses stored in the numerology section depend on (prompt version, model)"""
+        return {
+            "prompt": ANALYSIS_PROMPT_VERSION,
+            "model": self.name_holistic_service.llm.model_name,
+        }
+
+    def analysis_input_hash(self, responses: Iterable[QuestionnaireResponse], section: str) -> str:
+        """Fingerprint of the inputs of a questionnaire-based (LLM) section"""
+        return fingerprint({
+            "answers": answers_fingerprint(responses, SECTION_ANSWER_BLOCS[section]),
+            **self.analysis_signature(),
+        })
+
     async def _retry_with_backoff(
         self,
         func: Callable,
@@ -177,93 +240,123 @@ class HolisticProfileService:
                 full_name = "Unknown"
                 logger.warning("⚠️ No full_name found in session or Q1 response")
 
+            # 4c. Inputs of each section, and the active version to reuse from
+            input_hashes = self.section_input_hashes(responses, birth_data, full_name, uploaded_charts)
+            previous = await self._load_active_profile(user_id, db)
+
             # 5. Design Humain - Use uploaded chart OR calculate
-            if uploaded_charts["design_human"] and uploaded_charts["design_human"].extracted_data:
-                logger.info("📊 Using uploaded Design Humain chart (AI-analyzed)")
-                design_human = uploaded_charts["design_human"].extracted_data
-            else:
-                logger.info("🔮 Calculating Design Humain from birth data...")
-                design_human = self._calculate_design_human(birth_data)
+            design_human = self._reuse_section(previous, "design_human", input_hashes)
+            if design_human is None:
+                if uploaded_charts["design_human"] and uploaded_charts["design_human"].extracted_data:
+                    logger.info("📊 Using uploaded Design Humain chart (AI-analyzed)")
+                    design_human = uploaded_charts["design_human"].extracted_data
+                else:
+                    logger.info("🔮 Calculating Design Humain from birth data...")
+                    design_human = await self._cached_design_human(birth_data, db)
 
             # 6. Western Astrology - Use uploaded chart OR calculate
-            if uploaded_charts["birth_chart"] and uploaded_charts["birth_chart"].extracted_data:
-                logger.info("📊 Using uploaded Birth Chart (AI-analyzed)")
-                astrology_western = uploaded_charts["birth_chart"].extracted_data
-            else:
-                logger.info("✨ Calculating Western Astrology from birth data...")
-                astrology_western = self._calculate_astrology(birth_data)
+            astrology_western = self._reuse_section(previous, "astrology_western", input_hashes)
+            if astrology_western is None:
+                if uploaded_charts["birth_chart"] and uploaded_charts["birth_chart"].extracted_data:
+                    logger.info("📊 Using uploaded Birth Chart (AI-analyzed)")
+                    astrology_western = uploaded_charts["birth_chart"].extracted_data
+                else:
+                    logger.info("✨ Calculating Western Astrology from birth data...")
+                    astrology_western = await self._cached_astrology(birth_data, db)
 
-            logger.info("🐉 Calculating Chinese Astrology...")
-            astrology_chinese = self._calculate_chinese_astrology(birth_data)
+            astrology_chinese = self._reuse_section(previous, "astrology_chinese", input_hashes)
+            if astrology_chinese is None:
+                logger.info("🐉 Calculating Chinese Astrology...")
+                astrology_chinese = await self._cached_chinese_astrology(birth_data, db)
 
             # 6. Calculate Numerology with Etymology
-            logger.info("🔢 Calculating Numerology with etymological analysis...")
-            numerology = await self._calculate_numerology(full_name, birth_data)
+            numerology = self._reuse_section(previous, "numerology", input_hashes)
+            if numerology is None:
+                logger.info("🔢 Calculating Numerology with etymological analysis...")
+                numerology = await self._calculate_numerology(full_name, birth_data, db)
 
             # 7. Analyze Psychology (Ollama) - WITH RETRY
-            logger.info("🧠 Analyzing psychology (MBTI, Big Five, Enneagram)...")
-            psychological_analysis = await self._retry_with_backoff(
-                self._analyze_psychology,
-                responses,
-                max_retries=3,
-                initial_delay=2.0,
-                operation_name="Psychology Analysis"
-            )
-
-            # 8. Analyze Neurodivergence (Ollama) - WITH RETRY + GRACEFUL FALLBACK
-            logger.info("🧬 Analyzing neurodivergence patterns...")
-            try:
-                neurodivergence_analysis = await self._retry_with_backoff(
-                    self._analyze_neurodivergence,
-                    responses,
+            psychological_analysis = self._reuse_section(previous, "psychological_analysis", input_hashes)
+            if psychological_analysis is None:
+                logger.info("🧠 Analyzing psychology (MBTI, Big Five, Enneagram)...")
+                psychological_analysis = await self._retry_with_backoff(
+                    self._analyze_psychology,
+                    self._section_responses(responses, "psychological_analysis"),
                     max_retries=3,
                     initial_delay=2.0,
-                    operation_name="Neurodivergence Analysis"
-                )
-            except Exception as neuro_error:
-                # Graceful fallback: don't fail entire profile if neurodivergence fails
-                logger.error(f"❌ Neurodivergence analysis failed after all retries: {neuro_error}")
-                logger.warning("⚠️ Using fallback neurodivergence profile - will show as 'analysis pending'")
-                neurodivergence_analysis = self._get_fallback_neurodivergence_with_message(
-                    error_msg=str(neuro_error)
+                    operation_name="Psychology Analysis"
                 )
 
+            # 8. Analyze Neurodivergence (Ollama) - WITH RETRY + GRACEFUL FALLBACK
+            neurodivergence_analysis = self._reuse_section(previous, "neurodivergence_analysis", input_hashes)
+            if neurodivergence_analysis is None:
+                logger.info("🧬 Analyzing neurodivergence patterns...")
+                try:
+                    neurodivergence_analysis = await self._retry_with_backoff(
+                        self._analyze_neurodivergence,
+                        self._section_responses(responses, "neurodivergence_analysis"),
+                        max_retries=3,
+                        initial_delay=2.0,
+                        operation_name="Neurodivergence Analysis"
+                    )
+                except Exception as neuro_error:
+                    # Graceful fallback: don't fail entire profile if neurodivergence fails
+                    logger.error(f"❌ Neurodivergence analysis failed after all retries: {neuro_error}")
+                    logger.warning("⚠️ Using fallback neurodivergence profile - will show as 'analysis pending'")
+                    neurodivergence_analysis = self._get_fallback_neurodivergence_with_message(
+                        error_msg=str(neuro_error)
+                    )
+                    # Never reused: next regeneration retries the analysis
+                    input_hashes["neurodivergence_analysis"] = None
+
             # 9. Analyze Shinkofa dimensions (Ollama) - WITH RETRY
-            logger.info("🌈 Analyzing Shinkofa dimensions...")
-            shinkofa_analysis = await self._retry_with_backoff(
-                self._analyze_shinkofa,
-                responses,
-                max_retries=3,
-                initial_delay=2.0,
-                operation_name="Shinkofa Analysis"
-            )
+            shinkofa_analysis = self._reuse_section(previous, "shinkofa_analysis", input_hashes)
+            if shinkofa_analysis is None:
+                logger.info("🌈 Analyzing Shinkofa dimensions...")
+                shinkofa_analysis = await self._retry_with_backoff(
+                    self._analyze_shinkofa,
+                    self._section_responses(responses, "shinkofa_analysis"),
+                    max_retries=3,
+                    initial_delay=2.0,
+                    operation_name="Shinkofa Analysis"
+                )
 
-            # 9b. Extract Current Situation (Module A3) - V5.0 for coaching
-            logger.info("📍 Extracting current situation (challenges, aspirations)...")
-            current_situation = self._extract_current_situation(responses)
-
-            # 9c. Extract Spiritual Abilities (Module H3) - V5.0
-            logger.info("✨ Extracting spiritual abilities and experiences...")
-            spiritual_abilities = self._extract_spiritual_abilities(responses)
-
-            # 10. Generate AI Synthesis (Ollama) - WITH RETRY (most critical operation)
-            logger.info(f"📝 Generating AI synthesis for {full_name} (V5.0 - this may take 90-180s)...")
-            synthesis = await self._retry_with_backoff(
-                self.psych_service.generate_synthesis,
-                psychological_profile=psychological_analysis,
-                neurodivergence_profile=neurodivergence_analysis,
-                shinkofa_profile=shinkofa_analysis,
-                design_human=design_human,
-                astrology=astrology_western,
-                numerology=numerology,
-                full_name=full_name,
-                current_situation=current_situation,  # V5.0: Add current situation for coaching
-                spiritual_abilities=spiritual_abilities,  # V5.0: Add spiritual abilities
-                max_retries=3,
-                initial_delay=5.0,
-                backoff_factor=3.0,
-                operation_name="AI Synthesis Generation"
-            )
+            # 10. Generate AI Synthesis (Ollama) - only if an upstream section or its context changed
+            synthesis_hash = fingerprint({
+                "sections": {section: input_hashes[section] for section in PROFILE_SECTIONS},
+                "full_name": full_name,
+                "context": answers_fingerprint(responses, SYNTHESIS_ANSWER_BLOCS),
+                **self.analysis_signature(),
+            })
+            if previous is not None and previous.synthesis and previous.synthesis_input_hash == synthesis_hash:
+                logger.info(f"♻️ Synthesis inputs unchanged - reusing synthesis of v{previous.version}")
+                synthesis = previous.synthesis
+            else:
+                # 10a. Extract Current Situation (Module A3) - V5.0 for coaching
+                logger.info("📍 Extracting current situation (challenges, aspirations)...")
+                current_situation = self._extract_current_situation(responses)
+
+                # 10b. Extract Spiritual Abilities (Module H3) - V5.0
+                logger.info("✨ Extracting spiritual abilities and experiences...")
+                spiritual_abilities = self._extract_spiritual_abilities(responses)
+
+                logger.info(f"📝 Generating AI synthesis for {full_name} (V5.0 - this may take 90-180s)...")
+                synthesis = await self._retry_with_backoff(
+                    self.psych_service.generate_synthesis,
+                    psychological_profile=psychological_analysis,
+                    neurodivergence_profile=neurodivergence_analysis,
+                    shinkofa_profile=shinkofa_analysis,
+                    design_human=design_human,
+                    astrology=astrology_western,
+                    numerology=numerology,
+                    full_name=full_name,
+                    current_situation=current_situation,  # V5.0: Add current situation for coaching
+                    spiritual_abilities=spiritual_abilities,  # V5.0: Add spiritual abilities
+                    max_retries=3,
+                    initial_delay=5.0,
+                    backoff_factor=3.0,
+                    operation_name="AI Synthesis Generation"
+                )
 
             # 11. Generate recommendations
             recommendations = self._generate_recommendations(
@@ -274,22 +367,22 @@ class HolisticProfileService:
             )
 
             # 12. Handle versioning - Check for existing profiles
-            existing_profiles_result = await db.execute(
-                select(HolisticProfile)
-                .where(HolisticProfile.user_id == user_id)
-                .order_by(HolisticProfile.version.desc())
-            )
-            existing_profiles = existing_profiles_result.scalars().all()
+            latest_version = (await db.execute(
+                select(func.max(HolisticProfile.version)).where(HolisticProfile.user_id == user_id)
+            )).scalar_one_or_none()
 
             # Calculate new version number
-            if existing_profiles:
-                latest_version = existing_profiles[0].version
+            if latest_version is not None:
                 new_version = latest_version + 1
                 logger.info(f"🔄 Existing profiles found. Creating version {new_version}")
 
-                # Deactivate all previous versions
-                for old_profile in existing_profiles:
-                    old_profile.is_active = False
+                # Deactivate all previous versions (without loading them)
+                await db.execute(
+                    update(HolisticProfile)
+                    .where(HolisticProfile.user_id == user_id, HolisticProfile.is_active == True)
+                    .values(is_active=False, updated_at=datetime.now(timezone.utc))
+                    .execution_options(synchronize_session=False)
+                )
             else:
                 new_version = 1
                 logger.info(f"✨ First profile generation. Creating version {new_version}")
@@ -310,10 +403,13 @@ class HolisticProfileService:
                 astrology_chinese=astrology_chinese,
                 numerology=numerology,
                 synthesis=synthesis,
+                synthesis_input_hash=synthesis_hash,
                 recommendations=recommendations,
                 generated_at=datetime.now(timezone.utc),
                 updated_at=datetime.now(timezone.utc),
             )
+            for section, row in profile.sections.items():
+                row.input_hash = input_hashes[section]
 
             # 14. Save to database
             db.add(profile)
@@ -353,6 +449,103 @@ class HolisticProfileService:
         )
         return list(result.scalars().all())
 
+    async def _load_active_profile(self, user_id: str, db: AsyncSession) -> Optional[HolisticProfile]:
+        """Active profile version of the user (sections loaded), reused by regeneration"""
+        result = await db.execute(
+            select(HolisticProfile)
+            .where(HolisticProfile.user_id == user_id, HolisticProfile.is_active == True)
+            .order_by(HolisticProfile.version.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def load_section_responses(
+        self,
+        session_id: str,
+        section: str,
+        db: AsyncSession,
+    ) -> List[QuestionnaireResponse]:
+        """Responses of the answer blocs a questionnaire-based section depends on"""
+        result = await db.execute(
+            select(QuestionnaireResponse)
+            .where(
+                QuestionnaireResponse.session_id == session_id,
+                QuestionnaireResponse.bloc.in_(SECTION_ANSWER_BLOCS[section]),
+            )
+            .order_by(QuestionnaireResponse.answered_at)
+        )
+        return list(result.scalars().all())
+
+    def _section_responses(self, responses: List[QuestionnaireResponse], section: str) -> List[QuestionnaireResponse]:
+        """Responses a questionnaire-based section is analyzed from"""
+        blocs = SECTION_ANSWER_BLOCS[section]
+        return [r for r in responses if r.bloc in blocs]
+
+    def section_input_hashes(
+        self,
+        responses: List[QuestionnaireResponse],
+        birth_data: Dict,
+        full_name: str,
+        uploaded_charts: Dict[str, Optional[UploadedChart]],
+    ) -> Dict[str, Optional[str]]:
+        """
+        Fingerprint of the inputs of each profile section
+
+        Args:
+            responses: All responses of the session
+            birth_data: Session birth data
+            full_name: Resolved full name
+            uploaded_charts: Processed uploaded charts (they replace the calculation)
+
+        Returns:
+            Dict section -> input hash (PROFILE_SECTIONS keys)
+        """
+        def chart(calculator: str, version: int, inputs: Dict, uploaded: Optional[UploadedChart] = None) -> str:
+            if uploaded is not None and uploaded.extracted_data:
+                return fingerprint({"uploaded": uploaded.id, "data": uploaded.extracted_data})
+            if not birth_data:
+                return fingerprint({calculator: None})
+            return fingerprint({calculator: version, "inputs": normalize_chart_inputs(inputs)})
+
+        hashes: Dict[str, Optional[str]] = {
+            section: self.analysis_input_hash(responses, section)
+            for section in SECTION_ANSWER_BLOCS
+        }
+        hashes["design_human"] = chart(
+            "design_human", self.dh_service.CALCULATOR_VERSION,
+            self._design_human_inputs(birth_data), uploaded_charts.get("design_human"),
+        )
+        hashes["astrology_western"] = chart(
+            "astrology_western", self.astro_service.CALCULATOR_VERSION,
+            self._astrology_inputs(birth_data), uploaded_charts.get("birth_chart"),
+        )
+        hashes["astrology_chinese"] = chart(
+            "astrology_chinese", self.astro_service.CHINESE_CALCULATOR_VERSION,
+            {"birth_date": birth_data.get("date", "1990-01-01")},
+        )
+        # Numerology also carries the LLM name analysis (name_holistic_analysis)
+        hashes["numerology"] = fingerprint({
+            "chart": chart(
+                "numerology", self.num_service.CALCULATOR_VERSION,
+                {"full_name": full_name, "birth_date": birth_data.get("date", "1990-01-01")},
+            ),
+            "name_analysis": self.name_analysis_signature(),
+        })
+        return hashes
+
+    def _reuse_section(
+        self,
+        previous: Optional[HolisticProfile],
+        section: str,
+        input_hashes: Dict[str, Optional[str]],
+    ) -> Optional[Dict]:
+        """Section data of the previous version if computed from the same inputs (else None)"""
+        row = previous.sections.get(section) if previous is not None else None
+        if row is None or not row.data or row.input_hash is None or row.input_hash != input_hashes[section]:
+            return None
+        logger.info(f"♻️ {section} inputs unchanged - reusing v{previous.version}")
+        return row.data
+
     async def _load_uploaded_charts(self, session_id: str, db: AsyncSession) -> Dict[str, Optional[UploadedChart]]:
         """
         Load uploaded charts for session (Design Humain and/or Birth Chart)
@@ -386,6 +579,32 @@ class HolisticProfileService:
 
         return charts_dict
 
+    # ------------------------------------------------------------------
+    # Birth charts (pure calculators, memoized in chart_cache)
+    # ------------------------------------------------------------------
+
+    def _design_human_inputs(self, birth_data: Dict) -> Dict:
+        """Keyword inputs of DesignHumanService.calculate_chart"""
+        return {
+            "birth_date": birth_data.get("date", "1990-01-01"),
+            "birth_time": birth_data.get("time", "12:00:00"),
+            "latitude": birth_data.get("latitude", 48.8566),
+            "longitude": birth_data.get("longitude", 2.3522),
+            "timezone_offset": birth_data.get("utc_offset", "+00:00"),
+        }
+
+    def _astrology_inputs(self, birth_data: Dict) -> Dict:
+        """Keyword inputs of AstrologyService.calculate_chart"""
+        return {
+            "birth_date": birth_data.get("date", "1990-01-01"),
+            "birth_time": birth_data.get("time", "12:00")[:5],  # HH:MM only
+            "city": birth_data.get("city", "Paris"),
+            "country": birth_data.get("country", "France"),
+            "timezone": birth_data.get("timezone", "Europe/Paris"),
+            "latitude": birth_data.get("latitude"),  # GPS coordinates for precision
+            "longitude": birth_data.get("longitude"),
+        }
+
     def _calculate_design_human(self, birth_data: Dict) -> Dict:
         """Calculate Design Humain chart"""
         try:
@@ -393,13 +612,7 @@ class HolisticProfileService:
                 logger.warning("⚠️ No birth data - returning empty Design Humain")
                 return {}
 
-            return self.dh_service.calculate_chart(
-                birth_date=birth_data.get("date", "1990-01-01"),
-                birth_time=birth_data.get("time", "12:00:00"),
-                latitude=birth_data.get("latitude", 48.8566),
-                longitude=birth_data.get("longitude", 2.3522),
-                timezone_offset=birth_data.get("utc_offset", "+00:00"),
-            )
+            return self.dh_service.calculate_chart(**self._design_human_inputs(birth_data))
 
         except Exception as e:
             logger.error(f"❌ Design Humain calculation error: {e}")
@@ -412,15 +625,7 @@ class HolisticProfileService:
                 logger.warning("⚠️ No birth data - returning empty Astrology")
                 return {}
 
-            return self.astro_service.calculate_chart(
-                birth_date=birth_data.get("date", "1990-01-01"),
-                birth_time=birth_data.get("time", "12:00")[:5],  # HH:MM only
-                city=birth_data.get("city", "Paris"),
-                country=birth_data.get("country", "France"),
-                timezone=birth_data.get("timezone", "Europe/Paris"),
-                latitude=birth_data.get("latitude"),  # GPS coordinates for precision
-                longitude=birth_data.get("longitude"),
-            )
+            return self.astro_service.calculate_chart(**self._astrology_inputs(birth_data))
 
         except Exception as e:
             logger.error(f"❌ Astrology calculation error: {e}")
@@ -441,18 +646,77 @@ class HolisticProfileService:
             logger.error(f"❌ Chinese Astrology calculation error: {e}")
             return {}
 
-    async def _calculate_numerology(self, full_name: str, birth_data: Dict) -> Dict:
+    async def _cached_design_human(self, birth_data: Dict, db: AsyncSession) -> Dict:
+        """Design Humain chart through the chart cache"""
+        if not birth_data:
+            return self._calculate_design_human(birth_data)
+        return await self.chart_cache.get_or_compute(
+            db, "design_human", self.dh_service.CALCULATOR_VERSION,
+            self._design_human_inputs(birth_data),
+            lambda: self._calculate_design_human(birth_data),
+        )
+
+    async def _cached_astrology(self, birth_data: Dict, db: AsyncSession) -> Dict:
+        """Western Astrology chart through the chart cache"""
+        if not birth_data:
+            return self._calculate_astrology(birth_data)
+        return await self.chart_cache.get_or_compute(
+            db, "astrology_western", self.astro_service.CALCULATOR_VERSION,
+            self._astrology_inputs(birth_data),
+            lambda: self._calculate_astrology(birth_data),
+        )
+
+    async def _cached_chinese_astrology(self, birth_data: Dict, db: AsyncSession) -> Dict:
+        """Chinese Astrology through the chart cache"""
+        if not birth_data:
+            return self._calculate_chinese_astrology(birth_data)
+        return await self.chart_cache.get_or_compute(
+            db, "astrology_chinese", self.astro_service.CHINESE_CALCULATOR_VERSION,
+            {"birth_date": birth_data.get("date", "1990-01-01")},
+            lambda: self._calculate_chinese_astrology(birth_data),
+        )
+
+    async def _cached_numerology_chart(self, full_name: str, birth_data: Dict, db: AsyncSession) -> Dict:
+        """Basic numerology chart (no LLM name analysis) through the chart cache"""
+        inputs = {"full_name": full_name, "birth_date": birth_data.get("date", "1990-01-01")}
+        return await self.chart_cache.get_or_compute(
+            db, "numerology", self.num_service.CALCULATOR_VERSION, inputs,
+            lambda: self.num_service.calculate_chart(**inputs),
+        )
+
+    async def calculate_birth_charts(self, birth_data: Dict, full_name: str, db: AsyncSession) -> Dict[str, Dict]:
+        """
+        All birth-data charts, read through the chart cache
+
+        Used to fill empty chart sections (e.g., enrich-profile-section) without
+        regenerating the whole profile. Numerology excludes the LLM name analysis.
+
+        Returns:
+            Dict with design_human, astrology_western, astrology_chinese, numerology
+        """
+        numerology = {}
+        if full_name and birth_data:
+            try:
+                numerology = await self._cached_numerology_chart(full_name, birth_data, db)
+            except Exception as e:
+                logger.error(f"❌ Numerology calculation error: {e}")
+
+        return {
+            "design_human": await self._cached_design_human(birth_data, db),
+            "astrology_western": await self._cached_astrology(birth_data, db),
+            "astrology_chinese": await self._cached_chinese_astrology(birth_data, db),
+            "numerology": numerology,
+        }
+
+    async def _calculate_numerology(self, full_name: str, birth_data: Dict, db: AsyncSession) -> Dict:
         """Calculate Numerology chart with holistic name analysis (etymology + anthroponymy + energetic weight)"""
         try:
             if not full_name or not birth_data:
                 logger.warning("⚠️ Missing name or birth data - returning empty Numerology")
                 return {}
 
-            # Calculate basic numerology chart
-            numerology = self.num_service.calculate_chart(
-                full_name=full_name,
-                birth_date=birth_data.get("date", "1990-01-01"),
-            )
+            # Calculate basic numerology chart (memoized)
+            numerology = dict(await self._cached_numerology_chart(full_name, birth_data, db))
 
             # Extract first and last names
             name_parts = full_name.strip().split()
@@ -472,6 +736,7 @@ class HolisticProfileService:
                         "soul_urge": numerology.get("soul_urge", {}),
                         "personality": numerology.get("personality", {}),
                     },
+                    db=db,
                 )
 
                 # Enrich numerology data with holistic name analysis AND explicit names
@@ -493,6 +758,7 @@ class HolisticProfileService:
             # Convert responses to dict format for analysis
             responses_dict = [
                 {
+                    "question_id": r.question_id,
                     "bloc": r.bloc,
                     "question_text": r.question_text,
                     "answer": r.answer,
@@ -501,27 +767,30 @@ class HolisticProfileService:
                 for r in responses
             ]
 
+            # Encoded once: the seven prompts share the same prefix (prompt caching)
+            digest = encode_responses(responses_dict)
+
             # Run all analyses (sequential to avoid overwhelming Ollama)
             logger.info("  → Analyzing MBTI...")
-            mbti = await self.psych_service.analyze_mbti(responses_dict)
+            mbti = await self.psych_service.analyze_mbti(digest)
 
             logger.info("  → Analyzing Big Five...")
-            big_five = await self.psych_service.analyze_big_five(responses_dict)
+            big_five = await self.psych_service.analyze_big_five(digest)
 
             logger.info("  → Analyzing Enneagram...")
-            enneagram = await self.psych_service.analyze_enneagram(responses_dict)
+            enneagram = await self.psych_service.analyze_enneagram(digest)
 
             logger.info("  → Analyzing PNL meta-programs...")
-            pnl = await self.psych_service.analyze_pnl_meta_programs(responses_dict)
+            pnl = await self.psych_service.analyze_pnl_meta_programs(digest)
 
             logger.info("  → Analyzing PCM...")
-            pcm = await self.psych_service.analyze_pcm(responses_dict)
+            pcm = await self.psych_service.analyze_pcm(digest)
 
             logger.info("  → Analyzing VAKOG...")
-            vakog = await self.psych_service.analyze_vakog(responses_dict)
+            vakog = await self.psych_service.analyze_vakog(digest)
 
             logger.info("  → Analyzing Love Languages...")
-            love_languages = await self.psych_service.analyze_love_languages(responses_dict)
+            love_languages = await self.psych_service.analyze_love_languages(digest)
 
             return {
                 "mbti": mbti,
@@ -545,6 +814,7 @@ class HolisticProfileService:
         try:
             responses_dict = [
                 {
+                    "question_id": r.question_id,
                     "bloc": r.bloc,
                     "question_text": r.question_text,
                     "answer": r.answer,
@@ -567,6 +837,7 @@ class HolisticProfileService:
         try:
             responses_dict = [
                 {
+                    "question_id": r.question_id,
                     "bloc": r.bloc,
                     "question_text": r.question_text,
                     "answer": r.answer,
@@ -39,6 +39,13 @@ class HybridLLMService:
         logger.info(f"   Primary: {self.primary_provider.upper()}")
         logger.info(f"   Fallback: {'Ollama' if self.primary_provider == 'deepseek' else 'DeepSeek'}")
 
+    @property
+    def model_name(self) -> str:
+        """Primary provider and model ("deepseek:deepseek-chat"), identifies who writes the analyses"""
+        if self.primary_provider == "deepseek":
+            return f"deepseek:{self.deepseek.model}"
+        return f"ollama:{self.ollama.general_model}"
+
     async def generate(
         self,
         prompt: str,
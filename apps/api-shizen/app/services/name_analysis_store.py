@@ -0,0 +1,385 @@
+"""
+Name Analysis Store - Shared LLM name analyses
+Shinkofa Platform - Shizen AI
+
+Most users share their first name or surname with someone else: an analysis
+generated once is reused by every later profile.
+
+- Profile generation looks names up here and only calls the LLM for names
+  never seen (NameHolisticAnalysisService.analyze_full_name_holistic).
+- A background worker (run_name_analysis_worker) discovers names of ongoing
+  questionnaires, queues them `pending`, and fills them NAME_BATCH_SIZE at a
+  time with one LLM generation per batch (etymology_batch), so names are
+  usually ready before the profile is generated.
+- Discovery only reads sessions active since its last pass (keyset
+  high-water mark on last_activity_at, id).
+- Every API worker runs the background worker: a batch is claimed with
+  FOR UPDATE SKIP LOCKED and a lease (claimed_until), so two workers never
+  send the same names to the LLM. A claim whose worker died expires.
+- Writes run in the store's own short-lived sessions: the profile
+  generation session is only read from, never committed or rolled back.
+
+Keys are normalize_name() outputs scoped by locale (analyses are written in
+the prompt language).
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import record_cache
+from app.models import NameAnalysis, QuestionnaireSession, SessionStatus
+from app.services.name_etymology_service import (
+    FIRST_NAME,
+    LAST_NAME,
+    get_name_etymology_service,
+    normalize_name,
+)
+
+logger = logging.getLogger(__name__)
+
+ANTHROPONYMY = "anthroponymy"
+ENERGETIC_WEIGHT = "energetic_weight"
+
+NAME_ANALYSIS_LOCALE = "fr"  # Prompts (and therefore analyses) are in French
+NAME_BATCH_SIZE = int(os.getenv("NAME_ANALYSIS_BATCH_SIZE", "20"))
+NAME_WORKER_POLL_SECONDS = int(os.getenv("NAME_ANALYSIS_POLL_SECONDS", "60"))
+MAX_ATTEMPTS = 3
+# A claimed batch is left alone by other workers for this long (LLM call included)
+NAME_CLAIM_SECONDS = int(os.getenv("NAME_ANALYSIS_CLAIM_SECONDS", "600"))
+# Sessions touched more recently may still be in uncommitted transactions: read them next pass
+DISCOVERY_LAG_SECONDS = 5
+
+STATUS_PENDING = "pending"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+# (kind, name_key) -> analysis
+AnalysisKey = Tuple[str, str]
+
+
+def split_full_name(full_name: str) -> Tuple[str, str]:
+    """First and last name parts ("" last name for a single word)"""
+    parts = (full_name or "").strip().split()
+    if not parts:
+        return "", ""
+    return parts[0], parts[-1] if len(parts) > 1 else ""
+
+
+def pair_key(first_name: str, last_name: str) -> str:
+    """Key of a first/last name pair (anthroponymy)"""
+    return f"{normalize_name(first_name)}|{normalize_name(last_name)}"
+
+
+def energetic_key(first_name: str, last_name: str, numbers: Iterable[int]) -> str:
+    """Key of a pair + the numerology numbers its energetic analysis is based on"""
+    return pair_key(first_name, last_name) + "|" + "-".join(str(n) for n in numbers)
+
+
+def _insert(db: AsyncSession):
+    """Dialect-specific INSERT supporting ON CONFLICT (PostgreSQL in prod, SQLite in tests)"""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite.insert(NameAnalysis)
+    return postgresql.insert(NameAnalysis)
+
+
+class NameAnalysisStore:
+    """Lookup / save / batch-fill of shared name analyses"""
+
+    def __init__(
+        self,
+        etymology_service=None,
+        locale: str = NAME_ANALYSIS_LOCALE,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        self.etymology_service = etymology_service or get_name_etymology_service()
+        self.locale = locale
+        self.session_factory = session_factory
+        # (last_activity_at, id) of the last session read by discover_names
+        self._discovered_until: Optional[Tuple[datetime, str]] = None
+
+    async def lookup(self, db: AsyncSession, keys: Iterable[AnalysisKey]) -> Dict[AnalysisKey, str]:
+        """
+        Ready analyses among `keys`
+
+        Args:
+            db: Async database session
+            keys: (kind, name_key) pairs
+
+        Returns:
+            Analyses found, keyed like `keys`
+        """
+        keys = set(keys)
+        if not keys:
+            return {}
+        result = await db.execute(
+            select(NameAnalysis.kind, NameAnalysis.name_key, NameAnalysis.analysis).where(
+                NameAnalysis.locale == self.locale,
+                NameAnalysis.status == STATUS_READY,
+                NameAnalysis.kind.in_({kind for kind, _ in keys}),
+                NameAnalysis.name_key.in_({name_key for _, name_key in keys}),
+            )
+        )
+        found = {
+            (row.kind, row.name_key): row.analysis
+            for row in result.all()
+            if (row.kind, row.name_key) in keys
+        }
+        record_cache("name_analysis", hit=True, count=len(found))
+        record_cache("name_analysis", hit=False, count=len(keys) - len(found))
+        return found
+
+    async def save(self, rows: List[Tuple[str, str, str, str]]) -> None:
+        """
+        Store ready analyses (overwrites pending/failed rows) in a session of their own
+
+        Args:
+            rows: (kind, name_key, display_name, analysis) tuples
+        """
+        if not rows:
+            return
+        async with self.session_factory() as db:
+            await self._save(db, rows)
+            await db.commit()
+
+    async def _save(self, db: AsyncSession, rows: List[Tuple[str, str, str, str]]) -> None:
+        stmt = _insert(db).values([
+            {
+                "kind": kind,
+                "name_key": name_key,
+                "locale": self.locale,
+                "display_name": display_name,
+                "analysis": analysis,
+                "status": STATUS_READY,
+                "attempts": 0,
+            }
+            for kind, name_key, display_name, analysis in rows
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[NameAnalysis.kind, NameAnalysis.name_key, NameAnalysis.locale],
+            set_={
+                "analysis": stmt.excluded.analysis,
+                "status": stmt.excluded.status,
+                "claimed_until": None,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await db.execute(stmt)
+
+    async def enqueue(self, kind: str, names: Iterable[str]) -> int:
+        """
+        Queue names for the background worker (already known names ignored)
+
+        Returns:
+            Number of names newly queued
+        """
+        async with self.session_factory() as db:
+            queued = await self._enqueue(db, kind, names)
+            await db.commit()
+        return queued
+
+    async def _enqueue(self, db: AsyncSession, kind: str, names: Iterable[str]) -> int:
+        by_key = {normalize_name(n): n.strip() for n in names if normalize_name(n)}
+        if not by_key:
+            return 0
+        existing = await db.execute(
+            select(NameAnalysis.name_key).where(
+                NameAnalysis.kind == kind,
+                NameAnalysis.locale == self.locale,
+                NameAnalysis.name_key.in_(by_key),
+            )
+        )
+        for name_key in existing.scalars():
+            by_key.pop(name_key, None)
+        if not by_key:
+            return 0
+
+        stmt = _insert(db).values([
+            {
+                "kind": kind,
+                "name_key": name_key,
+                "locale": self.locale,
+                "display_name": display_name,
+                "status": STATUS_PENDING,
+                "attempts": 0,
+            }
+            for name_key, display_name in by_key.items()
+        ]).on_conflict_do_nothing()
+        await db.execute(stmt)
+        return len(by_key)
+
+    async def discover_names(self) -> int:
+        """
+        Queue first/last names of questionnaires not analyzed yet (sessions
+        active since the previous call only)
+
+        Returns:
+            Number of names newly queued
+        """
+        horizon = datetime.now(timezone.utc) - timedelta(seconds=DISCOVERY_LAG_SECONDS)
+        sort_key = tuple_(QuestionnaireSession.last_activity_at, QuestionnaireSession.id)
+        predicates = [
+            QuestionnaireSession.last_activity_at <= horizon,
+            QuestionnaireSession.full_name.isnot(None),
+            QuestionnaireSession.status.in_([
+                SessionStatus.STARTED,
+                SessionStatus.IN_PROGRESS,
+                SessionStatus.COMPLETED,
+            ]),
+        ]
+        if self._discovered_until is not None:
+            predicates.append(sort_key > tuple_(*self._discovered_until))
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(QuestionnaireSession.id, QuestionnaireSession.last_activity_at, QuestionnaireSession.full_name)
+                .where(*predicates)
+                .order_by(QuestionnaireSession.last_activity_at, QuestionnaireSession.id)
+            )
+            sessions = result.all()
+            if not sessions:
+                return 0
+
+            pairs = [split_full_name(session.full_name) for session in sessions]
+            queued = await self._enqueue(db, FIRST_NAME, [first for first, _ in pairs if first])
+            queued += await self._enqueue(db, LAST_NAME, [last for _, last in pairs if last])
+            await db.commit()
+        self._discovered_until = (sessions[-1].last_activity_at, sessions[-1].id)
+        return queued
+
+    async def claim_pending(self, kind: str, limit: int = NAME_BATCH_SIZE) -> List[Tuple[str, str]]:
+        """
+        Claim up to `limit` pending names of a kind for one batch (lease committed)
+
+        Rows locked or leased by another worker are skipped.
+
+        Returns:
+            (name_key, display_name) of the claimed names
+        """
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(NameAnalysis.name_key, NameAnalysis.display_name)
+                .where(
+                    NameAnalysis.kind == kind,
+                    NameAnalysis.locale == self.locale,
+                    NameAnalysis.status == STATUS_PENDING,
+                    or_(NameAnalysis.claimed_until.is_(None), NameAnalysis.claimed_until < now),
+                )
+                .order_by(NameAnalysis.created_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            claimed = [(row.name_key, row.display_name) for row in result.all()]
+            if claimed:
+                await db.execute(
+                    update(NameAnalysis)
+                    .where(*self._rows(kind, [name_key for name_key, _ in claimed]))
+                    .values(claimed_until=now + timedelta(seconds=NAME_CLAIM_SECONDS))
+                )
+            await db.commit()
+        return claimed
+
+    def _rows(self, kind: str, name_keys: Iterable[str]):
+        return (
+            NameAnalysis.kind == kind,
+            NameAnalysis.locale == self.locale,
+            NameAnalysis.name_key.in_(list(name_keys)),
+        )
+
+    async def process_pending(self, kind: str, limit: int = NAME_BATCH_SIZE) -> int:
+        """
+        Fill up to `limit` pending names of a kind with one LLM generation
+
+        Names missing from the LLM answer are retried on later passes, then
+        marked failed after MAX_ATTEMPTS (profile generation still analyzes
+        them individually).
+
+        Returns:
+            Number of pending rows processed (0 when the LLM call failed)
+        """
+        pending = await self.claim_pending(kind, limit)
+        if not pending:
+            return 0
+
+        try:
+            analyses = await self.etymology_service.etymology_batch(kind, [display_name for _, display_name in pending])
+        except Exception as e:
+            # LLM unavailable: release the batch for the next pass
+            logger.warning(f"⚠️ Name analysis batch failed ({kind}, {len(pending)} names): {e}")
+            async with self.session_factory() as db:
+                await db.execute(
+                    update(NameAnalysis)
+                    .where(*self._rows(kind, [name_key for name_key, _ in pending]))
+                    .values(claimed_until=None)
+                )
+                await db.commit()
+            return 0
+
+        async with self.session_factory() as db:
+            for name_key, _ in pending:
+                analysis = analyses.get(name_key)
+                if analysis:
+                    values = {"analysis": analysis, "status": STATUS_READY, "claimed_until": None}
+                else:
+                    values = {
+                        "attempts": NameAnalysis.attempts + 1,
+                        "status": case(
+                            (NameAnalysis.attempts + 1 >= MAX_ATTEMPTS, STATUS_FAILED),
+                            else_=STATUS_PENDING,
+                        ),
+                        "claimed_until": None,
+                    }
+                await db.execute(
+                    update(NameAnalysis)
+                    .where(*self._rows(kind, [name_key]), NameAnalysis.status == STATUS_PENDING)
+                    .values(**values)
+                )
+            await db.commit()
+
+        logger.info(f"📚 Name analyses batch ({kind}): {len(analyses)}/{len(pending)} names analyzed")
+        return len(pending)
+
+
+async def run_name_analysis_worker(
+    store: Optional[NameAnalysisStore] = None,
+    interval: int = NAME_WORKER_POLL_SECONDS,
+) -> None:
+    """
+    Background task: queue names of ongoing questionnaires and fill them in batches
+
+    Args:
+        store: Name analysis store (singleton by default)
+        interval: Poll interval in seconds
+    """
+    store = store or get_name_analysis_store()
+
+    while True:
+        try:
+            await store.discover_names()
+            for kind in (FIRST_NAME, LAST_NAME):
+                while await store.process_pending(kind) == NAME_BATCH_SIZE:
+                    pass
+        except Exception as e:
+            logger.warning(f"Name analysis worker failed: {e}")
+        await asyncio.sleep(interval)
+
+
+# Singleton instance
+_name_analysis_store: Optional[NameAnalysisStore] = None
+
+
+def get_name_analysis_store() -> NameAnalysisStore:
+    """Get or create Name Analysis store singleton"""
+    global _name_analysis_store
+    if _name_analysis_store is None:
+        _name_analysis_store = NameAnalysisStore()
+    return _name_analysis_store
@@ -4,13 +4,90 @@ Shinkofa Platform - Shizen AI
 
 Generates etymological analysis for first names and last names using LLM
 Provides origin, meaning, historical context, and cultural significance
+
+Analyses are shared across users through NameAnalysisStore
+(name_analysis_store.py): etymology_batch() analyzes many names in a single
+LLM generation for the background worker.
 """
+import json
 import logging
-from typing import Dict, Optional
+import re
+import unicodedata
+from typing import Dict, List, Optional
 from app.services.hybrid_llm_service import HybridLLMService
 
 logger = logging.getLogger(__name__)
 
+FIRST_NAME = "first_name"
+LAST_NAME = "last_name"
+
+ETYMOLOGY_SYSTEM_PROMPTS = {
+    FIRST_NAME: """Tu es un expert en étymologie et onomastique (étude des noms propres).
+Ton rôle est de fournir une analyse étymologique détaillée et précise des prénoms.
+
+INSTRUCTIONS:
+- Indique l'origine linguistique (hébreu, grec, latin, germanique, arabe, etc.)
+- Explique la signification originelle
+- Mentionne le contexte historique ou culturel si pertinent
+- Sois précis et concis (2-3 phrases maximum)
+- Ton ton est informatif mais accessible
+- Si le prénom a plusieurs origines possibles, mentionne la plus courante
+- NE mentionne PAS de numérologie ou vibrations - UNIQUEMENT l'étymologie historique""",
+    LAST_NAME: """Tu es un expert en étymologie et onomastique, spécialisé dans les noms de famille.
+Ton rôle est de fournir une analyse étymologique détaillée et précise des noms de famille.
+
+INSTRUCTIONS:
+- Indique la catégorie du nom : toponymique (lieu), patronymique (père), métier, sobriquet (surnom), etc.
+- Explique l'origine et la signification
+- Mentionne la région géographique d'origine si pertinent
+- Sois précis et concis (2-3 phrases maximum)
+- Ton ton est informatif mais accessible
+- NE mentionne PAS de numérologie ou vibrations - UNIQUEMENT l'étymologie historique""",
+}
+
+ETYMOLOGY_USER_PROMPTS = {
+    FIRST_NAME: """Analyse étymologique du prénom : {name}
+
+Fournis une analyse étymologique complète incluant :
+1. Origine linguistique (langue d'origine)
+2. Signification originelle
+3. Contexte historique ou culturel bref
+
+Format: 2-3 phrases maximum, style informatif.""",
+    LAST_NAME: """Analyse étymologique du nom de famille : {name}
+
+Fournis une analyse étymologique complète incluant :
+1. Catégorie du nom (toponymique, patronymique, métier, sobriquet)
+2. Origine et signification
+3. Contexte géographique ou historique bref
+
+Format: 2-3 phrases maximum, style informatif.""",
+}
+
+ETYMOLOGY_BATCH_PROMPT = """Analyse étymologique de chacun des {label} suivants :
+{names}
+
+Pour chacun, 2-3 phrases maximum, style informatif (même contenu que pour une analyse individuelle).
+
+Réponds UNIQUEMENT avec un objet JSON associant chaque nom, écrit exactement comme ci-dessus, à son analyse :
+{{"Nom": "Analyse...", ...}}"""
+
+
+def normalize_name(name: str) -> str:
+    """Store key of a name: Unicode-normalized, trimmed, single spaces, case-folded (accents kept)"""
+    return " ".join(unicodedata.normalize("NFKC", name or "").split()).casefold()
+
+
+def _parse_json_object(response: str) -> Dict:
+    """First JSON object of an LLM response (markdown fences tolerated)"""
+    match = re.search(r"\{.*\}", response, re.DOTALL)
+    if not match:
+        raise ValueError("No JSON object in LLM response")
+    result = json.loads(re.sub(r",\s*}", "}", match.group(0)))
+    if not isinstance(result, dict):
+        raise ValueError("LLM response is not a JSON object")
+    return result
+
 
 class NameEtymologyService:
     """
@@ -24,6 +101,53 @@ class NameEtymologyService:
         self.llm = HybridLLMService()
         logger.info("📚 Name Etymology Service initialized")
 
+    async def etymology(self, kind: str, name: str) -> str:
+        """
+        Etymology of one name part (raises on LLM failure, no fallback text)
+
+        Args:
+            kind: FIRST_NAME or LAST_NAME
+            name: Name as written by the user
+
+        Returns:
+            Analysis (2-3 sentences)
+        """
+        analysis = await self.llm.generate(
+            prompt=ETYMOLOGY_USER_PROMPTS[kind].format(name=name),
+            system=ETYMOLOGY_SYSTEM_PROMPTS[kind],
+            temperature=0.3,  # Low temperature for factual accuracy
+            max_tokens=300,
+        )
+        return analysis.strip()
+
+    async def etymology_batch(self, kind: str, names: List[str]) -> Dict[str, str]:
+        """
+        Etymology of many name parts in a single LLM generation
+
+        Args:
+            kind: FIRST_NAME or LAST_NAME
+            names: Names as written by users (distinct)
+
+        Returns:
+            Analyses keyed by normalize_name(); names the LLM skipped are absent
+
+        Raises:
+            Exception: LLM failure or unparseable response
+        """
+        label = "prénoms" if kind == FIRST_NAME else "noms de famille"
+        response = await self.llm.generate(
+            prompt=ETYMOLOGY_BATCH_PROMPT.format(label=label, names="\n".join(f"- {n}" for n in names)),
+            system=ETYMOLOGY_SYSTEM_PROMPTS[kind],
+            temperature=0.3,
+            max_tokens=200 * len(names) + 100,
+        )
+        wanted = {normalize_name(n) for n in names}
+        return {
+            normalize_name(name): str(analysis).strip()
+            for name, analysis in _parse_json_object(response).items()
+            if normalize_name(name) in wanted and str(analysis).strip()
+        }
+
     async def analyze_first_name(self, first_name: str) -> str:
         """
         Generate etymological analysis for a first name
@@ -40,36 +164,9 @@ class NameEtymologyService:
             "Marie vient de l'hébreu Myriam (מרים), signifiant 'celle qui élève'..."
         """
         try:
-            system_prompt = """Tu es un expert en étymologie et onomastique (étude des noms propres).
-Ton rôle est de fournir une analyse étymologique détaillée et précise des prénoms.
-
-INSTRUCTIONS:
-- Indique l'origine linguistique (hébreu, grec, latin, germanique, arabe, etc.)
-- Explique la signification originelle
-- Mentionne le contexte historique ou culturel si pertinent
-- Sois précis et concis (2-3 phrases maximum)
-- Ton ton est informatif mais accessible
-- Si le prénom a plusieurs origines possibles, mentionne la plus courante
-- NE mentionne PAS de numérologie ou vibrations - UNIQUEMENT l'étymologie historique"""
-
-            user_prompt = f"""Analyse étymologique du prénom : {first_name}
-
-Fournis une analyse étymologique complète incluant :
-1. Origine linguistique (langue d'origine)
-2. Signification originelle
-3. Contexte historique ou culturel bref
-
-Format: 2-3 phrases maximum, style informatif."""
-
-            analysis = await self.llm.generate(
-                prompt=user_prompt,
-                system=system_prompt,
-                temperature=0.3,  # Low temperature for factual accuracy
-                max_tokens=300,
-            )
-
+            analysis = await self.etymology(FIRST_NAME, first_name)
             logger.info(f"✅ Etymology analysis generated for first name: {first_name}")
-            return analysis.strip()
+            return analysis
 
         except Exception as e:
             logger.error(f"❌ Etymology analysis failed for '{first_name}': {e}")
@@ -92,35 +189,9 @@ Format: 2-3 phrases maximum, style informatif."""
             "Dupont est un nom d'origine toponymique française signifiant 'du pont'..."
         """
         try:
-            system_prompt = """Tu es un expert en étymologie et onomastique, spécialisé dans les noms de famille.
-Ton rôle est de fournir une analyse étymologique détaillée et précise des noms de famille.
-
-INSTRUCTIONS:
-- Indique la catégorie du nom : toponymique (lieu), patronymique (père), métier, sobriquet (surnom), etc.
-- Explique l'origine et la signification
-- Mentionne la région géographique d'origine si pertinent
-- Sois précis et concis (2-3 phrases maximum)
-- Ton ton est informatif mais accessible
-- NE mentionne PAS de numérologie ou vibrations - UNIQUEMENT l'étymologie historique"""
-
-            user_prompt = f"""Analyse étymologique du nom de famille : {last_name}
-
-Fournis une analyse étymologique complète incluant :
-1. Catégorie du nom (toponymique, patronymique, métier, sobriquet)
-2. Origine et signification
-3. Contexte géographique ou historique bref
-
-Format: 2-3 phrases maximum, style informatif."""
-
-            analysis = await self.llm.generate(
-                prompt=user_prompt,
-                system=system_prompt,
-                temperature=0.3,  # Low temperature for factual accuracy
-                max_tokens=300,
-            )
-
+            analysis = await self.etymology(LAST_NAME, last_name)
             logger.info(f"✅ Etymology analysis generated for last name: {last_name}")
-            return analysis.strip()
+            return analysis
 
         except Exception as e:
             logger.error(f"❌ Etymology analysis failed for '{last_name}': {e}")
@@ -7,17 +7,44 @@ Provides comprehensive name analysis across 3 dimensions:
 2. Anthroponymy (cultural patterns, social symbolism, archetypes)
 3. Energetic Weight (vibrational analysis, phonetic resonance, harmony)
 
-Integrates NameEtymologyService + LLM-powered cultural and energetic analysis
+Integrates NameEtymologyService + LLM-powered cultural and energetic analysis.
+Results are shared across users through NameAnalysisStore.
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import asyncio
 
-from app.services.name_etymology_service import get_name_etymology_service
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.name_etymology_service import FIRST_NAME, LAST_NAME, get_name_etymology_service, normalize_name
+from app.services.name_analysis_store import (
+    ANTHROPONYMY,
+    ENERGETIC_WEIGHT,
+    energetic_key,
+    get_name_analysis_store,
+    pair_key,
+)
 from app.services.hybrid_llm_service import HybridLLMService
 
 logger = logging.getLogger(__name__)
 
+NUMEROLOGY_KEYS = ("expression", "active", "hereditary", "soul_urge", "personality")
+
+
+def numerology_numbers(numerology_data: Dict[str, Any]) -> Tuple[int, ...]:
+    """Expression, active, hereditary, soul urge and personality numbers (dict or int format)"""
+    numbers = []
+    for key in NUMEROLOGY_KEYS:
+        val = numerology_data.get(key, 0)
+        if isinstance(val, dict):
+            numbers.append(val.get("number", 0))
+        elif isinstance(val, (int, float)):
+            numbers.append(int(val))
+        else:
+            numbers.append(0)
+    return tuple(numbers)
+
 
 class NameHolisticAnalysisService:
     """
@@ -55,7 +82,18 @@ class NameHolisticAnalysisService:
             Detailed anthroponymic analysis (4-6 sentences)
         """
         try:
-            system_prompt = """Tu es un expert en anthroponomie (étude scientifique des noms propres).
+            analysis = await self._generate_anthroponymy(first_name, last_name)
+            logger.info(f"✅ Anthroponymic analysis generated for: {first_name} {last_name}")
+            return analysis
+
+        except Exception as e:
+            logger.error(f"❌ Anthroponymic analysis failed for '{first_name} {last_name}': {e}")
+            # Fallback
+            return f"L'analyse anthroponymique de '{first_name} {last_name}' n'est pas disponible pour le moment."
+
+    async def _generate_anthroponymy(self, first_name: str, last_name: str) -> str:
+        """Anthroponymic analysis LLM call (raises on failure)"""
+        system_prompt = """Tu es un expert en anthroponomie (étude scientifique des noms propres).
 Ton rôle est d'analyser la dimension culturelle, sociale et symbolique des noms.
 
 INSTRUCTIONS:
@@ -67,7 +105,7 @@ INSTRUCTIONS:
 - Fournis 4 à 6 phrases détaillées selon la richesse du nom
 - Ton ton est analytique, érudit mais accessible"""
 
-            user_prompt = f"""Analyse anthroponymique complète de : {first_name} {last_name}
+        user_prompt = f"""Analyse anthroponymique complète de : {first_name} {last_name}
 
 Fournis une analyse détaillée incluant :
 1. Patterns culturels et construction identitaire associée au nom
@@ -78,20 +116,13 @@ Fournis une analyse détaillée incluant :
 
 Format: 4 à 6 phrases riches et détaillées."""
 
-            analysis = await self.llm.generate(
-                prompt=user_prompt,
-                system=system_prompt,
-                temperature=0.4,  # Factual but allows cultural interpretation
-                max_tokens=500,
-            )
-
-            logger.info(f"✅ Anthroponymic analysis generated for: {first_name} {last_name}")
-            return analysis.strip()
-
-        except Exception as e:
-            logger.error(f"❌ Anthroponymic analysis failed for '{first_name} {last_name}': {e}")
-            # Fallback
-            return f"L'analyse anthroponymique de '{first_name} {last_name}' n'est pas disponible pour le moment."
+        analysis = await self.llm.generate(
+            prompt=user_prompt,
+            system=system_prompt,
+            temperature=0.4,  # Factual but allows cultural interpretation
+            max_tokens=500,
+        )
+        return analysis.strip()
 
     async def analyze_energetic_weight(
         self,
@@ -122,23 +153,20 @@ Format: 4 à 6 phrases riches et détaillées."""
             Detailed energetic weight analysis (4-6 sentences)
         """
         try:
-            # Extract numerology data - handle both dict format and direct int format
-            def get_num(data: Dict, key: str) -> int:
-                """Extract number from numerology data, handling both formats"""
-                val = data.get(key, 0)
-                if isinstance(val, dict):
-                    return val.get("number", 0)
-                elif isinstance(val, (int, float)):
-                    return int(val)
-                return 0
-
-            expression_num = get_num(numerology_data, "expression")
-            active_num = get_num(numerology_data, "active")
-            hereditary_num = get_num(numerology_data, "hereditary")
-            soul_urge_num = get_num(numerology_data, "soul_urge")
-            personality_num = get_num(numerology_data, "personality")
-
-            system_prompt = """Tu es un expert en analyse vibratoire des noms (numérologie et phonétique énergétique).
+            analysis = await self._generate_energetic_weight(first_name, last_name, numerology_data)
+            logger.info(f"✅ Energetic weight analysis generated for: {first_name} {last_name}")
+            return analysis
+
+        except Exception as e:
+            logger.error(f"❌ Energetic weight analysis failed for '{first_name} {last_name}': {e}")
+            # Fallback
+            return f"L'analyse du poids énergétique de '{first_name} {last_name}' n'est pas disponible pour le moment."
+
+    async def _generate_energetic_weight(self, first_name: str, last_name: str, numerology_data: Dict[str, Any]) -> str:
+        """Energetic weight analysis LLM call (raises on failure)"""
+        expression_num, active_num, hereditary_num, soul_urge_num, personality_num = numerology_numbers(numerology_data)
+
+        system_prompt = """Tu es un expert en analyse vibratoire des noms (numérologie et phonétique énergétique).
 Ton rôle est d'expliquer l'énergie, la vibration et la résonance d'un nom.
 
 INSTRUCTIONS:
@@ -150,7 +178,7 @@ INSTRUCTIONS:
 - Fournis 4 à 6 phrases évocatrices et détaillées
 - Utilise un langage énergétique mais accessible, poétique mais précis"""
 
-            user_prompt = f"""Analyse vibratoire complète de : {first_name} {last_name}
+        user_prompt = f"""Analyse vibratoire complète de : {first_name} {last_name}
 
 Données numérologie:
 - Nombre d'Expression (nom complet): {expression_num}
@@ -168,26 +196,20 @@ Fournis une analyse détaillée incluant:
 
 Format: 4 à 6 phrases riches, évocatrices et précises."""
 
-            analysis = await self.llm.generate(
-                prompt=user_prompt,
-                system=system_prompt,
-                temperature=0.6,  # More creative for energetic interpretation
-                max_tokens=500,
-            )
-
-            logger.info(f"✅ Energetic weight analysis generated for: {first_name} {last_name}")
-            return analysis.strip()
-
-        except Exception as e:
-            logger.error(f"❌ Energetic weight analysis failed for '{first_name} {last_name}': {e}")
-            # Fallback
-            return f"L'analyse du poids énergétique de '{first_name} {last_name}' n'est pas disponible pour le moment."
+        analysis = await self.llm.generate(
+            prompt=user_prompt,
+            system=system_prompt,
+            temperature=0.6,  # More creative for energetic interpretation
+            max_tokens=500,
+        )
+        return analysis.strip()
 
     async def analyze_full_name_holistic(
         self,
         first_name: str,
         last_name: str,
         numerology_data: Dict[str, Any],
+        db: Optional[AsyncSession] = None,
     ) -> Dict[str, Any]:
         """
         Generate complete holistic name analysis
@@ -201,6 +223,8 @@ Format: 4 à 6 phrases riches, évocatrices et précises."""
             first_name: The first name to analyze
             last_name: The last name to analyze
             numerology_data: Numerology data for energetic analysis
+            db: Database session; when given, analyses are read from / saved to
+                the shared name analysis store (LLM only for unseen names)
 
         Returns:
             Dictionary containing:
@@ -216,6 +240,9 @@ Format: 4 à 6 phrases riches, évocatrices et précises."""
         try:
             logger.info(f"🌟 Starting holistic name analysis for: {first_name} {last_name}")
 
+            if db is not None:
+                return await self._analyze_with_store(first_name, last_name, numerology_data, db)
+
             # Run all analyses in parallel for performance
             etymology_task = self.etymology_service.analyze_full_name(first_name, last_name)
             anthroponymy_task = self.analyze_anthroponymy(first_name, last_name)
@@ -268,6 +295,73 @@ Format: 4 à 6 phrases riches, évocatrices et précises."""
                 "energetic_weight": f"Analyse du poids énergétique non disponible.",
             }
 
+    async def _analyze_with_store(
+        self,
+        first_name: str,
+        last_name: str,
+        numerology_data: Dict[str, Any],
+        db: AsyncSession,
+    ) -> Dict[str, Any]:
+        """Holistic analysis reusing shared analyses; the LLM only sees names never analyzed"""
+        store = get_name_analysis_store()
+        full_name = f"{first_name} {last_name}".strip()
+        first_key = (FIRST_NAME, normalize_name(first_name))
+        last_key = (LAST_NAME, normalize_name(last_name))
+        anthroponymy_key = (ANTHROPONYMY, pair_key(first_name, last_name))
+        energetic_weight_key = (ENERGETIC_WEIGHT, energetic_key(first_name, last_name, numerology_numbers(numerology_data)))
+
+        # key -> (display name, LLM call, fallback text)
+        wanted = {
+            first_key: (
+                first_name,
+                lambda: self.etymology_service.etymology(FIRST_NAME, first_name),
+                f"Prénom '{first_name}' - Analyse étymologique non disponible pour le moment.",
+            ),
+            anthroponymy_key: (
+                full_name,
+                lambda: self._generate_anthroponymy(first_name, last_name),
+                f"L'analyse anthroponymique de '{full_name}' n'est pas disponible pour le moment.",
+            ),
+            energetic_weight_key: (
+                full_name,
+                lambda: self._generate_energetic_weight(first_name, last_name, numerology_data),
+                f"L'analyse du poids énergétique de '{full_name}' n'est pas disponible pour le moment.",
+            ),
+        }
+        if last_name:
+            wanted[last_key] = (
+                last_name,
+                lambda: self.etymology_service.etymology(LAST_NAME, last_name),
+                f"Nom '{last_name}' - Analyse étymologique non disponible pour le moment.",
+            )
+
+        analyses = await store.lookup(db, wanted)
+        missing = [key for key in wanted if key not in analyses]
+        if missing:
+            results = await asyncio.gather(*(wanted[key][1]() for key in missing), return_exceptions=True)
+            fresh = []
+            for key, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    logger.error(f"❌ Name analysis failed ({key[0]}) for '{full_name}': {result}")
+                    analyses[key] = wanted[key][2]  # Fallback, not stored
+                    continue
+                analyses[key] = result
+                fresh.append((key[0], key[1], wanted[key][0], result))
+            try:
+                await store.save(fresh)  # own session: the profile transaction is left untouched
+            except SQLAlchemyError as e:
+                logger.warning(f"⚠️ Name analyses not stored for '{full_name}': {e}")
+
+        logger.info(f"✅ Holistic name analysis for {full_name}: {len(wanted) - len(missing)} reused, {len(missing)} generated")
+        return {
+            "etymology": {
+                "first_name": analyses[first_key],
+                "last_name": analyses.get(last_key, ""),
+            },
+            "anthroponymy": analyses[anthroponymy_key],
+            "energetic_weight": analyses[energetic_weight_key],
+        }
+
 
 # Singleton instance
 _name_holistic_analysis_service: Optional[NameHolisticAnalysisService] = None
@@ -86,6 +86,9 @@ class NumerologyService:
     All Master Numbers (11, 22, 33) are ALWAYS preserved and displayed as 11/2, 22/4, 33/6.
     """
 
+    # Bump when chart output changes (invalidates chart_cache entries)
+    CALCULATOR_VERSION = 1
+
     # Letter to number mapping (Pythagorean system)
     LETTER_VALUES = {
         'A': 1, 'J': 1, 'S': 1,
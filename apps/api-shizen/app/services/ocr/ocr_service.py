@@ -1,26 +1,77 @@
 """
 OCR Service - Extract text from PDF and images using Tesseract
 Shinkofa Platform - Shizen-Planner Service
+
+PDFs are streamed page by page: each page is rendered alone (first_page =
+last_page), at a DPI chosen from a cheap low-resolution probe of its ink
+density, and sent to the "ocr_pages" process pool. At most OCR_PAGES_IN_FLIGHT
+rendered pages exist at any time, and page texts are delivered in order as
+soon as they are ready (on_page callback / iter_pages generator).
 """
 
+import io
 import os
 import tempfile
+from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Callable, Deque, Dict, Any, Iterator, List, Optional, Tuple
 import logging
 
 try:
     import pytesseract
     from PIL import Image
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
 except ImportError as e:
     logging.error(f"OCR dependencies not installed: {e}")
     pytesseract = None
     Image = None
     convert_from_path = None
+    pdfinfo_from_path = None
+
+from app.core.executors import WorkloadPool, get_pool
 
 logger = logging.getLogger(__name__)
 
+# Adaptive DPI: dense pages (small print) get MAX_DPI, sparse ones MIN_DPI
+PROBE_DPI = 36
+MIN_DPI = 200
+MAX_DPI = 300
+DENSE_INK_RATIO = 0.08   # share of dark pixels in the probe above which a page is "dense"
+SPARSE_INK_RATIO = 0.02
+
+# Rendered pages waiting for / inside tesseract (bounds memory)
+OCR_PAGES_IN_FLIGHT = int(os.getenv("OCR_PAGES_IN_FLIGHT", "4"))
+
+PageCallback = Callable[[int, str], None]
+
+
+def choose_dpi(probe: "Image.Image") -> int:
+    """
+    Rendering DPI for a page from its low-resolution probe
+
+    Args:
+        probe: Page rendered at PROBE_DPI
+
+    Returns:
+        DPI between MIN_DPI and MAX_DPI (linear in ink density)
+    """
+    histogram = probe.convert("L").histogram()
+    total = sum(histogram) or 1
+    ink = sum(histogram[:128]) / total
+
+    if ink <= SPARSE_INK_RATIO:
+        return MIN_DPI
+    if ink >= DENSE_INK_RATIO:
+        return MAX_DPI
+    ratio = (ink - SPARSE_INK_RATIO) / (DENSE_INK_RATIO - SPARSE_INK_RATIO)
+    return int(round((MIN_DPI + ratio * (MAX_DPI - MIN_DPI)) / 10) * 10)
+
+
+def ocr_page(image: "Image.Image", language: str) -> str:
+    """Run tesseract on one page (top-level so it can run in a worker process)"""
+    return pytesseract.image_to_string(image, lang=language).strip()
+
 
 class OCRService:
     """
@@ -48,12 +99,13 @@ class OCRService:
                 "Please install: pip install pytesseract pdf2image Pillow"
             )
 
-    def extract_text_from_file(self, file_path: str) -> Dict[str, Any]:
+    def extract_text_from_file(self, file_path: str, on_page: Optional[PageCallback] = None) -> Dict[str, Any]:
         """
         Extract text from a file (PDF or image)
 
         Args:
             file_path: Path to the file
+            on_page: Called with (page_number, text) as each page is ready, in page order
 
         Returns:
             Dict with extracted text and metadata:
@@ -79,52 +131,142 @@ class OCRService:
 
         try:
             if path.suffix.lower() == '.pdf':
-                return self._process_pdf(file_path)
+                return self._process_pdf(file_path, on_page)
             else:
-                return self._process_image(file_path)
+                return self._process_image(Image.open(file_path), on_page)
+
+        except Exception as e:
+            logger.error(f"OCR extraction failed: {e}", exc_info=True)
+            return self._error_response(str(e))
+
+    def extract_text_from_bytes(
+        self,
+        content: bytes,
+        filename: str,
+        on_page: Optional[PageCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Extract text from uploaded bytes
+
+        Images are decoded in memory (no temp file). PDFs are written to one
+        temp file, removed afterwards, since poppler renders pages from a path.
+
+        Args:
+            content: File bytes
+            filename: Original filename (its extension selects the format)
+            on_page: Called with (page_number, text) as each page is ready
+
+        Returns:
+            Same dict as extract_text_from_file
+        """
+        suffix = Path(filename or "").suffix.lower()
+        if suffix not in self.SUPPORTED_FORMATS:
+            return self._error_response(
+                f"Unsupported file format: {suffix}. "
+                f"Supported: {', '.join(self.SUPPORTED_FORMATS)}"
+            )
+
+        try:
+            if suffix != '.pdf':
+                return self._process_image(Image.open(io.BytesIO(content)), on_page)
+
+            with tempfile.NamedTemporaryFile(suffix='.pdf', prefix='shinkofa_ocr_') as pdf_file:
+                pdf_file.write(content)
+                pdf_file.flush()
+                return self._process_pdf(pdf_file.name, on_page)
 
         except Exception as e:
             logger.error(f"OCR extraction failed: {e}", exc_info=True)
             return self._error_response(str(e))
 
-    def _process_pdf(self, pdf_path: str) -> Dict[str, Any]:
+    def iter_pages(self, pdf_path: str) -> Iterator[Tuple[int, str]]:
+        """
+        Stream (page_number, text) for a PDF, in page order
+
+        One page is rendered at a time; tesseract runs in the "ocr_pages"
+        process pool on up to OCR_PAGES_IN_FLIGHT pages concurrently.
         """
-        Convert PDF to images and extract text from each page
+        num_pages = pdfinfo_from_path(pdf_path)["Pages"]
+        pool = get_pool("ocr_pages")
+        in_flight: Deque[Tuple[int, Future]] = deque()
+
+        try:
+            for page_number in range(1, num_pages + 1):
+                image = self._render_page(pdf_path, page_number)
+                in_flight.append((page_number, self._submit(pool, image)))
+                del image
+
+                while len(in_flight) >= OCR_PAGES_IN_FLIGHT:
+                    yield self._collect(in_flight.popleft(), num_pages)
+
+            while in_flight:
+                yield self._collect(in_flight.popleft(), num_pages)
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+    def _submit(self, pool: WorkloadPool, image: "Image.Image") -> Future:
+        """OCR a page in the process pool (inline when the pool has a single worker)"""
+        if pool.config.max_workers > 1:
+            return pool.executor.submit(ocr_page, image, self.language)
+        future: Future = Future()
+        future.set_result(ocr_page(image, self.language))
+        return future
+
+    def _render_page(self, pdf_path: str, page_number: int) -> "Image.Image":
+        """Render a single page at the DPI its probe calls for"""
+        probe = convert_from_path(
+            pdf_path, dpi=PROBE_DPI, first_page=page_number, last_page=page_number, grayscale=True
+        )[0]
+        dpi = choose_dpi(probe)
+        logger.info(f"Rendering page {page_number} at {dpi} dpi")
+        return convert_from_path(
+            pdf_path, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=True
+        )[0]
+
+    @staticmethod
+    def _collect(entry: Tuple[int, Future], num_pages: int) -> Tuple[int, str]:
+        page_number, future = entry
+        text = future.result()
+        logger.info(f"Processed page {page_number}/{num_pages}")
+        return page_number, text
+
+    def _process_pdf(self, pdf_path: str, on_page: Optional[PageCallback] = None) -> Dict[str, Any]:
+        """
+        Stream PDF pages through OCR (see iter_pages)
         """
         logger.info(f"Processing PDF: {pdf_path}")
 
-        # Convert PDF to images
-        images = convert_from_path(pdf_path, dpi=300)
-
         pages_text = []
-        for i, image in enumerate(images):
-            logger.info(f"Processing page {i+1}/{len(images)}")
-            text = pytesseract.image_to_string(image, lang=self.language)
-            pages_text.append(text.strip())
+        for page_number, text in self.iter_pages(pdf_path):
+            pages_text.append(text)
+            if on_page:
+                on_page(page_number, text)
 
         full_text = "\n\n".join(pages_text)
 
         return {
             "text": full_text,
             "pages": pages_text,
-            "num_pages": len(images),
+            "num_pages": len(pages_text),
             "file_type": "pdf",
             "success": True,
             "error": None
         }
 
-    def _process_image(self, image_path: str) -> Dict[str, Any]:
+    def _process_image(self, image: "Image.Image", on_page: Optional[PageCallback] = None) -> Dict[str, Any]:
         """
         Extract text from a single image
         """
-        logger.info(f"Processing image: {image_path}")
+        logger.info(f"Processing image ({image.width}x{image.height})")
 
-        image = Image.open(image_path)
-        text = pytesseract.image_to_string(image, lang=self.language)
+        text = ocr_page(image, self.language)
+        if on_page:
+            on_page(1, text)
 
         return {
-            "text": text.strip(),
-            "pages": [text.strip()],
+            "text": text,
+            "pages": [text],
             "num_pages": 1,
             "file_type": "image",
             "success": True,
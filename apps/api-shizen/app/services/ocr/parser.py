@@ -36,6 +36,8 @@ class OCRTextParser:
             r'(?:Choix|Choice)\s*[:\-]\s*(.+?)(?=\n|$)',
         ]
 
+        self.reset()
+
     def parse_document(self, text: str) -> Dict[str, Any]:
         """
         Parse OCR text to extract questions and answers
@@ -62,17 +64,42 @@ class OCRTextParser:
         """
         logger.info("Starting OCR text parsing")
 
-        # Clean text
-        text = self._clean_text(text)
+        self.reset()
+        self.feed(text)
+        return self.finish()
 
-        # Split into lines for processing
-        lines = text.split('\n')
+    # ------------------------------------------------------------------
+    # Streaming (page by page, as OCR delivers text)
+    # ------------------------------------------------------------------
 
-        # Extract questions and answers
-        parsed_data = self._extract_qa_pairs(lines)
+    def reset(self) -> None:
+        """Start a new document"""
+        self._state = {"qa_pairs": [], "question": None, "answer": None}
+        self._texts: List[str] = []
 
-        # Extract structured sections (if any)
-        sections = self._extract_sections(text)
+    def feed(self, text: str) -> None:
+        """
+        Parse the next chunk of a document (e.g., one OCR page)
+
+        Chunks must end on line boundaries; feeding pages one by one gives the
+        same result as parse_document() on the pages joined by blank lines.
+        """
+        text = self._clean_text(text)
+        self._texts.append(text)
+        for line in text.split('\n'):
+            self._consume_line(self._state, line)
+
+    def feed_page(self, page_number: int, text: str) -> None:
+        """OCRService on_page callback"""
+        self.feed(text)
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Close the document and build the result (same structure as parse_document)
+        """
+        parsed_data = self._close_pair(self._state)
+        # Sections can span pages: run on the whole (cleaned) text
+        sections = self._extract_sections("\n\n".join(self._texts))
 
         result = {
             "questions_found": len([d for d in parsed_data if d.get('question_text')]),
@@ -85,98 +112,94 @@ class OCRTextParser:
         logger.info(f"Parsing complete: {result['questions_found']} questions, "
                    f"{result['answers_found']} answers")
 
+        self.reset()
         return result
 
     def _clean_text(self, text: str) -> str:
         """
         Clean and normalize OCR text
         """
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-
         # Normalize line breaks
         text = text.replace('\r\n', '\n').replace('\r', '\n')
 
+        # Remove extra whitespace (line breaks are kept: Q&A parsing is line-based)
+        text = re.sub(r'[^\S\n]+', ' ', text)
+        text = re.sub(r' ?\n ?', '\n', text)
+
         # Remove multiple consecutive newlines
         text = re.sub(r'\n{3,}', '\n\n', text)
 
         return text.strip()
 
-    def _extract_qa_pairs(self, lines: List[str]) -> List[Dict[str, Any]]:
-        """
-        Extract question-answer pairs from text lines
-        """
-        qa_pairs = []
-        current_question = None
-        current_answer = None
-
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-
-            # Try to match question patterns
-            question_match = None
-            for pattern in self.question_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    question_match = match
-                    break
-
-            if question_match:
-                # Save previous Q&A pair if exists
-                if current_question:
-                    qa_pairs.append({
-                        "question_number": current_question.get('number'),
-                        "question_text": current_question.get('text'),
-                        "answer": current_answer,
-                        "confidence": self._assess_confidence(current_question, current_answer)
-                    })
-
-                # Start new question
-                groups = question_match.groups()
-                if len(groups) >= 2:
-                    current_question = {
-                        'number': groups[0] if groups[0].isdigit() else None,
-                        'text': groups[1].strip()
-                    }
-                else:
-                    current_question = {
-                        'number': None,
-                        'text': groups[0].strip() if groups else line
-                    }
-                current_answer = None
-                continue
-
-            # Try to match answer patterns
-            answer_match = None
-            for pattern in self.answer_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    answer_match = match
-                    break
-
-            if answer_match:
-                current_answer = answer_match.group(1).strip()
-                continue
-
-            # If we have a current question but no explicit answer marker,
-            # the next line might be the answer
-            if current_question and not current_answer:
-                # Simple heuristic: if line is short and looks like an answer
-                if len(line) < 200 and not any(p in line.lower() for p in ['question', 'bloc', 'module']):
-                    current_answer = line
-
-        # Don't forget last Q&A pair
-        if current_question:
-            qa_pairs.append({
-                "question_number": current_question.get('number'),
-                "question_text": current_question.get('text'),
-                "answer": current_answer,
-                "confidence": self._assess_confidence(current_question, current_answer)
-            })
+    def _consume_line(self, state: Dict[str, Any], line: str) -> None:
+        """
+        Advance the Q&A state machine by one line
 
-        return qa_pairs
+        state: {"qa_pairs": [...], "question": current question, "answer": current answer}
+        """
+        line = line.strip()
+        if not line:
+            return
+
+        # Try to match question patterns
+        question_match = None
+        for pattern in self.question_patterns:
+            match = re.search(pattern, line, re.IGNORECASE)
+            if match:
+                question_match = match
+                break
+
+        if question_match:
+            # Save previous Q&A pair if exists
+            self._close_pair(state)
+
+            # Start new question
+            groups = question_match.groups()
+            if len(groups) >= 2:
+                state["question"] = {
+                    'number': groups[0] if groups[0].isdigit() else None,
+                    'text': groups[1].strip()
+                }
+            else:
+                state["question"] = {
+                    'number': None,
+                    'text': groups[0].strip() if groups else line
+                }
+            state["answer"] = None
+            return
+
+        # Try to match answer patterns
+        answer_match = None
+        for pattern in self.answer_patterns:
+            match = re.search(pattern, line, re.IGNORECASE)
+            if match:
+                answer_match = match
+                break
+
+        if answer_match:
+            state["answer"] = answer_match.group(1).strip()
+            return
+
+        # If we have a current question but no explicit answer marker,
+        # the next line might be the answer
+        if state["question"] and not state["answer"]:
+            # Simple heuristic: if line is short and looks like an answer
+            if len(line) < 200 and not any(p in line.lower() for p in ['question', 'bloc', 'module']):
+                state["answer"] = line
+
+    def _close_pair(self, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Append the pending Q&A pair (if any) and return all pairs"""
+        question, answer = state["question"], state["answer"]
+        if question:
+            state["qa_pairs"].append({
+                "question_number": question.get('number'),
+                "question_text": question.get('text'),
+                "answer": answer,
+                "confidence": self._assess_confidence(question, answer)
+            })
+        state["question"] = None
+        state["answer"] = None
+        return state["qa_pairs"]
 
     def _extract_sections(self, text: str) -> List[str]:
         """
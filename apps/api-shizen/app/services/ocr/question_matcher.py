@@ -0,0 +1,348 @@
+"""
+Question Matcher - Align OCR fragments to the 144 canonical questions
+Shinkofa Platform - Shizen-Planner Service
+
+Old paper questionnaires do not follow the current numbering, and OCR text
+is noisy, so question numbers found by OCRTextParser cannot be trusted.
+Instead, every canonical question is embedded once (French text from the
+compiled questionnaire + English text from app/data/question-texts-en.json)
+and each OCR fragment is matched by cosine similarity: one matrix product
+for the whole document.
+
+- Embedder: the local sentence-transformers model when installed (the
+  instance shared with semantic memory), otherwise character trigram hashing with IDF weights,
+  which tolerates OCR typos and needs nothing but NumPy.
+- Fragments scoring below QUESTION_MATCH_MIN_SCORE are "low" confidence:
+  only those are sent to the LLM, in one prompt listing their top candidates.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.executors import run_blocking
+from app.services.questionnaire_data_loader import DATA_DIR, get_compiled_questionnaire
+
+logger = logging.getLogger(__name__)
+
+# English texts keyed by question id, with the French text they translate
+TRANSLATIONS_PATH = DATA_DIR / "question-texts-en.json"
+
+# Cosine similarity thresholds (high >= HIGH, medium >= MIN, low below)
+QUESTION_MATCH_MIN_SCORE = float(os.getenv("QUESTION_MATCH_MIN_SCORE", "0.5"))
+QUESTION_MATCH_HIGH_SCORE = float(os.getenv("QUESTION_MATCH_HIGH_SCORE", "0.75"))
+
+# LLM fallback for low-confidence fragments (one prompt per document)
+QUESTION_MATCH_LLM_FALLBACK = os.getenv("QUESTION_MATCH_LLM_FALLBACK", "true").lower() == "true"
+MAX_LLM_FRAGMENTS = int(os.getenv("QUESTION_MATCH_MAX_LLM_FRAGMENTS", "40"))
+LLM_CANDIDATES = 3
+
+NGRAM_SIZE = 3
+NGRAM_DIMENSIONS = 1 << 13
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip accents and punctuation (OCR drops/mangles both)"""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+class CharNgramEmbedder:
+    """Hashed character trigrams, IDF-weighted and L2-normalized (NumPy only)"""
+
+    model_name = f"char{NGRAM_SIZE}gram-hash{NGRAM_DIMENSIONS}"
+
+    def __init__(self, dimensions: int = NGRAM_DIMENSIONS):
+        self.dimensions = dimensions
+        self._idf: Optional[np.ndarray] = None
+
+    def _buckets(self, text: str) -> List[int]:
+        padded = f" {normalize_text(text)} "
+        return [
+            zlib.crc32(padded[i:i + NGRAM_SIZE].encode()) % self.dimensions
+            for i in range(max(len(padded) - NGRAM_SIZE + 1, 0))
+        ]
+
+    def _counts(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            np.add.at(matrix[row], self._buckets(text), 1.0)
+        return matrix
+
+    def fit(self, texts: Sequence[str]) -> None:
+        """Learn IDF weights from the reference corpus (canonical questions)"""
+        document_frequency = (self._counts(texts) > 0).sum(axis=0)
+        self._idf = np.log((1 + len(texts)) / (1 + document_frequency)).astype(np.float32) + 1.0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """L2-normalized float32 vectors, one row per text"""
+        vectors = np.log1p(self._counts(texts))
+        if self._idf is not None:
+            vectors *= self._idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def default_embedder():
+    """Shared sentence-transformers model if installed, else character trigrams"""
+    from app.services.semantic_memory import get_local_embedder
+
+    return get_local_embedder() or CharNgramEmbedder()
+
+
+def load_canonical_questions(translations_path: Path = TRANSLATIONS_PATH) -> List[Dict]:
+    """
+    Canonical questions in questionnaire order
+
+    Returns:
+        [{"id": "A0_Q01", "number": 1, "bloc": "A", "text_fr": "...", "text_en": "..."}]
+    """
+    compiled = get_compiled_questionnaire().data
+    questions = [
+        {"id": question["id"], "bloc": bloc["id"], "text_fr": question["text"]}
+        for bloc in compiled["blocs"]
+        for module in bloc.get("modules", [])
+        for question in module["questions"]
+    ]
+
+    english: Dict[str, Dict[str, str]] = {}
+    try:
+        with open(translations_path, encoding="utf-8") as f:
+            english = json.load(f)["questions"]
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"⚠️ English question translations unavailable ({e}), matching on French only")
+
+    stale = []
+    for number, question in enumerate(questions, start=1):
+        question["number"] = number
+        translation = english.get(question["id"]) or {}
+        # A translation made from another French text would match the wrong question
+        if translation.get("fr") == question["text_fr"]:
+            question["text_en"] = translation.get("en") or ""
+        else:
+            question["text_en"] = ""
+            stale.append(question["id"])
+
+    if stale and english:
+        logger.warning(f"⚠️ {len(stale)} English question texts missing or outdated ({', '.join(stale[:5])}...), matching them on French only")
+    return questions
+
+
+@dataclass
+class QuestionMatch:
+    """Canonical question of one OCR fragment"""
+    question_id: Optional[str]
+    number: Optional[int]
+    bloc: Optional[str]
+    score: float
+    confidence: str  # high, medium, low
+    source: str = "embedding"  # embedding, llm
+    candidates: List[Tuple[int, float]] = field(default_factory=list)  # (number, score), best first
+
+
+class QuestionMatcher:
+    """Cosine search of OCR fragments over the embedded canonical questions"""
+
+    def __init__(
+        self,
+        embedder=None,
+        min_score: float = QUESTION_MATCH_MIN_SCORE,
+        high_score: float = QUESTION_MATCH_HIGH_SCORE,
+    ):
+        self.embedder = embedder if embedder is not None else default_embedder()
+        self.min_score = min_score
+        self.high_score = high_score
+        self.questions: List[Dict] = []
+        self._matrix: Optional[np.ndarray] = None  # (languages, questions, dimensions)
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._matrix is not None
+
+    def load(self, questions: Optional[List[Dict]] = None) -> None:
+        """Embed the canonical questions (blocking: run in the embeddings pool)"""
+        with self._lock:
+            if self._matrix is not None and questions is None:
+                return
+            questions = questions if questions is not None else load_canonical_questions()
+            texts_fr = [q["text_fr"] for q in questions]
+            texts_en = [q["text_en"] or q["text_fr"] for q in questions]
+            if hasattr(self.embedder, "fit"):
+                self.embedder.fit(texts_fr + texts_en)
+            vectors = self.embedder.embed(texts_fr + texts_en)
+            self._matrix = vectors.reshape(2, len(questions), -1)
+            self.questions = questions
+        logger.info(f"🧭 Question matcher ready: {len(questions)} questions ({self.embedder.model_name})")
+
+    def _confidence(self, score: float) -> str:
+        if score >= self.high_score:
+            return "high"
+        if score >= self.min_score:
+            return "medium"
+        return "low"
+
+    def match(self, fragments: List[str]) -> List[QuestionMatch]:
+        """
+        Align each fragment to its most likely canonical question (blocking)
+
+        Two fragments never get the same question: fragments are assigned in
+        order of decreasing score, each to its best question still free.
+
+        Args:
+            fragments: OCR question texts (empty strings get a "low" match)
+
+        Returns:
+            One QuestionMatch per fragment, in input order
+        """
+        if not self.loaded:
+            self.load()
+        if not fragments:
+            return []
+
+        vectors = self.embedder.embed([f or "" for f in fragments])
+        # Best of the French and English wording: (fragments, questions)
+        scores = np.einsum("fd,lqd->lfq", vectors, self._matrix).max(axis=0)
+        scores[[not (f or "").strip() for f in fragments]] = 0.0
+
+        top = min(LLM_CANDIDATES, scores.shape[1])
+        candidates = np.argsort(-scores, axis=1)[:, :top]
+
+        taken = np.zeros(scores.shape[1], dtype=bool)
+        matches: List[Optional[QuestionMatch]] = [None] * len(fragments)
+        for row in np.argsort(-scores.max(axis=1), kind="stable"):
+            free_scores = np.where(taken, -np.inf, scores[row])
+            index = int(np.argmax(free_scores))
+            score = float(free_scores[index])
+            confidence = self._confidence(score)
+            row_candidates = [(int(i) + 1, round(float(scores[row, i]), 4)) for i in candidates[row]]
+            if confidence == "low":
+                matches[row] = QuestionMatch(None, None, None, round(score, 4), confidence, candidates=row_candidates)
+                continue
+            taken[index] = True
+            question = self.questions[index]
+            matches[row] = QuestionMatch(
+                question["id"], question["number"], question["bloc"],
+                round(score, 4), confidence, candidates=row_candidates,
+            )
+        return matches
+
+    def question(self, number: int) -> Optional[Dict]:
+        """Canonical question by number (1-144)"""
+        if 1 <= number <= len(self.questions):
+            return self.questions[number - 1]
+        return None
+
+
+def _llm_prompt(matcher: QuestionMatcher, items: List[Tuple[int, str, QuestionMatch]]) -> str:
+    lines = [
+        "Des fragments OCR d'un ancien questionnaire papier doivent être reliés aux questions actuelles.",
+        "Pour chaque fragment, choisis le numéro de la question correspondante parmi ses candidats, ou null si aucun ne convient.",
+        "",
+    ]
+    for index, fragment, match in items:
+        lines.append(f"Fragment {index} : {fragment[:300]}")
+        for number, _ in match.candidates:
+            lines.append(f"  - {number} : {matcher.question(number)['text_fr']}")
+    lines += [
+        "",
+        'Retourne UNIQUEMENT un JSON : {"<numéro du fragment>": <numéro de question ou null>}',
+    ]
+    return "\n".join(lines)
+
+
+async def resolve_low_confidence(
+    matcher: QuestionMatcher,
+    fragments: List[str],
+    matches: List[QuestionMatch],
+    llm=None,
+) -> int:
+    """
+    Ask the LLM about low-confidence fragments only (one prompt, top candidates each)
+
+    Answers outside a fragment's candidates, or already matched questions, are ignored.
+
+    Args:
+        matcher: Loaded matcher (candidate texts)
+        fragments: OCR question texts
+        matches: Result of matcher.match(fragments), updated in place
+        llm: Service with async generate(prompt, system, temperature, max_tokens) (default: hybrid LLM)
+
+    Returns:
+        Number of fragments resolved by the LLM
+    """
+    items = [
+        (index, fragments[index], match)
+        for index, match in enumerate(matches)
+        if match.confidence == "low" and match.candidates and (fragments[index] or "").strip()
+    ][:MAX_LLM_FRAGMENTS]
+    if not items:
+        return 0
+
+    if llm is None:
+        from app.services.hybrid_llm_service import get_hybrid_llm_service
+        llm = get_hybrid_llm_service()
+
+    try:
+        response = await llm.generate(
+            prompt=_llm_prompt(matcher, items),
+            system="Tu relies des questions de questionnaire. Retourne UNIQUEMENT du JSON valide.",
+            temperature=0.0,
+            max_tokens=20 * len(items) + 50,
+        )
+        start, end = response.find("{"), response.rfind("}") + 1
+        choices = json.loads(response[start:end]) if start != -1 and end > start else {}
+    except Exception as e:
+        logger.warning(f"⚠️ LLM question matching failed: {e}")
+        return 0
+
+    taken = {match.number for match in matches if match.number is not None}
+    resolved = 0
+    for index, _, match in items:
+        number = choices.get(str(index))
+        if not isinstance(number, int) or number in taken:
+            continue
+        if number not in {candidate for candidate, _ in match.candidates}:
+            continue
+        question = matcher.question(number)
+        match.question_id, match.number, match.bloc = question["id"], number, question["bloc"]
+        match.confidence, match.source = "medium", "llm"
+        taken.add(number)
+        resolved += 1
+
+    logger.info(f"🤖 LLM matched {resolved}/{len(items)} low-confidence OCR fragments")
+    return resolved
+
+
+# Singleton instance
+_question_matcher: Optional[QuestionMatcher] = None
+
+
+def get_question_matcher() -> QuestionMatcher:
+    """Get or create Question Matcher singleton"""
+    global _question_matcher
+    if _question_matcher is None:
+        _question_matcher = QuestionMatcher()
+    return _question_matcher
+
+
+async def warm_question_matcher() -> None:
+    """Embed canonical questions at startup (off the event loop)"""
+    try:
+        await run_blocking("embeddings", get_question_matcher().load)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"⚠️ Question matcher warm-up failed (will retry on first import): {e}")
@@ -7,9 +7,13 @@ Models: qwen2.5:14b-instruct-q4_K_M (general), qwen2.5-coder:14b (code)
 """
 import httpx
 import os
+import time
 from typing import List, Dict, Optional
 import logging
 
+from app.core.metrics import LLM_REQUEST_DURATION, LLM_TOKENS
+from app.core.tracing import outgoing_trace_headers
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +28,10 @@ class OllamaService:
         self.general_model = os.getenv("OLLAMA_MODEL_GENERAL", "qwen2.5:14b-instruct-q4_K_M")
         self.code_model = os.getenv("OLLAMA_MODEL_CODE", "qwen2.5-coder:14b")
 
+        # Keep the model (and its KV cache) loaded between calls, so prompts
+        # sharing a prefix (e.g. the profile analyses) skip its prefill
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
         # HTTP client with timeout (V5.0: increased for comprehensive synthesis)
         self.client = httpx.AsyncClient(timeout=300.0)  # 5 min timeout for complex LLM operations (matches DeepSeek)
 
@@ -68,6 +76,7 @@ class OllamaService:
             "options": {
                 "temperature": temperature,
             },
+            "keep_alive": self.keep_alive,
         }
 
         if system:
@@ -76,13 +85,7 @@ class OllamaService:
         try:
             logger.info(f"📤 Sending chat request to Ollama (model: {selected_model})")
 
-            response = await self.client.post(
-                f"{self.base_url}/api/chat",
-                json=payload,
-            )
-            response.raise_for_status()
-
-            result = response.json()
+            result = await self._post("/api/chat", payload, "chat")
             logger.info(f"✅ Ollama response received")
 
             return result
@@ -119,24 +122,54 @@ class OllamaService:
             "options": {
                 "temperature": temperature,
             },
+            "keep_alive": self.keep_alive,
         }
 
         if system:
             payload["system"] = system
 
+        try:
+            result = await self._post("/api/generate", payload, "generate")
+            return result.get("response", "")
+
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Ollama generate error: {e}")
+            raise Exception(f"Ollama generate error: {str(e)}")
+
+    async def _post(self, path: str, payload: Dict, operation: str) -> Dict:
+        """
+        POST to the Ollama API with trace propagation, latency and token metrics
+
+        Args:
+            path: API path (e.g., "/api/chat")
+            payload: JSON body (with "model")
+            operation: Metric label ("chat", "generate")
+
+        Returns:
+            Decoded JSON response
+        """
+        model = payload["model"]
+        outcome = "error"
+        start = time.perf_counter()
         try:
             response = await self.client.post(
-                f"{self.base_url}/api/generate",
+                f"{self.base_url}{path}",
                 json=payload,
+                headers=outgoing_trace_headers(),
             )
             response.raise_for_status()
-
             result = response.json()
-            return result.get("response", "")
+            outcome = "success"
+        finally:
+            LLM_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                provider="ollama", model=model, operation=operation, outcome=outcome,
+            )
 
-        except httpx.HTTPError as e:
-            logger.error(f"❌ Ollama generate error: {e}")
-            raise Exception(f"Ollama generate error: {str(e)}")
+        # Ollama reports prompt/completion token counts on final responses
+        LLM_TOKENS.inc(result.get("prompt_eval_count") or 0, provider="ollama", model=model, kind="prompt")
+        LLM_TOKENS.inc(result.get("eval_count") or 0, provider="ollama", model=model, kind="completion")
+        return result
 
     async def list_models(self) -> List[str]:
         """
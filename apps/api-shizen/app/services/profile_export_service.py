@@ -3,87 +3,96 @@ Profile Export Service
 Shinkofa Platform - Shizen AI
 
 Exports holistic profile to Markdown and PDF formats
+
+- Markdown is rendered from a template compiled once at import
+  (string.Template), filled with a flat context built from the profile.
+- PDF is laid out from that Markdown by a small built-in writer (standard
+  Helvetica fonts, no external dependency).
+- Rendered artifacts are cached on disk, keyed by profile id, version,
+  updated_at and template revision: any profile update (rename, enrichment,
+  activation) changes the key, and older artifacts of the profile are pruned
+  when the new one is written (once past a grace period, so a download that
+  just resolved the previous path can still open it).
+- A failed render raises: nothing is written to the cache.
+- Rendering is blocking: callers run render_to_cache() in the "exports"
+  executor pool (export_bulk() does it for admin bulk exports).
 """
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
+from string import Template
+import asyncio
 import logging
 import os
-
+import shutil
+import textwrap
+import time
+import uuid
+import zipfile
+import zlib
+
+from app.core.executors import run_blocking
+from app.core.metrics import record_cache
 from app.models.holistic_profile import HolisticProfile
 
 logger = logging.getLogger(__name__)
 
+# Bump when the template or PDF layout changes (invalidates every cached artifact)
+EXPORT_TEMPLATE_REVISION = 2
 
-class ProfileExportService:
-    """
-    Profile export service
-
-    Generates Markdown and PDF exports of holistic profiles
-    """
-
-    def __init__(self):
-        """Initialize Profile Export service"""
-        self.export_dir = os.getenv("EXPORT_DIR", "./exports")
-        os.makedirs(self.export_dir, exist_ok=True)
-        logger.info("📄 Profile Export Service initialized")
-
-    def export_markdown(self, profile: HolisticProfile) -> str:
-        """
-        Export holistic profile to Markdown format
+# Superseded artifacts younger than this are kept (a response may still be streaming them)
+EXPORT_CACHE_GRACE_SECONDS = int(os.getenv("EXPORT_CACHE_GRACE_SECONDS", "300"))
 
-        Args:
-            profile: HolisticProfile instance
+# format -> (file extension, media type)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "markdown": ("md", "text/markdown; charset=utf-8"),
+    "pdf": ("pdf", "application/pdf"),
+}
 
-        Returns:
-            Markdown content as string
-        """
-        try:
-            # Build markdown content
-            md_content = f"""# 🌟 Profil Holistique Shinkofa
+MARKDOWN_TEMPLATE = Template("""# 🌟 Profil Holistique Shinkofa
 
-**Généré le** : {profile.generated_at.strftime("%d/%m/%Y à %H:%M")}
-**Utilisateur** : {profile.user_id}
+**Généré le** : $generated_at
+**Utilisateur** : $user_id
 
 ---
 
 ## 📊 Design Humain
 
-**Type** : {profile.design_human.get('type', 'N/A').title()}
-**Autorité** : {profile.design_human.get('authority', 'N/A').title()}
-**Profil** : {profile.design_human.get('profile', 'N/A')}
-**Stratégie** : {profile.design_human.get('strategy', 'N/A')}
-**Signature** : {profile.design_human.get('signature', 'N/A')}
-**Not-Self** : {profile.design_human.get('not_self', 'N/A')}
+**Type** : $dh_type
+**Autorité** : $dh_authority
+**Profil** : $dh_profile
+**Stratégie** : $dh_strategy
+**Signature** : $dh_signature
+**Not-Self** : $dh_not_self
 
-**Centres définis** : {', '.join([c.replace('_', ' ').title() for c in profile.design_human.get('defined_centers', [])])}
+**Centres définis** : $dh_defined_centers
 
 ---
 
 ## ✨ Astrologie Occidentale
 
-**Soleil** : {profile.astrology_western.get('sun_sign', 'N/A').title()}
-**Lune** : {profile.astrology_western.get('moon_sign', 'N/A').title()}
-**Ascendant** : {profile.astrology_western.get('ascendant', 'N/A').title()}
-**Élément dominant** : {profile.astrology_western.get('dominant_element', 'N/A').title()}
-**Modalité dominante** : {profile.astrology_western.get('dominant_modality', 'N/A').title()}
+**Soleil** : $aw_sun_sign
+**Lune** : $aw_moon_sign
+**Ascendant** : $aw_ascendant
+**Élément dominant** : $aw_dominant_element
+**Modalité dominante** : $aw_dominant_modality
 
 ---
 
 ## 🐉 Astrologie Chinoise
 
-**Signe animal** : {profile.astrology_chinese.get('animal_sign', 'N/A').title()}
-**Élément** : {profile.astrology_chinese.get('element', 'N/A').title()}
-**Yin/Yang** : {profile.astrology_chinese.get('yin_yang', 'N/A').title()}
+**Signe animal** : $ac_animal_sign
+**Élément** : $ac_element
+**Yin/Yang** : $ac_yin_yang
 
 ---
 
 ## 🔢 Numérologie
 
-**Chemin de vie** : {profile.numerology.get('life_path', 'N/A')}
-**Expression** : {profile.numerology.get('expression', 'N/A')}
-**Soul Urge** : {profile.numerology.get('soul_urge', 'N/A')}
-**Personnalité** : {profile.numerology.get('personality', 'N/A')}
-**Année personnelle** : {profile.numerology.get('personal_year', 'N/A')}
+**Chemin de vie** : $num_life_path
+**Expression** : $num_expression
+**Soul Urge** : $num_soul_urge
+**Personnalité** : $num_personality
+**Année personnelle** : $num_personal_year
 
 ---
 
@@ -91,41 +100,41 @@ class ProfileExportService:
 
 ### MBTI
 
-**Type** : {profile.psychological_analysis.get('mbti', {}).get('type', 'N/A')}
-**Description** : {profile.psychological_analysis.get('mbti', {}).get('description', 'N/A')}
+**Type** : $mbti_type
+**Description** : $mbti_description
 
 ### Big Five (OCEAN)
 
-- **Ouverture** : {profile.psychological_analysis.get('big_five', {}).get('openness', 'N/A')}/100
-- **Conscience** : {profile.psychological_analysis.get('big_five', {}).get('conscientiousness', 'N/A')}/100
-- **Extraversion** : {profile.psychological_analysis.get('big_five', {}).get('extraversion', 'N/A')}/100
-- **Agréabilité** : {profile.psychological_analysis.get('big_five', {}).get('agreeableness', 'N/A')}/100
-- **Neuroticisme** : {profile.psychological_analysis.get('big_five', {}).get('neuroticism', 'N/A')}/100
+- **Ouverture** : $big5_openness/100
+- **Conscience** : $big5_conscientiousness/100
+- **Extraversion** : $big5_extraversion/100
+- **Agréabilité** : $big5_agreeableness/100
+- **Neuroticisme** : $big5_neuroticism/100
 
 ### Ennéagramme
 
-**Type** : {profile.psychological_analysis.get('enneagram', {}).get('type', 'N/A')}
-**Aile** : {profile.psychological_analysis.get('enneagram', {}).get('wing', 'N/A')}
-**Tritype** : {profile.psychological_analysis.get('enneagram', {}).get('tritype', 'N/A')}
+**Type** : $enneagram_type
+**Aile** : $enneagram_wing
+**Tritype** : $enneagram_tritype
 
 ### PNL Méta-programmes
 
-- **Toward/Away** : {profile.psychological_analysis.get('pnl', {}).get('toward_away', 'N/A')}
-- **Internal/External** : {profile.psychological_analysis.get('pnl', {}).get('internal_external', 'N/A')}
-- **Options/Procedures** : {profile.psychological_analysis.get('pnl', {}).get('options_procedures', 'N/A')}
+- **Toward/Away** : $pnl_toward_away
+- **Internal/External** : $pnl_internal_external
+- **Options/Procedures** : $pnl_options_procedures
 
 ### PCM
 
-**Type dominant** : {profile.psychological_analysis.get('pcm', {}).get('dominant_type', 'N/A').title()}
+**Type dominant** : $pcm_dominant_type
 
 ### VAKOG
 
-**Canal dominant** : {profile.psychological_analysis.get('vakog', {}).get('dominant_channel', 'N/A').title()}
+**Canal dominant** : $vakog_dominant_channel
 
 ### Langages d'amour
 
-**Primaire** : {profile.psychological_analysis.get('love_languages', {}).get('primary', 'N/A').replace('_', ' ').title()}
-**Secondaire** : {profile.psychological_analysis.get('love_languages', {}).get('secondary', 'N/A').replace('_', ' ').title()}
+**Primaire** : $love_primary
+**Secondaire** : $love_secondary
 
 ---
 
@@ -133,15 +142,15 @@ class ProfileExportService:
 
 ### TDAH
 
-**Score** : {profile.neurodivergence_analysis.get('adhd', {}).get('score', 'N/A')}/100
+**Score** : $adhd_score/100
 
 ### HPI (Haut Potentiel Intellectuel)
 
-**Score** : {profile.neurodivergence_analysis.get('hpi', {}).get('score', 'N/A')}/100
+**Score** : $hpi_score/100
 
 ### Hypersensibilité
 
-**Score** : {profile.neurodivergence_analysis.get('hypersensitivity', {}).get('score', 'N/A')}/100
+**Score** : $hypersensitivity_score/100
 
 ---
 
@@ -149,38 +158,280 @@ class ProfileExportService:
 
 ### Roue de vie
 
-{self._format_life_wheel(profile.shinkofa_analysis.get('life_wheel', {}))}
+$life_wheel
 
 ### Archétypes
 
-**Primaire** : {profile.shinkofa_analysis.get('archetypes', {}).get('primary', 'N/A').title()}
-**Secondaire** : {profile.shinkofa_analysis.get('archetypes', {}).get('secondary', 'N/A').title()}
-**Tertiaire** : {profile.shinkofa_analysis.get('archetypes', {}).get('tertiary', 'N/A').title()}
+**Primaire** : $archetype_primary
+**Secondaire** : $archetype_secondary
+**Tertiaire** : $archetype_tertiary
 
 ---
 
 ## 📝 Synthèse IA
 
-{profile.synthesis or 'Synthèse non disponible'}
+$synthesis
 
 ---
 
 ## 💡 Recommandations
 
-{self._format_recommendations(profile.recommendations or {})}
+$recommendations
 
 ---
 
 **Profil généré par SHIZEN AI** - La Voie Shinkofa
-Copyright © {datetime.now().year} La Voie Shinkofa - Tous droits réservés
-"""
+Copyright © $year La Voie Shinkofa - Tous droits réservés
+""")
+
+# PDF layout (points, A4)
+PDF_PAGE_WIDTH = 595
+PDF_PAGE_HEIGHT = 842
+PDF_MARGIN = 50
+PDF_LINE_SPACING = 1.4
+PDF_BODY_STYLE = ("F1", 10)
+PDF_HEADING_STYLES = (("### ", ("F2", 12)), ("## ", ("F2", 14)), ("# ", ("F2", 18)))
+# Characters outside WinAnsi (standard PDF fonts) with a readable stand-in
+PDF_REPLACEMENTS = str.maketrans({"█": "#", "░": "."})
+
+
+def _get(data: Optional[Dict], *path: str, default: str = "N/A"):
+    """Nested dict value (default when missing or None)"""
+    for key in path:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+    return default if data is None else data
+
+
+def _title(value) -> str:
+    return str(value).replace("_", " ").title()
+
+
+def _format_life_wheel(life_wheel: Dict) -> str:
+    """Format life wheel dimensions"""
+    if not life_wheel:
+        return "Non disponible"
+
+    lines = []
+    for dimension, score in life_wheel.items():
+        bar = "█" * int(score) + "░" * (10 - int(score))
+        lines.append(f"- **{dimension.title()}** : {bar} {score}/10")
+
+    return "\n".join(lines)
+
+
+def _format_recommendations(recommendations: Dict) -> str:
+    """Format recommendations"""
+    if not recommendations:
+        return "Aucune recommandation disponible"
+
+    sections = []
+
+    for category, items in recommendations.items():
+        if not items:
+            continue
+
+        section = f"### {category.replace('_', ' ').title()}\n\n"
+        for item in items:
+            if isinstance(item, dict):
+                rec = item.get("recommendation", "")
+                section += f"- {rec}\n"
+            else:
+                section += f"- {item}\n"
+
+        sections.append(section)
+
+    return "\n".join(sections) if sections else "Aucune recommandation disponible"
+
+
+def markdown_context(profile: HolisticProfile) -> Dict[str, str]:
+    """
+    Template variables of a profile
+
+    Args:
+        profile: HolisticProfile with its sections loaded
+
+    Returns:
+        Flat dict of MARKDOWN_TEMPLATE placeholders
+    """
+    dh = profile.design_human
+    aw = profile.astrology_western
+    ac = profile.astrology_chinese
+    num = profile.numerology
+    psy = profile.psychological_analysis
+    neuro = profile.neurodivergence_analysis
+    shinkofa = profile.shinkofa_analysis
+    generated_at = profile.generated_at
+
+    return {
+        "generated_at": generated_at.strftime("%d/%m/%Y à %H:%M") if generated_at else "N/A",
+        "user_id": profile.user_id,
+        "dh_type": _title(_get(dh, "type")),
+        "dh_authority": _title(_get(dh, "authority")),
+        "dh_profile": _get(dh, "profile"),
+        "dh_strategy": _get(dh, "strategy"),
+        "dh_signature": _get(dh, "signature"),
+        "dh_not_self": _get(dh, "not_self"),
+        "dh_defined_centers": ", ".join(_title(c) for c in _get(dh, "defined_centers", default=[])),
+        "aw_sun_sign": _title(_get(aw, "sun_sign")),
+        "aw_moon_sign": _title(_get(aw, "moon_sign")),
+        "aw_ascendant": _title(_get(aw, "ascendant")),
+        "aw_dominant_element": _title(_get(aw, "dominant_element")),
+        "aw_dominant_modality": _title(_get(aw, "dominant_modality")),
+        "ac_animal_sign": _title(_get(ac, "animal_sign")),
+        "ac_element": _title(_get(ac, "element")),
+        "ac_yin_yang": _title(_get(ac, "yin_yang")),
+        "num_life_path": _get(num, "life_path"),
+        "num_expression": _get(num, "expression"),
+        "num_soul_urge": _get(num, "soul_urge"),
+        "num_personality": _get(num, "personality"),
+        "num_personal_year": _get(num, "personal_year"),
+        "mbti_type": _get(psy, "mbti", "type"),
+        "mbti_description": _get(psy, "mbti", "description"),
+        "big5_openness": _get(psy, "big_five", "openness"),
+        "big5_conscientiousness": _get(psy, "big_five", "conscientiousness"),
+        "big5_extraversion": _get(psy, "big_five", "extraversion"),
+        "big5_agreeableness": _get(psy, "big_five", "agreeableness"),
+        "big5_neuroticism": _get(psy, "big_five", "neuroticism"),
+        "enneagram_type": _get(psy, "enneagram", "type"),
+        "enneagram_wing": _get(psy, "enneagram", "wing"),
+        "enneagram_tritype": _get(psy, "enneagram", "tritype"),
+        "pnl_toward_away": _get(psy, "pnl", "toward_away"),
+        "pnl_internal_external": _get(psy, "pnl", "internal_external"),
+        "pnl_options_procedures": _get(psy, "pnl", "options_procedures"),
+        "pcm_dominant_type": _title(_get(psy, "pcm", "dominant_type")),
+        "vakog_dominant_channel": _title(_get(psy, "vakog", "dominant_channel")),
+        "love_primary": _title(_get(psy, "love_languages", "primary")),
+        "love_secondary": _title(_get(psy, "love_languages", "secondary")),
+        "adhd_score": _get(neuro, "adhd", "score"),
+        "hpi_score": _get(neuro, "hpi", "score"),
+        "hypersensitivity_score": _get(neuro, "hypersensitivity", "score"),
+        "life_wheel": _format_life_wheel(_get(shinkofa, "life_wheel", default={})),
+        "archetype_primary": _title(_get(shinkofa, "archetypes", "primary")),
+        "archetype_secondary": _title(_get(shinkofa, "archetypes", "secondary")),
+        "archetype_tertiary": _title(_get(shinkofa, "archetypes", "tertiary")),
+        "synthesis": profile.synthesis or "Synthèse non disponible",
+        "recommendations": _format_recommendations(profile.recommendations or {}),
+        # Generation year (not today's): keeps cached artifacts stable
+        "year": (generated_at or datetime.now()).year,
+    }
+
+
+def _pdf_lines(markdown: str):
+    """(font, size, text) lines of the PDF, wrapped to the page width"""
+    for raw in markdown.splitlines():
+        line = raw.strip()
+        font, size = PDF_BODY_STYLE
+        for prefix, style in PDF_HEADING_STYLES:
+            if line.startswith(prefix):
+                line, (font, size) = line[len(prefix):], style
+                break
+        if line == "---":
+            line = ""
+        elif line.startswith("- "):
+            line = "• " + line[2:]
+        line = line.replace("**", "").translate(PDF_REPLACEMENTS)
+        # Emojis are not in the standard fonts: dropped
+        line = line.encode("cp1252", "ignore").decode("cp1252").strip()
+
+        width = int((PDF_PAGE_WIDTH - 2 * PDF_MARGIN) / (size * 0.5))
+        for part in textwrap.wrap(line, width) or [""]:
+            yield font, size, part
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(markdown: str) -> bytes:
+    """
+    Lay out Markdown as a PDF document
+
+    Args:
+        markdown: Content rendered from MARKDOWN_TEMPLATE
+
+    Returns:
+        PDF bytes (Helvetica / Helvetica-Bold, WinAnsi encoding, A4)
+    """
+    pages: List[List[str]] = []
+    ops: List[str] = []
+    y = PDF_PAGE_HEIGHT - PDF_MARGIN
+    for font, size, text in _pdf_lines(markdown):
+        leading = size * PDF_LINE_SPACING
+        if y - leading < PDF_MARGIN:
+            pages.append(ops)
+            ops, y = [], PDF_PAGE_HEIGHT - PDF_MARGIN
+        y -= leading
+        if text:
+            ops.append(f"BT /{font} {size} Tf {PDF_MARGIN} {y:.1f} Td ({_pdf_escape(text)}) Tj ET")
+    pages.append(ops)
+
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages tree, filled once page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for page_ops in pages:
+        stream = zlib.compress("\n".join(page_ops).encode("cp1252"))
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+            % (PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT, len(objects))
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+class ProfileExportService:
+    """
+    Profile export service
+
+    Generates Markdown and PDF exports of holistic profiles, cached on disk
+    """
 
+    def __init__(self, export_dir: Optional[str] = None):
+        """Initialize Profile Export service"""
+        self.export_dir = export_dir or os.getenv("EXPORT_DIR", "./exports")
+        self.cache_dir = os.path.join(self.export_dir, "cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        logger.info("📄 Profile Export Service initialized")
+
+    def export_markdown(self, profile: HolisticProfile) -> str:
+        """
+        Export holistic profile to Markdown format
+
+        Args:
+            profile: HolisticProfile instance
+
+        Returns:
+            Markdown content as string
+
+        Raises:
+            Exception: Rendering failed (never returned as content, so it is never cached)
+        """
+        try:
+            md_content = MARKDOWN_TEMPLATE.substitute(markdown_context(profile))
             logger.info(f"✅ Markdown exported ({len(md_content)} characters)")
             return md_content
 
         except Exception as e:
             logger.error(f"❌ Markdown export error: {e}")
-            return f"# Erreur export\n\nErreur lors de l'export : {str(e)}"
+            raise
 
     def save_markdown(self, profile: HolisticProfile) -> str:
         """
@@ -217,61 +468,121 @@ Copyright © {datetime.now().year} La Voie Shinkofa - Tous droits réservés
 
         Returns:
             PDF content as bytes
-
-        Note:
-            Requires reportlab or fpdf library
-            For now, returns placeholder - implement with reportlab if needed
         """
-        # TODO: Implement PDF export with reportlab
-        # For MVP, we can use markdown2pdf conversion or simple text PDF
-        logger.warning("⚠️ PDF export not yet implemented - returning placeholder")
-
-        placeholder_text = f"""
-        Profil Holistique Shinkofa
+        return render_pdf(self.export_markdown(profile))
 
-        User: {profile.user_id}
-        Generated: {profile.generated_at}
+    # === Disk cache ===
 
-        PDF export coming soon...
-        Use Markdown export for now.
+    def artifact_path(self, profile_id: str, version: int, updated_at: Optional[datetime], fmt: str) -> str:
         """
+        Cache path of a rendered artifact
 
-        return placeholder_text.encode('utf-8')
-
-    def _format_life_wheel(self, life_wheel: Dict) -> str:
-        """Format life wheel dimensions"""
-        if not life_wheel:
-            return "Non disponible"
-
-        lines = []
-        for dimension, score in life_wheel.items():
-            bar = "█" * int(score) + "░" * (10 - int(score))
-            lines.append(f"- **{dimension.title()}** : {bar} {score}/10")
-
-        return "\n".join(lines)
+        Args:
+            profile_id: Profile ID
+            version: Profile version number
+            updated_at: Profile last update (part of the key: updates invalidate)
+            fmt: "markdown" or "pdf"
 
-    def _format_recommendations(self, recommendations: Dict) -> str:
-        """Format recommendations"""
-        if not recommendations:
-            return "Aucune recommandation disponible"
+        Returns:
+            File path (may not exist yet)
+        """
+        extension = EXPORT_FORMATS[fmt][0]
+        stamp = updated_at.strftime("%Y%m%d%H%M%S%f") if updated_at else "0"
+        filename = f"v{version}-{stamp}-r{EXPORT_TEMPLATE_REVISION}.{extension}"
+        return os.path.join(self.cache_dir, profile_id, filename)
+
+    def cached_path(self, profile_id: str, version: int, updated_at: Optional[datetime], fmt: str) -> Optional[str]:
+        """Cache path of an artifact if it was already rendered"""
+        path = self.artifact_path(profile_id, version, updated_at, fmt)
+        hit = os.path.exists(path)
+        record_cache("profile_export", hit=hit)
+        return path if hit else None
+
+    def render_to_cache(self, profile: HolisticProfile, fmt: str) -> str:
+        """
+        Render an artifact into the cache (blocking: run in the "exports" pool)
 
-        sections = []
+        Args:
+            profile: HolisticProfile with its sections loaded
+            fmt: "markdown" or "pdf"
 
-        for category, items in recommendations.items():
-            if not items:
+        Returns:
+            Path of the cached artifact
+        """
+        path = self.artifact_path(profile.id, profile.version, profile.updated_at, fmt)
+        if os.path.exists(path):
+            return path
+
+        markdown = self.export_markdown(profile)
+        content = render_pdf(markdown) if fmt == "pdf" else markdown.encode("utf-8")
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Atomic write: concurrent readers never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        self._prune(directory, keep=path, extension=EXPORT_FORMATS[fmt][0])
+
+        logger.info(f"📄 Profile {profile.id} v{profile.version} exported to {fmt} ({len(content)} bytes)")
+        return path
+
+    @staticmethod
+    def _prune(directory: str, keep: str, extension: str) -> None:
+        """Remove previous renders of a profile (older updated_at / template revision) past the grace period"""
+        cutoff = time.time() - EXPORT_CACHE_GRACE_SECONDS
+        for name in os.listdir(directory):
+            old_path = os.path.join(directory, name)
+            if not name.endswith(f".{extension}") or old_path == keep:
                 continue
+            try:
+                if os.path.getmtime(old_path) < cutoff:
+                    os.remove(old_path)
+            except FileNotFoundError:
+                pass  # Pruned by a concurrent render
 
-            section = f"### {category.replace('_', ' ').title()}\n\n"
-            for item in items:
-                if isinstance(item, dict):
-                    rec = item.get("recommendation", "")
-                    section += f"- {rec}\n"
-                else:
-                    section += f"- {item}\n"
+    def invalidate(self, profile_id: str) -> None:
+        """Drop every cached artifact of a profile (profile deleted)"""
+        shutil.rmtree(os.path.join(self.cache_dir, profile_id), ignore_errors=True)
 
-            sections.append(section)
+    async def export_bulk(self, profiles: Iterable[HolisticProfile], cached: Dict[str, str], fmt: str) -> str:
+        """
+        Zip the artifacts of many profiles, rendering misses on the "exports" pool
+
+        Args:
+            profiles: Profiles to render (sections loaded)
+            cached: Archive name -> path of artifacts already cached
+            fmt: "markdown" or "pdf"
 
-        return "\n".join(sections) if sections else "Aucune recommandation disponible"
+        Returns:
+            Path of a temporary zip archive (the caller removes it)
+        """
+        profiles = list(profiles)
+        paths = await asyncio.gather(*(
+            run_blocking("exports", self.render_to_cache, profile, fmt) for profile in profiles
+        ))
+        entries = dict(cached)
+        for profile, path in zip(profiles, paths):
+            entries[self.archive_name(profile.user_id, profile.version, fmt)] = path
+
+        archive = os.path.join(self.export_dir, f"bulk-{uuid.uuid4().hex}.zip")
+        await run_blocking("exports", _write_zip, archive, entries)
+        logger.info(f"📦 Bulk export: {len(entries)} profiles ({len(profiles)} rendered)")
+        return archive
+
+    @staticmethod
+    def archive_name(user_id: str, version: int, fmt: str) -> str:
+        """File name of an artifact for the client"""
+        return f"profil_{user_id}_v{version}.{EXPORT_FORMATS[fmt][0]}"
+
+
+def _write_zip(archive: str, entries: Dict[str, str]) -> None:
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, path in sorted(entries.items()):
+            zf.write(path, arcname=name)
 
 
 # Singleton instance
@@ -0,0 +1,153 @@
+"""
+Profile Stats Service - Materialized admin statistics
+Shinkofa Platform - Shizen AI
+
+The admin dashboard reads a single precomputed row (holistic_profile_stats)
+instead of aggregating the whole holistic_profiles table on every call.
+
+- compute_profile_stats(): every figure in ONE aggregate query (conditional
+  counts for the 7/30-day windows)
+- run_profile_stats_refresher(): background task refreshing the row every
+  PROFILE_STATS_REFRESH_SECONDS (workers skip the refresh when another one
+  just did it)
+- get_profile_stats(): single primary-key read, computed once if missing
+
+The windowed counts move with time even when no profile is written, which
+is why the snapshot is refreshed periodically rather than per write.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.executors import run_blocking
+from app.models.holistic_profile import HolisticProfile
+from app.models.profile_stats import PROFILE_STATS_ROW_ID, ProfileStatsSnapshot
+
+logger = logging.getLogger(__name__)
+
+PROFILE_STATS_REFRESH_SECONDS = int(os.getenv("PROFILE_STATS_REFRESH_SECONDS", "300"))
+
+
+def _insert(db: Session):
+    """Dialect-specific INSERT supporting ON CONFLICT (PostgreSQL in prod, SQLite in tests)"""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite.insert(ProfileStatsSnapshot)
+    return postgresql.insert(ProfileStatsSnapshot)
+
+
+def compute_profile_stats(db: Session, now: Optional[datetime] = None) -> Dict:
+    """
+    Aggregate holistic profile statistics in a single query
+
+    Args:
+        db: Database session
+        now: Reference time for the 7/30-day windows (default: now, UTC)
+
+    Returns:
+        Dict of ProfileStatsSnapshot columns
+    """
+    now = now or datetime.now(timezone.utc)
+    generated_at = HolisticProfile.generated_at
+    row = db.execute(
+        select(
+            func.count(HolisticProfile.id).label("total_profiles"),
+            func.count(func.distinct(HolisticProfile.user_id)).label("total_users_with_profile"),
+            func.count(case((generated_at >= now - timedelta(days=7), 1))).label("profiles_last_7_days"),
+            func.count(case((generated_at >= now - timedelta(days=30), 1))).label("profiles_last_30_days"),
+            # Complete = has synthesis
+            func.count(case((HolisticProfile.synthesis.isnot(None), 1))).label("complete_profiles"),
+            func.avg(HolisticProfile.version).label("average_version"),
+        )
+    ).one()
+
+    return {
+        "total_profiles": row.total_profiles,
+        "total_users_with_profile": row.total_users_with_profile or 0,
+        "profiles_last_7_days": row.profiles_last_7_days,
+        "profiles_last_30_days": row.profiles_last_30_days,
+        "complete_profiles": row.complete_profiles,
+        "average_version": round(float(row.average_version or 1.0), 2),
+        "computed_at": now,
+    }
+
+
+def refresh_profile_stats(db: Session, now: Optional[datetime] = None) -> Dict:
+    """
+    Recompute the statistics and store them in holistic_profile_stats
+
+    Returns:
+        The stored statistics
+    """
+    stats = compute_profile_stats(db, now)
+    stmt = _insert(db).values(id=PROFILE_STATS_ROW_ID, **stats)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ProfileStatsSnapshot.id],
+        set_={column: stmt.excluded[column] for column in stats},
+    )
+    db.execute(stmt)
+    db.commit()
+    return stats
+
+
+def get_profile_stats(db: Session) -> ProfileStatsSnapshot:
+    """
+    Latest statistics snapshot (computed on the spot the very first time)
+
+    Args:
+        db: Database session
+
+    Returns:
+        ProfileStatsSnapshot row
+    """
+    snapshot = db.get(ProfileStatsSnapshot, PROFILE_STATS_ROW_ID)
+    if snapshot is None:
+        refresh_profile_stats(db)
+        snapshot = db.get(ProfileStatsSnapshot, PROFILE_STATS_ROW_ID)
+    return snapshot
+
+
+async def run_profile_stats_refresher(
+    session_factory: Optional[Callable[[], Session]] = None,
+    interval: int = PROFILE_STATS_REFRESH_SECONDS,
+) -> None:
+    """
+    Background task: refresh the statistics snapshot off the request path
+
+    Args:
+        session_factory: Synchronous session factory (SessionLocal by default)
+        interval: Refresh interval in seconds
+    """
+    if session_factory is None:
+        from app.core.database import SessionLocal
+        session_factory = SessionLocal
+
+    def refresh() -> bool:
+        db = session_factory()
+        try:
+            computed_at = db.scalar(
+                select(ProfileStatsSnapshot.computed_at).where(ProfileStatsSnapshot.id == PROFILE_STATS_ROW_ID)
+            )
+            if computed_at is not None:
+                if computed_at.tzinfo is None:
+                    computed_at = computed_at.replace(tzinfo=timezone.utc)
+                # Another worker refreshed it recently
+                if datetime.now(timezone.utc) - computed_at < timedelta(seconds=interval / 2):
+                    return False
+            refresh_profile_stats(db)
+            return True
+        finally:
+            db.close()
+
+    while True:
+        try:
+            if await run_blocking("sync_db", refresh):
+                logger.info("📊 Profile stats snapshot refreshed")
+        except Exception as e:
+            logger.warning(f"Profile stats refresh failed: {e}")
+        await asyncio.sleep(interval)
@@ -15,12 +15,13 @@ Analyzes questionnaire responses using Hybrid LLM (DeepSeek + Ollama fallback) t
 
 Uses DeepSeek API (primary) with Ollama (fallback) for reliability
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import json
 import logging
 import re
 import traceback
 
+from app.services.analysis_prompt import ANALYSIS_SYSTEM_PROMPT, ResponseDigest
 from app.services.hybrid_llm_service import get_hybrid_llm_service
 
 logger = logging.getLogger(__name__)
@@ -39,7 +40,7 @@ class PsychologicalAnalysisService:
         self.llm = get_hybrid_llm_service()
         logger.info("🧠 Psychological Analysis Service initialized (Hybrid LLM)")
 
-    async def analyze_mbti(self, responses: List[Dict]) -> Dict:
+    async def analyze_mbti(self, responses: Union[List[Dict], ResponseDigest]) -> Dict:
         """
         Analyze MBTI (Myers-Briggs Type Indicator) from responses
 
@@ -52,12 +53,12 @@ class PsychologicalAnalysisService:
                 "challenges": [...]
             }
         """
-        prompt = self._build_mbti_prompt(responses)
+        prompt = self._build_mbti_prompt(ResponseDigest.of(responses))
 
         try:
             result = await self.llm.generate(
                 prompt=prompt,
-                system=self._get_system_prompt("mbti"),
+                system=ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.3,  # Lower temperature for more consistent analysis
             )
 
@@ -70,7 +71,7 @@ class PsychologicalAnalysisService:
             logger.error(f"❌ MBTI analysis error: {e}")
             return self._get_fallback_mbti()
 
-    async def analyze_big_five(self, responses: List[Dict]) -> Dict:
+    async def analyze_big_five(self, responses: Union[List[Dict], ResponseDigest]) -> Dict:
         """
         Analyze Big Five personality traits from responses
 
@@ -84,12 +85,12 @@ class PsychologicalAnalysisService:
                 "description": "..."
             }
         """
-        prompt = self._build_big_five_prompt(responses)
+        prompt = self._build_big_five_prompt(ResponseDigest.of(responses))
 
         try:
             result = await self.llm.generate(
                 prompt=prompt,
-                system=self._get_system_prompt("big_five"),
+                system=ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.3,
             )
 
@@ -101,7 +102,7 @@ class PsychologicalAnalysisService:
             logger.error(f"❌ Big Five analysis error: {e}")
             return self._get_fallback_big_five()
 
-    async def analyze_enneagram(self, responses: List[Dict]) -> Dict:
+    async def analyze_enneagram(self, responses: Union[List[Dict], ResponseDigest]) -> Dict:
         """
         Analyze Enneagram type from responses
 
@@ -115,12 +116,12 @@ class PsychologicalAnalysisService:
                 "core_desire": "..."
             }
         """
-        prompt = self._build_enneagram_prompt(responses)
+        prompt = self._build_enneagram_prompt(ResponseDigest.of(responses))
 
         try:
             result = await self.llm.generate(
                 prompt=prompt,
-                system=self._get_system_prompt("enneagram"),
+                system=ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.3,
             )
 
@@ -132,7 +133,7 @@ class PsychologicalAnalysisService:
             logger.error(f"❌ Enneagram analysis error: {e}")
             return self._get_fallback_enneagram()
 
-    async def analyze_neurodivergence(self, responses: List[Dict]) -> Dict:
+    async def analyze_neurodivergence(self, responses: Union[List[Dict], ResponseDigest]) -> Dict:
         """
         Analyze neurodivergence patterns from responses
 
@@ -146,7 +147,7 @@ class PsychologicalAnalysisService:
                 ...
             }
         """
-        prompt = self._build_neurodivergence_prompt(responses)
+        prompt = self._build_neurodivergence_prompt(ResponseDigest.of(responses))
 
         # Required neurodivergence types (must be present in response)
         required_neuro_types = ['adhd', 'autism', 'hpi', 'multipotentiality', 'hypersensitivity']
@@ -155,7 +156,7 @@ class PsychologicalAnalysisService:
             logger.info("🧬 Calling LLM for neurodivergence analysis...")
             result = await self.llm.generate(
                 prompt=prompt,
-                system=self._get_system_prompt("neurodivergence"),
+                system=ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.3,
             )
 
@@ -199,7 +200,7 @@ class PsychologicalAnalysisService:
             # Re-raise to trigger retry mechanism in holistic_profile_service
             raise Exception(f"Neurodivergence analysis failed: {error_msg}")
 
-    async def analyze_pnl_meta_programs(self, responses: List[Dict]) -> Dict:
+    async def analyze_pnl_meta_programs(self, responses: Union[List[Dict], ResponseDigest]) -> Dict:
         """
         Analyze PNL (Programmation Neuro-Linguistique) meta-programs
 
@@ -214,12 +215,12 @@ class PsychologicalAnalysisService:
                 ...
             }
         """
-        prompt = self._build_pnl_prompt(responses)
+        prompt = self._build_pnl_prompt(ResponseDigest.of(responses))
 
         try:
             result = await self.llm.generate(
                 prompt=prompt,
-                system=self._get_system_prompt("pnl"),
+                system=ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.3,
             )
 
@@ -231,7 +232,7 @@ class PsychologicalAnalysisService:
             logger.error(f"❌ PNL analysis error: {e}")
             return self._get_fallback_pnl()
 
-    async def analyze_pcm(self, responses: List[Dict]) -> Dict:
+    async def analyze_pcm(self, responses: Union[List[Dict], ResponseDigest]) -> Dict:
         """
         Analyze PCM (Process Communication Model)
 
@@ -245,12 +246,12 @@ class PsychologicalAnalysisService:
                 "stress_sequences": [...]
             }
         """
-        prompt = self._build_pcm_prompt(responses)
+        prompt = self._build_pcm_prompt(ResponseDigest.of(responses))
 
         try:
             result = await self.llm.generate(
                 prompt=prompt,
-                system=self._get_system_prompt("pcm"),
+                system=ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.3,
             )
 
@@ -262,7 +263,7 @@ class PsychologicalAnalysisService:
             logger.error(f"❌ PCM analysis error: {e}")
             return self._get_fallback_pcm()
 
-    async def analyze_vakog(self, responses: List[Dict]) -> Dict:
+    async def analyze_vakog(self, responses: Union[List[Dict], ResponseDigest]) -> Dict:
         """
         Analyze VAKOG (sensory preferences)
 
@@ -280,12 +281,12 @@ class PsychologicalAnalysisService:
                 "communication_preferences": [...]
             }
         """
-        prompt = self._build_vakog_prompt(responses)
+        prompt = self._build_vakog_prompt(ResponseDigest.of(responses))
 
         try:
             result = await self.llm.generate(
                 prompt=prompt,
-                system=self._get_system_prompt("vakog"),
+                system=ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.3,
             )
 
@@ -297,7 +298,7 @@ class PsychologicalAnalysisService:
             logger.error(f"❌ VAKOG analysis error: {e}")
             return self._get_fallback_vakog()
 
-    async def analyze_love_languages(self, responses: List[Dict]) -> Dict:
+    async def analyze_love_languages(self, responses: Union[List[Dict], ResponseDigest]) -> Dict:
         """
         Analyze Love Languages (Gary Chapman)
 
@@ -315,12 +316,12 @@ class PsychologicalAnalysisService:
                 "interpretation": "..."
             }
         """
-        prompt = self._build_love_languages_prompt(responses)
+        prompt = self._build_love_languages_prompt(ResponseDigest.of(responses))
 
         try:
             result = await self.llm.generate(
                 prompt=prompt,
-                system=self._get_system_prompt("love_languages"),
+                system=ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.3,
             )
 
@@ -332,7 +333,7 @@ class PsychologicalAnalysisService:
             logger.error(f"❌ Love Languages analysis error: {e}")
             return self._get_fallback_love_languages()
 
-    async def analyze_shinkofa_dimensions(self, responses: List[Dict]) -> Dict:
+    async def analyze_shinkofa_dimensions(self, responses: Union[List[Dict], ResponseDigest]) -> Dict:
         """
         Analyze Shinkofa-specific dimensions from responses
 
@@ -344,12 +345,12 @@ class PsychologicalAnalysisService:
                 "inner_dialogue": {"child": 60, "warrior": 75, "guide": 85, "sage": 70}
             }
         """
-        prompt = self._build_shinkofa_prompt(responses)
+        prompt = self._build_shinkofa_prompt(ResponseDigest.of(responses))
 
         try:
             result = await self.llm.generate(
                 prompt=prompt,
-                system=self._get_system_prompt("shinkofa"),
+                system=ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.3,
             )
 
@@ -977,15 +978,9 @@ Génère la synthèse holistique complète MAINTENANT.
 
     # ===== HELPER METHODS =====
 
-    def _build_mbti_prompt(self, responses: List[Dict]) -> str:
+    def _build_mbti_prompt(self, digest: ResponseDigest) -> str:
         """Build prompt for MBTI analysis"""
-        # Simplify responses for prompt
-        responses_summary = self._summarize_responses(responses)
-
-        return f"""Analyse les réponses suivantes pour déterminer le type MBTI (Myers-Briggs Type Indicator).
-
-**RÉPONSES QUESTIONNAIRE** :
-{responses_summary}
+        return digest.prompt("mbti", """Analyse les réponses ci-dessus pour déterminer le type MBTI (Myers-Briggs Type Indicator).
 
 **CONSIGNES** :
 1. Détermine les 4 dimensions MBTI :
@@ -997,25 +992,20 @@ Génère la synthèse holistique complète MAINTENANT.
 2. Calcule un score pour chaque dimension (-100 à +100)
 
 3. Retourne un JSON structuré **UNIQUEMENT** (pas de texte avant/après) :
-{{
+{
   "type": "INTJ",
-  "scores": {{"E_I": -60, "S_N": 40, "T_F": 30, "J_P": -20}},
+  "scores": {"E_I": -60, "S_N": 40, "T_F": 30, "J_P": -20},
   "description": "Description courte du type",
   "strengths": ["Force 1", "Force 2", "Force 3"],
   "challenges": ["Défi 1", "Défi 2", "Défi 3"]
-}}
+}
 
 IMPORTANT : Retourne UNIQUEMENT le JSON, sans aucun texte explicatif avant ou après.
-"""
+""")
 
-    def _build_big_five_prompt(self, responses: List[Dict]) -> str:
+    def _build_big_five_prompt(self, digest: ResponseDigest) -> str:
         """Build prompt for Big Five analysis"""
-        responses_summary = self._summarize_responses(responses)
-
-        return f"""Analyse les réponses suivantes pour déterminer les Big Five (OCEAN).
-
-**RÉPONSES QUESTIONNAIRE** :
-{responses_summary}
+        return digest.prompt("big_five", """Analyse les réponses ci-dessus pour déterminer les Big Five (OCEAN).
 
 **CONSIGNES** :
 Détermine les 5 traits (scores 0-100) :
@@ -1026,24 +1016,19 @@ Détermine les 5 traits (scores 0-100) :
 - Neuroticism (Neuroticisme) : Stabilité émotionnelle (score inversé)
 
 Retourne un JSON structuré **UNIQUEMENT** :
-{{
+{
   "openness": 85,
   "conscientiousness": 70,
   "extraversion": 40,
   "agreeableness": 75,
   "neuroticism": 55,
   "description": "Résumé profil en 2-3 phrases"
-}}
-"""
+}
+""")
 
-    def _build_enneagram_prompt(self, responses: List[Dict]) -> str:
+    def _build_enneagram_prompt(self, digest: ResponseDigest) -> str:
         """Build prompt for Enneagram analysis"""
-        responses_summary = self._summarize_responses(responses)
-
-        return f"""Analyse les réponses suivantes pour déterminer le type Ennéagramme.
-
-**RÉPONSES QUESTIONNAIRE** :
-{responses_summary}
+        return digest.prompt("enneagram", """Analyse les réponses ci-dessus pour déterminer le type Ennéagramme.
 
 **CONSIGNES** :
 Détermine :
@@ -1052,24 +1037,19 @@ Détermine :
 - Tritype (3 chiffres)
 
 Retourne un JSON structuré **UNIQUEMENT** :
-{{
+{
   "type": 5,
   "wing": 4,
   "tritype": "531",
   "description": "Description courte",
   "core_fear": "Peur centrale",
   "core_desire": "Désir central"
-}}
-"""
+}
+""")
 
-    def _build_neurodivergence_prompt(self, responses: List[Dict]) -> str:
+    def _build_neurodivergence_prompt(self, digest: ResponseDigest) -> str:
         """Build prompt for neurodivergence analysis with multi-dimensional scoring"""
-        responses_summary = self._summarize_responses(responses)
-
-        return f"""Analyse les réponses suivantes pour identifier les patterns de neurodivergence.
-
-**RÉPONSES QUESTIONNAIRE** :
-{responses_summary}
+        return digest.prompt("neurodivergence", """Analyse les réponses ci-dessus pour identifier les patterns de neurodivergence.
 
 ═══════════════════════════════════════════════════════════════
 ## 📊 MÉTHODOLOGIE DE SCORING (BASÉE SUR STANDARDS CLINIQUES)
@@ -1217,116 +1197,111 @@ Le score global est une MOYENNE PONDÉRÉE des dimensions, PAS un chiffre arbitr
 
 Retourne **UNIQUEMENT** ce JSON complet, sans texte avant/après :
 
-{{
-  "adhd": {{
+{
+  "adhd": {
     "score_global": 72,
     "profil": "inattention_predominante",
     "profil_label": "TDAH type Inattention prédominante",
-    "dimensions": {{"inattention": 85, "hyperactivite": 45, "impulsivite": 60, "dysregulation_emotionnelle": 70}},
+    "dimensions": {"inattention": 85, "hyperactivite": 45, "impulsivite": 60, "dysregulation_emotionnelle": 70},
     "manifestations_principales": ["Difficulté concentration", "Oublis fréquents", "Désorganisation"],
     "strategies_adaptation": ["Listes et rappels", "Fractionner tâches", "Environnement calme"]
-  }},
-  "autism": {{
+  },
+  "autism": {
     "score_global": 45,
     "profil": "traits_legers",
     "profil_label": "Traits autistiques légers",
-    "dimensions": {{"communication_sociale": 50, "interactions_sociales": 55, "interets_restreints": 40, "sensorialite": 35, "routines": 45}},
+    "dimensions": {"communication_sociale": 50, "interactions_sociales": 55, "interets_restreints": 40, "sensorialite": 35, "routines": 45},
     "manifestations_principales": [],
     "strategies_adaptation": []
-  }},
-  "hpi": {{
+  },
+  "hpi": {
     "score_global": 82,
     "profil": "complexe",
     "profil_label": "HPI Profil Complexe",
-    "dimensions": {{"intellectuelle": 90, "emotionnelle": 85, "creative": 75, "sensorielle": 70}},
+    "dimensions": {"intellectuelle": 90, "emotionnelle": 85, "creative": 75, "sensorielle": 70},
     "manifestations_principales": ["Pensée arborescente", "Besoin stimulation", "Intensité émotionnelle"],
     "strategies_adaptation": ["Projets complexes", "Temps récupération", "Canaliser créativité"]
-  }},
-  "multipotentiality": {{
+  },
+  "multipotentiality": {
     "score_global": 70,
     "profil_label": "Multipotentiel modéré",
     "manifestations_principales": ["Intérêts multiples", "Difficulté à choisir"],
     "strategies_adaptation": ["Portfolio career", "Rotation projets"]
-  }},
-  "hypersensitivity": {{
+  },
+  "hypersensitivity": {
     "score_global": 80,
     "types": ["emotionnelle", "sensorielle"],
     "profil_label": "Hypersensibilité émotionnelle et sensorielle",
-    "dimensions": {{"emotionnelle": 85, "sensorielle": 75}},
+    "dimensions": {"emotionnelle": 85, "sensorielle": 75},
     "manifestations_principales": ["Réactions émotionnelles intenses", "Sensibilité ambiances"],
     "strategies_adaptation": ["Temps seul", "Environnement contrôlé"]
-  }},
-  "toc": {{
+  },
+  "toc": {
     "score_global": 25,
     "profil_label": "Pas de TOC significatif",
-    "dimensions": {{"obsessions": 20, "compulsions": 25, "impact_fonctionnel": 15}},
+    "dimensions": {"obsessions": 20, "compulsions": 25, "impact_fonctionnel": 15},
     "manifestations_principales": [],
     "strategies_adaptation": []
-  }},
-  "dys": {{
+  },
+  "dys": {
     "score_global": 30,
     "profil_label": "Pas de trouble Dys- significatif",
     "types_detectes": [],
-    "dimensions": {{"lecture_ecriture": 25, "calcul_logique": 35, "coordination": 30, "langage_oral": 25}},
+    "dimensions": {"lecture_ecriture": 25, "calcul_logique": 35, "coordination": 30, "langage_oral": 25},
     "manifestations_principales": [],
     "strategies_adaptation": []
-  }},
-  "anxiety": {{
+  },
+  "anxiety": {
     "score_global": 55,
     "profil": "legere",
     "profil_label": "Anxiété légère",
-    "dimensions": {{"inquietude_chronique": 60, "symptomes_physiques": 50, "evitement": 45, "impact_social": 55}},
+    "dimensions": {"inquietude_chronique": 60, "symptomes_physiques": 50, "evitement": 45, "impact_social": 55},
     "manifestations_principales": ["Tendance à l'anticipation négative"],
     "strategies_adaptation": ["Techniques de relaxation", "Restructuration cognitive"]
-  }},
-  "bipolar": {{
+  },
+  "bipolar": {
     "score_global": 20,
     "profil_label": "Pas de bipolarité détectée",
-    "dimensions": {{"episodes_hauts": 15, "episodes_bas": 25, "cyclicite": 10, "impulsivite": 20}},
+    "dimensions": {"episodes_hauts": 15, "episodes_bas": 25, "cyclicite": 10, "impulsivite": 20},
     "manifestations_principales": [],
     "strategies_adaptation": []
-  }},
-  "ptsd": {{
+  },
+  "ptsd": {
     "score_global": 15,
     "profil_label": "Pas de SSPT détecté",
-    "dimensions": {{"reviviscences": 10, "evitement": 20, "hypervigilance": 15, "alterations_cognitives": 10}},
+    "dimensions": {"reviviscences": 10, "evitement": 20, "hypervigilance": 15, "alterations_cognitives": 10},
     "manifestations_principales": [],
     "strategies_adaptation": []
-  }},
-  "eating_disorder": {{
+  },
+  "eating_disorder": {
     "score_global": 25,
     "profil_label": "Pas de trouble alimentaire significatif",
     "types_detectes": [],
-    "dimensions": {{"relation_nourriture": 30, "image_corporelle": 25, "comportements_compensatoires": 15, "impact_sante": 20}},
+    "dimensions": {"relation_nourriture": 30, "image_corporelle": 25, "comportements_compensatoires": 15, "impact_sante": 20},
     "manifestations_principales": [],
     "strategies_adaptation": []
-  }},
-  "sleep_disorder": {{
+  },
+  "sleep_disorder": {
     "score_global": 45,
     "profil": "leger",
     "profil_label": "Difficultés de sommeil légères",
     "types_detectes": ["insomnie_legere"],
-    "dimensions": {{"endormissement": 50, "maintien_sommeil": 45, "qualite_recuperatrice": 40, "rythme_circadien": 35}},
+    "dimensions": {"endormissement": 50, "maintien_sommeil": 45, "qualite_recuperatrice": 40, "rythme_circadien": 35},
     "manifestations_principales": ["Difficultés occasionnelles d'endormissement"],
     "strategies_adaptation": ["Hygiène de sommeil", "Routine coucher régulière"]
-  }}
-}}
+  }
+}
 
 **RAPPEL CRITIQUE** :
 - TOUS les 12 types DOIVENT être présents dans la réponse
 - Le score global DOIT refléter la moyenne pondérée des dimensions
 - Score < 50 = "Pas de X détecté" avec profil_label approprié
 - Justifie chaque score par les réponses concrètes du questionnaire
-"""
+""")
 
-    def _build_shinkofa_prompt(self, responses: List[Dict]) -> str:
+    def _build_shinkofa_prompt(self, digest: ResponseDigest) -> str:
         """Build prompt for Shinkofa dimensions analysis"""
-        responses_summary = self._summarize_responses(responses)
-
-        return f"""Analyse les réponses suivantes pour déterminer les dimensions Shinkofa.
-
-**RÉPONSES QUESTIONNAIRE** :
-{responses_summary}
+        return digest.prompt("shinkofa", """Analyse les réponses ci-dessus pour déterminer les dimensions Shinkofa.
 
 **CONSIGNES** :
 Détermine :
@@ -1336,22 +1311,17 @@ Détermine :
 - Dialogue intérieur (Enfant, Guerrier, Guide, Sage - % activation)
 
 Retourne un JSON structuré **UNIQUEMENT** :
-{{
-  "life_wheel": {{"spiritual": 6, "mental": 8, "emotional": 5, "physical": 7, "social": 6, "professional": 8, "creative": 7, "financial": 5}},
-  "archetypes": {{"primary": "guide", "secondary": "creator", "tertiary": "warrior"}},
+{
+  "life_wheel": {"spiritual": 6, "mental": 8, "emotional": 5, "physical": 7, "social": 6, "professional": 8, "creative": 7, "financial": 5},
+  "archetypes": {"primary": "guide", "secondary": "creator", "tertiary": "warrior"},
   "limiting_paradigms": ["Je ne suis pas assez...", "Je dois toujours..."],
-  "inner_dialogue": {{"child": 60, "warrior": 75, "guide": 85, "sage": 70}}
-}}
-"""
+  "inner_dialogue": {"child": 60, "warrior": 75, "guide": 85, "sage": 70}
+}
+""")
 
-    def _build_pnl_prompt(self, responses: List[Dict]) -> str:
+    def _build_pnl_prompt(self, digest: ResponseDigest) -> str:
         """Build prompt for PNL meta-programs analysis"""
-        responses_summary = self._summarize_responses(responses)
-
-        return f"""Analyse les réponses suivantes pour déterminer les méta-programmes PNL.
-
-**RÉPONSES QUESTIONNAIRE** :
-{responses_summary}
+        return digest.prompt("pnl", """Analyse les réponses ci-dessus pour déterminer les méta-programmes PNL.
 
 **CONSIGNES** :
 Détermine les méta-programmes PNL principaux :
@@ -1365,7 +1335,7 @@ Détermine les méta-programmes PNL principaux :
 8. **Match/Mismatch** : Recherche similarités vs différences
 
 Retourne un JSON structuré **UNIQUEMENT** :
-{{
+{
   "toward_away": "toward",
   "internal_external": "internal",
   "options_procedures": "options",
@@ -1375,17 +1345,12 @@ Retourne un JSON structuré **UNIQUEMENT** :
   "global_specific": "global",
   "match_mismatch": "match",
   "description": "Résumé profil PNL en 2-3 phrases"
-}}
-"""
+}
+""")
 
-    def _build_pcm_prompt(self, responses: List[Dict]) -> str:
+    def _build_pcm_prompt(self, digest: ResponseDigest) -> str:
         """Build prompt for PCM analysis"""
-        responses_summary = self._summarize_responses(responses)
-
-        return f"""Analyse les réponses suivantes pour déterminer le profil PCM (Process Communication Model).
-
-**RÉPONSES QUESTIONNAIRE** :
-{responses_summary}
+        return digest.prompt("pcm", """Analyse les réponses ci-dessus pour déterminer le profil PCM (Process Communication Model).
 
 **CONSIGNES** :
 Détermine :
@@ -1396,25 +1361,20 @@ Détermine :
 5. **Canaux communication** : Préférés et à éviter
 
 Retourne un JSON structuré **UNIQUEMENT** :
-{{
+{
   "dominant_type": "persister",
   "base_type": "empathique",
   "phase_type": "persister",
   "drivers": ["Sois parfait", "Fais plaisir"],
-  "communication_channels": {{"preferred": ["Interrogatif"], "avoid": ["Directif"]}},
+  "communication_channels": {"preferred": ["Interrogatif"], "avoid": ["Directif"]},
   "stress_sequences": ["Driver → Masque → Cave"],
   "description": "Résumé profil PCM"
-}}
-"""
+}
+""")
 
-    def _build_vakog_prompt(self, responses: List[Dict]) -> str:
+    def _build_vakog_prompt(self, digest: ResponseDigest) -> str:
         """Build prompt for VAKOG analysis"""
-        responses_summary = self._summarize_responses(responses)
-
-        return f"""Analyse les réponses suivantes pour déterminer les préférences sensorielles VAKOG.
-
-**RÉPONSES QUESTIONNAIRE** :
-{responses_summary}
+        return digest.prompt("vakog", """Analyse les réponses ci-dessus pour déterminer les préférences sensorielles VAKOG.
 
 **CONSIGNES** :
 Détermine les canaux sensoriels dominants :
@@ -1427,29 +1387,24 @@ Détermine les canaux sensoriels dominants :
 Scores : 0-100 pour chaque canal
 
 Retourne un JSON structuré **UNIQUEMENT** :
-{{
+{
   "dominant_channel": "visual",
-  "scores": {{
+  "scores": {
     "visual": 85,
     "auditory": 60,
     "kinesthetic": 70,
     "olfactory": 40,
     "gustatory": 35
-  }},
+  },
   "learning_style": "Apprenant visuel - schémas, cartes mentales, vidéos",
   "communication_preferences": ["Montre-moi", "Vois-tu ce que je veux dire", "Je vois"],
   "description": "Résumé profil VAKOG"
-}}
-"""
+}
+""")
 
-    def _build_love_languages_prompt(self, responses: List[Dict]) -> str:
+    def _build_love_languages_prompt(self, digest: ResponseDigest) -> str:
         """Build prompt for Love Languages analysis"""
-        responses_summary = self._summarize_responses(responses)
-
-        return f"""Analyse les réponses suivantes pour déterminer les langages d'amour (Gary Chapman).
-
-**RÉPONSES QUESTIONNAIRE** :
-{responses_summary}
+        return digest.prompt("love_languages", """Analyse les réponses ci-dessus pour déterminer les langages d'amour (Gary Chapman).
 
 **CONSIGNES** :
 Détermine les 5 langages d'amour :
@@ -1462,123 +1417,20 @@ Détermine les 5 langages d'amour :
 Scores : 0-100 pour chaque langage
 
 Retourne un JSON structuré **UNIQUEMENT** :
-{{
+{
   "primary": "quality_time",
   "secondary": "words_of_affirmation",
-  "scores": {{
+  "scores": {
     "words_of_affirmation": 75,
     "quality_time": 90,
     "receiving_gifts": 45,
     "acts_of_service": 60,
     "physical_touch": 70
-  }},
+  },
   "interpretation": "Priorité temps de qualité, attention pleine. Apprécie aussi mots valorisants.",
   "description": "Résumé langages d'amour"
-}}
-"""
-
-    def _summarize_responses(self, responses: List[Dict], max_length: int = 8000) -> str:
-        """
-        Summarize questionnaire responses for prompt (V5.0)
-
-        Args:
-            responses: List of response dictionaries
-            max_length: Maximum character length for summary
-
-        Returns:
-            Formatted string summary with priority to free-form comments
-
-        V5.0 Changes:
-            - Extracts and prioritizes free-form comments from answer.comment
-            - Comments have PRIORITY over checkbox/radio values for AI analysis
-            - Increased max_length to 8000 to accommodate narrative context
-        """
-        summary_lines = []
-        comment_count = 0
-
-        for resp in responses[:70]:  # Increased from 50 to 70 to include more context
-            bloc = resp.get("bloc", "?")
-            question = resp.get("question_text", "")[:120]  # Increased from 100
-            answer = resp.get("answer", {})
-
-            # Format answer based on type (V5.0: handle AnswerValue structure)
-            if isinstance(answer, dict):
-                # V5.0: Extract value and comment separately
-                value = answer.get("value")
-                comment = answer.get("comment", "").strip()
-
-                # Format value (checkbox/radio/likert/text/number)
-                if isinstance(value, list):
-                    # Checkbox: join selected options
-                    value_str = ", ".join(str(v) for v in value[:3])  # Max 3 options displayed
-                    if len(value) > 3:
-                        value_str += f" (+{len(value)-3} autres)"
-                elif isinstance(value, dict):
-                    # Likert scale: show scores
-                    value_str = ", ".join(f"{k}:{v}" for k, v in value.items())
-                else:
-                    # Radio, text, number
-                    value_str = str(value)[:80] if value else ""
-
-                # V5.0: PRIORITIZE COMMENT over value
-                if comment:
-                    # Comment present: show it prominently with value as context
-                    comment_count += 1
-                    summary_lines.append(
-                        f"[{bloc}] {question[:100]}\n"
-                        f"  → Réponse: {value_str[:60]}\n"
-                        f"  💬 COMMENTAIRE (prioritaire): {comment[:300]}"
-                    )
-                else:
-                    # No comment: show value only
-                    summary_lines.append(f"[{bloc}] {question[:100]} → {value_str}")
-            else:
-                # Legacy format (not AnswerValue): just show the answer
-                answer_str = str(answer)[:80]
-                summary_lines.append(f"[{bloc}] {question[:100]} → {answer_str}")
-
-        summary = "\n".join(summary_lines)
-
-        # Add metadata header
-        summary = f"""📊 MÉTHODOLOGIE V5.0 ANTI-BIAIS :
-Les commentaires libres (💬) ont PRIORITÉ sur les cases cochées pour l'analyse.
-{comment_count} commentaires narratifs enrichissent l'analyse.
-
-═════════════════════════════════════════════════════════
-
-{summary}"""
-
-        # Truncate if too long (preserve priority comments at top)
-        if len(summary) > max_length:
-            summary = summary[:max_length] + "\n... (réponses tronquées - commentaires prioritaires conservés)"
-
-        return summary
-
-    def _get_system_prompt(self, analysis_type: str) -> str:
-        """Get system prompt for specific analysis type (V5.0)"""
-        # V5.0: Enhanced prompts with comment prioritization instructions
-        base_instruction = """
-
-MÉTHODOLOGIE V5.0 ANTI-BIAIS :
-- Les commentaires libres (💬 COMMENTAIRE) ont PRIORITÉ absolue sur les cases cochées
-- Privilégie les descriptions comportementales concrètes aux auto-évaluations
-- Les récits narratifs révèlent plus que les réponses binaires
-- Si conflit entre commentaire et case cochée → fais confiance au commentaire
-
-Retourne UNIQUEMENT un JSON valide, sans texte explicatif avant/après."""
-
-        prompts = {
-            "mbti": f"Tu es un expert en psychologie MBTI. Analyse les réponses avec rigueur.{base_instruction}",
-            "big_five": f"Tu es un expert en Big Five (OCEAN). Analyse les réponses avec rigueur.{base_instruction}",
-            "enneagram": f"Tu es un expert en Ennéagramme. Analyse les réponses avec rigueur.{base_instruction}",
-            "neurodivergence": f"Tu es un expert en neurodivergence (TDA(H), Autisme, HPI). Analyse les patterns avec bienveillance.{base_instruction}",
-            "pnl": f"Tu es un expert en PNL (Programmation Neuro-Linguistique). Analyse les méta-programmes.{base_instruction}",
-            "pcm": f"Tu es un expert en PCM (Process Communication Model). Analyse les types de personnalité.{base_instruction}",
-            "vakog": f"Tu es un expert en systèmes sensoriels VAKOG. Analyse les préférences.{base_instruction}",
-            "love_languages": f"Tu es un expert en langages d'amour (Gary Chapman). Analyse les préférences relationnelles.{base_instruction}",
-            "shinkofa": f"Tu es un expert en philosophie Shinkofa. Analyse les réponses avec sagesse.{base_instruction}",
-        }
-        return prompts.get(analysis_type, f"Tu es un expert en analyse psychologique.{base_instruction}")
+}
+""")
 
     def _parse_json_response(self, response: str, required_keys: List[str] = None) -> Dict:
         """
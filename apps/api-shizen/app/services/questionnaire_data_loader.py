@@ -1,11 +1,34 @@
 """
 Questionnaire Data Loader - Parse Markdown questions to JSON
 Shinkofa Platform - Holistic Questionnaire (144 questions - V5.1 optimized)
+
+The Markdown source is parsed once into a compiled JSON artifact
+(questionnaire-structure.compiled.json), stamped with the SHA-256 of the
+source so it is rebuilt when the Markdown changes.
+Build it ahead of time with:
+
+    python -m app.services.questionnaire_data_loader
 """
+import hashlib
+import json
+import logging
+import os
 import re
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
+from app.utils.http_cache import serialize_json, compute_etag
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+MARKDOWN_PATH = DATA_DIR / "Liste-Question-Questionnaire-Shizen-Complet.md"
+COMPILED_PATH = DATA_DIR / "questionnaire-structure.compiled.json"
+
+# Bump when the parser output changes, so stale artifacts get rebuilt
+COMPILED_FORMAT_VERSION = 2
+
 
 class QuestionnaireDataLoader:
     """
@@ -445,28 +468,146 @@ class QuestionnaireDataLoader:
             return "text"  # Default
 
 
-# Singleton instance for global access
-_loader_instance: Optional[QuestionnaireDataLoader] = None
+class CompiledQuestionnaire:
+    """
+    Parsed questionnaire with O(1) bloc/module lookups and pre-serialized payloads
 
+    Payloads (JSON bytes + ETag) are serialized lazily, once per resource.
+    """
 
-def get_questionnaire_data() -> Dict[str, Any]:
+    def __init__(self, data: Dict[str, Any], source_mtime_ns: int):
+        self.data = data
+        self.source_mtime_ns = source_mtime_ns
+        self.blocs: Dict[str, Dict[str, Any]] = {bloc["id"]: bloc for bloc in data["blocs"]}
+        self.modules: Dict[str, Dict[str, Any]] = {
+            module["id"]: module
+            for bloc in data["blocs"]
+            for module in bloc.get("modules", [])
+        }
+        self._payloads: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def payload(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Get (json_bytes, etag) for a resource
+
+        Args:
+            key: "structure", "bloc:<ID>" or "module:<ID>"
+
+        Returns:
+            Tuple (body, etag) or None if the bloc/module doesn't exist
+        """
+        cached = self._payloads.get(key)
+        if cached is not None:
+            return cached
+
+        kind, _, item_id = key.partition(":")
+        if kind == "structure":
+            obj = self.data
+        elif kind == "bloc":
+            obj = self.blocs.get(item_id)
+        elif kind == "module":
+            obj = self.modules.get(item_id)
+        else:
+            obj = None
+        if obj is None:
+            return None
+
+        body = serialize_json(obj)
+        with self._lock:
+            self._payloads[key] = (body, compute_etag(body))
+        return self._payloads[key]
+
+
+def _file_sha256(path: Path) -> str:
+    """SHA-256 of a file (identifies the source across deploys, unlike mtime)"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def compile_questionnaire(
+    markdown_path: Path = MARKDOWN_PATH,
+    compiled_path: Path = COMPILED_PATH,
+) -> Dict[str, Any]:
     """
-    Get questionnaire data (singleton pattern)
+    Parse the Markdown source and write the compiled JSON artifact
 
     Returns:
-        Structured questionnaire data as JSON
+        Parsed questionnaire data
     """
-    global _loader_instance
+    data = QuestionnaireDataLoader(str(markdown_path)).load_questions()
+
+    artifact = {
+        "format_version": COMPILED_FORMAT_VERSION,
+        "source_sha256": _file_sha256(markdown_path),
+        "data": data,
+    }
 
-    if _loader_instance is None:
-        # Path from app/data directory (accessible in Docker)
-        # File copied from: code-existant/Website-Shinkofa/Ressources/
-        markdown_path = Path(__file__).parent.parent / "data" / \
-                       "Liste-Question-Questionnaire-Shizen-Complet.md"
+    tmp_path = compiled_path.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(json.dumps(artifact, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, compiled_path)
+    except OSError as e:
+        # Read-only filesystem: keep serving from memory
+        logger.warning(f"Could not write compiled questionnaire artifact: {e}")
 
-        _loader_instance = QuestionnaireDataLoader(str(markdown_path))
+    return data
 
-    return _loader_instance.load_questions()
+
+def _load_compiled(markdown_path: Path, compiled_path: Path) -> Optional[Dict[str, Any]]:
+    """Load compiled artifact if it matches the current Markdown source"""
+    try:
+        artifact = json.loads(compiled_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if artifact.get("format_version") != COMPILED_FORMAT_VERSION:
+        return None
+    if artifact.get("source_sha256") != _file_sha256(markdown_path):
+        return None
+
+    return artifact.get("data")
+
+
+# Compiled questionnaire cache (invalidated by Markdown mtime)
+_compiled: Optional[CompiledQuestionnaire] = None
+_compiled_lock = threading.Lock()
+
+
+def get_compiled_questionnaire() -> CompiledQuestionnaire:
+    """
+    Get compiled questionnaire (parsed once, reloaded when the Markdown file changes)
+
+    Raises:
+        FileNotFoundError: If the Markdown source is missing
+    """
+    global _compiled
+
+    mtime_ns = MARKDOWN_PATH.stat().st_mtime_ns
+    compiled = _compiled
+    if compiled is not None and compiled.source_mtime_ns == mtime_ns:
+        return compiled
+
+    with _compiled_lock:
+        if _compiled is not None and _compiled.source_mtime_ns == mtime_ns:
+            return _compiled
+
+        data = _load_compiled(MARKDOWN_PATH, COMPILED_PATH)
+        if data is None:
+            logger.info("📋 Compiling questionnaire structure from Markdown source")
+            data = compile_questionnaire(MARKDOWN_PATH, COMPILED_PATH)
+
+        _compiled = CompiledQuestionnaire(data, mtime_ns)
+        return _compiled
+
+
+def get_questionnaire_data() -> Dict[str, Any]:
+    """
+    Get questionnaire data (compiled once, cached in memory)
+
+    Returns:
+        Structured questionnaire data as JSON
+    """
+    return get_compiled_questionnaire().data
 
 
 def get_bloc_questions(bloc_id: str) -> Optional[Dict[str, Any]]:
@@ -479,13 +620,7 @@ def get_bloc_questions(bloc_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Bloc data with questions or None if not found
     """
-    data = get_questionnaire_data()
-
-    for bloc in data.get("blocs", []):
-        if bloc.get("id") == bloc_id.upper():
-            return bloc
-
-    return None
+    return get_compiled_questionnaire().blocs.get(bloc_id.upper())
 
 
 def get_module_questions(module_id: str) -> Optional[Dict[str, Any]]:
@@ -498,11 +633,10 @@ def get_module_questions(module_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Module data with questions or None if not found
     """
-    data = get_questionnaire_data()
+    return get_compiled_questionnaire().modules.get(module_id.upper())
 
-    for bloc in data.get("blocs", []):
-        for module in bloc.get("modules", []):
-            if module.get("id") == module_id.upper():
-                return module
 
-    return None
+if __name__ == "__main__":
+    compiled_data = compile_questionnaire()
+    print(f"✅ Compiled {compiled_data['total_questions']} questions "
+          f"({compiled_data['total_blocs']} blocs) → {COMPILED_PATH}")
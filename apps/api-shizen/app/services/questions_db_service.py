@@ -1,11 +1,194 @@
 """
 Questions Database Service - Load questions from PostgreSQL with i18n support
 Shinkofa Platform - Multilingual Questionnaire (FR/EN/ES)
+
+Questions are served from a versioned in-memory catalog (one per locale).
+The catalog is loaded once from the `questions` table and reloaded when the
+`catalog_versions` row for "questions" is bumped (admin edits).
 """
-from typing import List, Dict, Any, Optional
+import asyncio
+import logging
+import os
+import re
+import threading
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+
 from app.models.question import Question
+from app.models.catalog_version import CatalogVersion
+from app.utils.http_cache import serialize_json, compute_etag
+
+logger = logging.getLogger(__name__)
+
+QUESTIONS_CATALOG = "questions"
+SUPPORTED_LOCALES = ("fr", "en", "es")
+
+# How often workers check catalog_versions for admin edits (seconds)
+CATALOG_POLL_SECONDS = int(os.getenv("QUESTION_CATALOG_POLL_SECONDS", "30"))
+
+_BLOC_LETTER_PATTERN = re.compile(r"BLOC ([A-I]) :")
+
+
+class LocaleCatalog:
+    """
+    All questions for one locale with O(1) lookups and pre-serialized payloads
+    """
+
+    def __init__(self, locale: str, questions: List[Dict[str, Any]], bloc_letters: List[Optional[str]]):
+        self.locale = locale
+        self.questions = questions
+        self.by_number: Dict[int, Dict[str, Any]] = {q["number"]: q for q in questions}
+
+        self.by_bloc_letter: Dict[str, List[Dict[str, Any]]] = {}
+        for question, letter in zip(questions, bloc_letters):
+            if letter:
+                self.by_bloc_letter.setdefault(letter, []).append(question)
+
+        self.grouped_by_bloc: Dict[str, List[Dict[str, Any]]] = {}
+        for question in questions:
+            self.grouped_by_bloc.setdefault(question["bloc"], []).append(question)
+
+        self._payloads: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def payload(self, key: str, build: Callable[[], Any]) -> Tuple[bytes, str]:
+        """
+        Get (json_bytes, etag) for a response, serializing it on first use
+
+        Args:
+            key: Cache key (e.g., "questions", "bloc:A", "structure")
+            build: Builds the response object if not cached yet
+        """
+        cached = self._payloads.get(key)
+        if cached is not None:
+            return cached
+
+        body = serialize_json(build())
+        with self._lock:
+            self._payloads[key] = (body, compute_etag(body))
+        return self._payloads[key]
+
+
+class QuestionCatalog:
+    """
+    Versioned in-memory question catalog shared by all requests of a worker
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._locales: Dict[str, LocaleCatalog] = {}
+        self._stale = True
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def read_version(db: Session) -> int:
+        """Read current catalog version (0 if the version row/table is missing)"""
+        try:
+            version = db.query(CatalogVersion.version).filter(
+                CatalogVersion.name == QUESTIONS_CATALOG
+            ).scalar()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Could not read questions catalog version: {e}")
+            return 0
+        return version or 0
+
+    def load(self, db: Session) -> None:
+        """(Re)load all locales from the questions table"""
+        with self._lock:
+            version = self.read_version(db)
+            rows = db.query(Question).order_by(Question.number).all()
+
+            bloc_letters = []
+            for row in rows:
+                match = _BLOC_LETTER_PATTERN.search(row.bloc_fr or "")
+                bloc_letters.append(match.group(1) if match else None)
+
+            self._locales = {
+                locale: LocaleCatalog(locale, [row.to_dict(locale) for row in rows], bloc_letters)
+                for locale in SUPPORTED_LOCALES
+            }
+            self.version = version
+            self._stale = False
+
+        logger.info(f"📚 Question catalog loaded: {len(rows)} questions, version {version}")
+
+    def invalidate(self) -> None:
+        """Mark catalog stale (reloaded on next access)"""
+        self._stale = True
+
+    def get(self, locale: str, db: Session) -> LocaleCatalog:
+        """
+        Get catalog for a locale (loads from DB only on first use or after invalidation)
+
+        Unsupported locales fall back to French, like Question.get_text().
+        """
+        if self._stale or not self._locales:
+            self.load(db)
+        return self._locales.get(locale) or self._locales["fr"]
+
+    def refresh_if_changed(self, db: Session) -> bool:
+        """Reload if the version row was bumped by another worker; returns True if reloaded"""
+        if self._stale or self.version is None:
+            return False  # Nothing loaded yet: next request loads it
+        if self.read_version(db) == self.version:
+            return False
+        self.load(db)
+        return True
+
+
+# Worker-wide catalog instance
+_question_catalog = QuestionCatalog()
+
+
+def get_question_catalog() -> QuestionCatalog:
+    """Get the worker-wide question catalog"""
+    return _question_catalog
+
+
+def bump_questions_catalog_version(db: Session) -> None:
+    """
+    Bump the questions catalog version (call after editing questions)
+
+    Other workers pick up the change on their next poll; this worker
+    is invalidated immediately.
+    """
+    result = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.name == QUESTIONS_CATALOG)
+        .values(version=CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(CatalogVersion(name=QUESTIONS_CATALOG, version=1))
+    db.commit()
+    _question_catalog.invalidate()
+
+
+async def run_catalog_refresher(session_factory: Callable[[], Session], interval: int = CATALOG_POLL_SECONDS) -> None:
+    """
+    Background task: poll catalog_versions and reload the catalog off the request path
+
+    Args:
+        session_factory: Synchronous session factory (e.g., SessionLocal)
+        interval: Poll interval in seconds
+    """
+    def check() -> bool:
+        db = session_factory()
+        try:
+            return _question_catalog.refresh_if_changed(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await asyncio.to_thread(check):
+                logger.info(f"🔄 Question catalog reloaded (version {_question_catalog.version})")
+        except Exception as e:
+            logger.warning(f"Question catalog refresh failed: {e}")
 
 
 class QuestionsDBService:
@@ -14,6 +197,10 @@ class QuestionsDBService:
     def __init__(self, db: Session):
         self.db = db
 
+    def get_catalog(self, locale: str = "fr") -> LocaleCatalog:
+        """Get in-memory catalog for a locale"""
+        return get_question_catalog().get(locale, self.db)
+
     def get_all_questions(self, locale: str = "fr") -> List[Dict[str, Any]]:
         """
         Get all 144 questions with translations
@@ -24,28 +211,7 @@ class QuestionsDBService:
         Returns:
             List of question dicts with translated fields
         """
-        # Fetch all questions ordered by number
-        questions = self.db.query(Question).order_by(Question.number).all()
-
-        # Convert to dict with translated fields
-        result = []
-        for q in questions:
-            question_dict = {
-                "id": q.id,
-                "number": q.number,
-                "text": q.get_text(locale),
-                "bloc": q.get_bloc(locale),
-                "module": q.get_module(locale),
-                "type": q.type,
-                "options": q.get_options(locale),
-                "annotation": q.get_annotation(locale),
-                "comment_label": q.get_comment_label(locale),
-                "is_required": q.is_required,
-                "line_number": q.line_number
-            }
-            result.append(question_dict)
-
-        return result
+        return self.get_catalog(locale).questions
 
     def get_question_by_number(self, number: int, locale: str = "fr") -> Optional[Dict[str, Any]]:
         """
@@ -58,24 +224,7 @@ class QuestionsDBService:
         Returns:
             Question dict or None if not found
         """
-        question = self.db.query(Question).filter(Question.number == number).first()
-
-        if not question:
-            return None
-
-        return {
-            "id": question.id,
-            "number": question.number,
-            "text": question.get_text(locale),
-            "bloc": question.get_bloc(locale),
-            "module": question.get_module(locale),
-            "type": question.type,
-            "options": question.get_options(locale),
-            "annotation": question.get_annotation(locale),
-            "comment_label": question.get_comment_label(locale),
-            "is_required": question.is_required,
-            "line_number": question.line_number
-        }
+        return self.get_catalog(locale).by_number.get(number)
 
     def get_questions_by_bloc(self, bloc_letter: str, locale: str = "fr") -> List[Dict[str, Any]]:
         """
@@ -88,31 +237,7 @@ class QuestionsDBService:
         Returns:
             List of question dicts filtered by bloc
         """
-        # Build bloc pattern to match (e.g., "🏠 BLOC A : ...")
-        bloc_pattern = f"%BLOC {bloc_letter.upper()} :%"
-
-        questions = self.db.query(Question).filter(
-            Question.bloc_fr.like(bloc_pattern)
-        ).order_by(Question.number).all()
-
-        result = []
-        for q in questions:
-            question_dict = {
-                "id": q.id,
-                "number": q.number,
-                "text": q.get_text(locale),
-                "bloc": q.get_bloc(locale),
-                "module": q.get_module(locale),
-                "type": q.type,
-                "options": q.get_options(locale),
-                "annotation": q.get_annotation(locale),
-                "comment_label": q.get_comment_label(locale),
-                "is_required": q.is_required,
-                "line_number": q.line_number
-            }
-            result.append(question_dict)
-
-        return result
+        return self.get_catalog(locale).by_bloc_letter.get(bloc_letter.upper(), [])
 
     def get_questions_grouped_by_bloc(self, locale: str = "fr") -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -124,17 +249,7 @@ class QuestionsDBService:
         Returns:
             Dict with bloc names as keys and question lists as values
         """
-        all_questions = self.get_all_questions(locale)
-
-        # Group by bloc
-        blocs = {}
-        for q in all_questions:
-            bloc_name = q["bloc"]
-            if bloc_name not in blocs:
-                blocs[bloc_name] = []
-            blocs[bloc_name].append(q)
-
-        return blocs
+        return self.get_catalog(locale).grouped_by_bloc
 
     def get_available_locales(self) -> List[str]:
         """
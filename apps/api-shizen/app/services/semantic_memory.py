@@ -0,0 +1,623 @@
+"""
+Semantic Memory - Embedding index over a user's history
+Shinkofa Platform - Shizen AI Chatbot
+
+The rolling summary (conversation_memory) only covers the current
+conversation. This service lets Shizen recall relevant facts from everything
+the user shared before: past conversations, journal entries, holistic
+profile synthesis.
+
+- Indexing runs in the background (run_memory_indexer, started by the app
+  lifespan): new/updated rows are chunked, embedded by a local
+  sentence-transformers model and stored in memory_items. Each source table
+  is followed with a (timestamp, id) watermark, so only new rows are embedded.
+  Every API worker runs the indexer, but a pass only runs in the worker
+  holding a PostgreSQL advisory lock; the others skip it.
+- Retrieval happens at prompt time: the user message is embedded and the
+  top-k closest snippets (cosine similarity) are injected in the prompt
+  within RETRIEVAL_TOKEN_BUDGET.
+
+Vectors are stored as float32 bytes in the database and searched per user
+with an in-memory FAISS flat index (numpy fallback), cached for the most
+recently active users. Cache entries expire after MEMORY_CACHE_SECONDS:
+another worker may have indexed new rows since they were loaded.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
+
+from app.core.executors import run_blocking
+from app.core.metrics import record_cache
+from app.models import (
+    ConversationSession,
+    ConversationStatus,
+    DailyJournal,
+    HolisticProfile,
+    MemoryIndexState,
+    MemoryItem,
+    Message,
+    MessageRole,
+)
+from app.services.conversation_memory import estimate_tokens, truncate_to_tokens
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+logger = logging.getLogger(__name__)
+
+# Local multilingual model (FR/EN/ES), 384 dimensions
+EMBEDDING_MODEL = os.getenv("SHIZEN_EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2")
+
+# Retrieval
+MEMORY_TOP_K = int(os.getenv("SHIZEN_MEMORY_TOP_K", "4"))
+MEMORY_MIN_SCORE = float(os.getenv("SHIZEN_MEMORY_MIN_SCORE", "0.35"))
+RETRIEVAL_TOKEN_BUDGET = int(os.getenv("SHIZEN_RETRIEVAL_TOKEN_BUDGET", "300"))
+CACHED_USERS = int(os.getenv("SHIZEN_MEMORY_CACHED_USERS", "256"))
+MEMORY_CACHE_SECONDS = int(os.getenv("SHIZEN_MEMORY_CACHE_SECONDS", "60"))
+
+# Indexing
+INDEX_POLL_SECONDS = int(os.getenv("SHIZEN_MEMORY_INDEX_POLL_SECONDS", "15"))
+INDEX_BATCH_ROWS = 64
+# Rows younger than this may still be in uncommitted transactions: index them next pass
+INDEX_LAG_SECONDS = 5
+CHUNK_CHARS = 800
+MIN_MESSAGE_CHARS = 20  # "ok", "merci"... carry nothing worth recalling
+# pg_try_advisory_lock key of the indexer pass (one worker indexes at a time)
+INDEXER_LOCK_KEY = 0x5A454E01
+
+SOURCE_MESSAGE = "message"
+SOURCE_JOURNAL = "journal"
+SOURCE_PROFILE = "profile"
+
+
+class LocalEmbedder:
+    """sentence-transformers model, loaded on first use (in an executor thread)"""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """L2-normalized float32 vectors, one row per text (blocking)"""
+        with self._lock:
+            if self._model is None:
+                logger.info(f"🧠 Loading embedding model {self.model_name}")
+                self._model = SentenceTransformer(self.model_name)
+        vectors = self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def chunk_text(text: str, max_chars: int = CHUNK_CHARS) -> List[str]:
+    """Split text into chunks of at most max_chars, on paragraph then word boundaries"""
+    chunks: List[str] = []
+    current = ""
+    for paragraph in (p.strip() for p in text.split("\n")):
+        if not paragraph:
+            continue
+        while len(paragraph) > max_chars:
+            cut = paragraph[:max_chars].rsplit(" ", 1)[0] or paragraph[:max_chars]
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(cut)
+            paragraph = paragraph[len(cut):].strip()
+        if current and len(current) + len(paragraph) + 1 > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def journal_text(journal: DailyJournal) -> str:
+    """Readable text of a journal entry (empty fields skipped)"""
+    parts = []
+    if journal.intentions:
+        parts.append(f"Intentions: {journal.intentions}")
+    if journal.gratitudes:
+        parts.append(f"Gratitudes: {', '.join(str(g) for g in journal.gratitudes if g)}")
+    if journal.successes:
+        parts.append(f"Réussites: {', '.join(str(s) for s in journal.successes if s)}")
+    if journal.learning:
+        parts.append(f"Apprentissage: {journal.learning}")
+    if journal.adjustments:
+        parts.append(f"Ajustements: {journal.adjustments}")
+    if not parts:
+        return ""
+    return "\n".join([f"Énergie {journal.energy_morning}/10 le matin, {journal.energy_evening}/10 le soir"] + parts)
+
+
+def profile_text(profile: HolisticProfile) -> str:
+    """Synthesis and recommendations of a holistic profile"""
+    parts = [profile.synthesis or ""]
+    recommendations = profile.recommendations
+    if isinstance(recommendations, dict):
+        for key, value in recommendations.items():
+            items = value if isinstance(value, list) else [value]
+            parts.append(f"{key}: " + "; ".join(str(i) for i in items if i))
+    elif isinstance(recommendations, list):
+        parts.extend(str(r) for r in recommendations if r)
+    return "\n".join(p for p in parts if p.strip())
+
+
+class UserVectors:
+    """One user's embedded snippets, searchable by cosine similarity"""
+
+    def __init__(self, items: List[Dict[str, Any]], matrix: np.ndarray):
+        self.items = items
+        self.matrix = matrix
+        self._index = None
+        if faiss is not None and len(items):
+            self._index = faiss.IndexFlatIP(matrix.shape[1])
+            self._index.add(matrix)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        exclude_scope: Optional[str] = None,
+        min_score: float = MEMORY_MIN_SCORE,
+    ) -> List[Dict[str, Any]]:
+        """Top-k items above min_score (items of exclude_scope skipped)"""
+        if not self.items:
+            return []
+        # Over-fetch so excluded items do not starve the result
+        fetch = min(len(self.items), k * 4)
+        if self._index is not None:
+            scores, positions = self._index.search(query.reshape(1, -1), fetch)
+            ranked = zip(scores[0].tolist(), positions[0].tolist())
+        else:
+            all_scores = self.matrix @ query
+            top = np.argpartition(-all_scores, fetch - 1)[:fetch]
+            top = top[np.argsort(-all_scores[top])]
+            ranked = ((float(all_scores[i]), int(i)) for i in top)
+
+        results = []
+        for score, position in ranked:
+            if position < 0 or score < min_score:
+                continue
+            item = self.items[position]
+            if exclude_scope and item["scope"] == exclude_scope:
+                continue
+            results.append({**item, "score": score})
+            if len(results) == k:
+                break
+        return results
+
+
+def format_retrieved_section(items: Optional[List[Dict[str, Any]]], budget: int = RETRIEVAL_TOKEN_BUDGET) -> str:
+    """
+    Retrieved snippets block of the agent prompt, within `budget` tokens
+
+    Items come best match first; the last one that fits is truncated.
+    """
+    if not items:
+        return ""
+
+    labels = {
+        SOURCE_MESSAGE: "Conversation du {date}",
+        SOURCE_JOURNAL: "Journal du {date}",
+        SOURCE_PROFILE: "Profil holistique",
+    }
+    lines: List[str] = []
+    remaining = budget
+    for item in items:
+        created_at = item.get("source_created_at")
+        label = labels.get(item["source_type"], "Souvenir").format(
+            date=created_at.strftime("%d/%m/%Y") if created_at else "?"
+        )
+        line = f"- [{label}] {' '.join(item['text'].split())}"
+        cost = estimate_tokens(line)
+        if cost > remaining:
+            if remaining > 20:
+                lines.append(truncate_to_tokens(line, remaining))
+            break
+        lines.append(line)
+        remaining -= cost
+
+    if not lines:
+        return ""
+    return "\n**SOUVENIRS PERTINENTS** (échanges et journaux passés) :\n" + "\n".join(lines) + "\n"
+
+
+def _vector_bytes(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _insert(db: AsyncSession):
+    """Dialect-specific INSERT supporting ON CONFLICT (PostgreSQL in prod, SQLite in tests)"""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite.insert(MemoryItem)
+    return postgresql.insert(MemoryItem)
+
+
+class SemanticMemoryService:
+    """Background indexing + per-user top-k retrieval"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        embedder=None,
+        cache_ttl: int = MEMORY_CACHE_SECONDS,
+    ):
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        if embedder is None:
+            embedder = get_local_embedder()
+
+        self.session_factory = session_factory
+        self.embedder = embedder
+        self.cache_ttl = cache_ttl
+        self._cache: "OrderedDict[str, Tuple[float, UserVectors]]" = OrderedDict()
+
+        if embedder is None:
+            logger.warning("⚠️ sentence-transformers not installed: semantic memory disabled")
+
+    @property
+    def enabled(self) -> bool:
+        return self.embedder is not None
+
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        return await run_blocking("embeddings", self.embedder.embed, texts)
+
+    # ------------------------------------------------------------------
+    # Retrieval
+    # ------------------------------------------------------------------
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        db: AsyncSession,
+        k: int = MEMORY_TOP_K,
+        exclude_scope: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Snippets of the user's history most similar to `query`
+
+        Args:
+            user_id: Owner of the memory
+            query: Text to match (usually the incoming user message)
+            db: Async database session
+            k: Max snippets returned
+            exclude_scope: Skip messages of this conversation (already in the prompt)
+
+        Returns:
+            Items (text, source_type, source_created_at, score), best first.
+            Empty when disabled or on failure: retrieval never blocks a reply.
+        """
+        if not self.enabled or not query.strip():
+            return []
+        try:
+            vectors = self._cached(user_id)
+            if vectors is None:
+                # Savepoint: a failed lookup must not discard the caller's pending work
+                async with db.begin_nested():
+                    vectors = await self._load_vectors(user_id, db)
+            if not len(vectors):
+                return []
+            query_vector = (await self._embed([query]))[0]
+            return vectors.search(query_vector, k, exclude_scope)
+        except SQLAlchemyError as e:
+            logger.warning(f"⚠️ Semantic memory lookup failed for user {user_id}: {e}")
+        except Exception as e:
+            logger.warning(f"⚠️ Semantic memory search failed for user {user_id}: {e}")
+        return []
+
+    def _cached(self, user_id: str) -> Optional[UserVectors]:
+        """Cached vectors of a user, None if missing or expired"""
+        entry = self._cache.get(user_id)
+        if entry is not None and entry[0] < time.monotonic():
+            del self._cache[user_id]
+            entry = None
+        record_cache("memory_vectors", hit=entry is not None)
+        if entry is None:
+            return None
+        self._cache.move_to_end(user_id)
+        return entry[1]
+
+    async def _load_vectors(self, user_id: str, db: AsyncSession) -> UserVectors:
+        """Load a user's vectors from memory_items and cache them"""
+        result = await db.execute(
+            select(
+                MemoryItem.text,
+                MemoryItem.source_type,
+                MemoryItem.scope,
+                MemoryItem.source_created_at,
+                MemoryItem.dimensions,
+                MemoryItem.embedding,
+            ).where(
+                MemoryItem.user_id == user_id,
+                MemoryItem.model == self.embedder.model_name,
+                # Messages of deleted conversations are never recalled
+                or_(
+                    MemoryItem.scope.is_(None),
+                    MemoryItem.scope.notin_(
+                        select(ConversationSession.id).where(
+                            ConversationSession.user_id == user_id,
+                            ConversationSession.status == ConversationStatus.DELETED,
+                        )
+                    ),
+                ),
+            )
+        )
+        rows = result.all()
+        dimensions = rows[0].dimensions if rows else 0
+        rows = [row for row in rows if row.dimensions == dimensions]
+        items = [
+            {
+                "text": row.text,
+                "source_type": row.source_type,
+                "scope": row.scope,
+                "source_created_at": row.source_created_at,
+            }
+            for row in rows
+        ]
+        matrix = (
+            np.frombuffer(b"".join(row.embedding for row in rows), dtype=np.float32).reshape(len(rows), dimensions)
+            if rows else np.zeros((0, 0), dtype=np.float32)
+        )
+        vectors = UserVectors(items, matrix)
+
+        self._cache[user_id] = (time.monotonic() + self.cache_ttl, vectors)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > CACHED_USERS:
+            self._cache.popitem(last=False)
+        return vectors
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's cached vectors (reloaded on next search)"""
+        self._cache.pop(user_id, None)
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    async def index_pending(self) -> int:
+        """
+        Embed every row written since the last pass
+
+        Returns:
+            Number of source rows processed (0 when another worker holds the indexer lock)
+        """
+        if not self.enabled:
+            return 0
+        total = 0
+        async with self._indexer_lock() as leader:
+            if not leader:
+                return 0
+            for source_type in (SOURCE_MESSAGE, SOURCE_JOURNAL, SOURCE_PROFILE):
+                while True:
+                    processed = await self._index_batch(source_type)
+                    total += processed
+                    if processed < INDEX_BATCH_ROWS:
+                        break
+        return total
+
+    @asynccontextmanager
+    async def _indexer_lock(self):
+        """
+        Yield True if this worker may run an indexing pass
+
+        PostgreSQL: session advisory lock held for the pass (released on exit, or
+        by the server if the worker dies). Other databases (SQLite in tests) have
+        a single process: always True.
+        """
+        async with self.session_factory() as db:
+            if db.bind.dialect.name != "postgresql":
+                yield True
+                return
+            acquired = await db.scalar(select(func.pg_try_advisory_lock(INDEXER_LOCK_KEY)))
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    await db.execute(select(func.pg_advisory_unlock(INDEXER_LOCK_KEY)))
+                    await db.commit()
+
+    async def _index_batch(self, source_type: str) -> int:
+        """Embed the next batch of one source and advance its watermark"""
+        async with self.session_factory() as db:
+            state = await db.get(MemoryIndexState, source_type)
+            position = (state.watermark_at, state.watermark_id) if state else None
+            horizon = datetime.now(timezone.utc) - timedelta(seconds=INDEX_LAG_SECONDS)
+
+            fetch = {
+                SOURCE_MESSAGE: self._fetch_messages,
+                SOURCE_JOURNAL: self._fetch_journals,
+                SOURCE_PROFILE: self._fetch_profiles,
+            }[source_type]
+            rows, chunks, stale_filters = await fetch(db, position, horizon)
+            if not rows:
+                return 0
+
+            vectors = await self._embed([chunk["text"] for chunk in chunks]) if chunks else []
+            for stale in stale_filters:
+                await db.execute(delete(MemoryItem).where(*stale))
+            now = datetime.now(timezone.utc)
+            if chunks:
+                # Chunk ids are deterministic: a row embedded twice keeps its first vector
+                await db.execute(_insert(db).values([
+                    {
+                        **chunk,
+                        "model": self.embedder.model_name,
+                        "dimensions": int(vector.shape[0]),
+                        "embedding": _vector_bytes(vector),
+                        "indexed_at": now,
+                    }
+                    for chunk, vector in zip(chunks, vectors)
+                ]).on_conflict_do_nothing(index_elements=["id"]))
+
+            last_at, last_id = rows[-1]
+            if state is None:
+                db.add(MemoryIndexState(source_type=source_type, watermark_at=last_at, watermark_id=last_id))
+            else:
+                state.watermark_at, state.watermark_id = last_at, last_id
+            await db.commit()
+
+        for user_id in {chunk["user_id"] for chunk in chunks}:
+            self.invalidate(user_id)
+        return len(rows)
+
+    @staticmethod
+    def _after(sort_key, position: Optional[Tuple[datetime, str]], horizon: datetime, timestamp_column):
+        """Keyset predicates: strictly after the watermark, older than the lag horizon"""
+        predicates = [timestamp_column <= horizon]
+        if position is not None:
+            predicates.append(sort_key > tuple_(*position))
+        return predicates
+
+    @staticmethod
+    def _chunks(user_id: str, source_type: str, source_id: str, text: str, created_at: datetime, scope: Optional[str] = None) -> List[Dict]:
+        return [
+            {
+                "id": f"{source_type}:{source_id}:{index}",
+                "user_id": user_id,
+                "source_type": source_type,
+                "source_id": source_id,
+                "scope": scope,
+                "text": chunk,
+                "source_created_at": created_at,
+            }
+            for index, chunk in enumerate(chunk_text(text))
+        ]
+
+    async def _fetch_messages(self, db: AsyncSession, position, horizon):
+        """User messages (append-only: no stale chunks to remove)"""
+        sort_key = tuple_(Message.created_at, Message.id)
+        result = await db.execute(
+            select(Message.id, Message.content, Message.created_at, Message.conversation_id, ConversationSession.user_id)
+            .join(ConversationSession, ConversationSession.id == Message.conversation_id)
+            .where(
+                Message.role == MessageRole.USER,
+                *self._after(sort_key, position, horizon, Message.created_at),
+            )
+            .order_by(Message.created_at, Message.id)
+            .limit(INDEX_BATCH_ROWS)
+        )
+        rows = result.all()
+        chunks = []
+        for row in rows:
+            if len(row.content.strip()) >= MIN_MESSAGE_CHARS:
+                chunks += self._chunks(row.user_id, SOURCE_MESSAGE, row.id, row.content, row.created_at, scope=row.conversation_id)
+        return [(row.created_at, row.id) for row in rows], chunks, []
+
+    async def _fetch_journals(self, db: AsyncSession, position, horizon):
+        """Created or edited journals (previous chunks of an edited entry replaced)"""
+        sort_key = tuple_(DailyJournal.updated_at, DailyJournal.id)
+        result = await db.execute(
+            select(DailyJournal)
+            .where(*self._after(sort_key, position, horizon, DailyJournal.updated_at))
+            .order_by(DailyJournal.updated_at, DailyJournal.id)
+            .limit(INDEX_BATCH_ROWS)
+        )
+        journals = result.scalars().all()
+        chunks = []
+        for journal in journals:
+            created_at = datetime.combine(journal.date, datetime.min.time(), tzinfo=timezone.utc)
+            chunks += self._chunks(journal.user_id, SOURCE_JOURNAL, journal.id, journal_text(journal), created_at)
+        stale = []
+        if journals:
+            stale.append((
+                MemoryItem.source_type == SOURCE_JOURNAL,
+                MemoryItem.source_id.in_([j.id for j in journals]),
+            ))
+        return [(j.updated_at, j.id) for j in journals], chunks, stale
+
+    async def _fetch_profiles(self, db: AsyncSession, position, horizon):
+        """Changed profiles: only the active version of a user stays indexed"""
+        sort_key = tuple_(HolisticProfile.updated_at, HolisticProfile.id)
+        result = await db.execute(
+            select(HolisticProfile)
+            .options(noload(HolisticProfile.sections))  # Synthesis and recommendations only
+            .where(*self._after(sort_key, position, horizon, HolisticProfile.updated_at))
+            .order_by(HolisticProfile.updated_at, HolisticProfile.id)
+            .limit(INDEX_BATCH_ROWS)
+        )
+        profiles = result.scalars().all()
+        chunks = []
+        stale = []
+        for profile in profiles:
+            if profile.is_active:
+                # New active version replaces every profile chunk of the user
+                stale.append((MemoryItem.source_type == SOURCE_PROFILE, MemoryItem.user_id == profile.user_id))
+                chunks = [c for c in chunks if c["user_id"] != profile.user_id]
+                chunks += self._chunks(profile.user_id, SOURCE_PROFILE, profile.id, profile_text(profile), profile.generated_at)
+            else:
+                stale.append((MemoryItem.source_type == SOURCE_PROFILE, MemoryItem.source_id == profile.id))
+                chunks = [c for c in chunks if c["source_id"] != profile.id]
+        return [(p.updated_at, p.id) for p in profiles], chunks, stale
+
+
+async def run_memory_indexer(service: Optional[SemanticMemoryService] = None, interval: int = INDEX_POLL_SECONDS) -> None:
+    """
+    Background task: embed new messages, journals and profiles
+
+    Args:
+        service: Semantic memory service (singleton by default)
+        interval: Poll interval in seconds
+    """
+    service = service or get_semantic_memory_service()
+    if not service.enabled:
+        return
+
+    while True:
+        try:
+            processed = await service.index_pending()
+            if processed:
+                logger.info(f"🧠 Semantic memory indexed {processed} rows")
+        except Exception as e:
+            logger.warning(f"Semantic memory indexing failed: {e}")
+        await asyncio.sleep(interval)
+
+
+# Singleton instances
+_local_embedder: Optional[LocalEmbedder] = None
+_semantic_memory_service: Optional[SemanticMemoryService] = None
+
+
+def get_local_embedder() -> Optional[LocalEmbedder]:
+    """
+    Get or create the shared sentence-transformers embedder (one model per worker)
+
+    Returns:
+        None when sentence-transformers is not installed
+    """
+    global _local_embedder
+    if _local_embedder is None and SentenceTransformer is not None:
+        _local_embedder = LocalEmbedder()
+    return _local_embedder
+
+
+def get_semantic_memory_service() -> SemanticMemoryService:
+    """Get or create Semantic Memory service singleton"""
+    global _semantic_memory_service
+    if _semantic_memory_service is None:
+        _semantic_memory_service = SemanticMemoryService()
+    return _semantic_memory_service
@@ -14,6 +14,8 @@ import os
 
 from app.services.shizen_tools import SHIZEN_TOOLS
 from app.services.llm_langchain_wrapper import get_unified_llm
+from app.services.conversation_memory import format_history_window, format_memory_section
+from app.services.semantic_memory import format_retrieved_section
 
 logger = logging.getLogger(__name__)
 
@@ -112,6 +114,7 @@ Final Answer: [Ta réponse finale à l'utilisateur en français naturel]
         chat_history: Optional[List[Dict]] = None,
         adaptive_context: Optional[str] = None,
         conversation_context: Optional[Dict] = None,
+        retrieved_memories: Optional[List[Dict]] = None,
     ) -> Dict:
         """
         Process user message through SHIZEN agent
@@ -123,28 +126,16 @@ Final Answer: [Ta réponse finale à l'utilisateur en français naturel]
             db: Database session
             chat_history: Previous messages for context
             adaptive_context: DH/Neuro style adaptation string (from ShizenContextService)
-            conversation_context: Persistent context (summary, preferences, goals)
+            conversation_context: Conversation memory (rolling summary, preferences, goals)
+            retrieved_memories: Relevant snippets of past conversations/journals (semantic memory)
 
         Returns:
             Agent response with metadata
         """
         try:
-            # Format chat history for prompt
+            # Token-budgeted prompt: rolling memory + newest messages that fit
             history_str = self._format_chat_history(chat_history or [])
-
-            # Build conversation context section
-            conv_context_str = ""
-            if conversation_context:
-                context_parts = []
-                if conversation_context.get("summary"):
-                    context_parts.append(f"Résumé précédent: {conversation_context['summary']}")
-                if conversation_context.get("goals_identified"):
-                    goals = ", ".join(conversation_context["goals_identified"][:3])
-                    context_parts.append(f"Objectifs identifiés: {goals}")
-                if conversation_context.get("emotional_state"):
-                    context_parts.append(f"État émotionnel: {conversation_context['emotional_state']}")
-                if context_parts:
-                    conv_context_str = "\n**MÉMOIRE CONVERSATION** :\n" + "\n".join(f"- {p}" for p in context_parts) + "\n"
+            conv_context_str = format_memory_section(conversation_context) + format_retrieved_section(retrieved_memories)
 
             # Build dynamic prompt with adaptive context
             dynamic_prompt = self.base_prompt_template.format(
@@ -210,16 +201,8 @@ Final Answer: [Ta réponse finale à l'utilisateur en français naturel]
             }
 
     def _format_chat_history(self, chat_history: List[Dict]) -> str:
-        """Format chat history for prompt"""
-        if not chat_history:
-            return "Pas d'historique (première interaction)"
-
-        formatted = []
-        for msg in chat_history[-10:]:  # Last 10 messages
-            role = "Utilisateur" if msg["role"] == "user" else "SHIZEN"
-            formatted.append(f"{role}: {msg['content']}")
-
-        return "\n".join(formatted)
+        """Format chat history for prompt (newest messages within HISTORY_TOKEN_BUDGET)"""
+        return format_history_window(chat_history)
 
     def _format_tools_description(self) -> str:
         """Format tools description for prompt"""
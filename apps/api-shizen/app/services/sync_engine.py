@@ -0,0 +1,517 @@
+"""
+Bulk Sync Engine - Set-based diff and upsert for /sync
+Shinkofa Platform - Planner
+
+Instead of one SELECT/UPDATE per entity, a sync:
+1. Loads one column-projected snapshot per table (indexed on user_id)
+2. Diffs client entities against it in memory (create / update / unchanged / delete)
+3. Writes creates + updates with batched INSERT ... ON CONFLICT DO UPDATE
+4. Deletes with a single DELETE per table (+ one tombstone upsert)
+
+Every write is stamped with the user's next sync revision, which drives the
+delta protocol (apply_delta): clients send "changes since revision N" with the
+revision each edited entity was based on, and conflicts are resolved per entity.
+
+Everything runs in the caller's transaction.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Type
+
+from sqlalchemy import select, delete, any_, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.task import Task
+from app.models.project import Project
+from app.models.ritual import Ritual
+from app.models.sync_revision import SyncTombstone
+from app.schemas.sync import TaskSync, ProjectSync, RitualSync, DeletedEntitySync
+from app.services.sync_revisions import allocate_revision, record_tombstones
+
+# Rows per INSERT statement (keeps bind parameters well under driver limits)
+SYNC_BATCH_SIZE = 500
+
+
+def parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
+    """Parse ISO datetime string (accepts trailing Z)"""
+    if not dt_str:
+        return None
+    try:
+        return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _comparable(value: Any) -> Any:
+    """Normalize values for diffing (SQLite returns naive datetimes, Postgres aware)"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass
+class EntitySpec:
+    """How a client entity maps onto a table"""
+    model: Type[Base]
+    # Name used in tombstones and delta payloads
+    entity_type: str
+    # Columns written from client data (and compared when diffing)
+    synced_columns: Sequence[str]
+    # Client schema -> column values (synced_columns + created_at)
+    to_row: Callable[[Any], Dict[str, Any]]
+
+
+TASK_SPEC = EntitySpec(
+    model=Task,
+    entity_type="task",
+    synced_columns=(
+        "title", "description", "completed", "priority", "due_date", "project_id",
+        "is_daily_task", "difficulty_level", "order",
+    ),
+    to_row=lambda t: {
+        "title": t.title,
+        "description": t.description,
+        "completed": t.completed,
+        "priority": t.priority,
+        "due_date": parse_datetime(t.dueDate),
+        "project_id": t.projectId,
+        "is_daily_task": bool(t.isDailyTask),
+        "difficulty_level": t.difficultyLevel,
+        "order": t.order or 0,
+        "created_at": parse_datetime(t.createdAt),
+    },
+)
+
+PROJECT_SPEC = EntitySpec(
+    model=Project,
+    entity_type="project",
+    synced_columns=("name", "description", "color", "icon", "status"),
+    to_row=lambda p: {
+        "name": p.name,
+        "description": p.description,
+        "color": p.color,
+        "icon": p.icon,
+        "status": p.status,
+        "created_at": parse_datetime(p.createdAt),
+    },
+)
+
+RITUAL_SPEC = EntitySpec(
+    model=Ritual,
+    entity_type="ritual",
+    synced_columns=("label", "icon", "completed_today", "category", "order"),
+    to_row=lambda r: {
+        "label": r.label,
+        "icon": r.icon,
+        "completed_today": r.completed,
+        "category": r.category,
+        "order": r.order,
+        "created_at": None,
+    },
+)
+
+
+@dataclass
+class EntityDiff:
+    """Result of diffing client entities against the server snapshot"""
+    creates: List[Dict[str, Any]] = field(default_factory=list)
+    updates: List[Dict[str, Any]] = field(default_factory=list)
+    delete_ids: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+class BulkSyncEngine:
+    """
+    Set-based sync for one user
+
+    Usage:
+        engine = BulkSyncEngine(db, user_id)
+        snapshot = engine.snapshot(TASK_SPEC)           # 1 query
+        diff = engine.diff(TASK_SPEC, snapshot, tasks, allow_delete=True)
+        engine.apply(TASK_SPEC, diff)                   # ceil(n/500) upserts + 1 delete
+    """
+
+    def __init__(self, db: Session, user_id: str, batch_size: int = SYNC_BATCH_SIZE):
+        self.db = db
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.dialect = db.get_bind().dialect.name
+        self._revision: Optional[int] = None
+
+    @property
+    def revision(self) -> int:
+        """Revision stamped on this engine's writes (allocated on first write)"""
+        if self._revision is None:
+            self._revision = allocate_revision(self.db, self.user_id)
+        return self._revision
+
+    def snapshot(self, spec: EntitySpec, extra_columns: Iterable[str] = ()) -> Dict[str, Dict[str, Any]]:
+        """
+        Load id + synced columns for every row of this user (single indexed query)
+
+        Returns:
+            Dict id -> column values
+        """
+        names = ["id", *spec.synced_columns, *extra_columns]
+        columns = [getattr(spec.model, name) for name in names]
+        rows = self.db.execute(
+            select(*columns).where(spec.model.user_id == self.user_id)
+        ).all()
+        return {row[0]: dict(zip(names, row)) for row in rows}
+
+    def diff(
+        self,
+        spec: EntitySpec,
+        snapshot: Dict[str, Dict[str, Any]],
+        client_items: Sequence[Any],
+        allow_delete: bool,
+    ) -> EntityDiff:
+        """
+        Diff client entities against the snapshot
+
+        Args:
+            spec: Entity mapping
+            snapshot: Result of snapshot()
+            client_items: Client entities (TaskSync, ProjectSync, RitualSync)
+            allow_delete: Delete server rows missing from the client list
+        """
+        result = EntityDiff()
+        now = datetime.now(timezone.utc)
+        client_ids: Set[str] = set()
+
+        for item in client_items:
+            if item.id in client_ids:
+                continue  # Duplicate id in payload: first one wins
+            client_ids.add(item.id)
+
+            row = spec.to_row(item)
+            existing = snapshot.get(item.id)
+
+            if existing is None:
+                row["id"] = item.id
+                row["user_id"] = self.user_id
+                row["created_at"] = row["created_at"] or now
+                row["updated_at"] = now
+                result.creates.append(row)
+            elif any(
+                _comparable(existing[col]) != _comparable(row[col])
+                for col in spec.synced_columns
+            ):
+                update_row = {col: row[col] for col in spec.synced_columns}
+                update_row["id"] = item.id
+                update_row["user_id"] = self.user_id
+                update_row["created_at"] = now  # Ignored on conflict (created_at not updated)
+                update_row["updated_at"] = now
+                result.updates.append(update_row)
+            else:
+                result.unchanged += 1
+
+        if allow_delete:
+            result.delete_ids = [entity_id for entity_id in snapshot if entity_id not in client_ids]
+
+        return result
+
+    def _insert(self, model: Type[Base]):
+        """Dialect-specific INSERT supporting ON CONFLICT"""
+        if self.dialect == "sqlite":
+            return sqlite.insert(model)
+        return postgresql.insert(model)
+
+    def upsert(self, spec: EntitySpec, rows: List[Dict[str, Any]]) -> None:
+        """
+        Batched INSERT ... ON CONFLICT (id) DO UPDATE
+
+        Conflicting rows owned by another user are left untouched.
+        """
+        if not rows:
+            return
+        model = spec.model
+        revision = self.revision
+        for start in range(0, len(rows), self.batch_size):
+            batch = [{**row, "revision": revision} for row in rows[start:start + self.batch_size]]
+            stmt = self._insert(model).values(batch)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[model.id],
+                set_={
+                    **{col: stmt.excluded[col] for col in spec.synced_columns},
+                    "updated_at": stmt.excluded.updated_at,
+                    "revision": stmt.excluded.revision,
+                },
+                where=model.user_id == self.user_id,
+            )
+            self.db.execute(stmt)
+
+    def id_filter(self, column, ids: List[str]):
+        """`column = ANY(:ids)` on Postgres (one array parameter), IN elsewhere"""
+        if self.dialect == "postgresql":
+            return column == any_(literal(ids, type_=postgresql.ARRAY(column.type)))
+        return column.in_(ids)
+
+    def delete_ids(self, spec: EntitySpec, ids: List[str]) -> int:
+        """Delete this user's rows by id in one statement and record their tombstones"""
+        if not ids:
+            return 0
+        result = self.db.execute(
+            delete(spec.model)
+            .where(self.id_filter(spec.model.id, ids), spec.model.user_id == self.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        record_tombstones(self.db, self.user_id, spec.entity_type, ids, self.revision)
+        return result.rowcount
+
+    def delete_project_tasks(
+        self,
+        project_ids: List[str],
+        task_snapshot: Dict[str, Dict[str, Any]],
+        written_tasks: Sequence[Dict[str, Any]],
+    ) -> None:
+        """Delete tasks of deleted projects (matches the ORM cascade)"""
+        deleted = set(project_ids)
+        task_ids = {
+            task_id for task_id, row in task_snapshot.items() if row["project_id"] in deleted
+        } | {
+            row["id"] for row in written_tasks if row["project_id"] in deleted
+        }
+        self.delete_ids(TASK_SPEC, sorted(task_ids))
+
+    def apply(self, spec: EntitySpec, diff: EntityDiff) -> None:
+        """Write a diff (creates + updates in batches, then deletes)"""
+        self.upsert(spec, diff.creates + diff.updates)
+        self.delete_ids(spec, diff.delete_ids)
+
+
+def sync_entities(
+    db: Session,
+    user_id: str,
+    tasks: Sequence[TaskSync],
+    projects: Sequence[ProjectSync],
+    rituals: Sequence[RitualSync],
+    snapshots: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+) -> Dict[str, EntityDiff]:
+    """
+    Apply client tasks/projects/rituals in bulk
+
+    Deletion rule (unchanged from the row-by-row version): server rows missing
+    from the client list are deleted only if the client sent a non-empty list.
+    Tasks of deleted projects are deleted too (matches the ORM cascade).
+
+    Args:
+        snapshots: Optional pre-loaded snapshots {"tasks": ..., "projects": ..., "rituals": ...}
+
+    Returns:
+        Diff per entity type (for logging)
+    """
+    engine = BulkSyncEngine(db, user_id)
+    snapshots = snapshots or {}
+
+    task_snapshot = snapshots.get("tasks")
+    if task_snapshot is None:
+        task_snapshot = engine.snapshot(TASK_SPEC)
+    project_snapshot = snapshots.get("projects")
+    if project_snapshot is None:
+        project_snapshot = engine.snapshot(PROJECT_SPEC)
+    ritual_snapshot = snapshots.get("rituals")
+    if ritual_snapshot is None:
+        ritual_snapshot = engine.snapshot(RITUAL_SPEC)
+
+    project_diff = engine.diff(PROJECT_SPEC, project_snapshot, projects, allow_delete=len(projects) > 0)
+    task_diff = engine.diff(TASK_SPEC, task_snapshot, tasks, allow_delete=len(tasks) > 0)
+    ritual_diff = engine.diff(RITUAL_SPEC, ritual_snapshot, rituals, allow_delete=len(rituals) > 0)
+
+    # Projects first so new tasks can reference new projects (FK)
+    engine.upsert(PROJECT_SPEC, project_diff.creates + project_diff.updates)
+    engine.apply(TASK_SPEC, task_diff)
+
+    if project_diff.delete_ids:
+        engine.delete_project_tasks(
+            project_diff.delete_ids, task_snapshot, task_diff.creates + task_diff.updates
+        )
+        engine.delete_ids(PROJECT_SPEC, project_diff.delete_ids)
+
+    engine.apply(RITUAL_SPEC, ritual_diff)
+
+    return {"tasks": task_diff, "projects": project_diff, "rituals": ritual_diff}
+
+
+SPECS_BY_TYPE: Dict[str, EntitySpec] = {
+    spec.entity_type: spec for spec in (TASK_SPEC, PROJECT_SPEC, RITUAL_SPEC)
+}
+
+
+@dataclass
+class DeltaResult:
+    """Outcome of a delta sync write"""
+    diffs: Dict[str, EntityDiff]
+    # Rejected client changes: {type, id, reason, serverRevision}
+    conflicts: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def load_delta_snapshots(engine: BulkSyncEngine) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Snapshots with revisions, keyed by entity type"""
+    return {
+        entity_type: engine.snapshot(spec, extra_columns=("revision",))
+        for entity_type, spec in SPECS_BY_TYPE.items()
+    }
+
+
+def _unchanged(spec: EntitySpec, existing: Dict[str, Any], item: Any) -> bool:
+    """True if the client entity carries exactly the server values"""
+    row = spec.to_row(item)
+    return all(_comparable(existing[col]) == _comparable(row[col]) for col in spec.synced_columns)
+
+
+def apply_delta(
+    db: Session,
+    user_id: str,
+    tasks: Sequence[TaskSync],
+    projects: Sequence[ProjectSync],
+    rituals: Sequence[RitualSync],
+    deleted: Sequence[DeletedEntitySync],
+    snapshots: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+) -> DeltaResult:
+    """
+    Apply client changes with per-entity conflict resolution
+
+    A client change is accepted when the server row has not moved past the
+    revision the client based it on. Otherwise the server version wins for
+    that entity only (reported in conflicts); the rest of the batch is applied:
+    - edit of a row changed on the server since baseRevision -> "modified"
+    - edit of a row deleted on the server since baseRevision -> "deleted"
+    - creation of an id the server already has (different values) -> "exists"
+    - deletion of a row changed on the server since baseRevision -> "modified"
+
+    Args:
+        snapshots: Optional result of load_delta_snapshots()
+
+    Returns:
+        DeltaResult with per-type diffs and conflicts
+    """
+    engine = BulkSyncEngine(db, user_id)
+    snapshots = snapshots if snapshots is not None else load_delta_snapshots(engine)
+    conflicts: List[Dict[str, Any]] = []
+
+    def conflict(entity_type: str, entity_id: str, reason: str, server_revision: int) -> None:
+        conflicts.append({
+            "type": entity_type, "id": entity_id, "reason": reason, "serverRevision": server_revision,
+        })
+
+    changes = {"task": tasks, "project": projects, "ritual": rituals}
+
+    # Tombstones only matter for edits of rows the server no longer has
+    missing_ids = [
+        item.id
+        for entity_type, items in changes.items()
+        for item in items
+        if item.baseRevision is not None and item.id not in snapshots[entity_type]
+    ]
+    tombstones: Dict[tuple, int] = {}
+    if missing_ids:
+        rows = db.execute(
+            select(SyncTombstone.entity_type, SyncTombstone.entity_id, SyncTombstone.revision)
+            .where(SyncTombstone.user_id == user_id, engine.id_filter(SyncTombstone.entity_id, missing_ids))
+        ).all()
+        tombstones = {(row[0], row[1]): row[2] for row in rows}
+
+    accepted: Dict[str, List[Any]] = {}
+    for entity_type, items in changes.items():
+        spec = SPECS_BY_TYPE[entity_type]
+        snapshot = snapshots[entity_type]
+        accepted[entity_type] = []
+        for item in items:
+            existing = snapshot.get(item.id)
+            base = item.baseRevision
+            if existing is None:
+                deleted_revision = tombstones.get((entity_type, item.id))
+                if base is not None and deleted_revision is not None and deleted_revision > base:
+                    conflict(entity_type, item.id, "deleted", deleted_revision)
+                    continue
+            elif base is None or existing["revision"] > base:
+                if not _unchanged(spec, existing, item):
+                    conflict(entity_type, item.id, "exists" if base is None else "modified", existing["revision"])
+                continue
+            accepted[entity_type].append(item)
+
+    delete_ids: Dict[str, List[str]] = {entity_type: [] for entity_type in SPECS_BY_TYPE}
+    for entity in deleted:
+        existing = snapshots[entity.type].get(entity.id)
+        if existing is None:
+            continue  # Already gone
+        if existing["revision"] > entity.baseRevision:
+            conflict(entity.type, entity.id, "modified", existing["revision"])
+            continue
+        delete_ids[entity.type].append(entity.id)
+
+    diffs = {
+        entity_type: engine.diff(SPECS_BY_TYPE[entity_type], snapshots[entity_type], accepted[entity_type], allow_delete=False)
+        for entity_type in SPECS_BY_TYPE
+    }
+    for entity_type, ids in delete_ids.items():
+        diffs[entity_type].delete_ids = ids
+
+    # Same write order as sync_entities (projects first for the FK)
+    task_diff, project_diff = diffs["task"], diffs["project"]
+    engine.upsert(PROJECT_SPEC, project_diff.creates + project_diff.updates)
+    engine.apply(TASK_SPEC, task_diff)
+    if project_diff.delete_ids:
+        engine.delete_project_tasks(
+            project_diff.delete_ids, snapshots["task"], task_diff.creates + task_diff.updates
+        )
+        engine.delete_ids(PROJECT_SPEC, project_diff.delete_ids)
+    engine.apply(RITUAL_SPEC, diffs["ritual"])
+
+    return DeltaResult(diffs=diffs, conflicts=conflicts)
+
+
+def load_changes_since(
+    db: Session,
+    user_id: str,
+    since_revision: int,
+    include_ids: Optional[Dict[str, List[str]]] = None,
+    up_to_revision: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Rows and tombstones written after `since_revision` (index on user_id, revision)
+
+    Args:
+        include_ids: Extra ids to return whatever their revision (conflicting entities)
+        up_to_revision: Revision returned to the client, read BEFORE this call - later
+            writes are left for the next sync instead of being skipped by the client
+
+    Returns:
+        Dict with "task"/"project"/"ritual" model lists and "deleted" tombstone dicts
+    """
+    engine = BulkSyncEngine(db, user_id)
+    include_ids = include_ids or {}
+    changes: Dict[str, Any] = {}
+    for entity_type, spec in SPECS_BY_TYPE.items():
+        model = spec.model
+        condition = model.revision > since_revision
+        if up_to_revision is not None:
+            condition = condition & (model.revision <= up_to_revision)
+        if include_ids.get(entity_type):
+            condition = condition | engine.id_filter(model.id, include_ids[entity_type])
+        changes[entity_type] = (
+            db.query(model)
+            .filter(model.user_id == user_id, condition)
+            .order_by(model.revision)
+            .all()
+        )
+
+    # A tombstone older than a re-created row of the same id is obsolete
+    live = {(entity_type, row.id) for entity_type, rows in changes.items() for row in rows}
+    tombstone_query = (
+        select(SyncTombstone.entity_type, SyncTombstone.entity_id, SyncTombstone.revision)
+        .where(SyncTombstone.user_id == user_id, SyncTombstone.revision > since_revision)
+        .order_by(SyncTombstone.revision)
+    )
+    if up_to_revision is not None:
+        tombstone_query = tombstone_query.where(SyncTombstone.revision <= up_to_revision)
+    tombstones = db.execute(tombstone_query).all() if since_revision > 0 else []
+    changes["deleted"] = [
+        {"type": row[0], "id": row[1], "revision": row[2]}
+        for row in tombstones
+        if (row[0], row[1]) not in live
+    ]
+    return changes
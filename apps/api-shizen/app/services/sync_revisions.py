@@ -0,0 +1,139 @@
+"""
+Sync Revisions - Per-user revision counter and tombstones for delta sync
+Shinkofa Platform - Planner
+
+Every transaction that writes tasks, projects or rituals takes the next
+revision of its user (one atomic upsert on `sync_revisions`) and stamps it on
+the rows it changes. Deleted rows leave a tombstone with that revision.
+
+The counter row stays locked until the transaction commits, so two writers
+for the same user are serialized and a client reading "revision > N" can
+never skip a revision that commits later.
+
+ORM writes (tasks/projects/rituals CRUD routes) are stamped automatically by
+a before_flush listener; the bulk sync engine stamps its Core statements itself.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Type
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.task import Task
+from app.models.project import Project
+from app.models.ritual import Ritual
+from app.models.sync_revision import SyncRevision, SyncTombstone
+
+# Entity type name (used in tombstones and delta payloads) -> model
+SYNC_ENTITY_MODELS: Dict[str, Type[Base]] = {
+    "task": Task,
+    "project": Project,
+    "ritual": Ritual,
+}
+_ENTITY_TYPES = {model: name for name, model in SYNC_ENTITY_MODELS.items()}
+
+
+def _insert(db: Session, model: Type[Base]):
+    """Dialect-specific INSERT supporting ON CONFLICT"""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def allocate_revision(db: Session, user_id: str) -> int:
+    """
+    Take the next revision for a user (single INSERT ... ON CONFLICT ... RETURNING)
+
+    Runs in the caller's transaction; the counter row stays locked until commit.
+
+    Returns:
+        New revision number
+    """
+    stmt = _insert(db, SyncRevision).values(
+        user_id=user_id,
+        revision=1,
+        updated_at=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SyncRevision.user_id],
+        set_={
+            "revision": SyncRevision.revision + 1,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ).returning(SyncRevision.revision)
+    return db.execute(stmt).scalar_one()
+
+
+def current_revision(db: Session, user_id: str) -> int:
+    """Latest revision of a user (0 if nothing was ever written)"""
+    revision = db.query(SyncRevision.revision).filter(SyncRevision.user_id == user_id).scalar()
+    return revision or 0
+
+
+def record_tombstones(
+    db: Session,
+    user_id: str,
+    entity_type: str,
+    entity_ids: Iterable[str],
+    revision: int,
+) -> None:
+    """
+    Record deletions in one statement (re-deleting an id moves its tombstone forward)
+
+    Args:
+        entity_type: "task", "project" or "ritual"
+        entity_ids: Deleted ids
+        revision: Revision of the deleting transaction
+    """
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "user_id": user_id,
+            "revision": revision,
+            "deleted_at": now,
+        }
+        for entity_id in entity_ids
+    ]
+    if not rows:
+        return
+
+    stmt = _insert(db, SyncTombstone).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SyncTombstone.entity_type, SyncTombstone.entity_id],
+        set_={"revision": stmt.excluded.revision, "deleted_at": stmt.excluded.deleted_at},
+        where=SyncTombstone.user_id == user_id,
+    )
+    db.execute(stmt)
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_orm_revisions(session: Session, flush_context, instances) -> None:
+    """Stamp revisions on ORM-written tasks/projects/rituals and record ORM deletions"""
+    changed = [
+        obj for obj in session.new
+        if type(obj) in _ENTITY_TYPES
+    ] + [
+        obj for obj in session.dirty
+        if type(obj) in _ENTITY_TYPES and session.is_modified(obj, include_collections=False)
+    ]
+    deleted = [obj for obj in session.deleted if type(obj) in _ENTITY_TYPES]
+    if not changed and not deleted:
+        return
+
+    revisions: Dict[str, int] = {}
+
+    def revision_for(user_id: str) -> int:
+        if user_id not in revisions:
+            revisions[user_id] = allocate_revision(session, user_id)
+        return revisions[user_id]
+
+    for obj in changed:
+        if obj.user_id:
+            obj.revision = revision_for(obj.user_id)
+
+    for obj in deleted:
+        record_tombstones(session, obj.user_id, _ENTITY_TYPES[type(obj)], [obj.id], revision_for(obj.user_id))
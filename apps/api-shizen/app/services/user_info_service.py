@@ -0,0 +1,143 @@
+"""
+User Info Service - Cached user lookups from the auth service
+Shinkofa Platform - Shizen AI
+
+Admin pages show usernames/emails next to profiles. Lookups go through one
+shared HTTP client (keep-alive connections), misses of a page are fetched
+concurrently, and results are cached for USER_INFO_CACHE_SECONDS so a
+dashboard reload does not hit the auth service again.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+USER_INFO_CACHE_SECONDS = int(os.getenv("USER_INFO_CACHE_SECONDS", "300"))
+USER_INFO_CACHE_SIZE = int(os.getenv("USER_INFO_CACHE_SIZE", "5000"))
+USER_INFO_CONCURRENCY = int(os.getenv("USER_INFO_CONCURRENCY", "10"))
+
+
+class UserInfoService:
+    """Username/email lookup with an in-process TTL cache"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        ttl: int = USER_INFO_CACHE_SECONDS,
+        max_entries: int = USER_INFO_CACHE_SIZE,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url or settings.AUTH_SERVICE_URL
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._transport = transport
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        # Connection pools belong to one event loop (tests create several loops)
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=5.0, transport=self._transport)
+            self._loop = loop
+        return self._client
+
+    def _cached(self, user_id: str) -> Optional[Dict]:
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return None
+        expires_at, info = entry
+        if expires_at < time.monotonic():
+            del self._cache[user_id]
+            return None
+        self._cache.move_to_end(user_id)
+        return info
+
+    def _store(self, user_id: str, info: Dict) -> None:
+        self._cache[user_id] = (time.monotonic() + self.ttl, info)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def _fetch(self, user_id: str, authorization: str, slots: asyncio.Semaphore) -> Optional[Dict]:
+        async with slots:
+            response = await self._http().get(
+                f"/auth/super-admin/admin/users/{user_id}",
+                headers={"Authorization": authorization},
+            )
+        if response.status_code == 404:
+            return {}  # Deleted user: cached too, nothing to show
+        if response.status_code != 200:
+            return None
+        user = response.json()
+        return {"username": user.get("username"), "email": user.get("email")}
+
+    async def get_many(self, user_ids: Iterable[str], authorization: str) -> Dict[str, Dict]:
+        """
+        Usernames/emails of many users (cache first, misses fetched concurrently)
+
+        Args:
+            user_ids: Users to resolve
+            authorization: Super admin "Bearer ..." header for the auth service
+
+        Returns:
+            user_id -> {"username", "email"} (users that could not be resolved are omitted)
+        """
+        user_map: Dict[str, Dict] = {}
+        missing = []
+        user_ids = list(dict.fromkeys(user_ids))
+        for user_id in user_ids:
+            info = self._cached(user_id)
+            if info is None:
+                missing.append(user_id)
+            elif info:
+                user_map[user_id] = info
+
+        record_cache("user_info", hit=False, count=len(missing))
+        record_cache("user_info", hit=True, count=len(user_ids) - len(missing))
+        if missing:
+            slots = asyncio.Semaphore(USER_INFO_CONCURRENCY)
+            results = await asyncio.gather(
+                *(self._fetch(user_id, authorization, slots) for user_id in missing),
+                return_exceptions=True,
+            )
+            for user_id, info in zip(missing, results):
+                if isinstance(info, Exception):
+                    logger.warning(f"⚠️ User info lookup failed for {user_id}: {info}")
+                    continue
+                if info is None:
+                    continue
+                self._store(user_id, info)
+                if info:
+                    user_map[user_id] = info
+
+        return user_map
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Forget one user (or everyone)"""
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(user_id, None)
+
+
+# Singleton instance
+_user_info_service: Optional[UserInfoService] = None
+
+
+def get_user_info_service() -> UserInfoService:
+    """Get or create User Info service singleton"""
+    global _user_info_service
+    if _user_info_service is None:
+        _user_info_service = UserInfoService()
+    return _user_info_service
@@ -7,9 +7,12 @@ Validates JWT tokens issued by auth service
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+import httpx
 import os
 from typing import Optional
 
+from app.core.config import settings
+
 # Must match auth service SECRET_KEY
 SECRET_KEY = os.getenv("AUTH_JWT_SECRET", "dev-secret-key-change-in-production")
 ALGORITHM = os.getenv("AUTH_JWT_ALGORITHM", "HS256")
@@ -60,3 +63,22 @@ def get_current_user_id(
 
     except JWTError:
         raise credentials_exception
+
+
+async def verify_super_admin(authorization: str) -> bool:
+    """Verify the request is from a super admin via auth service"""
+    if not authorization or not authorization.startswith("Bearer "):
+        return False
+
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{settings.AUTH_SERVICE_URL}/auth/me",
+                headers={"Authorization": authorization}
+            )
+            if response.status_code == 200:
+                user = response.json()
+                return user.get("is_super_admin", False)
+    except Exception:
+        pass
+    return False
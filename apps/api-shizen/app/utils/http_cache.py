@@ -0,0 +1,60 @@
+"""
+HTTP caching helpers (ETag / 304 Not Modified)
+Shinkofa Platform - Planner Service
+
+Serve pre-serialized JSON payloads with strong ETags so clients
+can revalidate cheaply with If-None-Match.
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def serialize_json(payload: Any) -> bytes:
+    """Serialize payload exactly like FastAPI's JSONResponse (compact, UTF-8)"""
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag from payload bytes"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match header against an ETag (handles lists and weak tags)"""
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def cached_json_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    cache_control: str = "no-cache",
+) -> Response:
+    """
+    Return pre-serialized JSON, or 304 if the client already has this version
+
+    Args:
+        request: Incoming request (reads If-None-Match)
+        body: Serialized JSON bytes
+        etag: ETag of body (see compute_etag)
+        cache_control: Cache-Control header (default: always revalidate)
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,42 @@
+"""
+Keyset pagination cursors
+Shinkofa Platform - Shizen-Planner Service
+
+A cursor is the opaque (url-safe base64) encoding of the sort key of the last
+row of a page: (timestamp, id). The next page is `WHERE (ts, id) < cursor`
+(or `>`), which an index on (..., ts, id) serves without scanning skipped rows,
+unlike OFFSET.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: str) -> str:
+    """Encode a (timestamp, id) sort key"""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """
+    Decode a cursor (None passes through)
+
+    Raises:
+        HTTPException 400: Malformed cursor
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        timestamp, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), row_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
@@ -5,18 +5,21 @@ Shinkofa Platform - Planner Service
 Provides tier-based access control by calling auth service
 Enforces limits for Musha (free) tier users
 """
+import functools
 import httpx
+import os
 import uuid
 from datetime import datetime, timezone
 from fastapi import HTTPException, status, Depends
-from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from typing import Optional
 from dataclasses import dataclass
 
-from app.core.database import get_db, get_async_db
+from app.core.database import get_async_db
 from app.core.config import settings
+from app.core.metrics import QUOTA_CHECK_DURATION
 from app.models.project import Project
 from app.models.task import Task
 from app.models.shizen_message_usage import ShizenMessageUsage
@@ -26,6 +29,21 @@ from app.utils.auth import get_current_user_id
 AUTH_SERVICE_URL = settings.AUTH_SERVICE_URL
 INTERNAL_API_KEY = settings.INTERNAL_API_KEY
 
+# Reserve-then-commit quota mode: the message is counted before the LLM call
+# and refunded if the call fails (set SHIZEN_QUOTA_RESERVE=false to count after success)
+SHIZEN_QUOTA_RESERVE = os.getenv("SHIZEN_QUOTA_RESERVE", "true").lower() == "true"
+
+
+def _timed(operation: str):
+    """Record the latency of an async tier/quota function (shizen_quota_check_duration_seconds)"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with QUOTA_CHECK_DURATION.time(operation=operation):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
 
 @dataclass
 class UserTier:
@@ -41,6 +59,7 @@ class UserTier:
     has_sensei_features: bool
 
 
+@_timed("tier_lookup")
 async def get_user_tier(user_id: str) -> UserTier:
     """
     Fetch user tier info from auth service
@@ -114,25 +133,31 @@ async def get_user_tier(user_id: str) -> UserTier:
         )
 
 
-def get_user_project_count(user_id: str, db: Session) -> int:
+async def get_user_project_count(user_id: str, db: AsyncSession) -> int:
     """Count user's active projects"""
-    return db.query(Project).filter(
-        Project.user_id == user_id,
-        Project.status != "archived"
-    ).count()
+    result = await db.execute(
+        select(func.count()).select_from(Project).where(
+            Project.user_id == user_id,
+            Project.status != "archived"
+        )
+    )
+    return result.scalar_one()
 
 
-def get_user_task_count(user_id: str, db: Session) -> int:
+async def get_user_task_count(user_id: str, db: AsyncSession) -> int:
     """Count user's active (incomplete) tasks"""
-    return db.query(Task).filter(
-        Task.user_id == user_id,
-        Task.completed == False
-    ).count()
+    result = await db.execute(
+        select(func.count()).select_from(Task).where(
+            Task.user_id == user_id,
+            Task.completed == False
+        )
+    )
+    return result.scalar_one()
 
 
 async def verify_project_limit(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> str:
     """
     Dependency that verifies user can create more projects
@@ -150,7 +175,7 @@ async def verify_project_limit(
         return user_id
 
     # Check current count against limit
-    current_count = get_user_project_count(user_id, db)
+    current_count = await get_user_project_count(user_id, db)
 
     if current_count >= tier.project_limit:
         raise HTTPException(
@@ -170,7 +195,7 @@ async def verify_project_limit(
 
 async def verify_task_limit(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> str:
     """
     Dependency that verifies user can create more tasks
@@ -188,7 +213,7 @@ async def verify_task_limit(
         return user_id
 
     # Check current count against limit
-    current_count = get_user_task_count(user_id, db)
+    current_count = await get_user_task_count(user_id, db)
 
     if current_count >= tier.task_limit:
         raise HTTPException(
@@ -236,21 +261,71 @@ async def get_user_shizen_message_count(user_id: str, db: AsyncSession) -> int:
     year_month = get_current_year_month()
 
     result = await db.execute(
-        select(ShizenMessageUsage).where(
+        select(ShizenMessageUsage.message_count).where(
             ShizenMessageUsage.user_id == user_id,
             ShizenMessageUsage.year_month == year_month
         )
     )
-    usage = result.scalar_one_or_none()
+    count = result.scalar_one_or_none()
+
+    return count or 0
+
+
+def _usage_insert(db: AsyncSession):
+    """Dialect-specific INSERT supporting ON CONFLICT (PostgreSQL in prod, SQLite in tests)"""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite.insert(ShizenMessageUsage)
+    return postgresql.insert(ShizenMessageUsage)
 
-    return usage.message_count if usage else 0
 
+async def _upsert_shizen_message_count(
+    user_id: str,
+    year_month: str,
+    db: AsyncSession,
+    limit: Optional[int] = None,
+) -> Optional[int]:
+    """
+    Atomically add one message to the monthly counter
+
+    Single INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement, so
+    concurrent messages never lose increments.
 
+    Args:
+        user_id: User ID
+        year_month: Billing period (e.g., "2026-01")
+        db: Async database session
+        limit: If set, only increment while message_count < limit
+
+    Returns:
+        New message count, or None if the limit was already reached
+    """
+    stmt = _usage_insert(db).values(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        year_month=year_month,
+        message_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ShizenMessageUsage.user_id, ShizenMessageUsage.year_month],
+        set_={
+            "message_count": ShizenMessageUsage.message_count + 1,
+            "updated_at": datetime.now(timezone.utc),
+        },
+        where=(ShizenMessageUsage.message_count < limit) if limit is not None else None,
+    ).returning(ShizenMessageUsage.message_count)
+
+    result = await db.execute(stmt)
+    new_count = result.scalar_one_or_none()
+    await db.commit()
+    return new_count
+
+
+@_timed("increment")
 async def increment_shizen_message_count(user_id: str, db: AsyncSession) -> int:
     """
     Increment user's Shizen message count for current month
 
-    Creates record if it doesn't exist.
+    Creates record if it doesn't exist (atomic upsert, one round trip).
 
     Args:
         user_id: User ID
@@ -259,35 +334,76 @@ async def increment_shizen_message_count(user_id: str, db: AsyncSession) -> int:
     Returns:
         New message count after increment
     """
+    return await _upsert_shizen_message_count(user_id, get_current_year_month(), db)
+
+
+@_timed("reserve")
+async def reserve_shizen_message(
+    user_id: str,
+    db: AsyncSession,
+) -> tuple[bool, int, Optional[int], str]:
+    """
+    Reserve one Shizen message from the monthly quota before calling the LLM
+
+    Check and increment happen in the same statement, so parallel messages
+    can never exceed the limit. Call refund_shizen_message() if the LLM fails.
+
+    Args:
+        user_id: User ID
+        db: Async database session
+
+    Returns:
+        Tuple of (reserved, count, limit, year_month)
+        - reserved: True if a message was reserved
+        - count: Message count after reservation (current count if refused)
+        - limit: Monthly limit (None = unlimited)
+        - year_month: Billing period the reservation belongs to (pass to refund)
+    """
+    tier = await get_user_tier(user_id)
+    limit = tier.shizen_message_limit
     year_month = get_current_year_month()
 
-    result = await db.execute(
-        select(ShizenMessageUsage).where(
+    if limit is not None and limit <= 0:
+        return (False, 0, limit, year_month)
+
+    new_count = await _upsert_shizen_message_count(user_id, year_month, db, limit=limit)
+    if new_count is None:
+        current_count = await get_user_shizen_message_count(user_id, db)
+        return (False, current_count, limit, year_month)
+
+    return (True, new_count, limit, year_month)
+
+
+@_timed("refund")
+async def refund_shizen_message(
+    user_id: str,
+    db: AsyncSession,
+    year_month: Optional[str] = None,
+) -> None:
+    """
+    Give back a message reserved with reserve_shizen_message()
+
+    Args:
+        user_id: User ID
+        db: Async database session
+        year_month: Billing period of the reservation (defaults to current month)
+    """
+    await db.execute(
+        update(ShizenMessageUsage)
+        .where(
             ShizenMessageUsage.user_id == user_id,
-            ShizenMessageUsage.year_month == year_month
+            ShizenMessageUsage.year_month == (year_month or get_current_year_month()),
+            ShizenMessageUsage.message_count > 0,
         )
-    )
-    usage = result.scalar_one_or_none()
-
-    if usage:
-        usage.message_count += 1
-        usage.updated_at = datetime.now(timezone.utc)
-        new_count = usage.message_count
-    else:
-        # Create new record for this month
-        usage = ShizenMessageUsage(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            year_month=year_month,
-            message_count=1,
+        .values(
+            message_count=ShizenMessageUsage.message_count - 1,
+            updated_at=datetime.now(timezone.utc),
         )
-        db.add(usage)
-        new_count = 1
-
+    )
     await db.commit()
-    return new_count
 
 
+@_timed("verify_limit")
 async def verify_shizen_message_limit(
     user_id: str,
     db: AsyncSession,
@@ -0,0 +1,120 @@
+"""
+Sync Benchmark - Bulk engine vs row-by-row ORM
+Measures a full /sync write (create, then update every entity) at 100, 1k and 10k tasks
+
+Usage:
+    python scripts/benchmark_sync.py                                  # in-memory SQLite
+    python scripts/benchmark_sync.py postgresql://user:pw@host/db     # real database
+    python scripts/benchmark_sync.py --sizes 100 1000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event, delete
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.task import Task
+from app.schemas.sync import TaskSync
+from app.services.sync_engine import TASK_SPEC, parse_datetime, sync_entities
+
+USER_ID = "benchmark-user"
+
+
+def make_tasks(count: int, completed: bool) -> List[TaskSync]:
+    """Build client payload"""
+    return [
+        TaskSync(id=f"bench-{i}", title=f"Task {i}", priority="p2", completed=completed)
+        for i in range(count)
+    ]
+
+
+def row_by_row(db: Session, tasks: List[TaskSync]) -> None:
+    """Previous /sync behaviour: one SELECT + INSERT/UPDATE per task"""
+    for t in tasks:
+        existing = db.query(Task).filter(Task.id == t.id, Task.user_id == USER_ID).first()
+        values = TASK_SPEC.to_row(t)
+        values.pop("created_at")
+        if existing:
+            for key, value in values.items():
+                setattr(existing, key, value)
+        else:
+            db.add(Task(id=t.id, user_id=USER_ID, created_at=parse_datetime(t.createdAt), **values))
+        db.flush()
+
+
+def bulk(db: Session, tasks: List[TaskSync]) -> None:
+    """Set-based engine"""
+    sync_entities(db, USER_ID, tasks, [], [])
+
+
+def measure(session_factory, engine, strategy: Callable, count: int) -> dict:
+    """Run create + update passes, return timings and statement counts"""
+    statements = []
+
+    def count_statement(*args):
+        statements.append(1)
+
+    db = session_factory()
+    try:
+        db.execute(delete(Task).where(Task.user_id == USER_ID))
+        db.commit()
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        results = {}
+        for phase, completed in (("create", False), ("update", True)):
+            tasks = make_tasks(count, completed)
+            statements.clear()
+            start = time.perf_counter()
+            strategy(db, tasks)
+            db.commit()
+            results[phase] = (time.perf_counter() - start, len(statements))
+        event.remove(engine, "before_cursor_execute", count_statement)
+        return results
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /sync write strategies")
+    parser.add_argument("database_url", nargs="?", default="sqlite:///:memory:")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 10000])
+    parser.add_argument("--skip-row-by-row", action="store_true", help="Only run the bulk engine")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite"):
+        engine = create_engine(
+            args.database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    strategies = [("bulk", bulk)]
+    if not args.skip_row_by_row:
+        strategies.append(("row-by-row", row_by_row))
+
+    print(f"📊 Sync benchmark on {engine.dialect.name}")
+    print(f"{'strategy':<12} {'tasks':>7} {'phase':<7} {'seconds':>9} {'statements':>11}")
+    for count in args.sizes:
+        for name, strategy in strategies:
+            for phase, (seconds, statements) in measure(session_factory, engine, strategy, count).items():
+                print(f"{name:<12} {count:>7} {phase:<7} {seconds:>9.3f} {statements:>11}")
+
+    session = session_factory()
+    session.execute(delete(Task).where(Task.user_id == USER_ID))
+    session.commit()
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Ephemeris Table Builder
+Prebuilds the Design Humain ephemeris table (1900-2100) so no chart computation
+has to call Swiss Ephemeris at request time
+
+Usage:
+    python scripts/build_ephemeris_table.py                 # full supported range
+    python scripts/build_ephemeris_table.py 1940 2030       # years [from, to)
+    EPHEMERIS_CACHE_DIR=/var/cache/shizen python scripts/build_ephemeris_table.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import swisseph as swe
+
+from app.services.ephemeris_table import JD_START, JD_END, get_ephemeris_table
+
+
+def main():
+    jd_from, jd_to = JD_START, JD_END
+    if len(sys.argv) == 3:
+        jd_from = swe.julday(int(sys.argv[1]), 1, 1, 0.0)
+        jd_to = swe.julday(int(sys.argv[2]), 1, 1, 0.0)
+
+    table = get_ephemeris_table()
+    print(f"🔭 Building ephemeris table in {table.cache_dir}")
+    start = time.perf_counter()
+    chunks = table.build_range(jd_from, jd_to)
+    print(f"✅ {chunks} chunks ready in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
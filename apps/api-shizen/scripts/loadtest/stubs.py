@@ -0,0 +1,148 @@
+"""
+Load-test stubs - Local stand-ins for the LLM providers and the auth service
+Shinkofa Platform - Shizen AI
+
+One FastAPI app serving:
+- Ollama:   POST /api/chat, POST /api/generate, GET /api/tags
+- DeepSeek: POST /v1/chat/completions (OpenAI-compatible, with usage)
+- Auth:     GET /internal/user-tier/{user_id} (unlimited Sensei tier)
+
+LLM answers wait `latency_ms` ± `jitter_ms` (uniform), so the API under test
+sees realistic in-flight LLM calls without a GPU. Replies end with a ReAct
+"Final Answer:" so the WebSocket agent finishes in one step.
+
+Usage (standalone):
+    python scripts/loadtest/stubs.py --port 8199 --latency-ms 300
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from fastapi import FastAPI, Request
+
+STUB_MODEL = "stub-llm"
+STUB_REPLY = (
+    "Thought: Je peux répondre directement.\n"
+    "Final Answer: Bonjour ! Prends une pause de 5 minutes, puis commence par ta tâche la plus courte. 🌱"
+)
+
+
+def _tokens(text: str) -> int:
+    """Rough token count reported in usage fields (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def create_stub_app(latency_ms: float = 300.0, jitter_ms: float = 100.0, seed: int = 0) -> FastAPI:
+    """
+    Build the stub app
+
+    Args:
+        latency_ms: Mean LLM response time
+        jitter_ms: Uniform jitter around the mean
+        seed: Random seed (reproducible latency sequence)
+
+    Returns:
+        FastAPI app
+    """
+    app = FastAPI(title="api-shizen load-test stubs")
+    rng = random.Random(seed)
+    app.state.llm_calls = 0
+
+    async def llm_delay() -> None:
+        app.state.llm_calls += 1
+        delay = max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+    @app.post("/api/chat")
+    async def ollama_chat(request: Request):
+        body = await request.json()
+        await llm_delay()
+        prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+        return {
+            "model": body.get("model", STUB_MODEL),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": STUB_REPLY},
+            "done": True,
+            "prompt_eval_count": _tokens(prompt),
+            "eval_count": _tokens(STUB_REPLY),
+        }
+
+    @app.post("/api/generate")
+    async def ollama_generate(request: Request):
+        body = await request.json()
+        await llm_delay()
+        return {
+            "model": body.get("model", STUB_MODEL),
+            "response": STUB_REPLY,
+            "done": True,
+            "prompt_eval_count": _tokens(body.get("prompt", "")),
+            "eval_count": _tokens(STUB_REPLY),
+        }
+
+    @app.get("/api/tags")
+    async def ollama_tags():
+        return {"models": [{"name": STUB_MODEL}]}
+
+    @app.post("/v1/chat/completions")
+    async def deepseek_chat(request: Request):
+        body = await request.json()
+        await llm_delay()
+        prompt_tokens = _tokens(" ".join(m.get("content", "") for m in body.get("messages", [])))
+        completion_tokens = _tokens(STUB_REPLY)
+        return {
+            "id": f"stub-{app.state.llm_calls}",
+            "object": "chat.completion",
+            "model": body.get("model", STUB_MODEL),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": STUB_REPLY},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_cache_hit_tokens": 0,
+                "prompt_cache_miss_tokens": prompt_tokens,
+            },
+        }
+
+    @app.get("/internal/user-tier/{user_id}")
+    async def user_tier(user_id: str):
+        return {
+            "user_id": user_id,
+            "tier": "sensei",
+            "status": "active",
+            "is_active": True,
+            "project_limit": None,
+            "task_limit": None,
+            "shizen_message_limit": None,
+            "has_family_access": False,
+            "has_sensei_features": True,
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return {"llm_calls": app.state.llm_calls}
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stub LLM + auth services for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8199)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = create_stub_app(args.latency_ms, args.jitter_ms, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Tests for materialized admin profile statistics and cached user lookups
+
+Validates:
+1. Statistics are aggregated in one query and stored in a single row
+2. The stats endpoint reads the snapshot (one primary-key query)
+3. User info is fetched once per user, concurrently, then served from cache
+4. GET /admin/profiles/stats serves the snapshot
+"""
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import get_db
+from app.models import HolisticProfile, HolisticProfileSection, ProfileStatsSnapshot, QuestionnaireSession
+from app.services.profile_stats_service import compute_profile_stats, get_profile_stats, refresh_profile_stats
+from app.routes import admin_profiles as admin_profiles_routes
+from app.services.user_info_service import UserInfoService
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def engine():
+    # StaticPool: the endpoint test reads the session from the TestClient thread
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (QuestionnaireSession, HolisticProfile, HolisticProfileSection, ProfileStatsSnapshot):
+        model.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    session.add(QuestionnaireSession(id="qs-1", user_id="user-1"))
+    for profile_id, user_id, version, days_ago, synthesis in [
+        ("p-1", "user-1", 1, 40, None),
+        ("p-2", "user-1", 2, 10, "Synthèse"),
+        ("p-3", "user-2", 1, 3, "Synthèse"),
+    ]:
+        session.add(HolisticProfile(
+            id=profile_id, session_id="qs-1", user_id=user_id, version=version,
+            synthesis=synthesis, generated_at=NOW - timedelta(days=days_ago),
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_stats_computed_in_one_query(db, engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    stats = compute_profile_stats(db, now=NOW)
+
+    assert len(statements) == 1
+    assert stats["total_profiles"] == 3
+    assert stats["total_users_with_profile"] == 2
+    assert (stats["profiles_last_7_days"], stats["profiles_last_30_days"]) == (1, 2)
+    assert stats["complete_profiles"] == 2
+    assert stats["average_version"] == 1.33
+
+
+def test_endpoint_reads_snapshot(db, engine):
+    refresh_profile_stats(db, now=NOW)
+    db.add(HolisticProfile(id="p-4", session_id="qs-1", user_id="user-3", generated_at=NOW))
+    db.commit()
+    db.expire_all()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    snapshot = get_profile_stats(db)
+    assert len(statements) == 1 and "holistic_profile_stats" in statements[0]
+    assert snapshot.total_profiles == 3  # until the next refresh
+
+    refresh_profile_stats(db, now=NOW)
+    db.expire_all()
+    assert get_profile_stats(db).total_profiles == 4
+
+
+
+def test_stats_endpoint(db, monkeypatch):
+    async def is_super_admin(authorization: str) -> bool:
+        return authorization == "Bearer admin-token"
+
+    monkeypatch.setattr(admin_profiles_routes, "verify_super_admin", is_super_admin)
+    app = FastAPI()
+    app.include_router(admin_profiles_routes.router)
+    app.dependency_overrides[get_db] = lambda: db
+    refresh_profile_stats(db, now=NOW)
+
+    client = TestClient(app)
+    assert client.get("/admin/profiles/stats", params={"authorization": "user-token"}).status_code == 403
+
+    response = client.get("/admin/profiles/stats", params={"authorization": "admin-token"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_profiles"] == 3
+    assert body["incomplete_profiles"] == 1
+    assert body["average_version"] == 1.33
+
+
+@pytest.mark.asyncio
+async def test_user_info_batched_and_cached():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        user_id = request.url.path.rsplit("/", 1)[-1]
+        if user_id == "gone":
+            return httpx.Response(404)
+        if user_id == "flaky":
+            return httpx.Response(503)
+        return httpx.Response(200, json={"username": f"name-{user_id}", "email": f"{user_id}@shinkofa.com"})
+
+    service = UserInfoService(base_url="http://auth", transport=httpx.MockTransport(handler))
+
+    users = await service.get_many(["u-1", "u-2", "u-1", "gone", "flaky"], "Bearer admin")
+    assert users == {
+        "u-1": {"username": "name-u-1", "email": "u-1@shinkofa.com"},
+        "u-2": {"username": "name-u-2", "email": "u-2@shinkofa.com"},
+    }
+    assert len(requests) == 4  # duplicates collapsed
+
+    await service.get_many(["u-1", "u-2", "gone", "flaky"], "Bearer admin")
+    assert requests[4:] == ["/auth/super-admin/admin/users/flaky"]  # only the failed lookup is retried
+
+    service.invalidate("u-1")
+    await service.get_many(["u-1"], "Bearer admin")
+    assert requests[-1] == "/auth/super-admin/admin/users/u-1"
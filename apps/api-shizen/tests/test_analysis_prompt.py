@@ -0,0 +1,102 @@
+"""
+Tests for the analysis prompt encoder
+
+Validates:
+1. Responses are deduplicated (last answer wins) and empty answers dropped
+2. Each analysis gets its own blocs first, within the token budget
+3. All analysis prompts of a session share the same system prompt and prefix
+4. Profile sections read exactly the blocs of their analyses
+"""
+import pytest
+
+from app.services.analysis_prompt import ANALYSIS_BLOCS, ANALYSIS_SYSTEM_PROMPT, SECTION_ANALYSES, encode_responses
+from app.services.holistic_profile_service import SECTION_ANSWER_BLOCS
+from app.services.conversation_memory import estimate_tokens
+from app.services.psychological_analysis_service import PsychologicalAnalysisService
+
+
+def _response(number: int, bloc: str, value="option_1", comment: str = "") -> dict:
+    answer = {"value": value}
+    if comment:
+        answer["comment"] = comment
+    return {
+        "question_id": f"Q{number:03d}",
+        "bloc": bloc,
+        "question_text": f"Question {number} du bloc {bloc} sur vos habitudes quotidiennes",
+        "answer": answer,
+        "question_type": "radio",
+    }
+
+
+RESPONSES = [
+    _response(n, "ABCDEFGHI"[n % 9], comment="Je préfère travailler seul le matin" if n % 10 == 0 else "")
+    for n in range(144)
+]
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = []
+
+    async def generate(self, prompt, system=None, temperature=0.7, max_tokens=2048):
+        self.calls.append((system, prompt))
+        return '{"type": "INTJ"}'
+
+
+def test_responses_deduplicated_and_empty_dropped():
+    digest = encode_responses([
+        _response(1, "E", value="option_1"),
+        _response(2, "E", value=None),
+        _response(1, "E", value=["a", "b", "c", "d", "e", "f"]),
+    ])
+
+    assert [line.text for line in digest.lines] == [
+        "[E] Question 1 du bloc E sur vos habitudes quotidiennes → a, b, c, d (+2)",
+    ]
+
+
+def test_analysis_subset_respects_budget_and_blocs():
+    digest = encode_responses(RESPONSES, budget=400, shared_budget=100)
+
+    shared = digest.shared_lines
+    assert shared and all(line.has_comment for line in shared)
+    assert sum(line.tokens for line in shared) <= 100
+
+    for analysis, first_bloc in (("mbti", "E"), ("shinkofa", "G"), ("vakog", "D")):
+        lines = digest.analysis_lines(analysis)
+        assert lines[0].bloc == first_bloc
+        assert not set(map(id, lines)) & set(map(id, shared))
+        assert sum(line.tokens for line in shared + lines) <= 400
+
+    prompt = digest.prompt("mbti", "Consignes MBTI")
+    responses_part = prompt[:prompt.index("Tu es un expert en psychologie MBTI")]
+    assert estimate_tokens(responses_part) <= 400 + 60  # headers
+
+
+@pytest.mark.asyncio
+async def test_analysis_prompts_share_prefix():
+    service = PsychologicalAnalysisService.__new__(PsychologicalAnalysisService)
+    service.llm = FakeLLM()
+    digest = encode_responses(RESPONSES)
+
+    await service.analyze_mbti(digest)
+    await service.analyze_big_five(digest)
+    await service.analyze_vakog(RESPONSES)  # raw responses are encoded the same way
+
+    systems = {system for system, _ in service.llm.calls}
+    assert systems == {ANALYSIS_SYSTEM_PROMPT}
+    prompts = [prompt for _, prompt in service.llm.calls]
+    assert all(prompt.startswith(digest.prefix) for prompt in prompts)
+    assert len({prompt[len(digest.prefix):] for prompt in prompts}) == 3
+    assert all(estimate_tokens(prompt) < 3000 for prompt in prompts)
+
+
+def test_section_blocs_cover_their_analyses():
+    assert set(SECTION_ANSWER_BLOCS) == set(SECTION_ANALYSES)
+    assert {a for analyses in SECTION_ANALYSES.values() for a in analyses} == set(ANALYSIS_BLOCS)
+    for section, analyses in SECTION_ANALYSES.items():
+        assert set(SECTION_ANSWER_BLOCS[section]) == {b for a in analyses for b in ANALYSIS_BLOCS[a]}
+    # Each analysis of a section finds its priority bloc among the section responses
+    digest = encode_responses(r for r in RESPONSES if r["bloc"] in SECTION_ANSWER_BLOCS["psychological_analysis"])
+    for analysis in SECTION_ANALYSES["psychological_analysis"]:
+        assert digest.analysis_lines(analysis)[0].bloc == ANALYSIS_BLOCS[analysis][0]
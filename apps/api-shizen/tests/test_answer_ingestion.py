@@ -0,0 +1,132 @@
+"""
+Tests for bulk questionnaire answer ingestion
+
+Validates:
+1. A batch is stored with one upsert and one progress update
+2. Re-submitted answers update the existing row (one answer per question)
+3. NDJSON imports are written in chunks and complete the session
+4. Invalid NDJSON lines are rejected with their line number, nothing stored
+5. Oversized lines are rejected, complete or not
+"""
+import json
+
+import pytest
+from sqlalchemy import event
+
+from app.models.questionnaire_response import QuestionnaireResponse
+from app.models.questionnaire_session import QuestionnaireSession, SessionStatus
+from app.routes import questionnaire as questionnaire_routes
+from app.services import answer_ingestion
+from tests.conftest import async_engine
+
+SESSION_ID = "qs-ingest"
+
+
+def _answer(number: int, value: str = "option_1") -> dict:
+    return {
+        "question_id": f"Q{number:03d}",
+        "bloc": "ABCDEFGHI"[number % 9],
+        "answer": {"value": value},
+        "question_type": "radio",
+    }
+
+
+def _ndjson(answers) -> bytes:
+    return "\n".join(json.dumps(answer) for answer in answers).encode() + b"\n"
+
+
+@pytest.fixture
+def questionnaire_session(db_session):
+    db_session.add(QuestionnaireSession(id=SESSION_ID, user_id="test-user-123"))
+    db_session.commit()
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_execute)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", before_execute)
+
+
+def test_batch_upserted_in_constant_statements(client, db_session, questionnaire_session, statements):
+    payload = {"session_id": SESSION_ID, "answers": [_answer(n) for n in range(50)]}
+    response = client.post("/questionnaire/submit-answers", json=payload)
+
+    assert response.status_code == 201, response.text
+    assert [a["question_id"] for a in response.json()] == [f"Q{n:03d}" for n in range(50)]
+    # session lookup + one upsert + one progress update
+    assert len(statements) == 3
+
+    payload["answers"] = [_answer(0, value="option_2"), _answer(50)]
+    assert client.post("/questionnaire/submit-answers", json=payload).status_code == 201
+
+    db_session.expire_all()
+    answers = db_session.query(QuestionnaireResponse).filter_by(session_id=SESSION_ID).all()
+    assert len(answers) == 51
+    assert next(a for a in answers if a.question_id == "Q000").answer == {"value": "option_2"}
+    session = db_session.get(QuestionnaireSession, SESSION_ID)
+    assert session.completion_percentage == str(51 * 100 // 144)
+    assert session.status == SessionStatus.IN_PROGRESS
+    assert session.current_bloc == _answer(50)["bloc"]
+
+
+def test_ndjson_import_completes_session(client, db_session, questionnaire_session, monkeypatch):
+    monkeypatch.setattr(answer_ingestion, "ANSWER_BATCH_SIZE", 40)
+    monkeypatch.setattr(questionnaire_routes, "ANSWER_BATCH_SIZE", 40)
+    answers = [_answer(n) for n in range(144)] + [_answer(3, value="option_4")]
+
+    response = client.post(
+        "/questionnaire/submit-answers/stream",
+        params={"session_id": SESSION_ID},
+        content=_ndjson(answers),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 201, response.text
+    assert response.json() == {
+        "session_id": SESSION_ID,
+        "received": 145,
+        "completion_percentage": 100,
+        "status": "completed",
+    }
+    db_session.expire_all()
+    assert db_session.query(QuestionnaireResponse).filter_by(session_id=SESSION_ID).count() == 144
+    session = db_session.get(QuestionnaireSession, SESSION_ID)
+    assert session.status == SessionStatus.COMPLETED
+    assert session.completed_at is not None
+
+
+def test_ndjson_invalid_line_rejected(client, db_session, questionnaire_session):
+    body = _ndjson([_answer(1)]) + b'{"question_id": "Q002"}\n'
+
+    response = client.post(
+        "/questionnaire/submit-answers/stream",
+        params={"session_id": SESSION_ID},
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Line 2:")
+    assert db_session.query(QuestionnaireResponse).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_ndjson_long_line_rejected_inside_chunk(monkeypatch):
+    monkeypatch.setattr(answer_ingestion, "MAX_NDJSON_LINE_BYTES", 200)
+    long_answer = dict(_answer(2), answer={"value": "x" * 300})
+
+    async def one_chunk():
+        # Complete oversized line, followed by a short partial line
+        yield _ndjson([_answer(1), long_answer]) + b'{"question_id"'
+
+    answers = []
+    with pytest.raises(answer_ingestion.AnswerStreamError, match="^Line 2: longer than 200 bytes"):
+        async for answer in answer_ingestion.read_answer_stream(one_chunk()):
+            answers.append(answer)
+    assert [a.question_id for a in answers] == ["Q001"]
@@ -0,0 +1,143 @@
+"""
+Tests for the persistent chart cache
+
+Validates:
+1. Equivalent birth inputs hit the same entry (normalized hash)
+2. A calculator version bump recomputes and overwrites the entry
+3. Empty (failed) results are never cached
+4. Profile pipeline computes each birth chart once across regenerations
+5. Cache failures never commit or roll back the caller's session
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+
+from app.models.chart_cache import ChartCacheEntry
+from app.models.questionnaire_session import QuestionnaireSession
+from app.services.chart_cache_service import ChartCacheService, chart_cache_key
+from app.services.holistic_profile_service import HolisticProfileService
+
+BIRTH_DATA = {
+    "date": "1990-06-15",
+    "time": "14:30:00",
+    "latitude": 48.8566,
+    "longitude": 2.3522,
+    "utc_offset": "+02:00",
+    "city": "Paris",
+    "country": "France",
+    "timezone": "Europe/Paris",
+}
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """File-backed async SQLite: cache writes use sessions of their own"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'charts.db'}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(ChartCacheEntry.__table__.create)
+        await conn.run_sync(QuestionnaireSession.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+class Counter:
+    """Chart calculator stub counting calls"""
+
+    def __init__(self, result):
+        self.calls = 0
+        self.result = result
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        return dict(self.result)
+
+
+class TestChartCache:
+    """Test ChartCacheService"""
+
+    def test_key_normalization(self):
+        """Test whitespace/Unicode/float noise do not change the key"""
+        a = chart_cache_key("numerology", {"full_name": "Élise  Martin ", "latitude": 48.85660000001})
+        b = chart_cache_key("numerology", {"full_name": "Élise Martin", "latitude": 48.8566})
+        assert a == b
+        assert a != chart_cache_key("design_human", {"full_name": "Élise Martin", "latitude": 48.8566})
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute(self, db, session_factory):
+        """Test compute runs once, then again only after a version bump"""
+        cache = ChartCacheService(session_factory)
+        compute = Counter({"type": "Projector"})
+        inputs = {"birth_date": "1990-06-15"}
+
+        for _ in range(3):
+            assert await cache.get_or_compute(db, "design_human", 1, inputs, compute) == {"type": "Projector"}
+        assert compute.calls == 1
+
+        compute.result = {"type": "Generator"}
+        assert await cache.get_or_compute(db, "design_human", 2, inputs, compute) == {"type": "Generator"}
+        assert compute.calls == 2
+
+        rows = (await db.execute(select(ChartCacheEntry))).scalars().all()
+        assert [(row.calculator_version, row.result) for row in rows] == [(2, {"type": "Generator"})]
+
+    @pytest.mark.asyncio
+    async def test_empty_result_not_cached(self, db, session_factory):
+        """Test failed calculations are retried next time"""
+        cache = ChartCacheService(session_factory)
+        compute = Counter({})
+        await cache.get_or_compute(db, "astrology_western", 1, {"birth_date": "x"}, compute)
+        await cache.get_or_compute(db, "astrology_western", 1, {"birth_date": "x"}, compute)
+        assert compute.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_write_leaves_caller_session_alone(self, db, session_factory, monkeypatch):
+        """Test a cache write error neither commits nor discards the caller's pending work"""
+        cache = ChartCacheService(session_factory)
+
+        def broken_upsert(*args):
+            raise OperationalError("INSERT", {}, Exception("disk I/O error"))
+
+        monkeypatch.setattr(cache, "_upsert", broken_upsert)
+        session = QuestionnaireSession(id="qs-1", user_id="user-1", full_name="Jean Martin")
+        db.add(session)
+        await db.flush()
+
+        result = await cache.get_or_compute(db, "numerology", 1, {"full_name": "Jean Martin"}, Counter({"life_path": 4}))
+
+        assert result == {"life_path": 4}
+        assert session in db and session.full_name == "Jean Martin"
+        await db.commit()
+        assert (await db.execute(select(ChartCacheEntry))).scalars().all() == []
+
+
+class TestProfilePipelineCache:
+    """Test HolisticProfileService reads charts through the cache"""
+
+    @pytest.mark.asyncio
+    async def test_birth_charts_computed_once(self, db, session_factory, monkeypatch):
+        """Test a second generation with the same birth data computes nothing"""
+        service = HolisticProfileService()
+        service.chart_cache = ChartCacheService(session_factory)
+        design_human = Counter({"type": "Projector"})
+        astrology = Counter({"sun_sign": "gemini"})
+        numerology = Counter({"life_path": {"value": 4}})
+        monkeypatch.setattr(service.dh_service, "calculate_chart", design_human)
+        monkeypatch.setattr(service.astro_service, "calculate_chart", astrology)
+        monkeypatch.setattr(service.num_service, "calculate_chart", numerology)
+
+        first = await service.calculate_birth_charts(BIRTH_DATA, "Jean Martin", db)
+        second = await service.calculate_birth_charts(dict(BIRTH_DATA), "Jean  Martin", db)
+
+        assert first == second
+        assert first["design_human"] == {"type": "Projector"}
+        assert first["astrology_chinese"]["animal_sign"]
+        assert (design_human.calls, astrology.calls, numerology.calls) == (1, 1, 1)
@@ -0,0 +1,155 @@
+"""
+Tests for the rolling conversation memory
+
+Validates:
+1. Messages leaving the recent window are folded into the summary in batches
+2. The watermark advances, so each message is summarized once
+3. Concurrent update requests are coalesced (no overlapping LLM calls)
+4. Prompt sections stay within their token budgets however long the conversation
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import ConversationSession, Message, MessageRole
+from app.services.conversation_memory import (
+    MEMORY_BATCH_MESSAGES,
+    RECENT_WINDOW_MESSAGES,
+    ConversationMemoryService,
+    estimate_tokens,
+    format_history_window,
+    format_memory_section,
+)
+
+START = datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+class FakeLLM:
+    """Records prompts and answers with a fixed memory JSON"""
+
+    def __init__(self, delay: float = 0):
+        self.prompts = []
+        self.delay = delay
+
+    async def generate(self, prompt, temperature=0.7):
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.delay)
+        return "Voici: " + json.dumps({
+            "summary": f"Résumé {len(self.prompts)}",
+            "user_preferences": ["sessions courtes"],
+            "goals_identified": ["mieux dormir"],
+            "emotional_state": "motivé",
+            "topics_discussed": ["sommeil"],
+        })
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(ConversationSession.__table__.create)
+        await conn.run_sync(Message.__table__.create)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add(ConversationSession(id="conv-1", user_id="user-1", context={}))
+        await db.commit()
+    yield factory
+    await engine.dispose()
+
+
+async def add_messages(factory, start: int, count: int):
+    async with factory() as db:
+        for i in range(start, start + count):
+            db.add(Message(
+                id=f"msg-{i:03d}",
+                conversation_id="conv-1",
+                role=MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT,
+                content=f"message {i}",
+                created_at=START + timedelta(minutes=i),
+            ))
+        await db.commit()
+
+
+async def load_context(factory):
+    async with factory() as db:
+        return (await db.get(ConversationSession, "conv-1")).context
+
+
+@pytest.mark.asyncio
+async def test_no_summary_while_window_holds_everything(session_factory):
+    llm = FakeLLM()
+    service = ConversationMemoryService(session_factory, llm)
+    await add_messages(session_factory, 0, RECENT_WINDOW_MESSAGES + MEMORY_BATCH_MESSAGES - 1)
+
+    assert await service.update_memory("conv-1") is False
+    assert llm.prompts == []
+
+
+@pytest.mark.asyncio
+async def test_rolling_summary_advances_watermark(session_factory):
+    llm = FakeLLM()
+    service = ConversationMemoryService(session_factory, llm)
+    total = RECENT_WINDOW_MESSAGES + MEMORY_BATCH_MESSAGES
+    await add_messages(session_factory, 0, total)
+
+    assert await service.update_memory("conv-1") is True
+    context = await load_context(session_factory)
+    assert context["summary"] == "Résumé 1"
+    assert context["memory"]["summarized_messages"] == MEMORY_BATCH_MESSAGES
+    # Recent window stays out of the summary
+    assert f"message {MEMORY_BATCH_MESSAGES - 1}" in llm.prompts[0]
+    assert f"message {MEMORY_BATCH_MESSAGES}\n" not in llm.prompts[0]
+
+    # Nothing new: no second LLM call
+    assert await service.update_memory("conv-1") is False
+
+    # Next batch builds on the previous summary
+    await add_messages(session_factory, total, MEMORY_BATCH_MESSAGES)
+    assert await service.update_memory("conv-1") is True
+    assert "Résumé 1" in llm.prompts[1]
+    assert "message 0\n" not in llm.prompts[1]
+    context = await load_context(session_factory)
+    assert context["memory"]["summarized_messages"] == 2 * MEMORY_BATCH_MESSAGES
+    assert context["goals_identified"] == ["mieux dormir"]
+    assert service.latest("conv-1")["summary"] == "Résumé 2"
+
+
+@pytest.mark.asyncio
+async def test_scheduled_updates_are_coalesced(session_factory):
+    llm = FakeLLM(delay=0.05)
+    service = ConversationMemoryService(session_factory, llm)
+    await add_messages(session_factory, 0, RECENT_WINDOW_MESSAGES + MEMORY_BATCH_MESSAGES)
+
+    for _ in range(5):
+        service.schedule_update("conv-1")
+    await service.wait_idle()
+
+    # First pass summarizes, the single coalesced rerun finds nothing new
+    assert len(llm.prompts) == 1
+
+
+def test_prompt_stays_within_budget():
+    long_history = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message numéro {i} " * 30}
+        for i in range(200)
+    ]
+    history = format_history_window(long_history, budget=300)
+    assert estimate_tokens(history) <= 300
+    assert "message numéro 199" in history
+    assert "message numéro 0 " not in history
+
+    memory = format_memory_section(
+        {"summary": "très long résumé " * 500, "goals_identified": ["a", "b"], "emotional_state": "calme"},
+        budget=100,
+    )
+    assert estimate_tokens(memory) <= 130  # budget + section header
+    assert "Objectifs identifiés: a, b" in memory
+
+
+def test_single_oversized_message_is_truncated():
+    history = format_history_window([{"role": "user", "content": "x" * 10_000}], budget=50)
+    assert 0 < estimate_tokens(history) <= 50
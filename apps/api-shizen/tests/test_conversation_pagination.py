@@ -0,0 +1,151 @@
+"""
+Tests for keyset-paginated conversation history and search
+
+Validates:
+1. Scrolling back through messages returns every message once, even with equal timestamps
+2. Forward reading with `after` resumes exactly after the cursor (not combined with `before`)
+3. Conversation list pages, search over titles/message content and tag filters
+4. PostgreSQL search predicates use the exact indexed expressions
+5. The list wrappers keep returning [] on error
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import ConversationSession, ConversationStatus, Message, MessageRole
+from app.services.conversation_service import ConversationService
+from app.utils.pagination import decode_cursor
+
+START = datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(ConversationSession.__table__.create)
+        await conn.run_sync(Message.__table__.create)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def seed_messages(db, count: int):
+    db.add(ConversationSession(id="conv-1", user_id="user-1", title="Énergie", meta={"tags": []}))
+    for i in range(count):
+        db.add(Message(
+            id=f"msg-{i:03d}",
+            conversation_id="conv-1",
+            role=MessageRole.USER,
+            content=f"message {i}",
+            # Pairs of messages share a timestamp: the id breaks ties
+            created_at=START + timedelta(seconds=i // 2),
+        ))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_scroll_back_covers_every_message_once(db):
+    await seed_messages(db, 23)
+    service = ConversationService()
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = await service.get_message_page("conv-1", db, limit=5, before=cursor)
+        assert [m.id for m in page] == sorted(m.id for m in page)  # chronological in page
+        seen = [m.id for m in page] + seen
+        if cursor is None:
+            break
+
+    assert seen == [f"msg-{i:03d}" for i in range(23)]
+
+
+@pytest.mark.asyncio
+async def test_forward_reading_with_after(db):
+    await seed_messages(db, 12)
+    service = ConversationService()
+
+    first = await service.get_conversation_history("conv-1", db, limit=5)
+    assert [m.id for m in first] == [f"msg-{i:03d}" for i in range(5)]
+
+    page, cursor = await service.get_message_page("conv-1", db, limit=5, after=None, oldest_first=True)
+    page, cursor = await service.get_message_page("conv-1", db, limit=5, after=cursor)
+    assert [m.id for m in page] == [f"msg-{i:03d}" for i in range(5, 10)]
+    page, cursor = await service.get_message_page("conv-1", db, limit=5, after=cursor)
+    assert [m.id for m in page] == ["msg-010", "msg-011"]
+    assert cursor is None
+
+
+
+@pytest.mark.asyncio
+async def test_before_and_after_together_rejected(db):
+    await seed_messages(db, 4)
+    service = ConversationService()
+    _, cursor = await service.get_message_page("conv-1", db, limit=2)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_message_page("conv-1", db, before=cursor, after=cursor)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_conversation_list_search_and_tags(db):
+    for i in range(7):
+        db.add(ConversationSession(
+            id=f"conv-{i}",
+            user_id="user-1",
+            title="Routine du matin" if i % 2 == 0 else f"Conversation {i}",
+            status=ConversationStatus.DELETED if i == 6 else ConversationStatus.ACTIVE,
+            meta={"tags": ["sommeil"] if i < 3 else ["energie"]},
+            last_message_at=START + timedelta(hours=i),
+        ))
+    db.add(ConversationSession(id="other", user_id="user-2", title="Routine", meta={"tags": []}))
+    db.add(Message(id="m-1", conversation_id="conv-3", role=MessageRole.USER, content="Ma routine du soir"))
+    await db.commit()
+    service = ConversationService()
+
+    ids = []
+    cursor = None
+    while True:
+        page, cursor = await service.list_conversations("user-1", db, limit=3, cursor=cursor)
+        ids += [c.id for c in page]
+        if cursor is None:
+            break
+    assert ids == [f"conv-{i}" for i in range(6, -1, -1)]
+
+    found = await service.search_conversations("user-1", db, query="routine")
+    assert [c.id for c in found] == ["conv-4", "conv-3", "conv-2", "conv-0"]  # conv-6 deleted
+
+    tagged, _ = await service.list_conversations("user-1", db, tags=["sommeil"])
+    assert [c.id for c in tagged] == ["conv-2", "conv-1", "conv-0"]
+
+
+def test_postgres_search_uses_indexed_expressions():
+    dialect = postgresql.dialect()
+    search_sql = str(ConversationService._search_filter("routine matin", postgres=True).compile(dialect=dialect))
+    tags_sql = str(ConversationService._tags_filter(["sommeil"], postgres=True).compile(dialect=dialect))
+
+    assert "to_tsvector('simple', coalesce(conversation_sessions.title, ''))" in search_sql
+    assert "to_tsvector('simple', messages.content)" in search_sql
+    assert "CAST(conversation_sessions.meta -> 'tags' AS JSONB) @>" in tags_sql
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_wrappers_return_empty_on_error(db):
+    await seed_messages(db, 3)
+    service = ConversationService()
+
+    assert [m.id for m in await service.get_conversation_history("conv-1", db)] == ["msg-000", "msg-001", "msg-002"]
+    assert await service.get_conversation_history("conv-1", db, after="not-a-cursor") == []
+    assert await service.get_user_conversations("user-1", db, cursor="not-a-cursor") == []
@@ -0,0 +1,99 @@
+"""
+Tests for the precomputed ephemeris table and batch Design Humain charts
+
+Validates:
+1. Interpolated positions match Swiss Ephemeris (well below one tone)
+2. Vectorized solar-arc solve matches the Newton solve on swe.calc_ut
+3. Chunks are persisted and reused without Swiss Ephemeris
+4. calculate_charts() matches calculate_chart()
+"""
+import numpy as np
+import pytest
+import swisseph as swe
+
+from app.services import ephemeris_table
+from app.services.design_human_service import DesignHumanService
+from app.services.ephemeris_table import BODIES, EphemerisTable
+
+# One tone = 0.9375° / 36
+TONE_DEGREES = 0.9375 / 36
+
+BIRTHS = [
+    {"birth_date": "1990-06-15", "birth_time": "14:30:00", "latitude": 48.8566, "longitude": 2.3522, "timezone_offset": "+02:00"},
+    {"birth_date": "1990-04-02", "birth_time": "03:05:00", "latitude": 45.76, "longitude": 4.83, "timezone_offset": "+02:00"},
+    {"birth_date": "1990-09-30", "birth_time": "23:59:00", "latitude": 40.71, "longitude": -74.0, "timezone_offset": "-04:00"},
+]
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    """Table with the 1990 chunks built in a temporary cache dir"""
+    table = EphemerisTable(cache_dir=tmp_path_factory.mktemp("ephemeris"))
+    table.build_range(swe.julday(1989, 12, 1, 0.0), swe.julday(1990, 11, 1, 0.0))
+    return table
+
+
+class TestEphemerisTable:
+    """Test table lookups"""
+
+    def test_positions_match_swiss_ephemeris(self, table):
+        """Test interpolation error stays far below one tone"""
+        jds = swe.julday(1990, 1, 1, 0.0) + np.random.default_rng(7).uniform(0, 250, 200)
+        longitudes, speeds = table.lookup(jds, build=False)
+
+        for row, jd in enumerate(jds):
+            for column, (body, _) in enumerate(BODIES):
+                expected = swe.calc_ut(jd, body)[0]
+                assert abs((longitudes[row, column] - expected[0] + 180) % 360 - 180) < TONE_DEGREES / 20
+                assert speeds[row, column] == pytest.approx(expected[3], abs=0.01)
+
+    def test_solar_arc(self, table):
+        """Test vectorized 88° solve matches the Swiss Ephemeris Newton solve"""
+        service = DesignHumanService(ephemeris=table)
+        jds = np.array([swe.julday(1990, m, 10, 12.0) for m in (4, 6, 9)])
+
+        solved = table.solve_solar_arc(jds, build=False)
+        for jd, design in zip(jds, solved):
+            assert design == pytest.approx(service._calculate_design_time(jd), abs=1e-3)
+
+    def test_chunks_reused_from_disk(self, table, monkeypatch):
+        """Test a new table loads persisted chunks instead of calling Swiss Ephemeris"""
+        fresh = EphemerisTable(cache_dir=table.cache_dir)
+        jd = swe.julday(1990, 6, 15, 12.0)
+        assert fresh.is_available(np.array([jd]))
+
+        monkeypatch.setattr(ephemeris_table.EphemerisTable, "_compute_chunk", staticmethod(lambda index: pytest.fail("rebuilt")))
+        longitudes, _ = fresh.lookup(np.array([jd]), build=False)
+        assert longitudes.shape == (1, len(BODIES))
+
+    def test_out_of_range(self, table):
+        """Test dates outside the table are rejected (service falls back to swe)"""
+        assert not table.supports(np.array([swe.julday(1850, 1, 1, 0.0)])).any()
+        with pytest.raises(ValueError):
+            table.lookup(np.array([swe.julday(2150, 1, 1, 0.0)]))
+
+
+class TestBatchCharts:
+    """Test DesignHumanService.calculate_charts"""
+
+    def test_batch_matches_single(self, table, monkeypatch):
+        """Test batch charts match single charts and use no Swiss Ephemeris call"""
+        service = DesignHumanService(ephemeris=table)
+        singles = [service.calculate_chart(**birth) for birth in BIRTHS]
+
+        monkeypatch.setattr(swe, "calc_ut", lambda *args: pytest.fail("swe.calc_ut called"))
+        charts = service.calculate_charts(BIRTHS + [{"birth_date": "not-a-date", "birth_time": "00:00:00"}])
+
+        assert charts[-1] is None
+        for single, chart in zip(singles, charts):
+            assert chart["type"] == single["type"]
+            assert chart["profile"] == single["profile"]
+            assert chart["gates"] == single["gates"]
+
+    def test_single_chart_falls_back_without_table(self, tmp_path):
+        """Test calculate_chart uses Swiss Ephemeris when no chunk is built"""
+        service = DesignHumanService(ephemeris=EphemerisTable(cache_dir=tmp_path))
+        chart = service.calculate_chart(**BIRTHS[0])
+
+        assert len(chart["personality_planets"]) == 13
+        assert list(tmp_path.iterdir()) == []
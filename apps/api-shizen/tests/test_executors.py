@@ -0,0 +1,90 @@
+"""
+Tests for off-event-loop execution
+
+Validates:
+1. Blocking work runs in the workload's pool thread, not on the event loop
+2. The loop keeps serving other coroutines while a pool job blocks
+3. Admission is bounded (workers + pending) and exceptions propagate
+4. The lag monitor reports callbacks blocking the loop past the threshold
+"""
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from app.core.executors import WorkloadConfig, WorkloadPool, get_pool, run_blocking
+from app.core.loop_monitor import LoopLagMonitor
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_uses_pool_thread():
+    thread_name = await run_blocking("ocr", lambda: threading.current_thread().name)
+    assert thread_name.startswith("ocr-pool")
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await run_blocking("ephemeris", time.sleep, 0.2)
+    task.cancel()
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_admission_is_bounded():
+    pool = WorkloadPool("test", WorkloadConfig(max_workers=1, max_pending=1))
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def job():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    await asyncio.gather(*(pool.run(job) for _ in range(6)))
+    pool.shutdown()
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_exceptions_propagate():
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await run_blocking("sync_db", fail)
+
+
+def test_unknown_workload():
+    with pytest.raises(KeyError):
+        get_pool("gpu")
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_reports_stall(caplog):
+    monitor = LoopLagMonitor(threshold_ms=50, interval_ms=10)
+    with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+        monitor.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.2)  # Block the loop on purpose
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    assert monitor.stats.stalls == 1
+    assert monitor.stats.max_lag_ms >= 100
+    assert any("test_loop_monitor_reports_stall" in r.getMessage() for r in caplog.records)
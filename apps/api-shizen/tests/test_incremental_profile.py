@@ -0,0 +1,202 @@
+"""
+Tests for incremental holistic profile regeneration
+
+Validates:
+1. A regeneration without changes recomputes nothing and reuses the synthesis
+2. An edited answer only recomputes the sections reading its bloc, then the synthesis
+3. Edited birth data only recomputes the charts depending on it
+4. A fallback neurodivergence result is never reused
+5. A new analysis model or prompt version recomputes the LLM sections only
+   (numerology included: it carries the LLM name analysis)
+"""
+import pytest
+
+from app.models.holistic_profile import HolisticProfile
+from app.models.questionnaire_response import QuestionnaireResponse
+from app.models.questionnaire_session import QuestionnaireSession, SessionStatus
+from app.services import holistic_profile_service
+from app.services.holistic_profile_service import HolisticProfileService
+from tests.conftest import TestingAsyncSessionLocal
+
+SESSION_ID = "qs-incremental"
+USER_ID = "test-user-123"
+
+
+class Counter:
+    """Async section calculator stub counting calls"""
+
+    def __init__(self, name: str, fail: bool = False):
+        self.name = name
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} unavailable")
+        return {"computed": self.name, "run": self.calls}
+
+
+class SynthesisCounter(Counter):
+    """Synthesis stub (text) counting calls"""
+
+    async def __call__(self, *args, **kwargs):
+        result = await super().__call__(*args, **kwargs)
+        return f"Synthèse n°{result['run']}"
+
+
+@pytest.fixture
+def questionnaire(db_session):
+    db_session.add(QuestionnaireSession(
+        id=SESSION_ID,
+        user_id=USER_ID,
+        status=SessionStatus.COMPLETED,
+        full_name="Jean Martin",
+        birth_data={"date": "1990-06-15", "time": "14:30:00", "latitude": 48.8566, "longitude": 2.3522},
+    ))
+    for number, bloc in enumerate("ABCDEFGHI", start=1):
+        db_session.add(QuestionnaireResponse(
+            id=f"r{number}", session_id=SESSION_ID, bloc=bloc, question_id=f"Q{number:03d}",
+            question_text=f"Question du bloc {bloc}", answer={"value": "option_1"}, question_type="radio",
+        ))
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = HolisticProfileService()
+    counters = {
+        "design_human": Counter("design_human"),
+        "astrology_western": Counter("astrology_western"),
+        "astrology_chinese": Counter("astrology_chinese"),
+        "numerology": Counter("numerology"),
+        "psychological_analysis": Counter("psychological_analysis"),
+        "neurodivergence_analysis": Counter("neurodivergence_analysis"),
+        "shinkofa_analysis": Counter("shinkofa_analysis"),
+    }
+    synthesis = SynthesisCounter("synthesis")
+    monkeypatch.setattr(service, "_cached_design_human", counters["design_human"])
+    monkeypatch.setattr(service, "_cached_astrology", counters["astrology_western"])
+    monkeypatch.setattr(service, "_cached_chinese_astrology", counters["astrology_chinese"])
+    monkeypatch.setattr(service, "_calculate_numerology", counters["numerology"])
+    monkeypatch.setattr(service, "_analyze_psychology", counters["psychological_analysis"])
+    monkeypatch.setattr(service, "_analyze_neurodivergence", counters["neurodivergence_analysis"])
+    monkeypatch.setattr(service, "_analyze_shinkofa", counters["shinkofa_analysis"])
+    monkeypatch.setattr(service.psych_service, "generate_synthesis", synthesis)
+    service.counters = counters
+    service.synthesis_counter = synthesis
+    return service
+
+
+async def _generate(service: HolisticProfileService) -> HolisticProfile:
+    async with TestingAsyncSessionLocal() as db:
+        return await service.generate_profile(SESSION_ID, USER_ID, db)
+
+
+def _calls(service: HolisticProfileService) -> dict:
+    calls = {name: counter.calls for name, counter in service.counters.items()}
+    calls["synthesis"] = service.synthesis_counter.calls
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_unchanged_inputs_reuse_everything(questionnaire, service):
+    first = await _generate(service)
+    assert set(_calls(service).values()) == {1}
+    assert all(row.input_hash for row in first.sections.values())
+
+    second = await _generate(service)
+
+    assert set(_calls(service).values()) == {1}
+    assert second.version == 2 and second.is_active
+    assert second.synthesis == first.synthesis
+    assert second.synthesis_input_hash == first.synthesis_input_hash
+    assert second.psychological_analysis == first.psychological_analysis
+    assert questionnaire.get(HolisticProfile, first.id).is_active is False
+
+
+@pytest.mark.asyncio
+async def test_edited_answer_recomputes_dependent_sections(questionnaire, service):
+    await _generate(service)
+
+    # Bloc G is only read by the Shinkofa analysis
+    questionnaire.get(QuestionnaireResponse, "r7").answer = {"value": "option_2"}
+    questionnaire.commit()
+    profile = await _generate(service)
+
+    calls = _calls(service)
+    assert calls.pop("shinkofa_analysis") == 2
+    assert calls.pop("synthesis") == 2
+    assert set(calls.values()) == {1}
+    assert profile.shinkofa_analysis == {"computed": "shinkofa_analysis", "run": 2}
+
+
+@pytest.mark.asyncio
+async def test_edited_birth_time_recomputes_charts_only(questionnaire, service):
+    await _generate(service)
+
+    session = questionnaire.get(QuestionnaireSession, SESSION_ID)
+    session.birth_data = {**session.birth_data, "time": "15:45:00"}
+    questionnaire.commit()
+    await _generate(service)
+
+    calls = _calls(service)
+    assert (calls.pop("design_human"), calls.pop("astrology_western"), calls.pop("synthesis")) == (2, 2, 2)
+    # Chinese astrology and numerology only read the birth date
+    assert set(calls.values()) == {1}
+
+
+@pytest.mark.asyncio
+async def test_fallback_neurodivergence_is_retried(questionnaire, service, monkeypatch):
+    retry = service._retry_with_backoff
+
+    async def no_backoff(func, *args, **kwargs):
+        return await retry(func, *args, **{**kwargs, "max_retries": 1, "initial_delay": 0.0})
+
+    monkeypatch.setattr(service, "_retry_with_backoff", no_backoff)
+    service.counters["neurodivergence_analysis"].fail = True
+    first = await _generate(service)
+    assert first.neurodivergence_analysis["_analysis_status"] == "pending"
+    assert first.sections["neurodivergence_analysis"].input_hash is None
+
+    service.counters["neurodivergence_analysis"].fail = False
+    second = await _generate(service)
+
+    assert second.neurodivergence_analysis["computed"] == "neurodivergence_analysis"
+    assert service.synthesis_counter.calls == 2
+    assert service.counters["psychological_analysis"].calls == 1
+
+
+@pytest.mark.asyncio
+async def test_new_model_or_prompt_version_recomputes_llm_sections(questionnaire, service, monkeypatch):
+    llm_sections = ("psychological_analysis", "neurodivergence_analysis", "shinkofa_analysis", "synthesis")
+    monkeypatch.setattr(service.psych_service.llm, "primary_provider", "deepseek")
+    await _generate(service)
+
+    monkeypatch.setattr(service.psych_service.llm, "primary_provider", "ollama")
+    await _generate(service)
+    calls = _calls(service)
+    assert [calls.pop(section) for section in llm_sections] == [2, 2, 2, 2]
+    assert set(calls.values()) == {1}  # charts do not depend on the model
+
+    monkeypatch.setattr(holistic_profile_service, "ANALYSIS_PROMPT_VERSION", 999)
+    await _generate(service)
+    calls = _calls(service)
+    assert [calls.pop(section) for section in llm_sections] == [3, 3, 3, 3]
+    assert calls.pop("numerology") == 2
+    assert set(calls.values()) == {1}
+
+
+@pytest.mark.asyncio
+async def test_new_name_analysis_model_recomputes_numerology(questionnaire, service, monkeypatch):
+    name_llm = service.name_holistic_service.llm
+    monkeypatch.setattr(name_llm, "primary_provider", "deepseek")
+    await _generate(service)
+
+    monkeypatch.setattr(name_llm, "primary_provider", "ollama")
+    await _generate(service)
+
+    calls = _calls(service)
+    assert (calls.pop("numerology"), calls.pop("synthesis")) == (2, 2)
+    assert set(calls.values()) == {1}
@@ -0,0 +1,179 @@
+"""
+Tests for metrics and trace propagation
+
+Validates:
+1. Metrics render in the Prometheus text format
+2. Requests are timed per route template and carry a trace context
+3. LLM calls propagate the trace and record latency / tokens per provider and model
+4. Pool checkout waits and cache lookups are recorded
+5. Worker snapshots are merged (multi-worker mode), /metrics is off or token-protected
+"""
+import json
+import os
+import subprocess
+import sys
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.database import TimedQueuePool
+from app.core.metrics import (
+    CACHE_REQUESTS,
+    DB_POOL_CHECKOUT_WAIT,
+    HTTP_REQUEST_DURATION,
+    LLM_REQUEST_DURATION,
+    LLM_TOKENS,
+    Counter,
+    Gauge,
+    Histogram,
+    Metric,
+    MetricsRegistry,
+    record_cache,
+)
+from app.core.tracing import ObservabilityMiddleware, outgoing_trace_headers, parse_traceparent
+from app.services.ollama_service import OllamaService
+import app.main as main_module
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+def test_text_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("demo_requests_total", "Requests", ("path",)))
+    latency = registry.register(Histogram("demo_latency_seconds", "Latency", buckets=(0.1, 1.0)))
+    requests.inc(path='/a"b')
+    requests.inc(2, path='/a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3)
+
+    assert registry.render().splitlines() == [
+        "# HELP demo_requests_total Requests",
+        "# TYPE demo_requests_total counter",
+        'demo_requests_total{path="/a\\"b"} 3',
+        "# HELP demo_latency_seconds Latency",
+        "# TYPE demo_latency_seconds histogram",
+        'demo_latency_seconds_bucket{le="0.1"} 1',
+        'demo_latency_seconds_bucket{le="1"} 2',
+        'demo_latency_seconds_bucket{le="+Inf"} 3',
+        "demo_latency_seconds_sum 3.55",
+        "demo_latency_seconds_count 3",
+    ]
+    with pytest.raises(ValueError):
+        requests.inc(other="x")
+
+
+def test_metric_without_samples_cannot_be_created():
+    class Incomplete(Metric):
+        type_name = "gauge"
+
+    with pytest.raises(TypeError):
+        Incomplete("demo_incomplete", "No samples()")
+
+
+def test_requests_timed_per_route_with_trace_context():
+    app = FastAPI()
+    app.add_middleware(ObservabilityMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: str):
+        return outgoing_trace_headers()
+
+    client = TestClient(app)
+    before = HTTP_REQUEST_DURATION.count(method="GET", route="/items/{item_id}", status="200")
+
+    response = client.get("/items/42", headers={"traceparent": TRACEPARENT})
+    outgoing = parse_traceparent(response.json()["traceparent"])
+    assert response.headers["X-Trace-Id"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert outgoing.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"  # same trace downstream
+    assert outgoing.span_id != "00f067aa0ba902b7"
+
+    fresh = client.get("/items/43")
+    assert fresh.headers["X-Trace-Id"] != response.headers["X-Trace-Id"]
+    assert HTTP_REQUEST_DURATION.count(method="GET", route="/items/{item_id}", status="200") == before + 2
+
+    assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("garbage") is None
+
+
+@pytest.mark.asyncio
+async def test_ollama_call_records_latency_tokens_and_propagates_trace():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("traceparent"))
+        return httpx.Response(200, json={"response": "Bonjour", "prompt_eval_count": 12, "eval_count": 30})
+
+    service = OllamaService()
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    labels = dict(provider="ollama", model="test-model")
+    prompt_tokens = LLM_TOKENS.value(kind="prompt", **labels)
+    calls = LLM_REQUEST_DURATION.count(operation="generate", outcome="success", **labels)
+
+    assert await service.generate("Salut", model="test-model") == "Bonjour"
+
+    assert parse_traceparent(seen[0]) is not None
+    assert LLM_TOKENS.value(kind="prompt", **labels) == prompt_tokens + 12
+    assert LLM_REQUEST_DURATION.count(operation="generate", outcome="success", **labels) == calls + 1
+
+
+def test_pool_checkout_wait_and_cache_lookups_recorded():
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool)
+    checkouts = DB_POOL_CHECKOUT_WAIT.count(engine="sync")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert DB_POOL_CHECKOUT_WAIT.count(engine="sync") == checkouts + 1
+    engine.dispose()
+
+    hits = CACHE_REQUESTS.value(cache="test", result="hit")
+    record_cache("test", hit=True, count=3)
+    record_cache("test", hit=False, count=0)
+    assert CACHE_REQUESTS.value(cache="test", result="hit") == hits + 3
+    assert CACHE_REQUESTS.value(cache="test", result="miss") == 0
+
+
+def _registry(directory):
+    registry = MetricsRegistry(str(directory))
+    requests = registry.register(Counter("demo_requests_total", "Requests", ("path",)))
+    latency = registry.register(Histogram("demo_latency_seconds", "Latency", buckets=(1.0,)))
+    registry.register(Gauge("demo_busy", "Busy", collect=lambda: {(): 2}))
+    return registry, requests, latency
+
+
+def test_worker_snapshots_are_merged(tmp_path):
+    # Another worker, already exited: its counters stay, its gauges do not
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    other, other_requests, other_latency = _registry(tmp_path)
+    other_requests.inc(3, path="/a")
+    other_latency.observe(0.5)
+    (tmp_path / f"worker-{exited.pid}.json").write_text(json.dumps(other.snapshot()))
+
+    registry, requests, latency = _registry(tmp_path)
+    requests.inc(path="/a")
+    requests.inc(path="/b")
+    latency.observe(2)
+
+    lines = registry.render().splitlines()
+    assert 'demo_requests_total{path="/a"} 4' in lines
+    assert 'demo_requests_total{path="/b"} 1' in lines
+    assert 'demo_latency_seconds_bucket{le="1"} 1' in lines
+    assert 'demo_latency_seconds_bucket{le="+Inf"} 2' in lines
+    assert "demo_latency_seconds_count 2" in lines
+    assert [line for line in lines if line.startswith("demo_busy")] == [f'demo_busy{{pid="{os.getpid()}"}} 2']
+
+
+def test_metrics_endpoint_disabled_or_token_protected(monkeypatch):
+    client = TestClient(main_module.app)
+    monkeypatch.setattr(main_module, "METRICS_ENABLED", False)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(main_module, "METRICS_ENABLED", True)
+    monkeypatch.setattr(main_module, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "# TYPE shizen_http_request_duration_seconds histogram" in response.text
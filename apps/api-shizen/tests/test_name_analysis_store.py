@@ -0,0 +1,201 @@
+"""
+Tests for the shared name analysis store
+
+Validates:
+1. The background worker queues names of ongoing questionnaires and fills them
+   with one LLM generation per batch
+2. Profile generation only calls the LLM for names never analyzed
+3. Partial / failed batches are retried without losing names
+4. Claimed names are not processed twice, discovery only reads new sessions
+5. Storing analyses never commits or rolls back the profile generation session
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.services.name_analysis_store as store_module
+from app.models import NameAnalysis, QuestionnaireSession, SessionStatus
+from app.services.name_analysis_store import NameAnalysisStore
+from app.services.name_etymology_service import FIRST_NAME, LAST_NAME, NameEtymologyService, normalize_name
+from app.services.name_holistic_analysis_service import NameHolisticAnalysisService
+
+EARLIER = datetime.now(timezone.utc) - timedelta(minutes=5)
+NUMEROLOGY = {"expression": {"number": 7}, "active": 3, "hereditary": {"number": 4}, "soul_urge": 1, "personality": 6}
+
+
+class FakeLLM:
+    """Answers batch prompts with a JSON object, single prompts with plain text"""
+
+    def __init__(self, skip=(), fail=False):
+        self.prompts = []
+        self.skip = set(skip)
+        self.fail = fail
+
+    async def generate(self, prompt, system=None, temperature=0.7, max_tokens=2048):
+        self.prompts.append(prompt)
+        if self.fail:
+            raise RuntimeError("LLM down")
+        if "objet JSON" in prompt:
+            names = [line[2:] for line in prompt.splitlines() if line.startswith("- ")]
+            return "```json\n" + json.dumps({n: f"Origine de {n}" for n in names if n not in self.skip}) + "\n```"
+        return f"Analyse: {prompt.splitlines()[0]}"
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """File-backed SQLite: the store opens sessions of its own"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'names.db'}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(QuestionnaireSession.__table__.create)
+        await conn.run_sync(NameAnalysis.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def make_store(session_factory):
+    def make(llm) -> NameAnalysisStore:
+        etymology = NameEtymologyService()
+        etymology.llm = llm
+        return NameAnalysisStore(etymology_service=etymology, session_factory=session_factory)
+    return make
+
+
+async def rows(db):
+    result = await db.execute(
+        select(NameAnalysis)
+        .order_by(NameAnalysis.kind, NameAnalysis.name_key)
+        .execution_options(populate_existing=True)
+    )
+    return {(r.kind, r.name_key): r for r in result.scalars()}
+
+
+@pytest.mark.asyncio
+async def test_worker_discovers_and_batches_names(db, make_store):
+    for i, (name, status) in enumerate([
+        ("Marie Dupont", SessionStatus.IN_PROGRESS),
+        ("marie  Martin", SessionStatus.STARTED),
+        ("Jean Dupont", SessionStatus.COMPLETED),
+        ("Paul Durand", SessionStatus.ANALYZED),  # profile already generated
+    ]):
+        db.add(QuestionnaireSession(id=f"s-{i}", user_id=f"u-{i}", full_name=name, status=status, last_activity_at=EARLIER))
+    await db.commit()
+    llm = FakeLLM()
+    store = make_store(llm)
+
+    assert await store.discover_names() == 4  # marie, jean / dupont, martin
+    assert await store.discover_names() == 0  # already queued
+
+    assert await store.process_pending(FIRST_NAME) == 2
+    assert await store.process_pending(LAST_NAME) == 2
+    assert len(llm.prompts) == 2  # one generation per batch
+
+    stored = await rows(db)
+    assert stored[(FIRST_NAME, "marie")].status == "ready"
+    assert stored[(LAST_NAME, "dupont")].analysis == "Origine de Dupont"
+    assert (FIRST_NAME, "paul") not in stored
+
+
+@pytest.mark.asyncio
+async def test_missing_and_failed_batches_are_retried(db, make_store):
+    store = make_store(FakeLLM(fail=True))
+    await store.enqueue(FIRST_NAME, ["Léa", "Zoé"])
+
+    # LLM down: batch left untouched
+    assert await store.process_pending(FIRST_NAME) == 0
+    assert all(r.attempts == 0 for r in (await rows(db)).values())
+
+    store.etymology_service.llm = FakeLLM(skip={"Zoé"})
+    assert await store.process_pending(FIRST_NAME) == 2
+    stored = await rows(db)
+    assert stored[(FIRST_NAME, "léa")].status == "ready"
+    assert (stored[(FIRST_NAME, "zoé")].status, stored[(FIRST_NAME, "zoé")].attempts) == ("pending", 1)
+
+
+
+@pytest.mark.asyncio
+async def test_claimed_names_skipped_and_discovery_incremental(db, make_store):
+    store = make_store(FakeLLM())
+    db.add(QuestionnaireSession(id="s-1", user_id="u-1", full_name="Marie Dupont",
+                                status=SessionStatus.IN_PROGRESS, last_activity_at=EARLIER))
+    await db.commit()
+    assert await store.discover_names() == 2
+
+    # Another worker holds the batch: nothing left to claim until its lease expires
+    assert await store.claim_pending(FIRST_NAME) == [("marie", "Marie")]
+    assert await store.process_pending(FIRST_NAME) == 0
+    await db.execute(NameAnalysis.__table__.update().values(claimed_until=EARLIER))
+    await db.commit()
+    assert await store.process_pending(FIRST_NAME) == 1
+
+    # Only sessions active since the last pass are read
+    await db.execute(QuestionnaireSession.__table__.update().values(full_name="Zoé Dupont", last_activity_at=EARLIER))
+    db.add(QuestionnaireSession(id="s-2", user_id="u-2", full_name="Jean Martin",
+                                status=SessionStatus.STARTED, last_activity_at=EARLIER + timedelta(seconds=1)))
+    await db.commit()
+    assert await store.discover_names() == 2
+    assert (FIRST_NAME, "zoé") not in await rows(db)
+
+
+@pytest.mark.asyncio
+async def test_profile_generation_only_calls_llm_for_unseen_names(db, make_store, monkeypatch):
+    llm = FakeLLM()
+    store = make_store(llm)
+    monkeypatch.setattr(store_module, "_name_analysis_store", store)
+    service = NameHolisticAnalysisService()
+    service.etymology_service = store.etymology_service
+    service.llm = llm
+
+    await store.save([(FIRST_NAME, "marie", "Marie", "Marie vient de l'hébreu")])
+
+    result = await service.analyze_full_name_holistic("MARIE", "Dupont", NUMEROLOGY, db=db)
+    assert result["etymology"]["first_name"] == "Marie vient de l'hébreu"
+    assert len(llm.prompts) == 3  # last name, anthroponymy, energetic weight
+    assert any("Nombre d'Expression (nom complet): 7" in p for p in llm.prompts)
+
+    # Same name for another user: everything reused
+    again = await service.analyze_full_name_holistic("Marie", "dupont", NUMEROLOGY, db=db)
+    assert len(llm.prompts) == 3
+    assert again == result
+
+
+@pytest.mark.asyncio
+async def test_failed_save_leaves_profile_session_alone(db, make_store, monkeypatch):
+    store = make_store(FakeLLM())
+    monkeypatch.setattr(store_module, "_name_analysis_store", store)
+    service = NameHolisticAnalysisService()
+    service.etymology_service = store.etymology_service
+    service.llm = store.etymology_service.llm
+
+    async def broken_save(db, rows):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(store, "_save", broken_save)
+    session = QuestionnaireSession(id="s-1", user_id="u-1", full_name="Marie Dupont")
+    db.add(session)
+    await db.flush()
+
+    result = await service.analyze_full_name_holistic("Marie", "Dupont", NUMEROLOGY, db=db)
+    assert result["etymology"]["first_name"].startswith("Analyse")
+
+    # Pending profile state survives and its objects are still loaded
+    assert session in db and session.full_name == "Marie Dupont"
+    await db.commit()
+    assert await rows(db) == {}
+
+
+def test_normalize_name():
+    assert normalize_name("  Marie  ANNE ") == "marie anne"
+    assert normalize_name("Hélène") != normalize_name("Helene")  # accents are meaningful
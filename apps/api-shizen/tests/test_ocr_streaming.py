@@ -0,0 +1,108 @@
+"""
+Tests for the streaming OCR pipeline
+
+Validates:
+1. PDFs are rendered one page at a time and pages are delivered in order
+2. DPI adapts to the ink density of each page
+3. Image uploads are decoded in memory (no temp file)
+4. Feeding pages to OCRTextParser matches parsing the whole document
+"""
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+
+from app.core.executors import WorkloadConfig, WorkloadPool
+from app.services.ocr import ocr_service as ocr_module
+from app.services.ocr.ocr_service import MAX_DPI, MIN_DPI, OCRService, choose_dpi
+from app.services.ocr.parser import OCRTextParser
+
+PAGES = [
+    "Question 1: Quel est ton rythme idéal ?\nRéponse: Le matin",
+    "Question 2: Comment recharges-tu ton énergie ?\nSeul(e) dans la nature",
+    "3. Préfères-tu planifier ou improviser ?\nRéponse: Planifier",
+]
+
+
+def _page_image(page_number: int, dense: bool = False) -> Image.Image:
+    """Blank page carrying its number in the top-left pixel (dense: mostly black)"""
+    image = Image.new("L", (60, 80), 0 if dense else 255)
+    image.putpixel((0, 0), page_number)
+    return image
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    """Poppler/tesseract stand-ins recording render calls (single inline OCR worker)"""
+    renders = []
+
+    def convert_from_path(pdf_path, dpi, first_page, last_page, grayscale):
+        assert first_page == last_page
+        renders.append((first_page, dpi))
+        return [_page_image(first_page, dense=first_page == 2)]
+
+    monkeypatch.setattr(ocr_module, "pdfinfo_from_path", lambda path: {"Pages": len(PAGES)})
+    monkeypatch.setattr(ocr_module, "convert_from_path", convert_from_path)
+    monkeypatch.setattr(ocr_module, "ocr_page", lambda image, language: PAGES[image.getpixel((0, 0)) - 1])
+    monkeypatch.setattr(
+        ocr_module, "get_pool",
+        lambda name: WorkloadPool(name, WorkloadConfig(max_workers=1, max_pending=0, kind="process")),
+    )
+    return renders
+
+
+def test_pdf_pages_stream_in_order(fake_ocr, tmp_path):
+    pdf_path = tmp_path / "chart.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    received = []
+
+    result = OCRService().extract_text_from_file(str(pdf_path), on_page=lambda n, text: received.append(n))
+
+    assert result["success"]
+    assert result["num_pages"] == 3
+    assert result["pages"] == PAGES
+    assert received == [1, 2, 3]
+    # Probe + final render per page, one page at a time
+    assert [page for page, _ in fake_ocr] == [1, 1, 2, 2, 3, 3]
+    final_dpis = {page: dpi for page, dpi in fake_ocr[1::2]}
+    assert final_dpis == {1: MIN_DPI, 2: MAX_DPI, 3: MIN_DPI}
+
+
+def test_choose_dpi_follows_ink_density():
+    sparse = Image.new("L", (100, 100), 255)
+    dense = Image.new("L", (100, 100), 255)
+    ImageDraw.Draw(dense).rectangle((0, 0, 99, 19), fill=0)  # 20% ink
+    medium = Image.new("L", (100, 100), 255)
+    ImageDraw.Draw(medium).rectangle((0, 0, 99, 4), fill=0)  # 5% ink
+
+    assert choose_dpi(sparse) == MIN_DPI
+    assert choose_dpi(dense) == MAX_DPI
+    assert MIN_DPI < choose_dpi(medium) < MAX_DPI
+
+
+def test_image_bytes_skip_temp_file(fake_ocr, monkeypatch):
+    def no_temp_file(*args, **kwargs):
+        raise AssertionError("temp file written for an image upload")
+
+    monkeypatch.setattr(ocr_module.tempfile, "NamedTemporaryFile", no_temp_file)
+    buffer = io.BytesIO()
+    _page_image(2).save(buffer, format="PNG")
+
+    result = OCRService().extract_text_from_bytes(buffer.getvalue(), "scan.png")
+
+    assert result["success"]
+    assert result["file_type"] == "image"
+    assert result["text"] == PAGES[1]
+
+
+def test_streamed_parsing_matches_whole_document():
+    parser = OCRTextParser()
+    for number, text in enumerate(PAGES, start=1):
+        parser.feed_page(number, text)
+    streamed = parser.finish()
+
+    whole = OCRTextParser().parse_document("\n\n".join(PAGES))
+
+    assert streamed == whole
+    assert streamed["questions_found"] == 3
+    assert [qa["answer"] for qa in streamed["data"]] == ["Le matin", "Seul(e) dans la nature", "Planifier"]
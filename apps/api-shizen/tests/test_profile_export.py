@@ -0,0 +1,196 @@
+"""
+Tests for the profile export pipeline
+
+Validates:
+1. Markdown is rendered from the compiled template, PDF is a valid document
+2. Exports are cached per profile version / update and served without reloading sections
+3. Updating a profile invalidates its cached artifacts (superseded ones pruned after a grace period)
+4. Bulk exports zip cached and freshly rendered profiles
+5. A failed render is reported, never cached
+"""
+import os
+import re
+import zipfile
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.services.profile_export_service as export_module
+from app.models import HolisticProfile, HolisticProfileSection, QuestionnaireSession
+from app.routes.shizen import export_profile
+from app.services.profile_export_service import ProfileExportService, render_pdf
+
+START = datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        for model in (QuestionnaireSession, HolisticProfile, HolisticProfileSection):
+            await conn.run_sync(model.__table__.create)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def factory(engine):
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add(QuestionnaireSession(id="qs-1", user_id="user-1"))
+        for index in (1, 2):
+            db.add(HolisticProfile(
+                id=f"p-{index}",
+                session_id="qs-1",
+                user_id="user-1",
+                version=index,
+                design_human={"type": "manifesting_generator", "defined_centers": ["sacral", "g_center"]},
+                numerology={"life_path": 7},
+                shinkofa_analysis={"life_wheel": {"santé": 6}},
+                synthesis="Tu avances par cycles (intenses) puis tu récupères.",
+                recommendations={"quotidien": [{"recommendation": "Marcher le matin"}, "Boire de l'eau"]},
+                generated_at=START,
+                updated_at=START,
+            ))
+        await db.commit()
+    return factory
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    service = ProfileExportService(export_dir=str(tmp_path))
+    monkeypatch.setattr(export_module, "_export_service", service)
+    return service
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements executed during the test"""
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def pdf_text(content: bytes) -> str:
+    """Text shown by the PDF content streams"""
+    streams = re.findall(rb"stream\n(.*?)\nendstream", content, re.S)
+    return "\n".join(zlib.decompress(s).decode("cp1252") for s in streams)
+
+
+@pytest.mark.asyncio
+async def test_markdown_export_uses_profile_sections(factory, service):
+    async with factory() as db:
+        response = await export_profile("p-1", format="markdown", current_user_id="user-1", db=db)
+
+    assert response.media_type.startswith("text/markdown")
+    with open(response.path, encoding="utf-8") as f:
+        markdown = f.read()
+    assert "**Type** : Manifesting Generator" in markdown
+    assert "**Centres définis** : Sacral, G Center" in markdown
+    assert "- **Santé** : ██████░░░░ 6/10" in markdown
+    assert "- Marcher le matin\n- Boire de l'eau" in markdown
+    assert "**Soleil** : N/A" in markdown  # missing section
+    assert "Copyright © 2026" in markdown
+
+
+@pytest.mark.asyncio
+async def test_pdf_export_is_a_valid_document(factory, service):
+    async with factory() as db:
+        response = await export_profile("p-1", format="pdf", current_user_id="user-1", db=db)
+
+    with open(response.path, "rb") as f:
+        content = f.read()
+    assert response.media_type == "application/pdf"
+    assert content.startswith(b"%PDF-1.4") and content.rstrip().endswith(b"%%EOF")
+    text = pdf_text(content)
+    assert "Profil Holistique Shinkofa" in text
+    assert "Tu avances par cycles \\(intenses\\) puis tu récupères." in text
+
+    # Long documents are paginated
+    long_pdf = render_pdf("\n".join(f"- ligne {i}" for i in range(200)))
+    assert b"/Count 4" in long_pdf
+
+
+@pytest.mark.asyncio
+async def test_cached_export_skips_sections_until_profile_update(factory, service, statements):
+    async with factory() as db:
+        first = await export_profile("p-1", format="pdf", current_user_id="user-1", db=db)
+
+    statements.clear()
+    async with factory() as db:
+        again = await export_profile("p-1", format="pdf", current_user_id="user-1", db=db)
+    assert again.path == first.path
+    assert not any("holistic_profile_sections" in s for s in statements)
+    os.utime(first.path, (0, 0))  # past the grace period
+
+    async with factory() as db:
+        profile = (await db.execute(select(HolisticProfile).where(HolisticProfile.id == "p-1"))).scalar_one()
+        profile.synthesis = "Nouvelle synthèse"
+        profile.updated_at = START + timedelta(hours=1)
+        await db.commit()
+        updated = await export_profile("p-1", format="pdf", current_user_id="user-1", db=db)
+
+    assert updated.path != first.path
+    assert "Nouvelle synthèse" in pdf_text(open(updated.path, "rb").read())
+    assert len(list((Path(service.cache_dir) / "p-1").iterdir())) == 1  # stale render pruned
+
+    with pytest.raises(HTTPException) as exc_info:
+        async with factory() as db:
+            await export_profile("p-1", format="pdf", current_user_id="user-2", db=db)
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_bulk_export_zips_cached_and_rendered_profiles(factory, service):
+    async with factory() as db:
+        cached = await export_profile("p-1", format="markdown", current_user_id="user-1", db=db)
+        profile = (await db.execute(select(HolisticProfile).where(HolisticProfile.id == "p-2"))).scalar_one()
+
+    archive = await service.export_bulk(
+        [profile],
+        {service.archive_name("user-1", 1, "markdown"): cached.path},
+        "markdown",
+    )
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.namelist() == ["profil_user-1_v1.md", "profil_user-1_v2.md"]
+        assert "Manifesting Generator" in zf.read("profil_user-1_v2.md").decode("utf-8")
+
+    service.invalidate("p-1")
+    assert service.cached_path("p-1", 1, START, "markdown") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_render_is_not_cached(factory, service, monkeypatch):
+    def broken_context(profile):
+        raise KeyError("life_wheel")
+
+    monkeypatch.setattr(export_module, "markdown_context", broken_context)
+    with pytest.raises(HTTPException) as exc_info:
+        async with factory() as db:
+            await export_profile("p-1", format="markdown", current_user_id="user-1", db=db)
+    assert exc_info.value.status_code == 500
+    assert service.cached_path("p-1", 1, START, "markdown") is None
+
+
+@pytest.mark.asyncio
+async def test_recent_superseded_render_survives_pruning(factory, service):
+    async with factory() as db:
+        first = await export_profile("p-1", format="markdown", current_user_id="user-1", db=db)
+        profile = (await db.execute(select(HolisticProfile).where(HolisticProfile.id == "p-1"))).scalar_one()
+        profile.updated_at = START + timedelta(hours=1)
+        await db.commit()
+        updated = await export_profile("p-1", format="markdown", current_user_id="user-1", db=db)
+
+    assert updated.path != first.path
+    assert os.path.exists(first.path)  # a download may still be reading it
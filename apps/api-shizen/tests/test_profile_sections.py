@@ -0,0 +1,118 @@
+"""
+Tests for HolisticProfile section storage and column-projected reads
+
+Validates:
+1. Analysis sections are stored in holistic_profile_sections and read back transparently
+2. Version listing and activation never read the section blobs
+3. A single section can be fetched on demand
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import HolisticProfile, HolisticProfileSection, QuestionnaireSession
+from app.routes.shizen import activate_profile_version, get_profile_section, get_user_profile_versions
+
+START = datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        for model in (QuestionnaireSession, HolisticProfile, HolisticProfileSection):
+            await conn.run_sync(model.__table__.create)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def factory(engine):
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add(QuestionnaireSession(id="qs-1", user_id="user-1"))
+        for version in (1, 2, 3):
+            db.add(HolisticProfile(
+                id=f"p-{version}",
+                session_id="qs-1",
+                user_id="user-1",
+                version=version,
+                is_active=version == 3,
+                design_human={"type": "projector", "gates": list(range(64))},
+                numerology={"life_path": version},
+                synthesis="Longue synthèse " * 200,
+                generated_at=START + timedelta(days=version),
+            ))
+        await db.commit()
+    return factory
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements executed during the test"""
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_sections_round_trip(factory):
+    async with factory() as db:
+        profile = (await db.execute(select(HolisticProfile).where(HolisticProfile.id == "p-2"))).scalar_one()
+        assert profile.design_human["type"] == "projector"
+        assert profile.numerology == {"life_path": 2}
+        assert profile.astrology_western is None
+
+        profile.numerology = {"life_path": 7}
+        profile.design_human = None
+        profile.astrology_chinese = {"animal_sign": "horse"}
+        await db.commit()
+
+    async with factory() as db:
+        rows = (await db.execute(
+            select(HolisticProfileSection.section, HolisticProfileSection.data)
+            .where(HolisticProfileSection.profile_id == "p-2")
+            .order_by(HolisticProfileSection.section)
+        )).all()
+    assert [tuple(r) for r in rows] == [("astrology_chinese", {"animal_sign": "horse"}), ("numerology", {"life_path": 7})]
+
+
+@pytest.mark.asyncio
+async def test_version_listing_and_activation_skip_sections(factory, statements):
+    async with factory() as db:
+        response = await get_user_profile_versions("user-1", current_user_id="user-1", db=db)
+        assert [v.version for v in response.versions] == [3, 2, 1]
+        assert [v.is_active for v in response.versions] == [True, False, False]
+
+        await activate_profile_version("p-1", current_user_id="user-1", db=db)
+
+    assert not any("holistic_profile_sections" in s for s in statements)
+    assert not any("synthesis" in s for s in statements)
+
+    async with factory() as db:
+        active = (await db.execute(select(HolisticProfile.id).where(HolisticProfile.is_active == True))).scalars().all()
+    assert active == ["p-1"]
+
+
+@pytest.mark.asyncio
+async def test_single_section_on_demand(factory):
+    async with factory() as db:
+        section = await get_profile_section("p-3", "numerology", current_user_id="user-1", db=db)
+        assert section["data"] == {"life_path": 3}
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_profile_section("p-3", "numerology", current_user_id="user-2", db=db)
+        assert exc_info.value.status_code == 403
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_profile_section("p-3", "passwords", current_user_id="user-1", db=db)
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,170 @@
+"""
+Tests for the in-memory question catalog (i18n questions endpoints)
+
+Validates:
+1. Questions served per locale from memory (no DB query after first load)
+2. Bloc and number lookups
+3. ETag / 304 revalidation
+4. Admin edit bumps the catalog version and reloads translations (super admin only)
+"""
+import pytest
+from sqlalchemy import event
+
+from app.models.question import Question
+from app.models.catalog_version import CatalogVersion
+from app.routes import admin_questions
+from app.services.questions_db_service import get_question_catalog, QuestionsDBService
+from tests.conftest import engine
+
+
+@pytest.fixture
+def seeded_questions(db_session):
+    """Seed three questions across two blocs"""
+    get_question_catalog().invalidate()
+    db_session.add(CatalogVersion(name="questions", version=1))
+    for number, bloc in [(1, "A"), (2, "A"), (3, "B")]:
+        db_session.add(Question(
+            id=f"q{number}",
+            number=number,
+            text_fr=f"Question {number} ?",
+            text_en=f"Question {number} EN?",
+            bloc_fr=f"🏠 BLOC {bloc} : CONTEXTE",
+            bloc_en=f"🏠 BLOC {bloc} : CONTEXT",
+            module_fr=f"Module {bloc}1 : Infos",
+            module_en=f"Module {bloc}1 : Info",
+            type="Free text",
+            is_required=True,
+        ))
+    db_session.commit()
+    yield
+    get_question_catalog().invalidate()
+
+
+@pytest.fixture
+def super_admin(monkeypatch):
+    """Auth service answers: the caller is a super admin"""
+    async def verify(authorization):
+        return authorization == "Bearer admin-token"
+
+    monkeypatch.setattr(admin_questions, "verify_super_admin", verify)
+
+
+@pytest.fixture
+def query_counter():
+    """Count SQL statements executed on the test engine"""
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_execute)
+
+
+class TestQuestionCatalog:
+    """Test versioned in-memory question catalog"""
+
+    def test_questions_by_locale(self, client, seeded_questions):
+        """Test questions are translated per locale"""
+        response = client.get("/questionnaire/questions/en")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_questions"] == 3
+        assert data["questions"][0]["text"] == "Question 1 EN?"
+
+        fr = client.get("/questionnaire/questions/fr").json()
+        assert fr["questions"][0]["text"] == "Question 1 ?"
+
+    def test_no_db_after_first_load(self, client, seeded_questions, query_counter):
+        """Test repeated requests never touch the database"""
+        client.get("/questionnaire/questions/en")
+        query_counter.clear()
+
+        for _ in range(5):
+            client.get("/questionnaire/questions/en")
+            client.get("/questionnaire/questions/en/bloc/A")
+            client.get("/questionnaire/structure?locale=en")
+
+        assert query_counter == []
+
+    def test_bloc_and_number_lookup(self, db_session, seeded_questions):
+        """Test O(1) bloc and number lookups"""
+        service = QuestionsDBService(db_session)
+        assert [q["number"] for q in service.get_questions_by_bloc("a", "en")] == [1, 2]
+        assert service.get_question_by_number(3, "en")["text"] == "Question 3 EN?"
+        assert service.get_question_by_number(99) is None
+        assert len(service.get_questions_grouped_by_bloc("fr")) == 2
+
+    def test_etag_not_modified(self, client, seeded_questions):
+        """Test If-None-Match returns 304"""
+        etag = client.get("/questionnaire/questions/en/bloc/B").headers["etag"]
+        response = client.get(
+            "/questionnaire/questions/en/bloc/B",
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 304
+
+    def test_admin_edit_reloads_catalog(self, client, db_session, seeded_questions, super_admin):
+        """Test admin edit bumps version and serves the new translation"""
+        before = client.get("/questionnaire/questions/en")
+        assert before.json()["questions"][1]["text"] == "Question 2 EN?"
+
+        response = client.patch(
+            "/admin/questions/by-number/2?authorization=admin-token",
+            json={"locale": "en", "text": "Edited question 2?"},
+        )
+        assert response.status_code == 200
+        assert response.json()["text"] == "Edited question 2?"
+
+        version = db_session.query(CatalogVersion).filter_by(name="questions").one()
+        assert version.version == 2
+
+        after = client.get("/questionnaire/questions/en")
+        assert after.json()["questions"][1]["text"] == "Edited question 2?"
+        assert after.headers["etag"] != before.headers["etag"]
+        assert get_question_catalog().version == 2
+
+    def test_admin_edit_requires_super_admin(self, client, db_session, seeded_questions, super_admin):
+        """Test anonymous / non-admin edits are rejected and null required fields refused"""
+        assert client.patch("/admin/questions/by-number/2", json={"locale": "en", "text": "x"}).status_code == 422
+        response = client.patch(
+            "/admin/questions/by-number/2?authorization=user-token",
+            json={"locale": "en", "text": "Hacked?"},
+        )
+        assert response.status_code == 403
+
+        response = client.patch(
+            "/admin/questions/by-number/2?authorization=admin-token",
+            json={"locale": "fr", "text": None},
+        )
+        assert response.status_code == 422
+
+        db_session.expire_all()
+        assert db_session.get(Question, "q2").text_en == "Question 2 EN?"
+        assert db_session.query(CatalogVersion).filter_by(name="questions").one().version == 1
+
+    def test_admin_can_clear_nullable_translation(self, client, db_session, seeded_questions, super_admin):
+        """Test optional translations (English / Spanish) can be cleared"""
+        response = client.patch(
+            "/admin/questions/by-number/2?authorization=admin-token",
+            json={"locale": "en", "text": None},
+        )
+        assert response.status_code == 200
+
+        db_session.expire_all()
+        question = db_session.get(Question, "q2")
+        assert question.text_en is None
+        assert question.text_fr is not None
+
+    def test_refresh_if_changed(self, db_session, seeded_questions):
+        """Test polling picks up a version bumped by another worker"""
+        catalog = get_question_catalog()
+        catalog.get("en", db_session)
+        assert catalog.refresh_if_changed(db_session) is False
+
+        db_session.query(CatalogVersion).filter_by(name="questions").update({"version": 5})
+        db_session.commit()
+
+        assert catalog.refresh_if_changed(db_session) is True
+        assert catalog.version == 5
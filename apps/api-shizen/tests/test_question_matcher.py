@@ -0,0 +1,127 @@
+"""
+Tests for OCR fragment → canonical question matching
+
+Validates:
+1. Noisy French and English fragments align to the right canonical question
+2. Two fragments never get the same question
+3. Only low-confidence fragments are sent to the LLM (one prompt, candidates only)
+4. English texts are aligned with the French question of the same id (all 144)
+5. The sentence-transformers model is shared with semantic memory
+"""
+import json
+
+import pytest
+
+from app.services import semantic_memory
+from app.services.ocr.question_matcher import (
+    TRANSLATIONS_PATH,
+    CharNgramEmbedder,
+    QuestionMatcher,
+    default_embedder,
+    load_canonical_questions,
+    resolve_low_confidence,
+)
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    matcher = QuestionMatcher(embedder=CharNgramEmbedder())
+    matcher.load()
+    return matcher
+
+
+class FakeLLM:
+    def __init__(self, response: str):
+        self.response = response
+        self.prompts = []
+
+    async def generate(self, prompt, system=None, temperature=0.7, max_tokens=2048):
+        self.prompts.append(prompt)
+        return self.response
+
+
+def test_noisy_fragments_match_canonical_questions(matcher):
+    assert len(matcher.questions) == 144
+    fragments = [
+        "Connaissez-vous l'orig1ne ou la signiflcation de votre prenom",  # OCR typos, no accents
+        "Do you feel in resonance with your first name?",                  # English wording
+        matcher.questions[-1]["text_fr"].upper(),
+    ]
+
+    matches = matcher.match(fragments)
+
+    assert [m.number for m in matches] == [2, 3, 144]
+    assert [m.question_id for m in matches] == [q["id"] for q in (matcher.question(2), matcher.question(3), matcher.question(144))]
+    assert all(m.confidence in ("high", "medium") for m in matches)
+    assert matches[2].bloc == "I"
+
+
+def test_english_texts_aligned_with_french(matcher):
+    with open(TRANSLATIONS_PATH, encoding="utf-8") as f:
+        translations = json.load(f)["questions"]
+
+    assert set(translations) == {q["id"] for q in matcher.questions}
+    for question in matcher.questions:
+        assert translations[question["id"]]["fr"] == question["text_fr"], question["id"]
+        assert question["text_en"] == translations[question["id"]]["en"] != "", question["id"]
+
+    fragments = [
+        "In your family of origin, you were:",
+        "You have an important appointment set for 2pm. In practice, you:",
+        "How confident are you in the accuracy of your answers?",
+    ]
+    assert [m.question_id for m in matcher.match(fragments)] == ["A2_Q02", "E2_Q06", "I1_Q10"]
+
+
+def test_outdated_english_text_ignored(tmp_path):
+    with open(TRANSLATIONS_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    data["questions"]["A2_Q02"]["fr"] = "Ancienne formulation de la question"
+    path = tmp_path / "question-texts-en.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    questions = {q["id"]: q for q in load_canonical_questions(path)}
+
+    assert questions["A2_Q02"]["text_en"] == ""
+    assert questions["A2_Q01"]["text_en"] == "Your family of origin:"
+
+
+def test_each_question_assigned_once(matcher):
+    text = matcher.question(2)["text_fr"]
+
+    first, duplicate, empty = matcher.match([text, text + " ?", ""])
+
+    assert first.number == 2 or duplicate.number == 2
+    assert first.number != duplicate.number
+    assert empty.confidence == "low" and empty.question_id is None
+
+
+@pytest.mark.asyncio
+async def test_llm_only_resolves_low_confidence_fragments(matcher):
+    fragments = [matcher.question(2)["text_fr"], "Q7 : reponse illisible sur le scan", "Mars est rouge"]
+    matches = matcher.match(fragments)
+    assert [m.confidence == "low" for m in matches] == [False, True, True]
+
+    candidate = matches[1].candidates[0][0]
+    llm = FakeLLM(f'Voici : {{"1": {candidate}, "2": 2}}')
+
+    resolved = await resolve_low_confidence(matcher, fragments, matches, llm=llm)
+
+    assert resolved == 1
+    assert len(llm.prompts) == 1
+    assert "Fragment 0" not in llm.prompts[0]  # confident match never sent
+    assert (matches[1].number, matches[1].source) == (candidate, "llm")
+    assert matches[2].question_id is None  # question 2 is already taken by fragment 0
+
+
+def test_embedding_model_shared_with_semantic_memory(monkeypatch):
+    monkeypatch.setattr(semantic_memory, "_local_embedder", None)
+    monkeypatch.setattr(semantic_memory, "SentenceTransformer", object)  # "installed", never loaded here
+
+    embedder = default_embedder()
+    assert isinstance(embedder, semantic_memory.LocalEmbedder)
+    assert semantic_memory.SemanticMemoryService(session_factory=object).embedder is embedder
+
+    monkeypatch.setattr(semantic_memory, "_local_embedder", None)
+    monkeypatch.setattr(semantic_memory, "SentenceTransformer", None)
+    assert isinstance(default_embedder(), CharNgramEmbedder)
@@ -0,0 +1,87 @@
+"""
+Tests for compiled questionnaire structure endpoints
+
+Validates:
+1. Structure served from compiled artifact (144 questions, 9 blocs)
+2. ETag / 304 Not Modified revalidation
+3. O(1) bloc and module lookups
+4. Invalidation when the Markdown source changes
+"""
+import os
+import shutil
+
+from app.services import questionnaire_data_loader as loader
+
+
+class TestQuestionnaireStructure:
+    """Test /questionnaire/structure endpoints"""
+
+    def test_structure_complete(self, client):
+        """Test full structure is served with an ETag"""
+        response = client.get("/questionnaire/structure")
+        assert response.status_code == 200
+        assert response.headers["etag"]
+
+        data = response.json()
+        assert data["total_questions"] == 144
+        assert data["total_blocs"] == 9
+        assert [bloc["id"] for bloc in data["blocs"]] == list("ABCDEFGHI")
+
+    def test_structure_not_modified(self, client):
+        """Test If-None-Match returns 304 with no body"""
+        etag = client.get("/questionnaire/structure").headers["etag"]
+
+        response = client.get("/questionnaire/structure", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        response = client.get("/questionnaire/structure", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+
+    def test_bloc_and_module_lookup(self, client):
+        """Test bloc/module endpoints use the indexes (case-insensitive)"""
+        bloc = client.get("/questionnaire/structure/bloc/b")
+        assert bloc.status_code == 200
+        assert bloc.json()["id"] == "B"
+
+        module_id = bloc.json()["modules"][0]["id"]
+        module = client.get(f"/questionnaire/structure/module/{module_id.lower()}")
+        assert module.status_code == 200
+        assert module.json()["id"] == module_id
+
+        etag = module.headers["etag"]
+        cached = client.get(
+            f"/questionnaire/structure/module/{module_id}",
+            headers={"If-None-Match": etag},
+        )
+        assert cached.status_code == 304
+
+    def test_unknown_bloc_and_module(self, client):
+        """Test unknown ids return 404"""
+        assert client.get("/questionnaire/structure/bloc/Z").status_code == 404
+        assert client.get("/questionnaire/structure/module/Z9").status_code == 404
+
+    def test_reload_on_source_change(self, tmp_path, monkeypatch):
+        """Test the compiled cache is rebuilt when the Markdown mtime changes"""
+        markdown = tmp_path / "questions.md"
+        shutil.copy(loader.MARKDOWN_PATH, markdown)
+        monkeypatch.setattr(loader, "MARKDOWN_PATH", markdown)
+        monkeypatch.setattr(loader, "COMPILED_PATH", tmp_path / "compiled.json")
+        monkeypatch.setattr(loader, "_compiled", None)
+
+        first = loader.get_compiled_questionnaire()
+        assert (tmp_path / "compiled.json").exists()
+        assert loader.get_compiled_questionnaire() is first
+
+        content = markdown.read_text(encoding="utf-8")
+        markdown.write_text(
+            content.replace("BLOC A : ", "BLOC A : MODIFIÉ ", 1),
+            encoding="utf-8",
+        )
+        stat = markdown.stat()
+        os.utime(markdown, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        second = loader.get_compiled_questionnaire()
+        assert second is not first
+        assert second.blocs["A"]["title"].startswith("MODIFIÉ")
+        assert second.payload("bloc:A")[1] != first.payload("bloc:A")[1]
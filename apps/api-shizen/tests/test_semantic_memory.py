@@ -0,0 +1,235 @@
+"""
+Tests for semantic long-term memory
+
+Validates:
+1. The indexer embeds new rows once (watermark) and retrieval finds them by meaning
+2. Messages of the current or a deleted conversation are not recalled
+3. Edited journals and new profile versions replace their previous chunks
+4. Retrieved snippets stay within their token budget
+5. Re-embedding an indexed row is a no-op, cached vectors expire
+6. A failed lookup keeps the caller's pending work
+"""
+import zlib
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import (
+    ConversationSession,
+    ConversationStatus,
+    DailyJournal,
+    HolisticProfile,
+    HolisticProfileSection,
+    MemoryIndexState,
+    MemoryItem,
+    Message,
+    MessageRole,
+    QuestionnaireSession,
+)
+from app.services.conversation_memory import estimate_tokens
+from app.services import semantic_memory
+from app.services.semantic_memory import (
+    SemanticMemoryService,
+    chunk_text,
+    format_retrieved_section,
+)
+
+START = datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+class FakeEmbedder:
+    """Hashed bag of words: texts sharing words are close (cosine)"""
+
+    model_name = "fake-bow"
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, sentence in enumerate(texts):
+            for word in sentence.lower().split():
+                vectors[row, zlib.crc32(word.strip(".,:;!?").encode()) % 64] += 1
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        for model in (ConversationSession, Message, DailyJournal, QuestionnaireSession,
+                      HolisticProfile, HolisticProfileSection, MemoryItem, MemoryIndexState):
+            await conn.run_sync(model.__table__.create)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add(ConversationSession(id="conv-old", user_id="user-1", context={}))
+        db.add(ConversationSession(id="conv-now", user_id="user-1", context={}))
+        db.add(ConversationSession(id="conv-other", user_id="user-2", context={}))
+        await db.commit()
+    yield factory
+    await engine.dispose()
+
+
+async def add_message(factory, message_id, conversation_id, content, minutes=0):
+    async with factory() as db:
+        db.add(Message(
+            id=message_id,
+            conversation_id=conversation_id,
+            role=MessageRole.USER,
+            content=content,
+            created_at=START + timedelta(minutes=minutes),
+        ))
+        await db.commit()
+
+
+async def search(service, factory, query, **kwargs):
+    async with factory() as db:
+        return await service.search("user-1", query, db, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_indexes_once_and_retrieves_by_similarity(session_factory):
+    embedder = FakeEmbedder()
+    service = SemanticMemoryService(session_factory, embedder)
+    await add_message(session_factory, "m-1", "conv-old", "Je dors mal depuis que je travaille tard le soir", 0)
+    await add_message(session_factory, "m-2", "conv-old", "Ma sœur vient me voir à Lyon le mois prochain", 1)
+    await add_message(session_factory, "m-3", "conv-old", "ok merci", 2)  # too short to index
+    await add_message(session_factory, "m-4", "conv-other", "Je dors mal depuis que je travaille tard", 3)
+    async with session_factory() as db:
+        db.add(DailyJournal(
+            id="j-1", user_id="user-1", date=date(2026, 1, 2),
+            intentions="Me coucher avant minuit", learning="Le sport le matin aide mon sommeil",
+            updated_at=START,
+        ))
+        await db.commit()
+
+    assert await service.index_pending() == 5
+    calls = embedder.calls
+    # Watermarks: nothing new, nothing re-embedded
+    assert await service.index_pending() == 0
+    assert embedder.calls == calls
+
+    results = await search(service, session_factory, "pourquoi je dors mal le soir ?", k=2)
+    assert results[0]["text"].startswith("Je dors mal depuis que je travaille tard le soir")
+    assert all(r["scope"] != "conv-other" for r in results)  # other users' memory never leaks
+
+    journal = await search(service, session_factory, "sport le matin et sommeil", k=1)
+    assert journal[0]["source_type"] == "journal"
+
+
+@pytest.mark.asyncio
+async def test_current_and_deleted_conversations_are_excluded(session_factory):
+    service = SemanticMemoryService(session_factory, FakeEmbedder())
+    await add_message(session_factory, "m-1", "conv-old", "Je prépare un marathon en avril", 0)
+    await add_message(session_factory, "m-2", "conv-now", "Je prépare un marathon en avril, quel plan ?", 1)
+    await service.index_pending()
+
+    results = await search(service, session_factory, "marathon en avril", exclude_scope="conv-now")
+    assert [r["scope"] for r in results] == ["conv-old"]
+
+    async with session_factory() as db:
+        (await db.get(ConversationSession, "conv-old")).status = ConversationStatus.DELETED
+        await db.commit()
+    service.invalidate("user-1")
+    assert await search(service, session_factory, "marathon en avril", exclude_scope="conv-now") == []
+
+
+@pytest.mark.asyncio
+async def test_edited_journal_and_new_profile_replace_chunks(session_factory):
+    service = SemanticMemoryService(session_factory, FakeEmbedder())
+    async with session_factory() as db:
+        db.add(QuestionnaireSession(id="qs-1", user_id="user-1"))
+        db.add(DailyJournal(id="j-1", user_id="user-1", date=date(2026, 1, 2), learning="Méditer le matin", updated_at=START))
+        db.add(HolisticProfile(id="p-1", session_id="qs-1", user_id="user-1", synthesis="Tu aimes les routines structurées",
+                               is_active=True, updated_at=START))
+        await db.commit()
+    await service.index_pending()
+
+    async with session_factory() as db:
+        journal = await db.get(DailyJournal, "j-1")
+        journal.learning, journal.updated_at = "Marcher en forêt le soir", START + timedelta(days=1)
+        (await db.get(HolisticProfile, "p-1")).is_active = False
+        db.add(HolisticProfile(id="p-2", session_id="qs-1", user_id="user-1", version=2,
+                               synthesis="Tu as besoin de pauses fréquentes", is_active=True, updated_at=START + timedelta(days=1)))
+        await db.commit()
+    await service.index_pending()
+
+    async with session_factory() as db:
+        items = (await db.execute(select(MemoryItem.source_id, MemoryItem.text).order_by(MemoryItem.id))).all()
+        assert await db.scalar(select(func.count()).select_from(MemoryIndexState)) == 2
+    assert [(i.source_id, "forêt" in i.text or "pauses" in i.text) for i in items] == [("j-1", True), ("p-2", True)]
+
+
+
+@pytest.mark.asyncio
+async def test_reindexing_skips_existing_items(session_factory):
+    service = SemanticMemoryService(session_factory, FakeEmbedder())
+    await add_message(session_factory, "m-1", "conv-old", "Je prépare un marathon en avril", 0)
+    await service.index_pending()
+
+    # Watermark lost (or a second indexer): the same chunks are inserted again
+    async with session_factory() as db:
+        await db.execute(MemoryIndexState.__table__.delete())
+        await db.commit()
+    assert await service.index_pending() == 1
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count()).select_from(MemoryItem)) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_vectors_expire(session_factory, monkeypatch):
+    service = SemanticMemoryService(session_factory, FakeEmbedder(), cache_ttl=60)
+    indexer = SemanticMemoryService(session_factory, FakeEmbedder())  # another worker
+    await add_message(session_factory, "m-1", "conv-old", "Je prépare un marathon en avril", 0)
+    await indexer.index_pending()
+    assert len(await search(service, session_factory, "marathon en avril")) == 1
+
+    await add_message(session_factory, "m-2", "conv-old", "Mon marathon en avril se passe à Paris", 1)
+    await indexer.index_pending()
+    assert len(await search(service, session_factory, "marathon en avril")) == 1  # still cached
+
+    now = semantic_memory.time.monotonic()
+    monkeypatch.setattr(semantic_memory.time, "monotonic", lambda: now + 61)
+    assert len(await search(service, session_factory, "marathon en avril")) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_lookup_keeps_pending_work(session_factory, monkeypatch):
+    service = SemanticMemoryService(session_factory, FakeEmbedder())
+
+    async def broken_load(user_id, db):
+        await db.execute(text("SELECT * FROM missing_table"))
+
+    monkeypatch.setattr(service, "_load_vectors", broken_load)
+    async with session_factory() as db:
+        db.add(ConversationSession(id="conv-new", user_id="user-1", context={}))
+        await db.flush()
+        assert await service.search("user-1", "marathon", db) == []
+        await db.commit()
+    async with session_factory() as db:
+        assert await db.get(ConversationSession, "conv-new") is not None
+
+
+def test_retrieved_section_within_budget():
+    items = [
+        {"text": "souvenir très détaillé " * 100, "source_type": "journal", "source_created_at": START, "score": 0.9},
+        {"text": "autre souvenir", "source_type": "message", "source_created_at": START, "score": 0.5},
+    ]
+    section = format_retrieved_section(items, budget=80)
+    assert estimate_tokens(section) <= 100  # budget + section header
+    assert "[Journal du 01/01/2026]" in section
+    assert format_retrieved_section([]) == ""
+
+
+def test_chunk_text_respects_size():
+    text = "Premier paragraphe.\n" + "mot " * 500 + "\nDernier."
+    chunks = chunk_text(text, max_chars=200)
+    assert all(len(c) <= 200 for c in chunks)
+    assert chunks[0] == "Premier paragraphe."
+    assert chunks[-1].endswith("Dernier.")
@@ -0,0 +1,174 @@
+"""
+Tests for Shizen message quota counter
+
+Validates:
+1. Atomic upsert increment (no lost updates under concurrency)
+2. Reserve-then-commit never exceeds the monthly limit
+3. Refund gives reserved messages back
+4. WebSocket chat refunds the reservation when the turn fails
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+
+from app.models.shizen_message_usage import ShizenMessageUsage
+from app.routes import shizen as shizen_routes
+from app.utils import tier_service
+from app.utils.tier_service import (
+    UserTier,
+    increment_shizen_message_count,
+    reserve_shizen_message,
+    refund_shizen_message,
+    get_user_shizen_message_count,
+)
+
+PARALLEL_MESSAGES = 200
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """File-backed SQLite so every session gets its own connection"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'quota.db'}",
+        poolclass=NullPool,
+        connect_args={"timeout": 30},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(ShizenMessageUsage.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _tier(limit):
+    async def fake_get_user_tier(user_id: str) -> UserTier:
+        return UserTier(
+            user_id=user_id,
+            tier="musha",
+            status="active",
+            is_active=True,
+            project_limit=2,
+            task_limit=10,
+            shizen_message_limit=limit,
+            has_family_access=False,
+            has_sensei_features=False,
+        )
+    return fake_get_user_tier
+
+
+class TestShizenQuota:
+    """Test atomic Shizen message quota"""
+
+    @pytest.mark.asyncio
+    async def test_parallel_increments_are_exact(self, session_factory):
+        """Hundreds of parallel messages are all counted"""
+        async def send():
+            async with session_factory() as db:
+                return await increment_shizen_message_count("user-1", db)
+
+        counts = await asyncio.gather(*(send() for _ in range(PARALLEL_MESSAGES)))
+
+        assert sorted(counts) == list(range(1, PARALLEL_MESSAGES + 1))
+        async with session_factory() as db:
+            assert await get_user_shizen_message_count("user-1", db) == PARALLEL_MESSAGES
+
+    @pytest.mark.asyncio
+    async def test_parallel_reservations_respect_limit(self, session_factory, monkeypatch):
+        """Parallel reservations never exceed the monthly limit"""
+        monkeypatch.setattr(tier_service, "get_user_tier", _tier(50))
+
+        async def send():
+            async with session_factory() as db:
+                return await reserve_shizen_message("user-2", db)
+
+        results = await asyncio.gather(*(send() for _ in range(PARALLEL_MESSAGES)))
+
+        assert sum(1 for reserved, *_ in results if reserved) == 50
+        async with session_factory() as db:
+            assert await get_user_shizen_message_count("user-2", db) == 50
+
+    @pytest.mark.asyncio
+    async def test_refund_after_failed_call(self, session_factory, monkeypatch):
+        """A refunded reservation frees its slot"""
+        monkeypatch.setattr(tier_service, "get_user_tier", _tier(1))
+
+        async with session_factory() as db:
+            reserved, count, limit, year_month = await reserve_shizen_message("user-3", db)
+            assert (reserved, count, limit) == (True, 1, 1)
+
+            reserved, count, _, _ = await reserve_shizen_message("user-3", db)
+            assert (reserved, count) == (False, 1)
+
+            await refund_shizen_message("user-3", db, year_month)
+            assert await get_user_shizen_message_count("user-3", db) == 0
+
+            reserved, count, _, _ = await reserve_shizen_message("user-3", db)
+            assert (reserved, count) == (True, 1)
+
+    @pytest.mark.asyncio
+    async def test_unlimited_tier_still_counts(self, session_factory, monkeypatch):
+        """Unlimited tiers are always allowed and still tracked"""
+        monkeypatch.setattr(tier_service, "get_user_tier", _tier(None))
+
+        async with session_factory() as db:
+            for expected in range(1, 4):
+                reserved, count, limit, _ = await reserve_shizen_message("user-4", db)
+                assert (reserved, count, limit) == (True, expected, None)
+
+    def test_websocket_refunds_on_failure(self, monkeypatch):
+        """A turn failing after the reservation gives the message back"""
+        class Stub:
+            def __init__(self, **methods):
+                self.__dict__.update(methods)
+
+        async def coro(value=None):
+            return value
+
+        async def agent_fails(**kwargs):
+            raise RuntimeError("agent down")
+
+        conversation = Stub(user_id="user-ws")
+        refunds = []
+
+        async def fake_db():
+            yield Stub(rollback=coro)
+
+        async def reserve(user_id, db):
+            return True, 1, 50, "2026-10"
+
+        async def refund(user_id, db, year_month=None):
+            refunds.append((user_id, year_month))
+
+        monkeypatch.setattr(shizen_routes, "SHIZEN_QUOTA_RESERVE", True)
+        monkeypatch.setattr(shizen_routes, "get_async_db", fake_db)
+        monkeypatch.setattr(shizen_routes, "reserve_shizen_message", reserve)
+        monkeypatch.setattr(shizen_routes, "refund_shizen_message", refund)
+        monkeypatch.setattr(shizen_routes, "get_shizen_agent", lambda: Stub(process_message=agent_fails))
+        monkeypatch.setattr(shizen_routes, "get_conversation_service", lambda: Stub(
+            get_conversation=lambda *a: coro(conversation),
+            get_recent_messages=lambda **kw: coro([]),
+            add_message=lambda **kw: coro(),
+        ))
+        monkeypatch.setattr(shizen_routes, "get_shizen_context_service", lambda: Stub(
+            get_user_profile_context=lambda *a: coro({}),
+            build_adaptive_prompt_section=lambda context: "",
+            get_conversation_context=lambda *a: coro(None),
+        ))
+        monkeypatch.setattr(shizen_routes, "get_conversation_memory_service", lambda: Stub(
+            latest=lambda conversation_id, context: context,
+        ))
+        monkeypatch.setattr(shizen_routes, "get_semantic_memory_service", lambda: Stub(
+            search=lambda *a, **kw: coro([]),
+        ))
+
+        app = FastAPI()
+        app.include_router(shizen_routes.router)
+        with TestClient(app).websocket_connect("/shizen/ws/conv-1") as websocket:
+            websocket.send_text('{"message": "Bonjour"}')
+            assert websocket.receive_json() == {"error": "agent down"}
+
+        assert refunds == [("user-ws", "2026-10")]
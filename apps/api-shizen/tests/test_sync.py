@@ -0,0 +1,265 @@
+"""
+Tests for /sync bulk engine
+
+Validates:
+1. Creates, updates and deletes of tasks, projects and rituals
+2. Stale clients are ignored (server-authoritative)
+3. Rows owned by another user are never overwritten
+4. Statement count does not grow with the number of entities
+5. Delta sync: changes since a revision, tombstones, per-entity conflicts
+6. Returned changes never go past the returned revision
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.models.task import Task
+from app.models.project import Project
+from app.routes import sync as sync_routes
+from app.services.sync_engine import load_changes_since
+from app.utils.tier_service import UserTier
+from tests.conftest import async_engine
+
+
+def _future() -> str:
+    return (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat()
+
+
+def _task(task_id: str, **overrides) -> dict:
+    task = {"id": task_id, "title": f"Task {task_id}", "priority": "p2"}
+    task.update(overrides)
+    return task
+
+
+@pytest.fixture(autouse=True)
+def unlimited_tier(monkeypatch):
+    """Avoid calling the auth service"""
+    async def fake_get_user_tier(user_id: str) -> UserTier:
+        return UserTier(
+            user_id=user_id, tier="sensei", status="active", is_active=True,
+            project_limit=None, task_limit=None, shizen_message_limit=None,
+            has_family_access=False, has_sensei_features=True,
+        )
+    monkeypatch.setattr(sync_routes, "get_user_tier", fake_get_user_tier)
+
+
+@pytest.fixture
+def query_counter():
+    """Count SQL statements executed by the sync routes (async engine)"""
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_execute)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", before_execute)
+
+
+class TestSyncEngine:
+    """Test bulk sync"""
+
+    def test_create_update_delete(self, client, db_session, auth_headers):
+        """Test full create / update / delete cycle"""
+        payload = {
+            "tasks": [_task("t1", projectId="p1"), _task("t2")],
+            "projects": [{"id": "p1", "name": "Projet"}],
+            "rituals": [{"id": "r1", "label": "Méditation", "completed": True}],
+            "lastUpdated": _future(),
+        }
+        response = client.post("/sync/", json=payload, headers=auth_headers)
+        data = response.json()
+        assert data["success"] is True, data
+        assert {t["id"] for t in data["data"]["tasks"]} == {"t1", "t2"}
+        assert data["data"]["rituals"][0]["completed"] is True
+
+        payload = {
+            "tasks": [_task("t1", title="Renamed", completed=True)],
+            "projects": [{"id": "p1", "name": "Projet"}],
+            "rituals": [{"id": "r1", "label": "Méditation", "completed": False}],
+            "lastUpdated": _future(),
+        }
+        data = client.post("/sync/", json=payload, headers=auth_headers).json()
+        assert data["success"] is True, data
+
+        tasks = {t["id"]: t for t in data["data"]["tasks"]}
+        assert set(tasks) == {"t1"}
+        assert tasks["t1"]["title"] == "Renamed"
+        assert tasks["t1"]["completed"] is True
+        assert tasks["t1"]["projectId"] is None
+        assert data["data"]["rituals"][0]["completed"] is False
+
+    def test_stale_client_ignored(self, client, db_session, auth_headers):
+        """Test a stale client gets server state and its changes are dropped"""
+        client.post("/sync/", json={
+            "tasks": [_task("t1")],
+            "lastUpdated": _future(),
+        }, headers=auth_headers)
+
+        data = client.post("/sync/", json={
+            "tasks": [_task("t1", title="Stale edit"), _task("t9")],
+            "lastUpdated": "2000-01-01T00:00:00Z",
+        }, headers=auth_headers).json()
+
+        assert [t["title"] for t in data["data"]["tasks"]] == ["Task t1"]
+
+    def test_other_user_rows_untouched(self, client, db_session, auth_headers):
+        """Test an id collision never overwrites another user's row"""
+        db_session.add(Task(id="shared", title="Not yours", user_id="someone-else"))
+        db_session.commit()
+
+        client.post("/sync/", json={
+            "tasks": [_task("shared", title="Hijack")],
+            "lastUpdated": _future(),
+        }, headers=auth_headers)
+
+        db_session.expire_all()
+        assert db_session.get(Task, "shared").title == "Not yours"
+
+    def test_deleted_project_removes_its_tasks(self, client, db_session, auth_headers):
+        """Test project deletion cascades to its tasks (like the ORM cascade)"""
+        client.post("/sync/", json={
+            "tasks": [_task("t1", projectId="p1")],
+            "projects": [{"id": "p1", "name": "A"}, {"id": "p2", "name": "B"}],
+            "lastUpdated": _future(),
+        }, headers=auth_headers)
+
+        client.post("/sync/", json={
+            "projects": [{"id": "p2", "name": "B"}],
+            "lastUpdated": _future(),
+        }, headers=auth_headers)
+
+        db_session.expire_all()
+        assert db_session.get(Project, "p1") is None
+        assert db_session.get(Task, "t1") is None
+
+    @pytest.mark.parametrize("count", [10, 1200])
+    def test_statement_count_is_constant(self, client, db_session, auth_headers, query_counter, count):
+        """Test the number of statements does not depend on entity count"""
+        tasks = [_task(f"t{i}") for i in range(count)]
+        client.post("/sync/", json={"tasks": tasks, "lastUpdated": _future()}, headers=auth_headers)
+        assert db_session.query(Task).count() == count
+
+        query_counter.clear()
+        tasks = [_task(f"t{i}", completed=True) for i in range(count)]
+        data = client.post("/sync/", json={"tasks": tasks, "lastUpdated": _future()}, headers=auth_headers).json()
+
+        assert data["success"] is True
+        assert all(t["completed"] for t in data["data"]["tasks"])
+        # 3 snapshots + revision + ceil(n / 500) upserts + 4 response reads + revision read
+        assert len(query_counter) <= 9 + -(-count // 500)
+
+
+def _delta(client, auth_headers, **payload) -> dict:
+    data = client.post("/sync/delta", json=payload, headers=auth_headers).json()
+    assert data["success"] is True, data
+    return data["data"]
+
+
+class TestDeltaSync:
+    """Test revision-based delta sync"""
+
+    def test_only_changes_since_revision(self, client, db_session, auth_headers):
+        """Test unchanged rows are not sent back"""
+        first = _delta(client, auth_headers, tasks=[_task("t1"), _task("t2")], rituals=[{"id": "r1", "label": "Yoga"}])
+        assert {t["id"] for t in first["tasks"]} == {"t1", "t2"}
+        assert first["revision"] == first["tasks"][0]["revision"]
+
+        empty = _delta(client, auth_headers, sinceRevision=first["revision"])
+        assert empty["tasks"] == [] and empty["rituals"] == [] and empty["deleted"] == []
+        assert empty["revision"] == first["revision"]
+
+        edit = _delta(
+            client, auth_headers, sinceRevision=first["revision"],
+            tasks=[_task("t2", title="Edited", baseRevision=first["revision"])],
+        )
+        assert [t["title"] for t in edit["tasks"]] == ["Edited"]
+        assert edit["revision"] == first["revision"] + 1
+
+    def test_per_entity_conflict(self, client, db_session, auth_headers):
+        """Test a concurrent edit only rejects the conflicting entity"""
+        base = _delta(client, auth_headers, tasks=[_task("t1"), _task("t2")])["revision"]
+
+        # Device B edits t1
+        _delta(client, auth_headers, sinceRevision=base, tasks=[_task("t1", title="From B", baseRevision=base)])
+
+        # Device A, still at `base`, edits t1 and t2
+        data = _delta(client, auth_headers, sinceRevision=base, tasks=[
+            _task("t1", title="From A", baseRevision=base),
+            _task("t2", title="From A", baseRevision=base),
+        ])
+
+        assert data["conflicts"] == [
+            {"type": "task", "id": "t1", "reason": "modified", "serverRevision": base + 1}
+        ]
+        titles = {t["id"]: t["title"] for t in data["tasks"]}
+        assert titles == {"t1": "From B", "t2": "From A"}
+
+    def test_tombstones(self, client, db_session, auth_headers):
+        """Test deletions are propagated as tombstones and win over stale edits"""
+        base = _delta(
+            client, auth_headers,
+            projects=[{"id": "p1", "name": "Projet"}],
+            tasks=[_task("t1", projectId="p1"), _task("t2")],
+        )["revision"]
+
+        data = _delta(client, auth_headers, sinceRevision=base, deleted=[
+            {"type": "project", "id": "p1", "baseRevision": base},
+        ])
+        assert {(d["type"], d["id"]) for d in data["deleted"]} == {("project", "p1"), ("task", "t1")}
+        assert data["tasks"] == []
+
+        stale = _delta(client, auth_headers, sinceRevision=base, tasks=[_task("t1", title="Late", baseRevision=base)])
+        assert stale["conflicts"][0]["reason"] == "deleted"
+        assert db_session.get(Task, "t1") is None
+
+    def test_delete_of_modified_row_rejected(self, client, db_session, auth_headers):
+        """Test a delete based on an old revision does not remove a newer edit"""
+        base = _delta(client, auth_headers, tasks=[_task("t1")])["revision"]
+        _delta(client, auth_headers, tasks=[_task("t1", title="Newer", baseRevision=base)])
+
+        data = _delta(client, auth_headers, sinceRevision=base, deleted=[
+            {"type": "task", "id": "t1", "baseRevision": base},
+        ])
+        assert data["conflicts"][0]["reason"] == "modified"
+        assert [t["title"] for t in data["tasks"]] == ["Newer"]
+
+    def test_orm_writes_are_stamped(self, client, db_session, auth_headers, test_user_id):
+        """Test CRUD routes (ORM) also bump revisions and leave tombstones"""
+        base = _delta(client, auth_headers, tasks=[_task("t1")])["revision"]
+
+        db_session.add(Task(id="t2", title="Via CRUD", user_id=test_user_id))
+        db_session.commit()
+        data = _delta(client, auth_headers, sinceRevision=base)
+        assert [t["id"] for t in data["tasks"]] == ["t2"]
+
+        db_session.delete(db_session.get(Task, "t1"))
+        db_session.commit()
+        data = _delta(client, auth_headers, sinceRevision=data["revision"])
+        assert data["deleted"] == [{"type": "task", "id": "t1", "revision": data["revision"]}]
+
+    def test_changes_bounded_by_returned_revision(self, client, db_session, auth_headers, test_user_id):
+        """Test a write newer than the returned revision is left for the next sync"""
+        base = _delta(client, auth_headers, tasks=[_task("t1")])["revision"]
+        _delta(client, auth_headers, sinceRevision=base, tasks=[_task("t2")])
+
+        # Revision read before a concurrent write (t2) committed
+        changes = load_changes_since(db_session, test_user_id, 0, up_to_revision=base)
+        assert [t.id for t in changes["task"]] == ["t1"]
+
+        # The client at `base` then gets t2
+        assert [t["id"] for t in _delta(client, auth_headers, sinceRevision=base)["tasks"]] == ["t2"]
+
+    def test_ritual_reset_is_synced(self, client, db_session, auth_headers):
+        """Test the bulk daily reset bumps revisions like ORM writes"""
+        base = _delta(client, auth_headers, rituals=[
+            {"id": "r1", "label": "Yoga", "completed": True},
+            {"id": "r2", "label": "Lecture", "completed": False},
+        ])["revision"]
+
+        assert client.post("/rituals/reset", headers=auth_headers).status_code == 200
+
+        data = _delta(client, auth_headers, sinceRevision=base)
+        assert [(r["id"], r["completed"]) for r in data["rituals"]] == [("r1", False)]
+        assert data["revision"] == base + 1
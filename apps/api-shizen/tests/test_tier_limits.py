@@ -0,0 +1,46 @@
+"""
+Tests for tier limits on planner routes (async session)
+
+Validates:
+1. Active task/project counts come from the request's AsyncSession
+2. Completed tasks and archived projects do not count toward the limit
+"""
+import pytest
+
+from app.utils import tier_service
+from app.utils.tier_service import UserTier
+
+
+@pytest.fixture(autouse=True)
+def musha_tier(monkeypatch):
+    """Free tier with tiny limits, without calling the auth service"""
+    async def fake_get_user_tier(user_id: str) -> UserTier:
+        return UserTier(
+            user_id=user_id, tier="musha", status="active", is_active=True,
+            project_limit=1, task_limit=2, shizen_message_limit=50,
+            has_family_access=False, has_sensei_features=False,
+        )
+    monkeypatch.setattr(tier_service, "get_user_tier", fake_get_user_tier)
+
+
+def test_task_limit_counts_active_tasks(client, auth_headers):
+    first = client.post("/tasks", json={"title": "Un"}, headers=auth_headers)
+    assert first.status_code == 201, first.text
+    assert client.post("/tasks", json={"title": "Deux"}, headers=auth_headers).status_code == 201
+
+    refused = client.post("/tasks", json={"title": "Trois"}, headers=auth_headers)
+    assert refused.status_code == 403
+    assert refused.json()["detail"]["current"] == 2
+
+    client.put(f"/tasks/{first.json()['id']}", json={"completed": True}, headers=auth_headers)
+    assert client.post("/tasks", json={"title": "Trois"}, headers=auth_headers).status_code == 201
+    assert len(client.get("/tasks", params={"completed": False}, headers=auth_headers).json()) == 2
+
+
+def test_project_limit_ignores_archived_projects(client, auth_headers):
+    project = client.post("/projects", json={"name": "Shizen"}, headers=auth_headers)
+    assert project.status_code == 201, project.text
+    assert client.post("/projects", json={"name": "Autre"}, headers=auth_headers).status_code == 403
+
+    client.put(f"/projects/{project.json()['id']}", json={"status": "archived"}, headers=auth_headers)
+    assert client.post("/projects", json={"name": "Autre"}, headers=auth_headers).status_code == 201
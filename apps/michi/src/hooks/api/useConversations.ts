@@ -5,7 +5,7 @@
 
 'use client'
 
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import type {
   Conversation,
   Message,
@@ -16,11 +16,13 @@ import type {
 } from '@/types/api'
 import {
   getConversations,
+  getConversationsPage,
   getConversation,
   createConversation,
   updateConversation,
   archiveConversation,
   getMessages,
+  getMessagesPage,
 } from '@/lib/api/conversations'
 
 // ==================
@@ -37,6 +39,10 @@ export const conversationKeys = {
   messages: (id: string) => [...conversationKeys.all, 'messages', id] as const,
   messageList: (id: string, filters?: MessageFilters) =>
     [...conversationKeys.messages(id), filters] as const,
+  messagePages: (id: string, limit?: number) =>
+    [...conversationKeys.messages(id), 'pages', limit] as const,
+  listPages: (filters?: Omit<ConversationFilters, 'cursor'>) =>
+    [...conversationKeys.lists(), 'pages', filters] as const,
 }
 
 // ==================
@@ -54,6 +60,22 @@ export function useConversations(filters?: ConversationFilters) {
   })
 }
 
+/**
+ * Conversations page by page ("load more": fetchNextPage / hasNextPage)
+ */
+export function useInfiniteConversations(
+  filters?: Omit<ConversationFilters, 'cursor'>
+) {
+  return useInfiniteQuery({
+    queryKey: conversationKeys.listPages(filters),
+    queryFn: ({ pageParam }) =>
+      getConversationsPage({ ...filters, cursor: pageParam }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    staleTime: 2 * 60 * 1000,
+  })
+}
+
 /**
  * Get single conversation by ID
  */
@@ -81,6 +103,25 @@ export function useMessages(
   })
 }
 
+/**
+ * Message history page by page, newest first ("load older": fetchNextPage)
+ * Each page is in chronological order: render pages in reverse.
+ */
+export function useInfiniteMessages(
+  conversationId: string | null,
+  limit?: number
+) {
+  return useInfiniteQuery({
+    queryKey: conversationKeys.messagePages(conversationId || '', limit),
+    queryFn: ({ pageParam }) =>
+      getMessagesPage(conversationId!, { limit, before: pageParam }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    enabled: !!conversationId,
+    staleTime: 30 * 1000,
+  })
+}
+
 // ==================
 // MUTATIONS
 // ==================
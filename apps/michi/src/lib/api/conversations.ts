@@ -10,17 +10,22 @@ import type {
   UpdateConversationInput,
   ConversationFilters,
   MessageFilters,
+  CursorPage,
 } from '@/types/api'
 import apiClient from './client'
 
 const CONVERSATIONS_ENDPOINT = '/shizen/conversations'
 
+// Keyset pagination: the cursor of the next page comes back in this header
+// (absent on the last page)
+const NEXT_CURSOR_HEADER = 'x-next-cursor'
+
 /**
- * Get all conversations for current user
+ * Get one page of the current user's conversations (most recent first)
  */
-export async function getConversations(
+export async function getConversationsPage(
   filters?: ConversationFilters
-): Promise<Conversation[]> {
+): Promise<CursorPage<Conversation>> {
   const params = new URLSearchParams()
 
   if (filters?.status_filter) {
@@ -29,8 +34,8 @@ export async function getConversations(
   if (filters?.limit !== undefined) {
     params.append('limit', String(filters.limit))
   }
-  if (filters?.offset !== undefined) {
-    params.append('offset', String(filters.offset))
+  if (filters?.cursor) {
+    params.append('cursor', filters.cursor)
   }
 
   const url = params.toString()
@@ -38,7 +43,20 @@ export async function getConversations(
     : CONVERSATIONS_ENDPOINT
 
   const response = await apiClient.get<Conversation[]>(url)
-  return response.data
+  return {
+    items: response.data,
+    next_cursor: response.headers[NEXT_CURSOR_HEADER] ?? null,
+  }
+}
+
+/**
+ * Get conversations for current user (first page)
+ */
+export async function getConversations(
+  filters?: ConversationFilters
+): Promise<Conversation[]> {
+  const page = await getConversationsPage(filters)
+  return page.items
 }
 
 /**
@@ -90,19 +108,25 @@ export async function archiveConversation(
 }
 
 /**
- * Get messages for a conversation
+ * Get one page of messages for a conversation (chronological order)
+ *
+ * Without a cursor, returns the newest messages; pass the returned
+ * next_cursor as `before` to load older ones.
  */
-export async function getMessages(
+export async function getMessagesPage(
   conversationId: string,
   filters?: MessageFilters
-): Promise<Message[]> {
+): Promise<CursorPage<Message>> {
   const params = new URLSearchParams()
 
   if (filters?.limit !== undefined) {
     params.append('limit', String(filters.limit))
   }
-  if (filters?.offset !== undefined) {
-    params.append('offset', String(filters.offset))
+  if (filters?.before) {
+    params.append('before', filters.before)
+  }
+  if (filters?.after) {
+    params.append('after', filters.after)
   }
 
   const url = params.toString()
@@ -110,5 +134,19 @@ export async function getMessages(
     : `${CONVERSATIONS_ENDPOINT}/${conversationId}/messages`
 
   const response = await apiClient.get<Message[]>(url)
-  return response.data
+  return {
+    items: response.data,
+    next_cursor: response.headers[NEXT_CURSOR_HEADER] ?? null,
+  }
+}
+
+/**
+ * Get messages for a conversation (newest page, chronological order)
+ */
+export async function getMessages(
+  conversationId: string,
+  filters?: MessageFilters
+): Promise<Message[]> {
+  const page = await getMessagesPage(conversationId, filters)
+  return page.items
 }
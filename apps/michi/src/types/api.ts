@@ -250,12 +250,16 @@ export interface UpdateConversationInput {
 export interface ConversationFilters {
   status_filter?: ConversationStatus
   limit?: number
-  offset?: number
+  /** next_cursor of the previous page */
+  cursor?: string
 }
 
 export interface MessageFilters {
   limit?: number
-  offset?: number
+  /** Scroll back: next_cursor of the previous (newer) page */
+  before?: string
+  /** Read forward: messages newer than this cursor */
+  after?: string
 }
 
 // ==================
@@ -286,3 +290,11 @@ export interface PaginatedResponse<T> {
   page_size: number
   total_pages: number
 }
+
+/**
+ * Keyset-paginated page (cursor read from the X-Next-Cursor header)
+ */
+export interface CursorPage<T> {
+  items: T[]
+  next_cursor: string | null
+}
@@ -2,7 +2,7 @@
 Availability routes - API endpoints for player availability management
 """
 
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
@@ -18,6 +18,9 @@ from app.schemas.availability import (
     PlayerAvailabilityExceptionResponse,
     AvailablePlayerResponse,
     TeamMemberAvailabilityResponse,
+    AvailabilityHeatmapResponse,
+    SlotFinderRequest,
+    SlotFinderResponse,
 )
 from app.services import availability_service
 
@@ -169,3 +172,50 @@ def get_available_players(
     team_player_ids = [4, 5, 6, 7, 9] if team_only else None
 
     return availability_service.get_available_players(db, start_time, end_time, team_player_ids)
+
+
+# ========== Team Availability Heatmap ==========
+
+@router.get("/heatmap", response_model=AvailabilityHeatmapResponse)
+def get_availability_heatmap(
+    week_start: Optional[date] = Query(None, description="First day of the week (default: Monday of the current week)"),
+    slot_minutes: int = Query(60, ge=15, le=240, description="Slot length in minutes (must divide 24h)"),
+    top: int = Query(5, ge=1, le=50, description="Number of best slots to return"),
+    team_only: bool = Query(True, description="Only check team members (IDs: 4, 5, 6, 7, 9)"),
+    current_user: User = Depends(require_role(["COACH", "MANAGER"])),
+    db: Session = Depends(get_db)
+):
+    """
+    Weekly heatmap of team availability (coaches/managers only)
+    For every slot of the week: number of players free for the whole slot (local time),
+    plus the best slots with the IDs of the free players
+    """
+    if (24 * 60) % slot_minutes:
+        raise HTTPException(status_code=400, detail="slot_minutes must divide 24 hours (e.g. 15, 30, 60, 120)")
+
+    if week_start is None:
+        today = date.today()
+        week_start = today - timedelta(days=today.weekday())
+
+    # Team member IDs
+    team_player_ids = [4, 5, 6, 7, 9] if team_only else None
+
+    return availability_service.get_availability_heatmap(db, week_start, slot_minutes, team_player_ids, top)
+
+
+# ========== Team Slot Finder ==========
+
+@router.post("/slot-finder", response_model=SlotFinderResponse)
+def find_team_slots(
+    request: SlotFinderRequest,
+    current_user: User = Depends(require_role(["COACH", "MANAGER"])),
+    db: Session = Depends(get_db)
+):
+    """
+    Suggest the best session times for a set of invited players (coaches/managers only)
+    Returns up to `top` non-overlapping slots, most available players first, earliest first on ties
+    IDs that are not players (unknown users, coaches, managers) come back in `unknown_player_ids`
+
+    Times are local (Europe/Paris), like /available-players
+    """
+    return availability_service.find_team_slots(db, request)
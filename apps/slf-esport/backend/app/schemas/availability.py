@@ -3,7 +3,7 @@ Availability schemas - Pydantic validation for player availabilities
 """
 
 from datetime import datetime, time, date
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, validator
 
 
@@ -153,3 +153,68 @@ class AvailablePlayerResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# ========== Availability Heatmap Schemas ==========
+
+class AvailabilitySlot(BaseModel):
+    """Time slot with the players free for the whole of it"""
+    start_time: datetime
+    end_time: datetime
+    available_count: int
+    available_user_ids: List[int]
+
+
+class AvailabilityHeatmapResponse(BaseModel):
+    """Schema for the weekly availability heatmap (coaches only)"""
+    week_start: date
+    slot_minutes: int
+    player_count: int
+    days: List[List[int]] = Field(..., description="One row per day from week_start: number of free players per slot")
+    best_slots: List[AvailabilitySlot]
+
+
+# ========== Slot Finder Schemas ==========
+
+class SlotFinderRequest(BaseModel):
+    """Schema for finding the best session times for a set of players"""
+    player_ids: List[int] = Field(..., min_items=1, max_items=200, description="Invited player IDs")
+    duration_minutes: int = Field(..., ge=15, le=720, description="Session duration")
+    start_date: date
+    end_date: date
+    step_minutes: int = Field(15, ge=5, le=120, description="Granularity of candidate start times")
+    earliest_time: Optional[time] = Field(None, description="Sessions start at or after this time (local)")
+    latest_time: Optional[time] = Field(None, description="Sessions end at or before this time (local, same day)")
+    min_players: int = Field(1, ge=1, description="Minimum number of free players")
+    top: int = Field(10, ge=1, le=50, description="Number of suggestions")
+
+    @validator('end_date')
+    def validate_date_range(cls, v, values):
+        """Ensure the range is ordered and at most 62 days long"""
+        start_date = values.get('start_date')
+        if start_date and v < start_date:
+            raise ValueError('end_date must be on or after start_date')
+        if start_date and (v - start_date).days > 61:
+            raise ValueError('Date range cannot exceed 62 days')
+        return v
+
+    @validator('latest_time')
+    def validate_time_window(cls, v, values):
+        """Ensure latest_time is after earliest_time (sessions cannot cross midnight)"""
+        earliest_time = values.get('earliest_time')
+        if v is not None and earliest_time is not None and v <= earliest_time:
+            raise ValueError('latest_time must be after earliest_time')
+        return v
+
+
+class SuggestedSlot(AvailabilitySlot):
+    """Suggested session time with the invited players who cannot attend"""
+    unavailable_user_ids: List[int]
+
+
+class SlotFinderResponse(BaseModel):
+    """Schema for slot finder results (best first)"""
+    player_count: int
+    duration_minutes: int
+    slots: List[SuggestedSlot]
+    unknown_player_ids: List[int] = Field(default_factory=list, description="Requested IDs that are not players (unknown users or non-JOUEUR)")
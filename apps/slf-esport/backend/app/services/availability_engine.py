@@ -0,0 +1,318 @@
+"""
+Availability Engine - Set-based team availability with an in-memory interval index
+
+Loads a team's availabilities and exceptions for a date window in two queries
+(players + availabilities in one outer join, exceptions in the other), then
+answers "who is free" for any number of slots without going back to the database.
+
+The day before the window is loaded too: an overnight window (end <= start)
+starting that day runs into the first day of the window.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, time, date, timedelta
+from typing import Callable, List, Optional, Dict, Tuple, Iterable
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_
+
+from app.models.availability import PlayerAvailability, PlayerAvailabilityException
+from app.models.user import User, UserRole
+from app.schemas.availability import AvailablePlayerResponse
+
+
+Interval = Tuple[datetime, datetime]
+
+
+def recurring_day(day: date) -> int:
+    """
+    day_of_week used by recurring availabilities for a date
+    (0=Sunday, 1=Monday, ..., 6=Saturday - same convention as check_user_available)
+    """
+    return (day.weekday() + 1) % 7
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort intervals and merge the ones that overlap or touch"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(intervals: List[Interval], removed: List[Interval]) -> List[Interval]:
+    """Remove `removed` from `intervals` (both sorted and merged)"""
+    result: List[Interval] = []
+    j = 0
+    for start, end in intervals:
+        while j < len(removed) and removed[j][1] <= start:
+            j += 1
+        k = j
+        while k < len(removed) and removed[k][0] < end:
+            if removed[k][0] > start:
+                result.append((start, removed[k][0]))
+            start = max(start, removed[k][1])
+            k += 1
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def _on_day(day: date, start: Optional[time], end: Optional[time]) -> Interval:
+    """Datetime interval of a time window on a day (whole day if no times, next day if end <= start)"""
+    if start is None or end is None:
+        day_start = datetime.combine(day, time.min)
+        return day_start, day_start + timedelta(days=1)
+    interval_start = datetime.combine(day, start)
+    interval_end = datetime.combine(day, end)
+    if interval_end <= interval_start:
+        interval_end += timedelta(days=1)
+    return interval_start, interval_end
+
+
+class PlayerAvailabilityIndex:
+    """Availability rules of one player, grouped by day for constant-time lookups"""
+
+    def __init__(self, user_id: int, username: str, email: str):
+        self.user_id = user_id
+        self.username = username
+        self.email = email
+        # (start_time, end_time, notes)
+        self.recurring: Dict[int, List[Tuple[time, time, Optional[str]]]] = defaultdict(list)
+        self.specific: Dict[date, List[Tuple[time, time, Optional[str]]]] = defaultdict(list)
+        # (start_time, end_time, is_unavailable, reason)
+        self.exceptions: Dict[date, List[Tuple[Optional[time], Optional[time], bool, Optional[str]]]] = defaultdict(list)
+
+    def add_availability(self, availability: PlayerAvailability) -> None:
+        window = (availability.start_time, availability.end_time, availability.notes)
+        if availability.specific_date:
+            self.specific[availability.specific_date].append(window)
+        elif availability.day_of_week is not None:
+            self.recurring[availability.day_of_week].append(window)
+
+    def add_exception(self, exception: PlayerAvailabilityException) -> None:
+        self.exceptions[exception.exception_date].append(
+            (exception.start_time, exception.end_time, exception.is_unavailable, exception.reason)
+        )
+
+    def check(self, start_time: datetime, end_time: datetime) -> Dict[str, any]:
+        """
+        Availability for a slot - same rules and result as check_user_available:
+        exceptions first, then specific dates, then recurring (any overlap counts)
+        """
+        session_date = start_time.date()
+        session_start_time = start_time.time()
+        session_end_time = end_time.time()
+
+        for exc_start, exc_end, is_unavailable, reason in self.exceptions.get(session_date, ()):
+            if exc_start and exc_end and not (session_start_time < exc_end and session_end_time > exc_start):
+                continue
+            return {
+                "is_available": not is_unavailable,
+                "availability_type": "exception_unavailable" if is_unavailable else "exception_available",
+                "reason": reason
+            }
+
+        for availability_type, windows in (
+            ("specific_date", self.specific.get(session_date, ())),
+            ("recurring", self.recurring.get(recurring_day(session_date), ())),
+        ):
+            for window_start, window_end, notes in windows:
+                if session_start_time < window_end and session_end_time > window_start:
+                    return {
+                        "is_available": True,
+                        "availability_type": availability_type,
+                        "reason": notes
+                    }
+
+        return {
+            "is_available": False,
+            "availability_type": "no_availability",
+            "reason": None
+        }
+
+    def free_intervals(self, start_date: date, end_date: date) -> List[Interval]:
+        """
+        Merged time ranges during which the player is free, from start_date to end_date (inclusive)
+        Recurring and specific-date windows are united, extra-availability exceptions added,
+        then unavailability exceptions removed (whole day when they have no times)
+        """
+        free: List[Interval] = []
+        busy: List[Interval] = []
+        day = start_date
+        while day <= end_date:
+            for window_start, window_end, _ in (*self.recurring.get(recurring_day(day), ()), *self.specific.get(day, ())):
+                free.append(_on_day(day, window_start, window_end))
+            for exc_start, exc_end, is_unavailable, _ in self.exceptions.get(day, ()):
+                (busy if is_unavailable else free).append(_on_day(day, exc_start, exc_end))
+            day += timedelta(days=1)
+        return subtract_intervals(merge_intervals(free), merge_intervals(busy))
+
+
+class TeamAvailability:
+    """
+    In-memory availability index of a team over a date window
+
+    Usage:
+        team = TeamAvailability.load(db, date(2026, 1, 5), date(2026, 1, 11), [4, 5, 6])
+        team.available_players(start, end)        # same result as get_available_players
+        team.count_free(grid_start, step, slots, duration)
+        team.best_slots(grid_start, step, duration, counts, top=5)
+    """
+
+    def __init__(self, players: List[PlayerAvailabilityIndex], start_date: date, end_date: date):
+        self.players = players
+        self.start_date = start_date
+        self.end_date = end_date
+        self._free: Dict[int, List[Interval]] = {}
+
+    @classmethod
+    def load(cls, db: Session, start_date: date, end_date: date, team_player_ids: Optional[List[int]] = None) -> "TeamAvailability":
+        """
+        Load players, their active availabilities and their exceptions for [start_date, end_date]
+        (plus the day before, for overnight windows)
+        If team_player_ids is provided, only those players (still restricted to JOUEUR, like get_available_players)
+        """
+        load_start = start_date - timedelta(days=1)
+        player_filters = [User.role == UserRole.JOUEUR]
+        if team_player_ids:
+            player_filters.append(User.id.in_(team_player_ids))
+
+        # 1. Players + availabilities relevant to the window (outer join keeps players without any)
+        rows = db.query(User, PlayerAvailability).outerjoin(
+            PlayerAvailability,
+            and_(
+                PlayerAvailability.user_id == User.id,
+                PlayerAvailability.is_active == True,
+                or_(
+                    PlayerAvailability.specific_date == None,
+                    PlayerAvailability.specific_date.between(load_start, end_date)
+                )
+            )
+        ).filter(*player_filters).order_by(User.id, PlayerAvailability.id).all()
+
+        players: Dict[int, PlayerAvailabilityIndex] = {}
+        for user, availability in rows:
+            player = players.get(user.id)
+            if player is None:
+                player = players[user.id] = PlayerAvailabilityIndex(user.id, user.username, user.email)
+            if availability is not None:
+                player.add_availability(availability)
+
+        # 2. Exceptions in the window
+        if players:
+            exceptions = db.query(PlayerAvailabilityException).join(
+                User, PlayerAvailabilityException.user_id == User.id
+            ).filter(
+                *player_filters,
+                PlayerAvailabilityException.exception_date.between(load_start, end_date)
+            ).order_by(PlayerAvailabilityException.id).all()
+
+            for exception in exceptions:
+                players[exception.user_id].add_exception(exception)
+
+        return cls(list(players.values()), start_date, end_date)
+
+    def _covers(self, start: datetime, end: datetime) -> None:
+        if start.date() < self.start_date or (end - timedelta(microseconds=1)).date() > self.end_date:
+            raise ValueError(f"Slot {start} - {end} is outside the loaded window {self.start_date} - {self.end_date}")
+
+    def available_players(self, start_time: datetime, end_time: datetime) -> List[AvailablePlayerResponse]:
+        """Availability of every player for a slot (available first, then by username)"""
+        if not self.start_date <= start_time.date() <= self.end_date:
+            raise ValueError(f"Slot {start_time} is outside the loaded window {self.start_date} - {self.end_date}")
+
+        available_players = []
+        for player in self.players:
+            availability_info = player.check(start_time, end_time)
+            available_players.append(AvailablePlayerResponse(
+                user_id=player.user_id,
+                username=player.username,
+                email=player.email,
+                is_available=availability_info["is_available"],
+                availability_type=availability_info["availability_type"],
+                reason=availability_info.get("reason")
+            ))
+
+        available_players.sort(key=lambda p: (not p.is_available, p.username))
+        return available_players
+
+    def free_intervals(self, player: PlayerAvailabilityIndex) -> List[Interval]:
+        """
+        Merged free intervals of a player over the loaded window (computed once)
+        Expanded from the day before, so overnight windows reaching into the first day are kept
+        """
+        if player.user_id not in self._free:
+            self._free[player.user_id] = player.free_intervals(self.start_date - timedelta(days=1), self.end_date)
+        return self._free[player.user_id]
+
+    def free_players(self, start: datetime, end: datetime) -> List[int]:
+        """IDs of the players free for the whole of [start, end)"""
+        self._covers(start, end)
+        free = []
+        for player in self.players:
+            intervals = self.free_intervals(player)
+            i = bisect_right(intervals, (start, datetime.max)) - 1
+            if i >= 0 and intervals[i][0] <= start and intervals[i][1] >= end:
+                free.append(player.user_id)
+        return free
+
+    def count_free(self, grid_start: datetime, step: timedelta, slots: int, duration: timedelta) -> List[int]:
+        """
+        Number of players free for the whole of [grid_start + i*step, + duration), for i in range(slots)
+
+        Each free interval marks the contiguous range of slot starts it contains
+        (difference array), so the cost is O(slots + intervals), not O(slots x players).
+        """
+        self._covers(grid_start, grid_start + step * (slots - 1) + duration)
+        step_s = step.total_seconds()
+        diff = [0] * (slots + 1)
+        for player in self.players:
+            for start, end in self.free_intervals(player):
+                first = max(0, -int(-(start - grid_start).total_seconds() // step_s))  # ceil
+                last = min(slots - 1, int((end - duration - grid_start).total_seconds() // step_s))
+                if first <= last:
+                    diff[first] += 1
+                    diff[last + 1] -= 1
+
+        counts = []
+        running = 0
+        for value in diff[:slots]:
+            running += value
+            counts.append(running)
+        return counts
+
+    def best_slots(self, grid_start: datetime, step: timedelta, duration: timedelta, counts: List[int], top: int,
+                   min_count: int = 1, accept: Optional[Callable[[datetime, datetime], bool]] = None) -> List[Tuple[datetime, int]]:
+        """
+        Top slots of a count_free result: most free players first, earliest first on ties
+        Slots overlapping an already selected one are skipped, so suggestions are distinct
+
+        Args:
+            counts: count_free(grid_start, step, len(counts), duration)
+            top: Maximum number of slots
+            min_count: Minimum number of free players
+            accept: Optional filter on (start, end), e.g. allowed hours
+
+        Returns:
+            [(slot_start, free_player_count)]
+        """
+        ranked = sorted((i for i, count in enumerate(counts) if count >= min_count), key=lambda i: (-counts[i], i))
+
+        selected: List[Tuple[datetime, int]] = []
+        for index in ranked:
+            start = grid_start + step * index
+            end = start + duration
+            if accept and not accept(start, end):
+                continue
+            if any(start < chosen + duration and end > chosen for chosen, _ in selected):
+                continue
+            selected.append((start, counts[index]))
+            if len(selected) == top:
+                break
+        return selected
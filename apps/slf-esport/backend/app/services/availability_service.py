@@ -16,7 +16,13 @@ from app.schemas.availability import (
     PlayerAvailabilityExceptionUpdate,
     AvailablePlayerResponse,
     TeamMemberAvailabilityResponse,
+    AvailabilitySlot,
+    AvailabilityHeatmapResponse,
+    SlotFinderRequest,
+    SlotFinderResponse,
+    SuggestedSlot,
 )
+from app.services.availability_engine import TeamAvailability
 
 
 def get_user_availabilities(db: Session, user_id: int) -> List[PlayerAvailability]:
@@ -330,29 +336,83 @@ def get_available_players(db: Session, start_time: datetime, end_time: datetime,
     """
     Get all available players for a given time slot
     If team_player_ids is provided, only check those players
+    Same rules as check_user_available, evaluated on the in-memory team index (2 queries total)
     """
-    # Get all players (or specific team members)
-    query = db.query(User).filter(User.role == UserRole.JOUEUR)
-    if team_player_ids:
-        query = query.filter(User.id.in_(team_player_ids))
-
-    players = query.all()
-
-    # Check availability for each player
-    available_players = []
-    for player in players:
-        availability_info = check_user_available(db, player.id, start_time, end_time)
-
-        available_players.append(AvailablePlayerResponse(
-            user_id=player.id,
-            username=player.username,
-            email=player.email,
-            is_available=availability_info["is_available"],
-            availability_type=availability_info["availability_type"],
-            reason=availability_info.get("reason")
-        ))
+    team = TeamAvailability.load(db, start_time.date(), start_time.date(), team_player_ids)
+    return team.available_players(start_time, end_time)
+
+
+def get_availability_heatmap(db: Session, week_start: date, slot_minutes: int = 60, team_player_ids: Optional[List[int]] = None, top: int = 5) -> AvailabilityHeatmapResponse:
+    """
+    Weekly heatmap: number of players free for the whole of each slot, plus the best slots
+    Best slots: most free players first, earliest first on ties (slots with nobody free are skipped)
+    """
+    week_end = week_start + timedelta(days=6)
+    team = TeamAvailability.load(db, week_start, week_end, team_player_ids)
+
+    step = timedelta(minutes=slot_minutes)
+    slots_per_day = (24 * 60) // slot_minutes
+    grid_start = datetime.combine(week_start, time.min)
+    counts = team.count_free(grid_start, step, 7 * slots_per_day, step)
+
+    best_slots = [
+        AvailabilitySlot(
+            start_time=slot_start,
+            end_time=slot_start + step,
+            available_count=count,
+            available_user_ids=team.free_players(slot_start, slot_start + step)
+        )
+        for slot_start, count in team.best_slots(grid_start, step, step, counts, top)
+    ]
+
+    return AvailabilityHeatmapResponse(
+        week_start=week_start,
+        slot_minutes=slot_minutes,
+        player_count=len(team.players),
+        days=[counts[day * slots_per_day:(day + 1) * slots_per_day] for day in range(7)],
+        best_slots=best_slots
+    )
 
-    # Sort: available first, then by username
-    available_players.sort(key=lambda p: (not p.is_available, p.username))
 
-    return available_players
+def find_team_slots(db: Session, request: SlotFinderRequest) -> SlotFinderResponse:
+    """
+    Suggest session times for a set of invited players
+    Sweeps the merged free intervals of every player over the date range (one count per
+    grid start, no per-slot query) and returns the top distinct slots by number of free players
+    Requested IDs that are not players (unknown users, coaches, managers) are reported, not counted
+    """
+    team = TeamAvailability.load(db, request.start_date, request.end_date, request.player_ids)
+
+    duration = timedelta(minutes=request.duration_minutes)
+    step = timedelta(minutes=request.step_minutes)
+    grid_start = datetime.combine(request.start_date, time.min)
+    grid_end = datetime.combine(request.end_date + timedelta(days=1), time.min)
+    slot_count = (grid_end - duration - grid_start) // step + 1
+    counts = team.count_free(grid_start, step, slot_count, duration) if slot_count > 0 else []
+
+    def within_hours(start: datetime, end: datetime) -> bool:
+        if request.earliest_time and start.time() < request.earliest_time:
+            return False
+        if request.latest_time and (end.date() != start.date() or end.time() > request.latest_time):
+            return False
+        return True
+
+    player_ids = [player.user_id for player in team.players]
+    unknown_player_ids = sorted(set(request.player_ids) - set(player_ids))
+    slots = []
+    for slot_start, count in team.best_slots(grid_start, step, duration, counts, request.top, request.min_players, within_hours):
+        free_ids = team.free_players(slot_start, slot_start + duration)
+        slots.append(SuggestedSlot(
+            start_time=slot_start,
+            end_time=slot_start + duration,
+            available_count=count,
+            available_user_ids=free_ids,
+            unavailable_user_ids=[user_id for user_id in player_ids if user_id not in free_ids]
+        ))
+
+    return SlotFinderResponse(
+        player_count=len(player_ids),
+        duration_minutes=request.duration_minutes,
+        slots=slots,
+        unknown_player_ids=unknown_player_ids
+    )
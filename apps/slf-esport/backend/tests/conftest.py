@@ -0,0 +1,14 @@
+"""
+Test configuration - settings required to import app.core.config without a .env
+"""
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-" + "y" * 32)
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_USER", "test")
+os.environ.setdefault("POSTGRES_PASSWORD", "test")
+os.environ.setdefault("POSTGRES_DB", "test")
+# Never connected to: tests bind their own SQLite engines (a file URL keeps the pool arguments valid)
+os.environ.setdefault("DATABASE_URL", "sqlite:////tmp/slf-esport-tests-unused.db")
+os.environ.setdefault("DEBUG", "false")
@@ -0,0 +1,258 @@
+"""
+Availability engine tests - the in-memory team index must give the same answers
+as the per-player check_user_available rules
+"""
+import random
+from datetime import datetime, date, time, timedelta
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.user import User, UserRole
+from app.models.availability import PlayerAvailability, PlayerAvailabilityException
+from app.schemas.availability import SlotFinderRequest
+from app.services import availability_service
+from app.services.availability_engine import TeamAvailability
+
+
+WEEK_START = date(2026, 1, 5)  # Monday
+
+
+@pytest.fixture
+def db():
+    """SQLite session with only the tables the availability engine reads"""
+    engine = create_engine("sqlite://")
+    tables = [User.__table__, PlayerAvailability.__table__, PlayerAvailabilityException.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_user(db, user_id: int, role: UserRole = UserRole.JOUEUR) -> None:
+    db.add(User(
+        id=user_id,
+        username=f"u{user_id:02d}",
+        email=f"u{user_id}@example.com",
+        hashed_password="hashed",
+        role=role
+    ))
+
+
+@pytest.fixture
+def seeded_db(db):
+    """Random team: recurring and specific-date windows, timed and whole-day exceptions, a few coaches"""
+    rng = random.Random(1)
+    for user_id in range(1, 41):
+        add_user(db, user_id, UserRole.JOUEUR if user_id % 8 else UserRole.COACH)
+
+    for user_id in range(1, 41):
+        for _ in range(rng.randint(0, 6)):
+            hour = rng.randint(8, 21)
+            if rng.random() < 0.7:
+                when = {"day_of_week": rng.randint(0, 6)}
+            else:
+                when = {"specific_date": WEEK_START + timedelta(days=rng.randint(0, 13))}
+            db.add(PlayerAvailability(
+                user_id=user_id,
+                start_time=time(hour),
+                end_time=time(min(23, hour + rng.randint(1, 3))),
+                is_active=rng.random() < 0.9,
+                notes=f"note {user_id}",
+                **when
+            ))
+        for _ in range(rng.randint(0, 3)):
+            timed = rng.random() < 0.5
+            hour = rng.randint(8, 20)
+            db.add(PlayerAvailabilityException(
+                user_id=user_id,
+                exception_date=WEEK_START + timedelta(days=rng.randint(0, 13)),
+                start_time=time(hour) if timed else None,
+                end_time=time(hour + 2) if timed else None,
+                is_unavailable=rng.random() < 0.7,
+                reason=f"reason {user_id}"
+            ))
+    db.commit()
+    return db
+
+
+def per_player(db, start: datetime, end: datetime, team_player_ids=None):
+    """Reference result: check_user_available for every player, in get_available_players order"""
+    query = db.query(User).filter(User.role == UserRole.JOUEUR)
+    if team_player_ids:
+        query = query.filter(User.id.in_(team_player_ids))
+    rows = []
+    for user in query.all():
+        info = availability_service.check_user_available(db, user.id, start, end)
+        rows.append((user.id, info["is_available"], info["availability_type"], info.get("reason")))
+    return sorted(rows, key=lambda row: (not row[1], f"u{row[0]:02d}"))
+
+
+def test_available_players_matches_check_user_available(seeded_db):
+    seen_types = set()
+    for day in range(14):
+        for hour in range(7, 23, 2):
+            for minutes in (30, 120):
+                start = datetime.combine(WEEK_START + timedelta(days=day), time(hour))
+                end = start + timedelta(minutes=minutes)
+                for team_player_ids in (None, [1, 2, 3, 8, 9]):
+                    engine_rows = [
+                        (p.user_id, p.is_available, p.availability_type, p.reason)
+                        for p in availability_service.get_available_players(seeded_db, start, end, team_player_ids)
+                    ]
+                    assert engine_rows == per_player(seeded_db, start, end, team_player_ids), (start, end, team_player_ids)
+                    seen_types.update(row[2] for row in engine_rows)
+
+    # Every rule (exceptions, specific dates, recurring windows) was exercised
+    assert seen_types == {
+        "exception_unavailable", "exception_available", "specific_date", "recurring", "no_availability"
+    }
+
+
+def test_exception_overrides_recurring_and_specific_windows(db):
+    add_user(db, 1)
+    monday = WEEK_START
+    db.add(PlayerAvailability(user_id=1, day_of_week=1, start_time=time(18), end_time=time(22)))
+    db.add(PlayerAvailability(user_id=1, specific_date=monday + timedelta(days=1), start_time=time(10), end_time=time(12)))
+    db.add(PlayerAvailabilityException(
+        user_id=1, exception_date=monday, start_time=time(19), end_time=time(20), is_unavailable=True, reason="dentist"
+    ))
+    db.add(PlayerAvailabilityException(user_id=1, exception_date=monday + timedelta(days=7), is_unavailable=True))
+    db.commit()
+
+    for start in (
+        datetime.combine(monday, time(18)),          # recurring (day_of_week 1 = Monday)
+        datetime.combine(monday, time(19, 30)),      # timed exception inside the recurring window
+        datetime.combine(monday, time(21)),          # recurring again after the exception
+        datetime.combine(monday + timedelta(days=1), time(10)),  # specific date
+        datetime.combine(monday + timedelta(days=7), time(18)),  # whole-day exception
+    ):
+        end = start + timedelta(minutes=30)
+        team = TeamAvailability.load(db, start.date(), start.date())
+        (player,) = team.available_players(start, end)
+        expected = availability_service.check_user_available(db, 1, start, end)
+        assert (player.is_available, player.availability_type, player.reason) == (
+            expected["is_available"], expected["availability_type"], expected.get("reason")
+        ), start
+
+
+def test_overnight_window_from_the_day_before(db):
+    add_user(db, 1)
+    add_user(db, 2)
+    sunday = WEEK_START - timedelta(days=1)
+    # Sunday 22:00 -> Monday 02:00 (day_of_week 0 = Sunday)
+    db.add(PlayerAvailability(user_id=1, day_of_week=0, start_time=time(22), end_time=time(2)))
+    db.add(PlayerAvailability(user_id=2, specific_date=sunday, start_time=time(23), end_time=time(1)))
+    db.commit()
+
+    team = TeamAvailability.load(db, WEEK_START, WEEK_START)
+    midnight = datetime.combine(WEEK_START, time.min)
+    assert sorted(team.free_players(midnight, midnight + timedelta(hours=1))) == [1, 2]
+    assert team.free_players(midnight + timedelta(hours=1), midnight + timedelta(hours=2)) == [1]
+    assert team.count_free(midnight, timedelta(hours=1), 3, timedelta(hours=1)) == [2, 1, 0]
+
+
+def test_count_free_matches_free_players(seeded_db):
+    week_end = WEEK_START + timedelta(days=6)
+    team = TeamAvailability.load(seeded_db, WEEK_START, week_end)
+    grid_start = datetime.combine(WEEK_START, time.min)
+
+    for step_minutes, duration_minutes in ((60, 60), (30, 90), (15, 120)):
+        step = timedelta(minutes=step_minutes)
+        duration = timedelta(minutes=duration_minutes)
+        slots = (datetime.combine(week_end + timedelta(days=1), time.min) - duration - grid_start) // step + 1
+        counts = team.count_free(grid_start, step, slots, duration)
+        for index, count in enumerate(counts):
+            start = grid_start + step * index
+            assert count == len(team.free_players(start, start + duration)), (start, duration)
+        assert max(counts) > 0
+
+
+def test_free_intervals_match_brute_force(seeded_db):
+    team = TeamAvailability.load(seeded_db, WEEK_START, WEEK_START + timedelta(days=6))
+
+    def covered(windows, moment):
+        return any(start <= moment < end for start, end in windows)
+
+    for player in team.players:
+        intervals = team.free_intervals(player)
+        for offset in range(7):
+            day = WEEK_START + timedelta(days=offset)
+            free, busy = [], []
+            windows = list(player.recurring.get((day.weekday() + 1) % 7, [])) + list(player.specific.get(day, []))
+            for start, end, _ in windows:
+                free.append((datetime.combine(day, start), datetime.combine(day, end)))
+            for start, end, is_unavailable, _ in player.exceptions.get(day, []):
+                if start:
+                    window = (datetime.combine(day, start), datetime.combine(day, end))
+                else:
+                    window = (datetime.combine(day, time.min), datetime.combine(day + timedelta(days=1), time.min))
+                (busy if is_unavailable else free).append(window)
+            for minute in range(0, 24 * 60, 5):
+                moment = datetime.combine(day, time.min) + timedelta(minutes=minute)
+                assert covered(intervals, moment) == (covered(free, moment) and not covered(busy, moment)), (player.user_id, moment)
+
+
+def test_best_slots_ranked_and_distinct(seeded_db):
+    team = TeamAvailability.load(seeded_db, WEEK_START, WEEK_START + timedelta(days=6))
+    grid_start = datetime.combine(WEEK_START, time.min)
+    step = timedelta(minutes=30)
+    duration = timedelta(minutes=90)
+    slots = (7 * 24 * 60 - 90) // 30 + 1
+    counts = team.count_free(grid_start, step, slots, duration)
+
+    best = team.best_slots(grid_start, step, duration, counts, top=8, min_count=2)
+    assert best
+    # Most free players first, earliest first on ties
+    assert best == sorted(best, key=lambda slot: (-slot[1], slot[0]))
+    assert all(count >= 2 for _, count in best)
+    # No two suggestions overlap
+    for i, (first, _) in enumerate(best):
+        for second, _ in best[i + 1:]:
+            assert first + duration <= second or second + duration <= first
+    # The first suggestion is the best slot of the whole grid
+    assert best[0][1] == max(counts)
+
+
+def test_find_team_slots_reports_non_players(db):
+    for user_id in (1, 2):
+        add_user(db, user_id)
+    add_user(db, 3, UserRole.COACH)
+    for user_id in (1, 2, 3):
+        db.add(PlayerAvailability(user_id=user_id, day_of_week=1, start_time=time(18), end_time=time(21)))
+    db.commit()
+
+    response = availability_service.find_team_slots(db, SlotFinderRequest(
+        player_ids=[1, 2, 3, 99],
+        duration_minutes=60,
+        start_date=WEEK_START,
+        end_date=WEEK_START,
+        step_minutes=30,
+        earliest_time=time(17),
+        latest_time=time(22),
+        top=3
+    ))
+
+    assert response.player_count == 2
+    assert response.unknown_player_ids == [3, 99]
+    starts = [slot.start_time.time() for slot in response.slots]
+    assert starts == [time(18), time(19), time(20)]
+    for slot in response.slots:
+        assert slot.available_user_ids == [1, 2]
+        assert slot.unavailable_user_ids == []
+
+
+def test_slot_finder_rejects_empty_time_window():
+    with pytest.raises(ValidationError, match="latest_time must be after earliest_time"):
+        SlotFinderRequest(
+            player_ids=[1],
+            duration_minutes=60,
+            start_date=WEEK_START,
+            end_date=WEEK_START,
+            earliest_time=time(20),
+            latest_time=time(18)
+        )